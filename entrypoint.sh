@@ -8,4 +8,21 @@ python manage.py collectstatic --no-input
 # Apply any outstanding database migrations
 python manage.py migrate
 
+# Render the markdown of the rows saved before their renderings were stored
+python manage.py render_markdown
+
+# Read the dimensions, colour and placeholder of the images uploaded before they were stored
+python manage.py backfill_image_metadata
+
+# Generate the image renditions of the uploads changed since the last start
+python manage.py generate_images
+
+# Delete the pages cached by the previous deployment, the cache outliving the containers
+python manage.py reset_page_cache
+
+# Pre-render the pages for nginx to serve them directly (removes them in maintenance mode)
+if [ -n "$PRERENDER_ROOT" ]; then
+    python manage.py prerender
+fi
+
 exec "$@"
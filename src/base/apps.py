@@ -12,3 +12,12 @@ class BaseConfig(AppConfig):
 
     def ready(self) -> None:
         post_migrate.connect(create_default_site_media, sender=self)
+
+        # Imported here as it needs the models of every app to be loaded
+        from core.db_pool import connect_pool_stats  # noqa: PLC0415
+        from core.page_cache_invalidation import connect_page_cache_invalidation  # noqa: PLC0415
+        from utils.singletons import connect_singleton_invalidation  # noqa: PLC0415
+
+        connect_pool_stats()
+        connect_page_cache_invalidation()
+        connect_singleton_invalidation()
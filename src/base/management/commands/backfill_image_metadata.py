@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from utils.models import ImageMetadataModel
+
+if TYPE_CHECKING:
+    from django.core.management.base import CommandParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Read the dimensions, dominant colour and placeholder of the images into their stored companions. "
+        "Only the images whose metadata were never read are read, unless --force is given."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Read the metadata of every image, e.g. after replacing the files in the storage.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for model in apps.get_models():
+            if not issubclass(model, ImageMetadataModel):
+                continue
+
+            field_names = list(model.get_image_metadata_field_names())
+            updated = 0
+
+            for instance in model._default_manager.all():
+                if instance.update_image_metadata(force=options["force"]):
+                    # Saved one by one, so the cached pages and singletons depending on them are invalidated
+                    instance.save(update_fields=field_names)
+                    updated += 1
+
+            self.stdout.write(f"{model._meta.label}: {updated} updated")
+
+        self.stdout.write(self.style.SUCCESS("Image metadata are up to date."))
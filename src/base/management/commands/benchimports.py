@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.import_time import check_budget, profile_startup
+
+if TYPE_CHECKING:
+    from django.core.management.base import CommandParser
+
+DEFAULT_BUDGET = Path(settings.BASE_DIR) / "benchmarks" / "import-budget.json"
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile the imports of the startup of a gunicorn worker with `python -X importtime`, reporting the packages "
+        "taking the longest to import, and fail when the startup goes over the import budget."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--runs", type=int, default=5, help="Number of processes profiled, the fastest being reported."
+        )
+        parser.add_argument("--top", type=int, default=15, help="Number of packages reported.")
+        parser.add_argument(
+            "--budget",
+            type=Path,
+            default=DEFAULT_BUDGET,
+            help=f"JSON budget to check against. Defaults to {DEFAULT_BUDGET.name}, skipped if missing.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["runs"] < 1:
+            msg = "The number of runs must be at least 1."
+            raise CommandError(msg)
+        if options["top"] < 0:
+            msg = "The number of packages reported can't be negative."
+            raise CommandError(msg)
+
+        try:
+            profile = profile_startup(options["runs"])
+        except RuntimeError as error:
+            raise CommandError(str(error)) from error
+
+        packages = sorted(profile.packages.items(), key=lambda item: item[1], reverse=True)[: options["top"]]
+        self.stdout.write(f"{'package':<32}{'self_ms':>12}")
+        for package, self_ms in packages:
+            self.stdout.write(f"{package:<32}{self_ms:>12}")
+        self.stdout.write(f"{'total':<32}{profile.total_ms:>12}")
+
+        budget_file: Path = options["budget"]
+        if not budget_file.exists():
+            return
+
+        if overruns := check_budget(profile, json.loads(budget_file.read_text())):
+            msg = f"{len(overruns)} overruns of the budget {budget_file}:\n" + "\n".join(overruns)
+            raise CommandError(msg)
+
+        self.stdout.write(self.style.SUCCESS(f"Within the budget {budget_file}."))
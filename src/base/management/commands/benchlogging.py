@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.logging_benchmark import LoggingStats, run_logging_benchmark
+
+if TYPE_CHECKING:
+    from django.core.management.base import CommandParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Log a burst of structured records as JSON to the null device, synchronously with the previous formatter, "
+        "synchronously, and through the queue of the logging listener, reporting the records per second logged by "
+        "the calling thread and written."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--records", type=int, default=100_000, help="Number of records logged with each setup.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["records"] < 1:
+            msg = "The number of records must be at least 1."
+            raise CommandError(msg)
+
+        results = run_logging_benchmark(options["records"])
+
+        self.stdout.write(f"{'setup':<16}" + "".join(f"{metric:>22}" for metric in LoggingStats._fields))
+        for setup, stats in results.items():
+            self.stdout.write(f"{setup:<16}" + "".join(f"{value:>22}" for value in stats))
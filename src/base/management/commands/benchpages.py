@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import METRICS, BenchmarkError, DatasetSize, compare_to_baseline, run_benchmark
+
+if TYPE_CHECKING:
+    from django.core.management.base import CommandParser
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "pages-baseline.json"
+
+
+class Command(BaseCommand):
+    help = (
+        "Render every public page, in each language, over a number of iterations against a seeded dataset, "
+        "report the latency percentiles, queries, allocated memory and size of each page, and compare them "
+        "against a baseline. The dataset is rolled back, leaving the database untouched."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--iterations", type=int, default=20, help="Number of times each page is rendered.")
+        parser.add_argument("--projects", type=int, default=10, help="Number of projects in the dataset.")
+        parser.add_argument("--experiences", type=int, default=10, help="Number of experiences in the dataset.")
+        parser.add_argument("--education", type=int, default=3, help="Number of education entries in the dataset.")
+        parser.add_argument("--technologies", type=int, default=20, help="Number of technologies in the dataset.")
+        parser.add_argument("--output", type=Path, help="File to save the results to, as JSON.")
+        parser.add_argument(
+            "--baseline",
+            type=Path,
+            default=DEFAULT_BASELINE,
+            help=f"JSON results to compare against. Defaults to {DEFAULT_BASELINE.name}, skipped if missing.",
+        )
+        parser.add_argument("--no-compare", action="store_true", help="Do not compare against the baseline.")
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Relative increase over the baseline tolerated for every metric. Defaults to 0.2 (20%%).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["iterations"] < 1:
+            msg = "The number of iterations must be at least 1."
+            raise CommandError(msg)
+
+        size = DatasetSize(
+            projects=options["projects"],
+            experiences=options["experiences"],
+            education=options["education"],
+            technologies=options["technologies"],
+        )
+        try:
+            results = run_benchmark(size, options["iterations"])
+        except BenchmarkError as error:
+            raise CommandError(str(error)) from error
+        report = {
+            "dataset": size._asdict(),
+            "iterations": options["iterations"],
+            "pages": {key: stats._asdict() for key, stats in results.items()},
+        }
+
+        self.stdout.write(f"{'page':<24}" + "".join(f"{metric:>12}" for metric in METRICS))
+        for key, stats in results.items():
+            self.stdout.write(f"{key:<24}" + "".join(f"{value:>12}" for value in stats))
+
+        if output := options["output"]:
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text(json.dumps(report, indent=2) + "\n")
+            self.stdout.write(f"Saved the results to {output}")
+
+        baseline_file: Path = options["baseline"]
+        if options["no_compare"] or not baseline_file.exists():
+            return
+
+        baseline = json.loads(baseline_file.read_text())
+        if baseline["dataset"] != report["dataset"]:
+            msg = f"The baseline was measured against another dataset: {baseline['dataset']}."
+            raise CommandError(msg)
+
+        if regressions := compare_to_baseline(results, baseline["pages"], options["tolerance"]):
+            msg = f"{len(regressions)} regressions over the baseline {baseline_file}:\n" + "\n".join(regressions)
+            raise CommandError(msg)
+
+        self.stdout.write(self.style.SUCCESS(f"No regressions over the baseline {baseline_file}."))
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.db_pool import get_pool
+from core.db_pool_benchmark import run_pool_stress
+
+if TYPE_CHECKING:
+    from django.core.management.base import CommandParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Stress the PostgreSQL connection pool with more concurrent threads than it has connections, each making "
+        "requests holding a connection, and report the latency and errors of the requests and the statistics of the "
+        "pool."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--threads", type=int, default=16, help="Number of concurrent threads.")
+        parser.add_argument("--requests", type=int, default=20, help="Number of requests of each thread.")
+        parser.add_argument(
+            "--hold-ms", type=float, default=50.0, help="Time each request holds its connection, in ms."
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["threads"] < 1:
+            msg = "The number of threads must be at least 1."
+            raise CommandError(msg)
+        if options["requests"] < 1:
+            msg = "The number of requests must be at least 1."
+            raise CommandError(msg)
+        if options["hold_ms"] < 0:
+            msg = "The time each request holds its connection can't be negative."
+            raise CommandError(msg)
+
+        try:
+            stats = run_pool_stress(options["threads"], options["requests"], options["hold_ms"])
+        except RuntimeError as error:
+            raise CommandError(str(error)) from error
+
+        if (pool := get_pool(connection)) is not None:
+            self.stdout.write(
+                f"{options['threads']} threads, pool of {pool.min_size} to {pool.max_size} connections, "
+                f"{pool.timeout}s timeout"
+            )
+        for metric, value in stats._asdict().items():
+            self.stdout.write(f"{metric:<16}{value:>12}")
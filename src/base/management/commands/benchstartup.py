@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.prerender import get_prerender_paths
+from core.startup_benchmark import StartupStats, run_startup_benchmark
+
+if TYPE_CHECKING:
+    from django.core.management.base import CommandParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Start gunicorn as in production, without and with the warm-up of its workers, requesting every page in each "
+        "language as soon as it accepts connections, and report the time to its first response and to its first fast "
+        "response, in ms."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--workers", type=int, default=2, help="Number of gunicorn workers.")
+        parser.add_argument(
+            "--passes", type=int, default=5, help="Requests of every page after the first, for the steady latency."
+        )
+        parser.add_argument(
+            "--fast-ms",
+            type=float,
+            default=None,
+            help="Latency of a fast response, in ms (default: twice the steady median).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["workers"] < 1:
+            msg = "The number of workers must be at least 1."
+            raise CommandError(msg)
+        if options["passes"] < 1:
+            msg = "The number of passes must be at least 1."
+            raise CommandError(msg)
+        if options["fast_ms"] is not None and options["fast_ms"] <= 0:
+            msg = "The latency of a fast response must be positive."
+            raise CommandError(msg)
+        if find_spec("gunicorn") is None:
+            msg = "gunicorn is not installed."
+            raise CommandError(msg)
+        if not (paths := sorted(get_prerender_paths())):
+            msg = "There are no pages to request."
+            raise CommandError(msg)
+
+        try:
+            results = run_startup_benchmark(paths, options["workers"], options["passes"], options["fast_ms"])
+        except RuntimeError as error:
+            raise CommandError(str(error)) from error
+
+        self.stdout.write(f"{'setup':<10}" + "".join(f"{metric:>24}" for metric in StartupStats._fields))
+        for setup, stats in results.items():
+            self.stdout.write(f"{setup:<10}" + "".join(f"{value:>24}" for value in stats))
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import os
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from imagekit.registry import generator_registry
+
+from core.image_generation import ImageStatus, generate_images, get_cache_files
+
+if TYPE_CHECKING:
+    from django.core.management.base import CommandParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the imagekit renditions of every uploaded image across a pool of processes, skipping those "
+        "whose source image is unchanged since recorded in the manifest of the generated images."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--spec",
+            action="append",
+            dest="specs",
+            help="Id of an image spec to generate (e.g. home:project:card_images_webp_400), instead of every spec. "
+            "Can be repeated.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.process_cpu_count() or 1,
+            help="Number of processes generating the images. Defaults to the number of available CPUs.",
+        )
+        parser.add_argument("--force", action="store_true", help="Generate every image, even if unchanged.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["workers"] < 1:
+            msg = "The number of workers must be at least 1."
+            raise CommandError(msg)
+        if unknown_specs := set(options["specs"] or ()) - set(generator_registry.get_ids()):
+            msg = f"Unknown image specs: {', '.join(sorted(unknown_specs))}."
+            raise CommandError(msg)
+
+        start = time.perf_counter()
+        files = get_cache_files(options["specs"])
+        if options["workers"] > 1:
+            # Not to be shared with the forked processes
+            connections.close_all()
+        results = generate_images(files, options["workers"], options["force"])
+
+        for result in results:
+            if result.status is not ImageStatus.SKIPPED or options["verbosity"] > 1:
+                self.stdout.write(f"{result.status}: {result.name}")
+
+        counts = Counter(result.status for result in results)
+        summary = ", ".join(f"{counts[status]} {status}" for status in ImageStatus)
+        elapsed = time.perf_counter() - start
+        # Not an error, for a missing source image not to prevent the container from starting
+        if counts[ImageStatus.FAILED]:
+            self.stdout.write(self.style.WARNING(f"Some images could not be generated ({summary}, in {elapsed:.1f}s)."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Images are up to date ({summary}, in {elapsed:.1f}s)."))
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from django.core.management.base import BaseCommand
+
+from core.page_cache import get_stats, reset_stats
+
+if TYPE_CHECKING:
+    from django.core.management.base import CommandParser
+
+
+class Command(BaseCommand):
+    help = "Show the full-page cache hit rate of every URL served since the counters were last reset."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--reset", action="store_true", help="Reset the counters after showing them.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        stats = get_stats()
+
+        if not stats:
+            self.stdout.write("No page cache lookups recorded.")
+        else:
+            width = max(len(entry.path) for entry in stats)
+            self.stdout.write(f"{'Path':<{width}}  {'Hits':>8}  {'Misses':>8}  {'Hit rate':>8}")
+
+            for entry in stats:
+                self.stdout.write(f"{entry.path:<{width}}  {entry.hits:>8}  {entry.misses:>8}  {entry.hit_rate:>8.1%}")
+
+            hits = sum(entry.hits for entry in stats)
+            lookups = sum(entry.lookups for entry in stats)
+            self.stdout.write(f"{'Total':<{width}}  {hits:>8}  {lookups - hits:>8}  {hits / lookups:>8.1%}")
+
+        if options["reset"]:
+            reset_stats()
+            self.stdout.write(self.style.SUCCESS("Page cache counters reset."))
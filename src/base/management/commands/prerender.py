@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.prerender import get_prerender_paths, prerender_pages, remove_stale_pages
+
+if TYPE_CHECKING:
+    from django.core.management.base import CommandParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Render every page, in each language, to static HTML files (with gzip and brotli compressed siblings) "
+        "for nginx to serve them directly. The pages that no longer exist are removed, as every page is in "
+        "maintenance mode."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--output", type=Path, help="Directory to write the pages to. Defaults to the PRERENDER_ROOT setting."
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="URL path of a page to render, instead of every page. Can be repeated.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        root: Path | None = options["output"] or (Path(settings.PRERENDER_ROOT) if settings.PRERENDER_ROOT else None)
+        if root is None:
+            msg = "No output directory: set PRERENDER_ROOT or pass --output."
+            raise CommandError(msg)
+        if settings.MAINTENANCE_MODE:
+            # nginx would serve the pre-rendered pages instead of the maintenance page
+            for path in remove_stale_pages((), root) if root.is_dir() else ():
+                self.stdout.write(f"Removed {path}")
+            self.stdout.write(self.style.WARNING(f"Maintenance mode: no pages are pre-rendered to {root}."))
+            return
+        if not settings.PAGE_CACHE_COOKIELESS:
+            msg = "Pre-rendered pages are shared by every visitor, which requires PAGE_CACHE_COOKIELESS."
+            raise CommandError(msg)
+
+        paths = options["paths"] or get_prerender_paths()
+        result = prerender_pages(paths, root)
+        removed = result.removed
+        if not options["paths"]:
+            removed += remove_stale_pages(result.written, root)
+
+        for path in removed:
+            self.stdout.write(f"Removed {path}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Pre-rendered {len(result.written)} pages ({result.size / 1024:.1f} KiB) to {root}.")
+        )
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from itertools import batched
+from typing import TYPE_CHECKING, Any
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from solo.models import SingletonModel
+
+from utils.fields import EncryptedJSONField
+from utils.singletons import invalidate_solo
+
+if TYPE_CHECKING:
+    from django.core.management.base import CommandParser
+
+_DEFAULT_BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-encrypt the encrypted fields of every row with the newest of the FIELD_ENCRYPTION_KEY keys, "
+        "so the older ones can be removed."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=_DEFAULT_BATCH_SIZE,
+            help=f"Number of rows updated per query (default {_DEFAULT_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size: int = options["batch_size"]
+        if batch_size <= 0:
+            msg = "The batch size must be a positive number."
+            raise CommandError(msg)
+
+        for model in apps.get_models():
+            field_names = [
+                field.attname for field in model._meta.concrete_fields if isinstance(field, EncryptedJSONField)
+            ]
+            if not field_names:
+                continue
+
+            updated = 0
+            with transaction.atomic():
+                rows = model._default_manager.only(*field_names).select_for_update().iterator(chunk_size=batch_size)
+                for batch in batched(rows, batch_size):
+                    # Decrypted with whichever key they were encrypted with, as read by bulk_update, and
+                    # encrypted again with the newest one
+                    updated += model._default_manager.bulk_update(batch, field_names)
+
+            if issubclass(model, SingletonModel):
+                # The processes keep the singleton along with its former ciphertext
+                invalidate_solo(model)
+
+            self.stdout.write(f"{model._meta.label}: {updated} re-encrypted")
+
+        self.stdout.write(self.style.SUCCESS("The encrypted fields are encrypted with the newest key."))
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from utils.models import RenderedMarkdownModel
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the markdown fields of every language into their stored HTML and plain text companions. "
+        "Only the rows whose renderings are outdated are saved."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for model in apps.get_models():
+            if not issubclass(model, RenderedMarkdownModel):
+                continue
+
+            field_names = list(model.get_rendered_markdown_field_names())
+            updated = 0
+
+            for instance in model._default_manager.all():
+                stored = [getattr(instance, field_name) for field_name in field_names]
+                instance.render_markdown()
+
+                if stored != [getattr(instance, field_name) for field_name in field_names]:
+                    # Saved one by one, so the cached pages and singletons depending on them are invalidated
+                    instance.save(update_fields=field_names)
+                    updated += 1
+
+            self.stdout.write(f"{model._meta.label}: {updated} updated")
+
+        self.stdout.write(self.style.SUCCESS("Markdown renderings are up to date."))
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from core.page_cache import reset_page_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete every cached page and start a new content version (invalidating the JSON-LD documents and the "
+        "copies of the pages held by the browsers), for the pages to be rendered by the deployed code."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        purged_keys = reset_page_cache()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {purged_keys} cached pages and bumped the content version."))
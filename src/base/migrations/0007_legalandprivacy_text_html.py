@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+# Generated by Django 5.2.18 on 2026-10-18 17:59
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (("base", "0006_rename_background_image_to_portrait_image"),)
+
+    operations = (
+        migrations.AddField(
+            model_name="legalandprivacy",
+            name="text_html",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="legalandprivacy",
+            name="text_html_en",
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="legalandprivacy",
+            name="text_html_es",
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+    )
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:05
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (("base", "0007_legalandprivacy_text_html"),)
+
+    operations = (
+        migrations.CreateModel(
+            name="JsonLdDocument",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("path", models.CharField(max_length=500, unique=True)),
+                ("content_version", models.CharField(max_length=32)),
+                ("document", models.TextField()),
+            ],
+        ),
+    )
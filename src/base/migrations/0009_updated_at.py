@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:16
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (("base", "0008_jsonlddocument"),)
+
+    operations = (
+        migrations.AddField(
+            model_name="followmelink",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="googleanalytics",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="legalandprivacy",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="sitemedia",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    )
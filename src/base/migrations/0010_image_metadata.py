@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:13
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (("base", "0009_updated_at"),)
+
+    operations = (
+        migrations.AddField(
+            model_name="sitemedia",
+            name="logo_color",
+            field=models.CharField(blank=True, editable=False, max_length=7),
+        ),
+        migrations.AddField(
+            model_name="sitemedia",
+            name="logo_height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="sitemedia",
+            name="logo_placeholder",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="sitemedia",
+            name="logo_width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="sitemedia",
+            name="portrait_image_color",
+            field=models.CharField(blank=True, editable=False, max_length=7),
+        ),
+        migrations.AddField(
+            model_name="sitemedia",
+            name="portrait_image_height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="sitemedia",
+            name="portrait_image_placeholder",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="sitemedia",
+            name="portrait_image_width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    )
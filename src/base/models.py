@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import mimetypes
 from functools import cached_property
+from types import MappingProxyType
 
 from django.db import models
 from django_cooco.models import CookieGroup
@@ -9,10 +10,16 @@ from imagekit.models import ImageSpecField
 from imagekit.processors import ResizeToFit, SmartResize
 from solo.models import SingletonModel
 
+from utils.images import ResponsiveImageField
+from utils.models import ImageMetadataModel, MarkdownRendering, RenderedMarkdownModel, TimestampedModel
 
-class LegalAndPrivacy(models.Model):  # type: ignore[django-manager-missing] # https://github.com/typeddjango/django-stubs/issues/1023
+
+class LegalAndPrivacy(RenderedMarkdownModel, TimestampedModel):
     title = models.CharField(max_length=100, unique=True)
     text = models.TextField()
+    text_html = models.TextField(blank=True, editable=False)
+
+    rendered_markdown_fields = MappingProxyType({"text": (MarkdownRendering.HTML,)})
 
     def __str__(self) -> str:
         return self.title
@@ -22,7 +29,7 @@ class LegalAndPrivacy(models.Model):  # type: ignore[django-manager-missing] # h
         return f"legal_and_privacy_{self.id}_modal"
 
 
-class FollowMeLink(models.Model):
+class FollowMeLink(TimestampedModel):
     name = models.CharField(max_length=50)
     link = models.URLField()
     svg_view_box = models.CharField(max_length=16)
@@ -32,7 +39,7 @@ class FollowMeLink(models.Model):
         return self.name
 
 
-class GoogleAnalytics(SingletonModel):
+class GoogleAnalytics(TimestampedModel, SingletonModel):
     use_analytics = models.BooleanField(default=False)
     gtag = models.CharField(max_length=20, blank=True)
     cookie_consent = models.ForeignKey(CookieGroup, on_delete=models.RESTRICT, null=True)
@@ -42,13 +49,17 @@ class GoogleAnalytics(SingletonModel):
         return "Google Analytics"
 
 
-class SiteMedia(SingletonModel):
+class SiteMedia(ImageMetadataModel, TimestampedModel, SingletonModel):
     portrait_image = models.ImageField(
         upload_to="site/",
         default="site/portrait.png",
         help_text="16:9 image with the subject centered (used for hero portrait and social media "
         "previews: 1200x630 OG, 1200x675 Twitter). Minimum recommended size: 1920x1080px.",
     )
+    portrait_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    portrait_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    portrait_image_color = models.CharField(max_length=7, blank=True, editable=False)
+    portrait_image_placeholder = models.TextField(blank=True, editable=False)
 
     portrait_display = ImageSpecField(
         source="portrait_image",
@@ -57,11 +68,16 @@ class SiteMedia(SingletonModel):
         options={"quality": 85},
     )
 
-    portrait_mobile_display = ImageSpecField(
+    # Hero portrait: the mobile banner spans the screen, while on desktop the image covers a
+    # frame up to 40rem (or 72vh) tall, hence 16/9 of that wide for the recommended 16:9 photo.
+    # Both use the same sizes, so the browser downloads a single rendition for them. The
+    # renditions keep the aspect ratio of the photo, only cropped by the layout (object-top).
+    portrait_images = ResponsiveImageField(
         source="portrait_image",
-        processors=[ResizeToFit(900, 506, upscale=False)],
-        format="WEBP",
-        options={"quality": 80},
+        widths=(640, 960, 1280, 1920),
+        aspect_ratio=None,
+        sizes="(min-width: 1024px) min(128vh, 1138px), 100vw",
+        fallback_width=1280,
     )
 
     og_preview_image_display = ImageSpecField(
@@ -81,6 +97,10 @@ class SiteMedia(SingletonModel):
     favicon = models.ImageField(upload_to="site/", default="site/favicon.ico")
 
     logo = models.ImageField(upload_to="site/", default="site/icon.png")
+    logo_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    logo_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    logo_color = models.CharField(max_length=7, blank=True, editable=False)
+    logo_placeholder = models.TextField(blank=True, editable=False)
     logo_display = ImageSpecField(
         source="logo",
         processors=[ResizeToFit(64, 64, upscale=False)],
@@ -88,6 +108,8 @@ class SiteMedia(SingletonModel):
         options={"lossless": True},
     )
 
+    image_metadata_fields = ("portrait_image", "logo")
+
     def __str__(self) -> str:
         return "Site Media"
 
@@ -95,3 +117,14 @@ class SiteMedia(SingletonModel):
     def favicon_content_type(self) -> str:
         """Return the MIME type of the favicon, used for the favicon link tag."""
         return mimetypes.guess_type(self.favicon.name)[0] or "image/x-icon"
+
+
+class JsonLdDocument(models.Model):
+    """Serialized JSON-LD document of a page, stored when JSON_LD_DB_STORAGE is enabled (see core.json_ld)."""
+
+    path = models.CharField(max_length=500, unique=True)
+    content_version = models.CharField(max_length=32)
+    document = models.TextField()
+
+    def __str__(self) -> str:
+        return self.path
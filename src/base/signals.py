@@ -4,7 +4,6 @@ from pathlib import Path
 from typing import Any
 
 from django.conf import settings
-from PIL import Image
 
 # Placeholder images for the SiteMedia defaults, generated after migrations so a fresh
 # install works without manually providing media files. Replace them via the admin (Site Media).
@@ -16,6 +15,8 @@ DEFAULT_SITE_MEDIA_IMAGES: dict[str, tuple[tuple[int, int], str]] = {
 
 
 def create_default_site_media(**kwargs: Any) -> None:
+    from PIL import Image  # noqa: PLC0415
+
     media_root = Path(settings.MEDIA_ROOT)
     site_media_root = media_root / "site"
     site_media_root.mkdir(parents=True, exist_ok=True)
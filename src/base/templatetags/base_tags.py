@@ -3,13 +3,18 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any, TypedDict
 
 from django import template
+from django.template.backends.utils import csrf_input
 from django.template.defaultfilters import stringfilter
 from django.urls import reverse
+from django.utils.html import format_html
 from django.utils.translation import gettext_lazy
 
 from base.models import FollowMeLink, GoogleAnalytics, LegalAndPrivacy, SiteMedia
+from core.page_cache import is_visitor_state_deferred
+from utils.singletons import get_solo
 
 if TYPE_CHECKING:
+    from django.utils.safestring import SafeString
     from django_stubs_ext import StrOrPromise, StrPromise
 
 register = template.Library()
@@ -59,6 +64,25 @@ def current_page_url(context: dict[str, Any]) -> str:
     return reverse(request.resolver_match.url_name, kwargs=request.resolver_match.kwargs)
 
 
+@register.simple_tag(takes_context=True)
+def visitor_state_deferred(context: dict[str, Any]) -> bool:
+    """Return whether the per-visitor parts of the page are filled in by the visitor_state view."""
+    return is_visitor_state_deferred(context["request"])
+
+
+@register.simple_tag(takes_context=True)
+def visitor_csrf_token(context: dict[str, Any]) -> SafeString:
+    """Render the CSRF hidden input, or an empty one to be filled in by the visitor_state view.
+
+    Replaces {% csrf_token %} in templates of cacheable pages: reading the token sets the CSRF
+    cookie and makes the response vary on Cookie, which defeats the page cache.
+    """
+    request = context["request"]
+    if is_visitor_state_deferred(request):
+        return format_html('<input type="hidden" name="csrfmiddlewaretoken" value="" data-visitor-csrf-token>')
+    return csrf_input(request)
+
+
 @register.simple_tag
 def get_navbar_data() -> NavbarDataDict:
     return NAVBAR_DATA
@@ -89,9 +113,9 @@ def get_footer_data() -> dict[str, Any]:
 
 @register.simple_tag
 def get_google_analytics() -> GoogleAnalytics:
-    return GoogleAnalytics.get_solo()
+    return get_solo(GoogleAnalytics)
 
 
 @register.simple_tag
 def get_site_media() -> SiteMedia:
-    return SiteMedia.get_solo()
+    return get_solo(SiteMedia)
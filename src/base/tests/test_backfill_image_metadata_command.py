@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from base.models import SiteMedia
+from base.signals import create_default_site_media
+
+
+class TestBackfillImageMetadataCommand(TestCase):
+    def setUp(self) -> None:
+        self.media_root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root))
+        create_default_site_media()
+        SiteMedia.get_solo()
+
+    def _call_command(self, force: bool = False) -> str:
+        output = StringIO()
+        call_command("backfill_image_metadata", force=force, stdout=output)
+        return output.getvalue()
+
+    def test_backfills_missing_metadata(self) -> None:
+        # Simulate a row saved before the metadata of its images were stored
+        SiteMedia.objects.update(portrait_image_width=None, portrait_image_height=None, portrait_image_placeholder="")
+
+        output = self._call_command()
+
+        site_media = SiteMedia.objects.get()
+        self.assertEqual(
+            dimensions := (site_media.portrait_image_width, site_media.portrait_image_height),
+            (1920, 1080),
+            f"Expected the backfilled dimensions, got '{dimensions}'",
+        )
+        self.assertTrue(site_media.portrait_image_placeholder, "Expected the backfilled placeholder")
+        self.assertIn("base.SiteMedia: 1 updated", output, f"Unexpected output '{output}'")
+
+    def test_skips_rows_with_metadata(self) -> None:
+        output = self._call_command()
+
+        self.assertIn("base.SiteMedia: 0 updated", output, f"Unexpected output '{output}'")
+
+    def test_force_reads_replaced_images(self) -> None:
+        # Simulate an image replaced in the storage, under the same name
+        SiteMedia.objects.update(portrait_image_color="#000000")
+
+        output = self._call_command(force=True)
+
+        self.assertEqual(
+            color := SiteMedia.objects.get().portrait_image_color, "#ffffff", f"Expected the read colour, got '{color}'"
+        )
+        self.assertIn("base.SiteMedia: 1 updated", output, f"Unexpected output '{output}'")
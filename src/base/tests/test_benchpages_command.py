@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from typing import Any
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from core.benchmark import METRICS, PageStats, compare_to_baseline
+from home.models import Project
+
+DATASET = {"projects": 2, "experiences": 1, "education": 1, "technologies": 3}
+EXPECTED_PAGES = {
+    *(
+        f"{language}:{page}"
+        for language in ("en", "es")
+        for page in ("home", "my-career", "projects", "project-detail", "contact", "404")
+    ),
+    "robots.txt",
+    "sitemap.xml",
+}
+
+
+class TestBenchpagesCommand(TestCase):
+    def setUp(self) -> None:
+        self.directory = Path(self.enterContext(tempfile.TemporaryDirectory()))
+
+    def _call_command(self, **options: Any) -> str:
+        output = StringIO()
+        options = {"iterations": 1, "baseline": self.directory / "missing.json", **DATASET, **options}
+        call_command("benchpages", stdout=output, **options)
+        return output.getvalue()
+
+    def _write_baseline(self, pages: dict[str, dict[str, float]], dataset: dict[str, int] = DATASET) -> Path:
+        baseline = self.directory / "baseline.json"
+        baseline.write_text(json.dumps({"dataset": dataset, "iterations": 1, "pages": pages}))
+        return baseline
+
+    def test_saves_the_statistics_of_every_page(self) -> None:
+        output_file = self.directory / "results.json"
+        self._call_command(output=output_file)
+
+        results = json.loads(output_file.read_text())
+        self.assertEqual(results["dataset"], DATASET, f"Unexpected dataset '{results['dataset']}'")
+        self.assertEqual(
+            set(results["pages"]), EXPECTED_PAGES, f"Expected every public page, got '{set(results['pages'])}'"
+        )
+        for key, stats in results["pages"].items():
+            self.assertEqual(list(stats), list(METRICS), f"Unexpected metrics '{list(stats)}' for '{key}'")
+            self.assertGreater(stats["bytes"], 0, f"The page '{key}' should have content")
+
+    def test_leaves_the_database_untouched(self) -> None:
+        Project.objects.create(title="Existing", slug="existing", summary="S", problem="P", approach="A", outcome="O")
+
+        self._call_command()
+
+        self.assertEqual(
+            list(slugs := Project.objects.values_list("slug", flat=True)),
+            ["existing"],
+            f"The seeded dataset should be rolled back and the existing content kept, got '{slugs}'",
+        )
+
+    def test_regression_over_the_baseline_fails(self) -> None:
+        baseline = self._write_baseline({"en:home": {"queries": 1}})
+
+        with self.assertRaisesMessage(CommandError, "en:home queries"):
+            self._call_command(baseline=baseline)
+
+    def test_results_within_the_baseline_pass(self) -> None:
+        baseline = self._write_baseline({key: dict.fromkeys(METRICS, 10**9) for key in EXPECTED_PAGES})
+
+        output = self._call_command(baseline=baseline)
+
+        self.assertIn("No regressions", output, f"Unexpected output '{output}'")
+
+    def test_baseline_of_another_dataset_fails(self) -> None:
+        baseline = self._write_baseline({}, dataset={**DATASET, "projects": 500})
+
+        with self.assertRaisesMessage(CommandError, "another dataset"):
+            self._call_command(baseline=baseline)
+
+
+class TestCompareToBaseline(TestCase):
+    STATS = PageStats(p50_ms=10.0, p95_ms=12.0, p99_ms=15.0, queries=5, memory_kib=100.0, bytes=1000)
+
+    def test_increase_within_the_tolerance_is_not_a_regression(self) -> None:
+        baseline = {"en:home": {**self.STATS._asdict(), "p99_ms": 12.6}}
+
+        regressions = compare_to_baseline({"en:home": self.STATS}, baseline, tolerance=0.2)
+
+        self.assertEqual(regressions, [], f"Expected no regressions, got '{regressions}'")
+
+    def test_increase_over_the_tolerance_is_a_regression(self) -> None:
+        baseline = {"en:home": {**self.STATS._asdict(), "p99_ms": 12.0, "queries": 4}}
+
+        regressions = compare_to_baseline({"en:home": self.STATS}, baseline, tolerance=0.2)
+
+        self.assertEqual(
+            regressions,
+            ["en:home p99_ms: 15.0 > 12.0 (+20%)", "en:home queries: 5 > 4 (+20%)"],
+            f"Unexpected regressions '{regressions}'",
+        )
+
+    def test_pages_missing_from_the_baseline_are_skipped(self) -> None:
+        regressions = compare_to_baseline({"en:home": self.STATS}, {}, tolerance=0.2)
+
+        self.assertEqual(regressions, [], f"Expected no regressions, got '{regressions}'")
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import tempfile
+from io import StringIO
+from pathlib import Path
+from typing import Any
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from base.models import SiteMedia
+from base.signals import create_default_site_media
+
+
+class TestGenerateImagesCommand(TestCase):
+    def setUp(self) -> None:
+        self.media_root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root))
+        create_default_site_media()
+        SiteMedia.get_solo()
+
+    def _call_command(self, **options: Any) -> str:
+        output = StringIO()
+        call_command("generate_images", stdout=output, **{"workers": 1, **options})
+        return output.getvalue()
+
+    def test_images_are_generated_then_skipped(self) -> None:
+        first_output = self._call_command()
+        second_output = self._call_command()
+
+        self.assertIn("12 generated, 0 skipped, 0 failed", first_output, f"Unexpected output '{first_output}'")
+        self.assertIn("0 generated, 12 skipped, 0 failed", second_output, f"Unexpected output '{second_output}'")
+
+    def test_only_the_given_specs_are_generated(self) -> None:
+        output = self._call_command(specs=["base:sitemedia:logo_display"])
+
+        self.assertIn("1 generated, 0 skipped, 0 failed", output, f"Unexpected output '{output}'")
+
+    def test_unknown_specs_are_refused(self) -> None:
+        with self.assertRaisesMessage(CommandError, "Unknown image specs: base:sitemedia:missing."):
+            self._call_command(specs=["base:sitemedia:missing"])
+
+    def test_failures_are_reported(self) -> None:
+        (self.media_root / "site" / "icon.png").unlink()
+
+        with self.assertLogs("images", level="ERROR"):
+            output = self._call_command()
+
+        self.assertIn("11 generated, 0 skipped, 1 failed", output, f"Unexpected output '{output}'")
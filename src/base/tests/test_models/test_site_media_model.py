@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import itertools
 from io import BytesIO
 from typing import ClassVar
 
@@ -8,6 +9,7 @@ from django.test import TestCase
 from PIL import Image
 
 from base.models import SiteMedia
+from utils.images import DEFAULT_FORMATS
 
 
 def _build_uploaded_image(name: str, size: tuple[int, int], image_format: str) -> SimpleUploadedFile:
@@ -66,22 +68,26 @@ class TestSiteMediaModelDefaults(TestCase):
 
 
 class TestSiteMediaModelDisplayFields(TestCase):
-    def test_portrait_mobile_display_is_resized_to_fit(self) -> None:
+    def test_portrait_images_are_resized_to_fit(self) -> None:
         site_media = SiteMedia.get_solo()
-        site_media.portrait_image = _build_uploaded_image("portrait.jpg", (1920, 1080), "JPEG")
+        site_media.portrait_image = _build_uploaded_image("portrait.jpg", (1200, 1600), "JPEG")
         site_media.save()
 
-        with Image.open(site_media.portrait_mobile_display.path) as image:
-            self.assertLessEqual(
-                image.size[0],
-                900,
-                f"Expected portrait_mobile_display width to be at most 900px, got '{image.size[0]}'",
-            )
-            self.assertLessEqual(
-                image.size[1],
-                506,
-                f"Expected portrait_mobile_display height to be at most 506px, got '{image.size[1]}'",
-            )
+        for image_format, width in itertools.product(DEFAULT_FORMATS, (640, 960, 1280, 1920)):
+            with Image.open(site_media.portrait_images.get_file(image_format, width).path) as image:
+                self.assertEqual(image.format, image_format.name, f"Unexpected format '{image.format}'")
+                self.assertLessEqual(
+                    image.size[0],
+                    min(width, 1200),
+                    f"Expected the {width}px portrait to be at most {width}px wide and not upscaled, "
+                    f"got '{image.size}'",
+                )
+                self.assertAlmostEqual(
+                    image.size[1] / image.size[0],
+                    4 / 3,
+                    delta=0.01,
+                    msg=f"Expected the {width}px portrait to keep the aspect ratio of the photo, got '{image.size}'",
+                )
 
     def test_og_preview_image_display_is_resized_to_fill(self) -> None:
         site_media = SiteMedia.get_solo()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from io import StringIO
+
+from cryptography.fernet import Fernet, InvalidToken
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from contact.models import ContactFormConfiguration
+from utils.singletons import get_solo, get_solo_version
+
+OLD_KEY = Fernet.generate_key().decode()
+NEW_KEY = Fernet.generate_key().decode()
+
+
+class TestReencryptFieldsCommand(TestCase):
+    def setUp(self) -> None:
+        with override_settings(FIELD_ENCRYPTION_KEYS=[OLD_KEY]):
+            config = ContactFormConfiguration.get_solo()
+            config.provider_config = {"api_key": "super-secret"}
+            config.save()
+
+    def test_reencrypts_with_the_newest_key(self) -> None:
+        output = StringIO()
+        with override_settings(FIELD_ENCRYPTION_KEYS=[NEW_KEY, OLD_KEY]):
+            call_command("reencrypt_fields", stdout=output)
+
+        self.assertIn(
+            "contact.ContactFormConfiguration: 1 re-encrypted",
+            output.getvalue(),
+            f"Unexpected output '{output.getvalue()}'",
+        )
+        with override_settings(FIELD_ENCRYPTION_KEYS=[NEW_KEY]):
+            self.assertEqual(
+                provider_config := ContactFormConfiguration.objects.get().provider_config,
+                {"api_key": "super-secret"},
+                f"The value should be decrypted with the newest key alone, got '{provider_config}'",
+            )
+
+    def test_values_are_unreadable_with_the_former_key_afterwards(self) -> None:
+        with override_settings(FIELD_ENCRYPTION_KEYS=[NEW_KEY, OLD_KEY]):
+            call_command("reencrypt_fields", stdout=StringIO())
+
+        with (
+            override_settings(FIELD_ENCRYPTION_KEYS=[OLD_KEY]),
+            self.assertRaises(InvalidToken, msg="The value should no longer be encrypted with the former key"),
+        ):
+            _ = ContactFormConfiguration.objects.get().provider_config
+
+    def test_invalidates_the_cached_singletons(self) -> None:
+        get_solo(ContactFormConfiguration)
+        version = get_solo_version(ContactFormConfiguration)
+
+        with override_settings(FIELD_ENCRYPTION_KEYS=[NEW_KEY, OLD_KEY]):
+            call_command("reencrypt_fields", stdout=StringIO())
+
+        self.assertNotEqual(
+            get_solo_version(ContactFormConfiguration),
+            version,
+            "The processes should reload the singletons along with their new ciphertext",
+        )
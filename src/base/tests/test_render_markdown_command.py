@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from base.models import LegalAndPrivacy
+
+
+class TestRenderMarkdownCommand(TestCase):
+    def test_backfills_outdated_renderings(self) -> None:
+        legal_and_privacy = LegalAndPrivacy.objects.create(title="Privacy", text="Some **text**")
+        # Simulate a row saved before its renderings were stored
+        LegalAndPrivacy.objects.filter(pk=legal_and_privacy.pk).update(text_html_en="", text_html_es="")
+
+        output = StringIO()
+        call_command("render_markdown", stdout=output)
+
+        legal_and_privacy.refresh_from_db()
+        self.assertEqual(
+            html := legal_and_privacy.text_html,
+            "<p>Some <strong>text</strong></p>",
+            f"Expected the backfilled HTML, got '{html}'",
+        )
+        self.assertIn("base.LegalAndPrivacy: 1 updated", output.getvalue(), f"Unexpected output '{output.getvalue()}'")
+
+    def test_skips_up_to_date_rows(self) -> None:
+        LegalAndPrivacy.objects.create(title="Privacy", text="Some text")
+
+        output = StringIO()
+        call_command("render_markdown", stdout=output)
+
+        self.assertIn("base.LegalAndPrivacy: 0 updated", output.getvalue(), f"Unexpected output '{output.getvalue()}'")
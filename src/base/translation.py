@@ -10,4 +10,5 @@ class LegalAndPrivacyTranslationOptions(TranslationOptions):
     fields = (
         "title",
         "text",
+        "text_html",
     )
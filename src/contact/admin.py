@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from django.contrib.admin import ModelAdmin, register
+from django.contrib.admin.views.main import ORDER_VAR
 from django.utils.translation import gettext_lazy
 from solo.admin import SingletonModelAdmin
 
 from .forms import ContactFormConfigurationForm
-from .models import ContactFormConfiguration, ContactMessage
+from .models import ContactFormConfiguration, ContactMessage, OutboxEmail
+from .search import SEARCH_RANK, search_contact_messages
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+    from django.http import HttpRequest
 
 
 @register(ContactMessage)
@@ -27,6 +35,7 @@ class ContactMessageAdmin(ModelAdmin[ContactMessage]):
 
     list_filter = ("service_interest", "budget_range", "timeline", "is_read")
 
+    # Searched with the ranked full-text search of contact.search where supported
     search_fields = (
         "name",
         "email",
@@ -36,6 +45,43 @@ class ContactMessageAdmin(ModelAdmin[ContactMessage]):
 
     date_hierarchy = "created_at"
 
+    def get_search_results(
+        self, request: HttpRequest, queryset: QuerySet[ContactMessage], search_term: str
+    ) -> tuple[QuerySet[ContactMessage], bool]:
+        results = search_contact_messages(queryset, search_term)
+        if results is None:
+            return super().get_search_results(request, queryset, search_term)
+
+        # Sorted by relevance, unless by a column of the changelist
+        if ORDER_VAR not in request.GET:
+            results = results.order_by(f"-{SEARCH_RANK}", *results.query.order_by)
+        return results, False
+
+
+@register(OutboxEmail)
+class OutboxEmailAdmin(ModelAdmin[OutboxEmail]):
+    """Admin interface for the emails queued in the outbox, read-only as they are sent by `process_outbox`."""
+
+    list_display = ("subject", "status", "attempts", "next_attempt_at", "created_at", "sent_at")
+    list_filter = ("status",)
+    readonly_fields = (
+        "contact_message",
+        "subject",
+        "body",
+        "from_email",
+        "to",
+        "reply_to",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "last_error",
+        "created_at",
+        "sent_at",
+    )
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
 
 @register(ContactFormConfiguration)
 class ContactFormConfigurationAdmin(SingletonModelAdmin):
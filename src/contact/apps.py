@@ -1,8 +1,28 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Any
+
 from django.apps import AppConfig
+from django.core import checks
+from django.core.signals import setting_changed
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def check_anymail_settings(app_configs: Sequence[AppConfig] | None, **kwargs: Any) -> list[checks.CheckMessage]:
+    """Run the system checks of anymail, whose app is not installed not to import it (and requests) on every start."""
+    from anymail.checks import check_deprecated_settings, check_insecure_settings  # noqa: PLC0415
+
+    return [*check_deprecated_settings(app_configs, **kwargs), *check_insecure_settings(app_configs, **kwargs)]
 
 
 class ContactConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "contact"
+
+    def ready(self) -> None:
+        from .recaptcha import reset_recaptcha_client_on_setting_changed  # noqa: PLC0415
+
+        setting_changed.connect(reset_recaptcha_client_on_setting_changed)
+        checks.register(check_anymail_settings)
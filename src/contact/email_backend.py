@@ -1,11 +1,29 @@
+"""Email backend sending through the provider configured in the admin.
+
+The delegate backend (SMTP or Brevo's API) is built once per process from the
+`ContactFormConfiguration` singleton, and rebuilt only when its version changes (see
+`utils.singletons`), so the provider credentials are not decrypted again for every email.
+Its connection is shared by every `DatabaseEmailBackend` of the process and kept open
+across sends: it is reopened when it was idle for longer than
+`EMAIL_CONNECTION_IDLE_TIMEOUT`, before the server drops it, and once more when the server
+dropped it anyway.
+"""
+
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import contextlib
+import smtplib
+import threading
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
 
-from anymail.backends.brevo import EmailBackend as BrevoEmailBackend
+from django.conf import settings
 from django.core.mail.backends.base import BaseEmailBackend
 from django.core.mail.backends.smtp import EmailBackend as SMTPEmailBackend
 
+from core.metrics import EMAIL_CONNECTIONS
+from utils.singletons import get_solo, get_solo_version
+
 from .models import ContactFormConfiguration, EmailProvider
 
 if TYPE_CHECKING:
@@ -13,23 +31,154 @@ if TYPE_CHECKING:
 
     from django.core.mail.message import EmailMessage
 
+# Errors of a connection dropped by the server, after which the email is sent again over a new one
+_DISCONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError)
+
 
 class EmailProviderNotConfiguredError(Exception):
     pass
 
 
+class EmailBackendStats(NamedTuple):
+    """Number of delegate backends built, connections opened, emails sent and reconnections of the process."""
+
+    builds: int
+    opens: int
+    sends: int
+    reconnects: int
+
+
+class _SharedBackend:
+    """Delegate backend built from a version of the configuration, along with the state of its connection."""
+
+    def __init__(self, version: str, backend: BaseEmailBackend) -> None:
+        self.version = version
+        self.backend = backend
+        self.is_open = False
+        self.last_used = 0.0
+
+    def close(self) -> None:
+        self.is_open = False
+        # The connection may already be broken
+        with contextlib.suppress(Exception):
+            self.backend.close()
+
+
+_lock = threading.Lock()
+_shared_backend: _SharedBackend | None = None
+_stats = dict.fromkeys(EmailBackendStats._fields, 0)
+
+
+def get_email_backend_stats() -> EmailBackendStats:
+    """Return the counters of the email backend of the process, for monitoring."""
+    with _lock:
+        return EmailBackendStats(**_stats)
+
+
+def reset_email_backend() -> None:
+    """Close the shared connection, drop the delegate backend and reset the counters of the process."""
+    global _shared_backend  # noqa: PLW0603
+
+    with _lock:
+        if _shared_backend is not None:
+            _shared_backend.close()
+        _shared_backend = None
+        _stats.update(dict.fromkeys(_stats, 0))
+
+
 class DatabaseEmailBackend(BaseEmailBackend):
-    """Email backend that delegates to SMTP or Brevo's API, configured via ContactFormConfiguration."""
+    """Email backend that delegates to SMTP or Brevo's API, configured via ContactFormConfiguration.
+
+    The delegate backend and its connection are shared by the whole process: closing this
+    backend keeps the connection open for the next sends, until it is idle for longer than
+    `EMAIL_CONNECTION_IDLE_TIMEOUT` or the configuration changes.
+    """
+
+    def open(self) -> bool | None:
+        try:
+            with _lock:
+                self._get_open_backend()
+        except Exception:
+            if not self.fail_silently:
+                raise
+            return False
+        return True
+
+    def close(self) -> None:
+        # The shared connection is kept open for the next sends
+        pass
 
     def send_messages(self, email_messages: Sequence[EmailMessage]) -> int:
-        config = ContactFormConfiguration.get_solo()
-        return self._build_backend(config).send_messages(email_messages) or 0
+        num_sent = 0
+        with _lock:
+            try:
+                # Sent one by one, for a message to be sent again only if it wasn't already
+                for message in email_messages:
+                    num_sent += self._send(message)
+            except Exception:
+                if not self.fail_silently:
+                    raise
+        return num_sent
+
+    def _send(self, message: EmailMessage) -> int:
+        try:
+            try:
+                sent = self._get_open_backend().send_messages([message])
+            except _DISCONNECTION_ERRORS:
+                # The server dropped the connection: send again over a new one
+                self._close_shared_backend()
+                _stats["reconnects"] += 1
+                EMAIL_CONNECTIONS.inc(event="reconnect")
+                sent = self._get_open_backend().send_messages([message])
+        except Exception:
+            # The connection is left in an unknown state: the next email opens a new one
+            self._close_shared_backend()
+            raise
+
+        _stats["sends"] += sent or 0
+        return sent or 0
+
+    def _get_open_backend(self) -> BaseEmailBackend:
+        """Return the shared delegate backend, built for the current configuration, with an open connection.
+
+        Must be called with the lock held.
+        """
+        global _shared_backend  # noqa: PLW0603
+
+        version = get_solo_version(ContactFormConfiguration)
+        if _shared_backend is None or _shared_backend.version != version:
+            self._close_shared_backend()
+            _shared_backend = _SharedBackend(version, self._build_backend(get_solo(ContactFormConfiguration)))
+            _stats["builds"] += 1
+
+        now = time.monotonic()
+        if _shared_backend.is_open and now - _shared_backend.last_used > settings.EMAIL_CONNECTION_IDLE_TIMEOUT:
+            # Likely dropped by the server meanwhile
+            _shared_backend.close()
+            _stats["reconnects"] += 1
+            EMAIL_CONNECTIONS.inc(event="reconnect")
+
+        if not _shared_backend.is_open:
+            # Opened explicitly, for the delegate not to close it after sending
+            _shared_backend.backend.open()
+            _shared_backend.is_open = True
+            _stats["opens"] += 1
+            EMAIL_CONNECTIONS.inc(event="open")
+
+        _shared_backend.last_used = now
+        return _shared_backend.backend
+
+    def _close_shared_backend(self) -> None:
+        if _shared_backend is not None:
+            _shared_backend.close()
 
     def _build_backend(self, config: ContactFormConfiguration) -> BaseEmailBackend:
         provider_config: dict[str, Any] = config.provider_config
 
         match config.email_provider:
             case EmailProvider.BREVO_API:
+                from anymail.backends.brevo import EmailBackend as BrevoEmailBackend  # noqa: PLC0415
+
                 return BrevoEmailBackend(  # type: ignore[no-any-return]
                     api_key=provider_config.get("api_key", ""),
                 )
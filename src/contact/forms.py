@@ -8,6 +8,7 @@ from django.utils.translation import gettext_lazy
 
 from contact.models import BudgetRange, ContactFormConfiguration, ContactMessage, EmailProvider, Timeline
 from home.models import Service
+from utils.singletons import get_solo
 
 MINIMUM_MESSAGE_LENGTH = 10
 
@@ -120,7 +121,7 @@ class ContactForm(forms.ModelForm[ContactMessage]):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
 
-        if not ContactFormConfiguration.get_solo().legal_and_privacy:
+        if not get_solo(ContactFormConfiguration).legal_and_privacy:
             del self.fields[CONTACT_FORM_FIELD_PRIVACY_POLICY_ACCEPTED]
 
     def clean_message(self) -> str:
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from contact.search import is_search_supported
+from contact.search_benchmark import BENCHMARKED_SEARCHES, SearchStats, run_search_benchmark
+
+if TYPE_CHECKING:
+    from django.core.management.base import CommandParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a number of contact messages and time the admin searches of them, with the full-text search and "
+        "with the default icontains search, reporting the latency percentiles of each. The messages are rolled "
+        "back, leaving the database untouched."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--messages", type=int, default=100_000, help="Number of contact messages seeded.")
+        parser.add_argument("--iterations", type=int, default=10, help="Number of times each search is run.")
+        parser.add_argument(
+            "--search",
+            action="append",
+            dest="searches",
+            help="Search term to benchmark, repeatable. Defaults to a set of representative searches.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["messages"] < 0 or options["iterations"] < 1:
+            msg = "The number of messages can't be negative, and that of iterations must be at least 1."
+            raise CommandError(msg)
+        if not is_search_supported("default"):
+            msg = "The full-text search of the contact messages is not supported by the database."
+            raise CommandError(msg)
+
+        searches = tuple(options["searches"] or BENCHMARKED_SEARCHES)
+        results = run_search_benchmark(options["messages"], options["iterations"], searches)
+
+        self.stdout.write(f"{'search':<28}" + "".join(f"{metric:>18}" for metric in SearchStats._fields))
+        for search_term, stats in results.items():
+            self.stdout.write(f"{search_term:<28}" + "".join(f"{value:>18}" for value in stats))
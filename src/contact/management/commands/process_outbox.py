@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import signal
+import threading
+from typing import TYPE_CHECKING, Any
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from contact.outbox import process_outbox
+
+if TYPE_CHECKING:
+    from types import FrameType
+
+    from django.core.management.base import CommandParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Send the due emails of the outbox (e.g. the contact form notifications) in batches over a single "
+        "connection, retrying the failed ones with an exponential backoff."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size", type=int, help="Number of emails sent per batch. Defaults to the OUTBOX_BATCH_SIZE setting."
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Keep running as a worker, processing the outbox every this many seconds, instead of once.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        interval: float | None = options["interval"]
+        if interval is not None and interval <= 0:
+            msg = "The interval must be a positive number of seconds."
+            raise CommandError(msg)
+
+        # On SIGTERM (e.g. docker stop), the email being sent is sent and recorded before stopping
+        stopping = threading.Event()
+
+        def stop(signum: int, frame: FrameType | None) -> None:
+            stopping.set()
+
+        if interval is not None:
+            signal.signal(signal.SIGTERM, stop)
+
+        while not stopping.is_set():
+            result = process_outbox(options["batch_size"], should_stop=stopping.is_set)
+            if result.sent or result.retried or result.failed or interval is None:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Outbox processed: {result.sent} sent, {result.retried} to retry, {result.failed} failed."
+                    )
+                )
+
+            if interval is None:
+                return
+
+            # Drop the connection if it became unusable, as done between requests
+            close_old_connections()
+            stopping.wait(interval)
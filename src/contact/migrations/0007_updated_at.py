@@ -0,0 +1,16 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:16
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (("contact", "0006_add_qualification_fields_to_contact_message"),)
+
+    operations = (
+        migrations.AddField(
+            model_name="contactformconfiguration",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    )
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:05
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import TextField
+from django.db.models.functions import Cast, Upper
+
+if TYPE_CHECKING:
+    from django.apps.registry import Apps
+    from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+FTS_TABLE = "contact_contactmessage_fts"
+
+
+def get_postgresql_indexes() -> tuple[GinIndex, ...]:
+    return (
+        # Must match contact.search.get_search_vector, for the index to be used by the searches
+        GinIndex(
+            SearchVector("name", weight="A", config="simple")
+            + SearchVector("email", weight="A", config="simple")
+            + SearchVector("subject", weight="B", config="simple")
+            + SearchVector("message", weight="C", config="simple"),
+            name="contact_message_search_idx",
+        ),
+        # Match the `UPPER(column::text) LIKE UPPER(...)` of the icontains lookups
+        GinIndex(OpClass(Upper(Cast("name", TextField())), name="gin_trgm_ops"), name="contact_message_name_trgm_idx"),
+        GinIndex(
+            OpClass(Upper(Cast("email", TextField())), name="gin_trgm_ops"), name="contact_message_email_trgm_idx"
+        ),
+    )
+
+
+def create_search_indexes(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    contact_message = apps.get_model("contact", "ContactMessage")
+
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for index in get_postgresql_indexes():
+            schema_editor.add_index(contact_message, index)
+
+    elif schema_editor.connection.vendor == "sqlite":
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                # Searched with the default icontains lookups of the admin
+                return
+
+        table = contact_message._meta.db_table
+        columns = "name, email, subject, message"
+        new_values = "new.id, new.name, new.email, new.subject, new.message"
+        old_values = "'delete', old.id, old.name, old.email, old.subject, old.message"
+        for statement in (
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({columns}, content='{table}', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')",
+            f"CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES ({new_values}); END",
+            f"CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ({old_values}); END",
+            f"CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE ON {table} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ({old_values}); "
+            f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES ({new_values}); END",
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+        ):
+            schema_editor.execute(statement)
+
+
+def drop_search_indexes(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    contact_message = apps.get_model("contact", "ContactMessage")
+
+    if schema_editor.connection.vendor == "postgresql":
+        for index in get_postgresql_indexes():
+            schema_editor.remove_index(contact_message, index)
+
+    elif schema_editor.connection.vendor == "sqlite":
+        for trigger in ("insert", "delete", "update"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{trigger}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+    dependencies = (("contact", "0008_outboxemail"),)
+
+    operations = (migrations.RunPython(create_search_indexes, drop_search_indexes),)
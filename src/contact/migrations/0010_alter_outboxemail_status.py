@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:40
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (("contact", "0009_contactmessage_search"),)
+
+    operations = (
+        migrations.AlterField(
+            model_name="outboxemail",
+            name="status",
+            field=models.CharField(
+                choices=[("pending", "Pending"), ("sending", "Sending"), ("sent", "Sent"), ("failed", "Failed")],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+    )
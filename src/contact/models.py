@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy
 from solo.models import SingletonModel
 
 from base.models import LegalAndPrivacy
 from utils.fields import EncryptedJSONField
+from utils.models import TimestampedModel
 
 
 class EmailProvider(models.TextChoices):
@@ -57,7 +59,44 @@ class ContactMessage(models.Model):
         return f"{self.name} - {self.subject}"
 
 
-class ContactFormConfiguration(SingletonModel):
+class OutboxEmailStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    SENDING = "sending", "Sending"
+    SENT = "sent", "Sent"
+    FAILED = "failed", "Failed"
+
+
+class OutboxEmail(models.Model):
+    """Email queued in the transaction of the submission, sent later by the `process_outbox` command."""
+
+    contact_message = models.ForeignKey(
+        ContactMessage,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="outbox_emails",
+    )
+    subject = models.TextField()
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    reply_to = models.JSONField(default=list, blank=True)
+    status = models.CharField(max_length=20, choices=OutboxEmailStatus.choices, default=OutboxEmailStatus.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("created_at",)
+        indexes = (models.Index(fields=("status", "next_attempt_at")),)
+
+    def __str__(self) -> str:
+        return f"{self.subject} ({self.get_status_display()})"
+
+
+class ContactFormConfiguration(TimestampedModel, SingletonModel):
     """Singleton configuration for the contact form: privacy notice and email sending."""
 
     email_provider = models.CharField(max_length=20, choices=EmailProvider.choices, default=EmailProvider.SMTP)
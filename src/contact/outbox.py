@@ -0,0 +1,230 @@
+"""Outbox of the emails sent on behalf of the visitors, outside of their requests.
+
+The emails are written to the `OutboxEmail` table in the transaction of the submission
+they notify about, so the request returns as soon as it is committed. The
+`process_outbox` command sends the due emails in batches over a single email backend
+connection; a failed email is retried with an exponential backoff, and its final error is
+saved to its contact message.
+
+The emails of a batch are claimed in a short transaction (marked as being sent for
+`OUTBOX_LEASE_SECONDS`), then sent outside of it, the outcome of each one committed on its
+own: a worker stopped or failing in the middle of a batch only leaves the email being sent
+to be sent again, once its lease expires, while concurrent workers skip the claimed ones.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import datetime
+import logging
+import time
+import traceback
+from typing import TYPE_CHECKING, NamedTuple
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from core.metrics import CONTACT_SUBMISSIONS, EMAIL_SEND_DURATION
+
+from .models import OutboxEmail, OutboxEmailStatus
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from django.core.mail.backends.base import BaseEmailBackend
+
+    from .models import ContactMessage
+
+contact_logger = logging.getLogger("contact")
+
+
+class OutboxResult(NamedTuple):
+    """Number of emails sent, scheduled for a retry, and given up on by a run of the outbox."""
+
+    sent: int
+    retried: int
+    failed: int
+
+
+def enqueue_email(email: EmailMessage, contact_message: ContactMessage | None = None) -> OutboxEmail:
+    """Queue an email to be sent by the `process_outbox` command, once the current transaction is committed.
+
+    Args:
+        email: The email to send.
+        contact_message: The contact message the email notifies about, for its final error to be saved to.
+
+    Returns:
+        The queued email.
+    """
+    return OutboxEmail.objects.create(
+        contact_message=contact_message,
+        subject=str(email.subject),
+        body=str(email.body),
+        from_email=email.from_email,
+        to=list(email.to),
+        reply_to=list(email.reply_to),
+    )
+
+
+def get_retry_delay(attempts: int) -> datetime.timedelta:
+    """Return the delay before the next attempt to send an email, doubled after every failed attempt.
+
+    Args:
+        attempts: The number of failed attempts so far.
+    """
+    delay = settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    return datetime.timedelta(seconds=min(delay, settings.OUTBOX_RETRY_MAX_SECONDS))
+
+
+def _send(outbox_email: OutboxEmail, connection: BaseEmailBackend) -> None:
+    start = time.perf_counter()
+    outcome = "failed"
+    try:
+        # Opens the connection on first use, and again after a failure closed it
+        connection.open()
+        EmailMessage(
+            subject=outbox_email.subject,
+            body=outbox_email.body,
+            from_email=outbox_email.from_email,
+            to=outbox_email.to,
+            reply_to=outbox_email.reply_to,
+            connection=connection,
+        ).send(fail_silently=False)
+        outcome = "sent"
+    finally:
+        EMAIL_SEND_DURATION.observe(time.perf_counter() - start, outcome=outcome)
+
+
+def _record_failure(outbox_email: OutboxEmail, error: str) -> bool:
+    """Record a failed attempt, returning whether the email is given up on."""
+    outbox_email.attempts += 1
+    outbox_email.last_error = error
+
+    if outbox_email.attempts < settings.OUTBOX_MAX_ATTEMPTS:
+        outbox_email.status = OutboxEmailStatus.PENDING
+        outbox_email.next_attempt_at = timezone.now() + get_retry_delay(outbox_email.attempts)
+        outbox_email.save(update_fields=("attempts", "last_error", "status", "next_attempt_at"))
+        contact_logger.warning(
+            "Failed to send email notification, retrying",
+            extra={
+                "contact_message_id": outbox_email.contact_message_id,
+                "attempts": outbox_email.attempts,
+                "next_attempt_at": outbox_email.next_attempt_at.isoformat(),
+            },
+        )
+        return False
+
+    outbox_email.status = OutboxEmailStatus.FAILED
+    outbox_email.save(update_fields=("attempts", "last_error", "status"))
+
+    if contact_message := outbox_email.contact_message:
+        CONTACT_SUBMISSIONS.inc(outcome="email_failed")
+        # Save the error to the contact message for later review
+        contact_message.error = error
+        contact_message.save(update_fields=("error",))
+
+    # Called while handling the error, for its traceback to be logged
+    contact_logger.exception(
+        "Failed to send email notification for contact message",
+        extra={"contact_message_id": outbox_email.contact_message_id, "attempts": outbox_email.attempts},
+    )
+    return True
+
+
+def _claim_batch(batch_size: int) -> list[OutboxEmail]:
+    """Claim the due emails, including those whose claim expired, for the lease time."""
+    now = timezone.now()
+
+    # Locked only while claimed, for concurrent workers to skip them
+    with transaction.atomic():
+        batch = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("contact_message")
+            .filter(
+                status__in=(OutboxEmailStatus.PENDING, OutboxEmailStatus.SENDING),
+                next_attempt_at__lte=now,
+            )
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        for outbox_email in batch:
+            outbox_email.status = OutboxEmailStatus.SENDING
+            outbox_email.next_attempt_at = now + datetime.timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+        OutboxEmail.objects.bulk_update(batch, ("status", "next_attempt_at"))
+
+    return batch
+
+
+def _release(outbox_emails: list[OutboxEmail]) -> None:
+    """Give the claimed emails not attempted back to the outbox, to be sent right away."""
+    OutboxEmail.objects.filter(
+        pk__in=[outbox_email.pk for outbox_email in outbox_emails], status=OutboxEmailStatus.SENDING
+    ).update(status=OutboxEmailStatus.PENDING, next_attempt_at=timezone.now())
+
+
+def _process_batch(
+    batch_size: int, connection: BaseEmailBackend, should_stop: Callable[[], bool]
+) -> OutboxResult | None:
+    sent = retried = failed = 0
+
+    batch = _claim_batch(batch_size)
+    if not batch:
+        return None
+
+    for index, outbox_email in enumerate(batch):
+        if should_stop():
+            _release(batch[index:])
+            break
+
+        try:
+            _send(outbox_email, connection)
+        except Exception:
+            error = traceback.format_exc()
+            # The connection may be broken: it is opened again for the next email
+            with contextlib.suppress(Exception):
+                connection.close()
+
+            with transaction.atomic():
+                is_given_up = _record_failure(outbox_email, error)
+            if is_given_up:
+                failed += 1
+            else:
+                retried += 1
+            continue
+
+        outbox_email.attempts += 1
+        outbox_email.status = OutboxEmailStatus.SENT
+        outbox_email.sent_at = timezone.now()
+        outbox_email.save(update_fields=("attempts", "status", "sent_at"))
+        sent += 1
+
+    return OutboxResult(sent, retried, failed)
+
+
+def process_outbox(batch_size: int | None = None, should_stop: Callable[[], bool] | None = None) -> OutboxResult:
+    """Send the due emails of the outbox, in batches over a single email backend connection.
+
+    Args:
+        batch_size: The number of emails claimed per batch. Defaults to `OUTBOX_BATCH_SIZE`.
+        should_stop: Called before sending each email: once it returns True, the claimed emails
+            left are given back to the outbox and the processing stops (e.g. on SIGTERM).
+
+    Returns:
+        The number of emails sent, scheduled for a retry, and given up on.
+    """
+    total = OutboxResult(sent=0, retried=0, failed=0)
+    connection = get_connection(fail_silently=False)
+
+    try:
+        while result := _process_batch(
+            batch_size or settings.OUTBOX_BATCH_SIZE, connection, should_stop or (lambda: False)
+        ):
+            total = OutboxResult(*(count + batch_count for count, batch_count in zip(total, result, strict=True)))
+            if should_stop is not None and should_stop():
+                break
+    finally:
+        with contextlib.suppress(Exception):
+            connection.close()
+
+    return total
@@ -0,0 +1,145 @@
+"""Rate limiting of the contact form submissions, per client IP and per email address.
+
+Each client IP and email address gets a token bucket in the shared cache, holding up to the
+number of submissions of its rate (e.g. `5/h`) and refilled continuously over its period. A
+submission takes a token from both buckets and is refused, before the form is validated or
+reCAPTCHA is called, when either is empty. The buckets are read and written without a lock,
+so concurrent submissions may get a few more through than the limit, which is acceptable
+against spam bursts.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import re
+import time
+from typing import TYPE_CHECKING, NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest
+
+security_logger = logging.getLogger("security")
+
+_RATE_PATTERN = re.compile(r"^\s*(?P<tokens>\d+)\s*/\s*(?P<period>[smhd])\s*$")
+_PERIOD_SECONDS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+_BUCKET_KEY_TEMPLATE = "contact-rate-limit:{scope}:{identity}"
+
+
+class Rate(NamedTuple):
+    """Number of submissions allowed per period of time, in seconds."""
+
+    tokens: int
+    seconds: int
+
+
+class RateLimitExceeded(NamedTuple):
+    """A refused submission: the limit exceeded, and the seconds until the next one is allowed."""
+
+    scope: str
+    retry_after: int
+
+
+def parse_rate(value: str) -> Rate | None:
+    """Parse a rate such as `5/h` (5 per hour), with a period of `s`, `m`, `h` or `d`.
+
+    Args:
+        value: The rate to parse, or an empty string for no limit.
+
+    Returns:
+        The parsed rate, or None for no limit.
+
+    Raises:
+        ImproperlyConfigured: If the rate is not valid.
+    """
+    if not value.strip():
+        return None
+
+    match = _RATE_PATTERN.match(value)
+    if match is None or int(match["tokens"]) <= 0:
+        msg = f"Invalid rate '{value}': expected a positive number of requests per s, m, h or d (e.g. '5/h')"
+        raise ImproperlyConfigured(msg)
+    return Rate(int(match["tokens"]), _PERIOD_SECONDS[match["period"]])
+
+
+def take_token(scope: str, identity: str, rate: Rate) -> float:
+    """Take a token from the bucket of the given identity, refilled at the given rate.
+
+    Args:
+        scope: The kind of identity limited (e.g. `ip`).
+        identity: The identity limited, hashed for the cache key.
+        rate: The rate of the limit.
+
+    Returns:
+        0 if a token was taken, else the seconds until the bucket holds one again.
+    """
+    key = _BUCKET_KEY_TEMPLATE.format(scope=scope, identity=hashlib.sha256(identity.encode()).hexdigest())
+    now = time.time()
+
+    bucket: tuple[float, float] | None = cache.get(key)
+    tokens = float(rate.tokens)
+    if bucket is not None:
+        stored_tokens, updated_at = bucket
+        tokens = min(tokens, stored_tokens + (now - updated_at) * rate.tokens / rate.seconds)
+
+    if tokens < 1:
+        return (1 - tokens) * rate.seconds / rate.tokens
+
+    # Expires once it would be full again, as a missing bucket is
+    cache.set(key, (tokens - 1, now), timeout=rate.seconds)
+    return 0
+
+
+def get_client_ip(request: HttpRequest) -> str:
+    """Return the IP address of the client, as seen by the first of the `TRUSTED_PROXY_COUNT` proxies.
+
+    Each proxy appends the address it received the request from to `X-Forwarded-For`, so only the
+    last entries, added by the trusted proxies, can't be forged by the client. With fewer entries,
+    the first one is used, as added by the outermost proxy (e.g. when fewer are in front of Django).
+    """
+    remote_addr: str = request.META.get("REMOTE_ADDR", "")
+    proxy_count: int = settings.TRUSTED_PROXY_COUNT
+    if proxy_count <= 0:
+        return remote_addr
+
+    forwarded_for: list[str] = [
+        address.strip() for address in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if address.strip()
+    ]
+    if not forwarded_for:
+        return remote_addr
+    return forwarded_for[-min(proxy_count, len(forwarded_for))]
+
+
+def check_contact_rate_limit(request: HttpRequest) -> RateLimitExceeded | None:
+    """Take a token for a contact form submission from the buckets of its client IP and email address.
+
+    Args:
+        request: The POST request of the submission.
+
+    Returns:
+        The limit exceeded, or None if the submission is allowed.
+    """
+    client_ip = get_client_ip(request)
+    identities = (
+        ("ip", client_ip, parse_rate(settings.CONTACT_RATE_LIMIT_IP)),
+        ("email", request.POST.get("email", "").strip().lower(), parse_rate(settings.CONTACT_RATE_LIMIT_EMAIL)),
+    )
+
+    for scope, identity, rate in identities:
+        if not identity or rate is None:
+            continue
+
+        if wait := take_token(scope, identity, rate):
+            retry_after = math.ceil(wait)
+            security_logger.warning(
+                "Contact form submission rate limited",
+                extra={"scope": scope, "client_ip": client_ip, "retry_after": retry_after},
+            )
+            return RateLimitExceeded(scope, retry_after)
+
+    return None
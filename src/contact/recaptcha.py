@@ -0,0 +1,264 @@
+"""Verification of the reCAPTCHA v3 tokens of the contact form submissions.
+
+The verifications are sent over a keep-alive session, reusing its pooled connections to
+Google's siteverify endpoint. A circuit breaker stops calling the endpoint once it has
+failed repeatedly: while open, the submissions are allowed right away, as they are on any
+API error, instead of holding a worker until the timeout. After a cool-down period, a
+single verification is let through to probe the endpoint, closing the circuit on success.
+
+The session and the circuit breaker are per process, created on first use (i.e. after the
+gunicorn workers are forked), requests being only imported then. The outcome and latency
+of every verification are logged as structured fields.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from django.conf import settings
+
+from core.metrics import RECAPTCHA_DURATION
+from core.server_timing import time_phase
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+recaptcha_logger = logging.getLogger("recaptcha")
+security_logger = logging.getLogger("security")
+
+_POOL_SIZE = 4
+
+
+class RecaptchaResult(NamedTuple):
+    """Result of reCAPTCHA verification."""
+
+    is_valid: bool
+    score: float | None
+
+
+class RecaptchaOutcome(StrEnum):
+    """Outcome of a reCAPTCHA verification, as logged."""
+
+    PASSED = "passed"
+    REJECTED = "rejected"
+    API_ERROR = "api_error"
+    CIRCUIT_OPEN = "circuit_open"
+    UNEXPECTED_ERROR = "unexpected_error"
+
+
+class CircuitBreaker:
+    """Circuit breaker opening after consecutive failures, and half-opening after a cool-down period.
+
+    Args:
+        failure_threshold: The number of consecutive failures opening the circuit.
+        reset_seconds: The time after which an open circuit lets a single call through.
+        clock: The monotonic clock, in seconds.
+    """
+
+    def __init__(
+        self, failure_threshold: int, reset_seconds: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the circuit is open, i.e. calls are not allowed until the cool-down period is over."""
+        return self._opened_at is not None
+
+    def allow_call(self) -> bool:
+        """Return whether a call is allowed: always when closed, and a single probe once half-open."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or self._clock() - self._opened_at < self.reset_seconds:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold or if the probe of a half-open circuit failed."""
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._probing = False
+
+
+class RecaptchaClient:
+    """Client of the reCAPTCHA siteverify endpoint, over a pooled keep-alive session behind a circuit breaker.
+
+    Args:
+        verify_url: The URL of the siteverify endpoint.
+        timeout: The timeout of each verification, in seconds.
+        circuit_breaker: The circuit breaker of the endpoint.
+    """
+
+    def __init__(self, verify_url: str, timeout: float, circuit_breaker: CircuitBreaker) -> None:
+        import requests  # noqa: PLC0415
+        from requests.adapters import HTTPAdapter  # noqa: PLC0415
+
+        self.verify_url = verify_url
+        self.timeout = timeout
+        self.circuit_breaker = circuit_breaker
+        self.session = requests.Session()
+        self.session.mount(verify_url, HTTPAdapter(pool_connections=1, pool_maxsize=_POOL_SIZE))
+
+    def verify(self, token: str) -> RecaptchaResult:
+        """Verify a reCAPTCHA v3 token of the contact form.
+
+        Network and API errors (and an open circuit) allow the submission, to avoid blocking
+        legitimate users; unexpected errors reject it.
+
+        Args:
+            token: The reCAPTCHA token from the frontend.
+
+        Returns:
+            A RecaptchaResult named tuple with is_valid and score.
+        """
+        import requests  # noqa: PLC0415
+
+        if not self.circuit_breaker.allow_call():
+            recaptcha_logger.warning(
+                "reCAPTCHA circuit open, allowing submission",
+                extra={"outcome": RecaptchaOutcome.CIRCUIT_OPEN, "duration_ms": 0.0},
+            )
+            return RecaptchaResult(is_valid=True, score=None)
+
+        start = time.perf_counter()
+
+        def get_call_fields(outcome: RecaptchaOutcome) -> dict[str, Any]:
+            # Called once per verification, with its outcome: its latency is counted in the metrics too
+            duration = time.perf_counter() - start
+            RECAPTCHA_DURATION.observe(duration, outcome=outcome)
+            return {"outcome": outcome, "duration_ms": round(duration * 1000, 1)}
+
+        try:
+            with time_phase("http"):
+                response = self.session.post(
+                    self.verify_url,
+                    data={
+                        "secret": settings.RECAPTCHA_SECRET_KEY,
+                        "response": token,
+                    },
+                    timeout=self.timeout,
+                )
+
+            response.raise_for_status()
+
+            result = response.json()
+
+            success = result.get("success", False)
+            score = result.get("score", 0.0)
+            action = result.get("action", "")
+
+            # Verify score meets threshold
+            is_passed = success and action == "contact_form" and score >= settings.RECAPTCHA_SCORE_THRESHOLD
+
+        except requests.RequestException:
+            self.circuit_breaker.record_failure()
+            # Network or API error - allow submission to avoid blocking legitimate users
+            recaptcha_logger.warning(
+                "reCAPTCHA API error, allowing submission",
+                exc_info=True,
+                extra=get_call_fields(RecaptchaOutcome.API_ERROR),
+            )
+            return RecaptchaResult(is_valid=True, score=None)
+
+        except Exception:
+            # Also a failure of the endpoint, so a half-open circuit does not wait for its probe forever
+            self.circuit_breaker.record_failure()
+            # Unexpected error - log and reject for security
+            recaptcha_logger.exception(
+                "Unexpected error during reCAPTCHA verification",
+                extra=get_call_fields(RecaptchaOutcome.UNEXPECTED_ERROR),
+            )
+            return RecaptchaResult(is_valid=False, score=None)
+
+        self.circuit_breaker.record_success()
+
+        if is_passed:
+            recaptcha_logger.info(
+                "reCAPTCHA verification passed", extra={"score": score, **get_call_fields(RecaptchaOutcome.PASSED)}
+            )
+            return RecaptchaResult(is_valid=True, score=score)
+
+        security_logger.warning(
+            "reCAPTCHA verification failed",
+            extra={
+                "success": success,
+                "score": score,
+                "action": action,
+                **get_call_fields(RecaptchaOutcome.REJECTED),
+            },
+        )
+        return RecaptchaResult(is_valid=False, score=score)
+
+
+_client: RecaptchaClient | None = None
+
+
+def get_recaptcha_client() -> RecaptchaClient:
+    """Return the reCAPTCHA client of the process, created on first use from the settings."""
+    global _client  # noqa: PLW0603
+    if _client is None:
+        _client = RecaptchaClient(
+            verify_url=settings.RECAPTCHA_VERIFY_URL,
+            timeout=settings.RECAPTCHA_TIMEOUT,
+            circuit_breaker=CircuitBreaker(
+                failure_threshold=settings.RECAPTCHA_CIRCUIT_FAILURE_THRESHOLD,
+                reset_seconds=settings.RECAPTCHA_CIRCUIT_RESET_SECONDS,
+            ),
+        )
+    return _client
+
+
+def reset_recaptcha_client() -> None:
+    """Discard the reCAPTCHA client of the process, closing its connections and its circuit."""
+    global _client  # noqa: PLW0603
+    if _client is not None:
+        _client.session.close()
+    _client = None
+
+
+def reset_recaptcha_client_on_setting_changed(setting: str, **kwargs: Any) -> None:
+    """Discard the reCAPTCHA client when one of its settings is changed, e.g. overridden in tests."""
+    if setting.startswith("RECAPTCHA_"):
+        reset_recaptcha_client()
+
+
+def verify_recaptcha(token: str) -> RecaptchaResult:
+    """Verify the reCAPTCHA v3 token of a contact form submission.
+
+    Args:
+        token: The reCAPTCHA token from the frontend.
+
+    Returns:
+        A RecaptchaResult named tuple with is_valid and score.
+    """
+    # If reCAPTCHA is not configured, allow the submission (development mode)
+    if not settings.IS_RECAPTCHA_CONFIGURED:
+        return RecaptchaResult(is_valid=True, score=None)
+
+    # If reCAPTCHA is configured but no token provided, reject (spam attempt)
+    if not token:
+        security_logger.warning("reCAPTCHA token missing from contact form submission")
+        return RecaptchaResult(is_valid=False, score=None)
+
+    return get_recaptcha_client().verify(token)
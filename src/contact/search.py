@@ -0,0 +1,124 @@
+"""Ranked full-text search of the contact messages, for the admin.
+
+On PostgreSQL, the messages are matched against a weighted `SearchVector` of their name,
+email, subject and message, backed by a GIN expression index, and against trigram indexes of
+their name and email for partial matches (e.g. a domain). On SQLite, used in development and
+tests, they are matched through an FTS5 table kept in sync by triggers. Both indexes are
+created by the `0009_contactmessage_search` migration; on any other database, or when SQLite
+lacks FTS5, the default `icontains` search of the admin is used instead.
+
+Every word of the search term must prefix a word of the message, and the matches are ranked
+by relevance in the `search_rank` annotation, the matches in the name and email weighing
+more than in the subject, and these more than in the message.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import Q
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+    from django.db.models.expressions import CombinedExpression
+
+    from .models import ContactMessage
+
+SEARCH_RANK = "search_rank"
+
+# Text search configuration of PostgreSQL: words are not stemmed, as the messages come in any language
+SEARCH_CONFIG = "simple"
+
+FTS_TABLE = "contact_contactmessage_fts"
+
+# bm25 weights of the name, email, subject and message columns of the FTS5 table, as those of
+# the A, A, B and C weights of the search vector in PostgreSQL
+_FTS_WEIGHTS = "1.0, 1.0, 0.4, 0.2"
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def get_search_vector() -> CombinedExpression:
+    """Return the search vector of the contact messages, as indexed by the `0009_contactmessage_search` migration."""
+    return (
+        SearchVector("name", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("email", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("subject", weight="B", config=SEARCH_CONFIG)
+        + SearchVector("message", weight="C", config=SEARCH_CONFIG)
+    )
+
+
+def get_search_words(search_term: str) -> list[str]:
+    """Return the words of a search term, without the operators of the full-text query syntaxes."""
+    return _WORD_PATTERN.findall(search_term.lower())
+
+
+def has_fts_table(alias: str) -> bool:
+    """Return whether the SQLite database of the given alias has the FTS5 table of the contact messages."""
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", (FTS_TABLE,))
+        return cursor.fetchone() is not None
+
+
+def is_search_supported(alias: str) -> bool:
+    """Return whether the database of the given alias supports the full-text search of the contact messages."""
+    vendor = connections[alias].vendor
+    return vendor == "postgresql" or (vendor == "sqlite" and has_fts_table(alias))
+
+
+def is_full_text_search(search_term: str, alias: str) -> bool:
+    """Return whether a search term is searched with the full-text search, rather than the admin's default one."""
+    return bool(get_search_words(search_term)) and is_search_supported(alias)
+
+
+def _search_postgresql(
+    queryset: QuerySet[ContactMessage], words: list[str], search_term: str
+) -> QuerySet[ContactMessage]:
+    query = SearchQuery(" & ".join(f"{word}:*" for word in words), config=SEARCH_CONFIG, search_type="raw")
+    vector = get_search_vector()
+
+    return (
+        queryset.alias(search_document=vector)
+        # The full-text match uses the GIN index of the vector, the partial ones the trigram indexes
+        .filter(Q(search_document=query) | Q(name__icontains=search_term) | Q(email__icontains=search_term))
+        .annotate(**{SEARCH_RANK: SearchRank(vector, query)})
+    )
+
+
+def _search_sqlite(queryset: QuerySet[ContactMessage], words: list[str]) -> QuerySet[ContactMessage]:
+    # Quoted, for words such as AND or NOT not to be read as operators
+    query = " ".join(f'"{word}"*' for word in words)
+    table = queryset.model._meta.db_table
+
+    # Joined rather than queried in a subquery per message, for the rank of all of them to be computed in a
+    # single pass over the FTS5 table, the table having no model to join it through
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = "{table}"."id"', f"{FTS_TABLE} MATCH %s"],
+        params=[query],
+        # bm25 is lower for better matches
+        select={SEARCH_RANK: f"-bm25({FTS_TABLE}, {_FTS_WEIGHTS})"},
+    )
+
+
+def search_contact_messages(queryset: QuerySet[ContactMessage], search_term: str) -> QuerySet[ContactMessage] | None:
+    """Filter the contact messages matching a search term, annotated with their rank in `search_rank`.
+
+    Args:
+        queryset: The contact messages to search.
+        search_term: The search term, as typed in the admin.
+
+    Returns:
+        The matching contact messages, or None if the database doesn't support the full-text search
+        or the search term has no words.
+    """
+    if not is_full_text_search(search_term, queryset.db):
+        return None
+
+    words = get_search_words(search_term)
+    if connections[queryset.db].vendor == "postgresql":
+        return _search_postgresql(queryset, words, search_term.strip())
+    return _search_sqlite(queryset, words)
@@ -0,0 +1,147 @@
+"""Benchmark of the admin search of the contact messages, against a seeded inbox.
+
+Every search is run as the admin changelist runs it (a count, and the first page of results)
+with the full-text search of `contact.search` and with the default `icontains` search of the
+admin over the same fields, in a transaction rolled back at the end.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+import statistics
+import time
+from typing import TYPE_CHECKING, NamedTuple
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import ContactMessage
+from .search import SEARCH_RANK, search_contact_messages
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from django.db.models import QuerySet
+
+# Searches of a name prefix, an email domain, a common word, a rare word and several words
+BENCHMARKED_SEARCHES = ("mart", "example.org", "project", "quasar", "website redesign budget")
+
+# Ordering of the admin changelist, with the primary key as tiebreaker
+_ORDERING = ("-created_at", "-pk")
+_PAGE_SIZE = 100
+_BATCH_SIZE = 2000
+
+_FIRST_NAMES = ("Martin", "Marta", "Lucia", "Hugo", "Sofia", "Daniel", "Paula", "Javier", "Elena", "Carlos")
+_LAST_NAMES = ("Garcia", "Martinez", "Lopez", "Sanchez", "Perez", "Gomez", "Martin", "Jimenez", "Ruiz", "Diaz")
+_DOMAINS = ("example.com", "example.org", "mail.test", "company.test")
+_WORDS = (
+    "project website redesign budget timeline django python api integration deadline quote meeting "
+    "mobile application backend frontend performance database migration consulting support hosting "
+    "ecommerce store booking platform dashboard analytics design review proposal contract start"
+).split()
+# Words used once in a while, as in real messages
+_RARE_WORDS = ("quasar", "nebula", "zephyr", "obsidian", "lantern")
+_RARE_WORD_PROBABILITY = 0.01
+
+
+class SearchStats(NamedTuple):
+    """Number of matches of a search, and its latency percentiles with each search."""
+
+    matches: int
+    full_text_p50_ms: float
+    full_text_p95_ms: float
+    icontains_p50_ms: float
+    icontains_p95_ms: float
+
+
+def _build_message(rng: random.Random) -> ContactMessage:
+    first_name, last_name = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+    words = rng.choices(_WORDS, k=rng.randint(20, 80))
+    if rng.random() < _RARE_WORD_PROBABILITY:
+        words.append(rng.choice(_RARE_WORDS))
+
+    return ContactMessage(
+        name=f"{first_name} {last_name}",
+        email=f"{first_name}.{last_name}{rng.randint(1, 999)}@{rng.choice(_DOMAINS)}".lower(),
+        subject=" ".join(rng.choices(_WORDS, k=rng.randint(2, 6))).capitalize(),
+        message=" ".join(words).capitalize() + ".",
+    )
+
+
+def seed_messages(count: int, seed: int = 0) -> None:
+    """Create the given number of contact messages, built from a seeded random generator."""
+    rng = random.Random(seed)
+    messages = (_build_message(rng) for _ in range(count))
+    for batch in itertools.batched(messages, _BATCH_SIZE):
+        ContactMessage.objects.bulk_create(batch)
+
+
+def _search_icontains(queryset: QuerySet[ContactMessage], search_term: str) -> QuerySet[ContactMessage]:
+    # As the default search of the admin: every word in any of the fields
+    for word in search_term.split():
+        queryset = queryset.filter(
+            Q(name__icontains=word) | Q(email__icontains=word) | Q(subject__icontains=word) | Q(message__icontains=word)
+        )
+    return queryset.order_by(*_ORDERING)
+
+
+def _search_full_text(queryset: QuerySet[ContactMessage], search_term: str) -> QuerySet[ContactMessage]:
+    results = search_contact_messages(queryset, search_term)
+    if results is None:
+        msg = "The full-text search is not supported by the database"
+        raise RuntimeError(msg)
+    return results.order_by(f"-{SEARCH_RANK}", *_ORDERING)
+
+
+def _time_search(
+    search: Callable[[QuerySet[ContactMessage], str], QuerySet[ContactMessage]], search_term: str, iterations: int
+) -> tuple[int, list[float]]:
+    durations_ms: list[float] = []
+    matches = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        results = search(ContactMessage.objects.all(), search_term)
+        matches = results.count()
+        list(results[:_PAGE_SIZE])
+        durations_ms.append((time.perf_counter() - start) * 1000)
+    return matches, sorted(durations_ms)
+
+
+def _get_percentile(sorted_values: list[float], percentile: int) -> float:
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    return round(statistics.quantiles(sorted_values, n=100, method="inclusive")[percentile - 1], 2)
+
+
+def run_search_benchmark(
+    messages: int, iterations: int, searches: tuple[str, ...] = BENCHMARKED_SEARCHES
+) -> dict[str, SearchStats]:
+    """Seed the given number of contact messages and time every search with both searches.
+
+    Args:
+        messages: The number of contact messages seeded.
+        iterations: The number of times each search is run.
+        searches: The search terms benchmarked.
+
+    Returns:
+        The statistics of each search, by search term.
+    """
+    with transaction.atomic():
+        try:
+            seed_messages(messages)
+
+            results: dict[str, SearchStats] = {}
+            for search_term in searches:
+                matches, full_text_ms = _time_search(_search_full_text, search_term, iterations)
+                _, icontains_ms = _time_search(_search_icontains, search_term, iterations)
+                results[search_term] = SearchStats(
+                    matches=matches,
+                    full_text_p50_ms=_get_percentile(full_text_ms, 50),
+                    full_text_p95_ms=_get_percentile(full_text_ms, 95),
+                    icontains_p50_ms=_get_percentile(icontains_ms, 50),
+                    icontains_p95_ms=_get_percentile(icontains_ms, 95),
+                )
+            return results
+        finally:
+            transaction.set_rollback(True)
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, cast
-
-from django.test import TestCase
-
-from contact.email_backend import DatabaseEmailBackend
+import smtplib
+from typing import TYPE_CHECKING, Any, cast
+from unittest import mock
+
+from django.core.mail import EmailMessage
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import TestCase, override_settings
+
+from contact.email_backend import (
+    DatabaseEmailBackend,
+    EmailBackendStats,
+    get_email_backend_stats,
+    reset_email_backend,
+)
 from contact.models import ContactFormConfiguration, EmailProvider
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from anymail.backends.brevo import EmailBackend as BrevoEmailBackend
     from django.core.mail.backends.smtp import EmailBackend as SMTPEmailBackend
 
@@ -73,3 +84,150 @@ class TestDatabaseEmailBackend(TestCase):
         self.assertEqual(
             brevo_backend.api_key, "test-api-key", f"Expected api_key 'test-api-key', got '{brevo_backend.api_key}'"
         )
+
+
+class _FakeDelegateBackend(BaseEmailBackend):
+    """Delegate backend recording its connections, whose connection can be dropped as by the server."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.is_open = False
+        self.opened = 0
+        self.closed = 0
+        self.drop_connection = False
+        self.sent: list[str] = []
+
+    def open(self) -> bool:
+        if self.is_open:
+            return False
+        self.is_open = True
+        self.opened += 1
+        return True
+
+    def close(self) -> None:
+        self.is_open = False
+        self.closed += 1
+
+    def send_messages(self, email_messages: Sequence[EmailMessage]) -> int:
+        if not self.is_open:
+            msg = "Sending over a closed connection"
+            raise AssertionError(msg)
+        if self.drop_connection:
+            self.drop_connection = False
+            msg = "Connection unexpectedly closed"
+            raise smtplib.SMTPServerDisconnected(msg)
+        if any("fail" in str(message.subject) for message in email_messages):
+            msg = "Mocked sending failure"
+            raise smtplib.SMTPDataError(554, msg)
+        self.sent.extend(str(message.subject) for message in email_messages)
+        return len(email_messages)
+
+
+@override_settings(EMAIL_CONNECTION_IDLE_TIMEOUT=60.0)
+class TestDatabaseEmailBackendSharedConnection(TestCase):
+    def setUp(self) -> None:
+        reset_email_backend()
+        self.addCleanup(reset_email_backend)
+        # Created beforehand, as its creation changes its version
+        ContactFormConfiguration.get_solo()
+
+        self.delegates: list[_FakeDelegateBackend] = []
+        build_patcher = mock.patch.object(DatabaseEmailBackend, "_build_backend", side_effect=self._build_delegate)
+        build_patcher.start()
+        self.addCleanup(build_patcher.stop)
+
+        self.now = 1000.0
+        clock_patcher = mock.patch("contact.email_backend.time.monotonic", side_effect=lambda: self.now)
+        clock_patcher.start()
+        self.addCleanup(clock_patcher.stop)
+
+    def _build_delegate(self, config: ContactFormConfiguration) -> _FakeDelegateBackend:
+        delegate = _FakeDelegateBackend()
+        self.delegates.append(delegate)
+        return delegate
+
+    def _send(self, subject: str = "Notification") -> int:
+        backend = DatabaseEmailBackend()
+        with backend:
+            return backend.send_messages([EmailMessage(subject=subject, body="Body", to=("contact@localhost",))])
+
+    def test_backend_and_connection_are_reused_across_sends(self) -> None:
+        for _ in range(3):
+            self._send()
+
+        self.assertEqual(len(self.delegates), 1, f"Expected a single delegate backend, got '{len(self.delegates)}'")
+        self.assertEqual(self.delegates[0].opened, 1, f"Expected a single connection, got '{self.delegates[0].opened}'")
+        self.assertTrue(self.delegates[0].is_open, "The connection should be kept open after closing the backend")
+        self.assertEqual(
+            stats := get_email_backend_stats(),
+            EmailBackendStats(builds=1, opens=1, sends=3, reconnects=0),
+            f"Unexpected stats '{stats}'",
+        )
+
+    def test_configuration_change_rebuilds_the_backend(self) -> None:
+        self._send()
+
+        config = ContactFormConfiguration.get_solo()
+        config.email_provider = EmailProvider.BREVO_API
+        config.save()
+        self._send()
+        self._send()
+
+        self.assertEqual(
+            len(self.delegates), 2, f"Expected the backend to be rebuilt once, got '{len(self.delegates)}'"
+        )
+        self.assertFalse(self.delegates[0].is_open, "The connection of the previous backend should be closed")
+        self.assertEqual(self.delegates[1].sent, ["Notification"] * 2, "The next emails should use the new backend")
+
+    def test_idle_connection_is_reopened(self) -> None:
+        self._send()
+        self.now += 30
+        self._send()
+        self.now += 61
+        self._send()
+
+        delegate = self.delegates[0]
+        self.assertEqual(
+            (delegate.opened, delegate.closed),
+            (2, 1),
+            f"Only the connection idle for too long should be reopened, got '{delegate.opened}' opened",
+        )
+        self.assertEqual(
+            reconnects := get_email_backend_stats().reconnects, 1, f"Expected one reconnection, got '{reconnects}'"
+        )
+
+    def test_dropped_connection_is_reopened_and_the_email_sent_again(self) -> None:
+        self._send()
+        self.delegates[0].drop_connection = True
+
+        sent = self._send("After disconnection")
+
+        self.assertEqual(sent, 1, f"The email should be sent over a new connection, got '{sent}' sent")
+        self.assertEqual(
+            self.delegates[0].sent,
+            ["Notification", "After disconnection"],
+            f"Unexpected emails sent '{self.delegates[0].sent}'",
+        )
+        self.assertEqual(
+            stats := get_email_backend_stats(),
+            EmailBackendStats(builds=1, opens=2, sends=2, reconnects=1),
+            f"Unexpected stats '{stats}'",
+        )
+
+    def test_failure_closes_the_connection(self) -> None:
+        self._send()
+
+        with self.assertRaises(smtplib.SMTPDataError):
+            self._send("fail")
+        self._send()
+
+        delegate = self.delegates[0]
+        self.assertEqual(delegate.opened, 2, "The connection should be opened again after a failure")
+        self.assertEqual(delegate.sent, ["Notification"] * 2, f"Unexpected emails sent '{delegate.sent}'")
+
+    def test_failure_is_silenced_when_asked(self) -> None:
+        backend = DatabaseEmailBackend(fail_silently=True)
+
+        sent = backend.send_messages([EmailMessage(subject="fail", body="Body", to=("contact@localhost",))])
+
+        self.assertEqual(sent, 0, f"No email should be reported as sent, got '{sent}'")
@@ -0,0 +1,231 @@
+"""Tests for the email outbox and its `process_outbox` worker command."""
+
+from __future__ import annotations
+
+import datetime
+from io import StringIO
+from typing import TYPE_CHECKING, Any, ClassVar
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend as LocmemEmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+import contact.outbox
+from contact.models import ContactMessage, OutboxEmail, OutboxEmailStatus
+from contact.outbox import OutboxResult, enqueue_email, get_retry_delay, process_outbox
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from django.core.mail.backends.base import BaseEmailBackend
+
+
+class CountingEmailBackend(LocmemEmailBackend):
+    """Locmem email backend counting the connections opened and the backends created."""
+
+    instances: ClassVar[int] = 0
+    opened: ClassVar[int] = 0
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.is_open = False
+        type(self).instances += 1
+
+    def open(self) -> bool:
+        if self.is_open:
+            return False
+        self.is_open = True
+        type(self).opened += 1
+        return True
+
+    def close(self) -> None:
+        self.is_open = False
+
+    def send_messages(self, messages: Sequence[EmailMessage]) -> int:
+        if any("fail" in message.subject for message in messages):
+            msg = "Mocked sending failure"
+            raise ConnectionError(msg)
+        return super().send_messages(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND="contact.tests.test_outbox.CountingEmailBackend",
+    OUTBOX_MAX_ATTEMPTS=3,
+    OUTBOX_RETRY_BASE_SECONDS=60,
+    OUTBOX_RETRY_MAX_SECONDS=3600,
+)
+class TestProcessOutbox(TestCase):
+    def setUp(self) -> None:
+        CountingEmailBackend.instances = 0
+        CountingEmailBackend.opened = 0
+        self.contact_message = ContactMessage.objects.create(
+            name="Visitor", email="visitor@example.com", subject="Hello", message="A message"
+        )
+
+    def _enqueue(self, subject: str = "Notification") -> OutboxEmail:
+        email = EmailMessage(
+            subject=subject,
+            body="Body",
+            from_email="noreply@localhost",
+            to=("contact@localhost",),
+            reply_to=("visitor@example.com",),
+        )
+        return enqueue_email(email, self.contact_message)
+
+    def test_sends_the_queued_email(self) -> None:
+        outbox_email = self._enqueue()
+
+        result = process_outbox()
+
+        self.assertEqual(result, OutboxResult(sent=1, retried=0, failed=0), f"Unexpected result '{result}'")
+        outbox_email.refresh_from_db()
+        self.assertEqual(status := outbox_email.status, OutboxEmailStatus.SENT, f"Unexpected status '{status}'")
+        self.assertIsNotNone(outbox_email.sent_at, "The sending time should be recorded")
+        self.assertEqual(len(mail.outbox), 1, f"Expected exactly one email to be sent, got '{len(mail.outbox)}'")
+        self.assertEqual(
+            (mail.outbox[0].to, mail.outbox[0].reply_to),
+            (["contact@localhost"], ["visitor@example.com"]),
+            f"Unexpected recipients '{mail.outbox[0].to}' and reply-to '{mail.outbox[0].reply_to}'",
+        )
+
+    def test_batches_share_a_single_connection(self) -> None:
+        for _ in range(5):
+            self._enqueue()
+
+        result = process_outbox(batch_size=2)
+
+        self.assertEqual(result.sent, 5, f"Expected every email to be sent, got '{result}'")
+        self.assertEqual(
+            (CountingEmailBackend.instances, CountingEmailBackend.opened),
+            (1, 1),
+            "Every batch should be sent over the same connection",
+        )
+
+    def test_failure_is_retried_with_exponential_backoff(self) -> None:
+        outbox_email = self._enqueue("fail")
+
+        with self.assertLogs("contact", level="WARNING"):
+            result = process_outbox()
+
+        self.assertEqual(result, OutboxResult(sent=0, retried=1, failed=0), f"Unexpected result '{result}'")
+        outbox_email.refresh_from_db()
+        self.assertEqual(outbox_email.attempts, 1, f"Expected one attempt, got '{outbox_email.attempts}'")
+        self.assertIn("Mocked sending failure", outbox_email.last_error, "The error of the attempt should be saved")
+        self.assertAlmostEqual(
+            outbox_email.next_attempt_at,
+            timezone.now() + datetime.timedelta(seconds=60),
+            delta=datetime.timedelta(seconds=5),
+            msg="The email should be retried after the base delay",
+        )
+
+        self.assertEqual(process_outbox(), OutboxResult(0, 0, 0), "Emails should not be retried before due")
+
+    def test_failure_does_not_block_the_other_emails(self) -> None:
+        self._enqueue("fail")
+        self._enqueue()
+
+        with self.assertLogs("contact", level="WARNING"):
+            result = process_outbox()
+
+        self.assertEqual(result, OutboxResult(sent=1, retried=1, failed=0), f"Unexpected result '{result}'")
+        self.assertEqual(
+            CountingEmailBackend.opened, 2, "The connection should be opened again after a failure closed it"
+        )
+
+    def test_final_failure_is_saved_to_the_contact_message(self) -> None:
+        outbox_email = self._enqueue("fail")
+        OutboxEmail.objects.filter(pk=outbox_email.pk).update(attempts=2)
+
+        with self.assertLogs("contact", level="ERROR"):
+            result = process_outbox()
+
+        self.assertEqual(result, OutboxResult(sent=0, retried=0, failed=1), f"Unexpected result '{result}'")
+        outbox_email.refresh_from_db()
+        self.assertEqual(status := outbox_email.status, OutboxEmailStatus.FAILED, f"Unexpected status '{status}'")
+        self.contact_message.refresh_from_db()
+        self.assertIn(
+            "Mocked sending failure",
+            self.contact_message.error,
+            f"The final error should be saved to the contact message, got '{self.contact_message.error}'",
+        )
+
+    def test_sent_emails_are_kept_when_the_worker_dies_mid_batch(self) -> None:
+        first, second, third = (self._enqueue(f"Notification {index}") for index in range(3))
+        send = contact.outbox._send
+
+        def send_then_die(outbox_email: OutboxEmail, connection: BaseEmailBackend) -> None:
+            if outbox_email.pk == second.pk:
+                raise SystemExit
+            send(outbox_email, connection)
+
+        with mock.patch("contact.outbox._send", side_effect=send_then_die), self.assertRaises(SystemExit):
+            process_outbox()
+
+        statuses = dict(OutboxEmail.objects.values_list("pk", "status"))
+        self.assertEqual(
+            [statuses[outbox_email.pk] for outbox_email in (first, second, third)],
+            [OutboxEmailStatus.SENT, OutboxEmailStatus.SENDING, OutboxEmailStatus.SENDING],
+            "The email sent should be recorded, the others left claimed",
+        )
+        self.assertEqual(process_outbox(), OutboxResult(0, 0, 0), "Claimed emails should not be sent before due")
+
+        with override_settings(OUTBOX_LEASE_SECONDS=0):
+            OutboxEmail.objects.filter(status=OutboxEmailStatus.SENDING).update(next_attempt_at=timezone.now())
+            result = process_outbox()
+
+        self.assertEqual(result, OutboxResult(sent=2, retried=0, failed=0), f"Unexpected result '{result}'")
+        self.assertEqual(len(mail.outbox), 3, f"Expected each email to be sent once, got '{len(mail.outbox)}'")
+
+    def test_stopping_gives_the_claimed_emails_back(self) -> None:
+        for _ in range(3):
+            self._enqueue()
+
+        result = process_outbox(should_stop=lambda: len(mail.outbox) >= 1)
+
+        self.assertEqual(result, OutboxResult(sent=1, retried=0, failed=0), f"Unexpected result '{result}'")
+        self.assertEqual(
+            pending := OutboxEmail.objects.filter(
+                status=OutboxEmailStatus.PENDING, next_attempt_at__lte=timezone.now()
+            ).count(),
+            2,
+            f"The emails not attempted should be due again, got {pending}",
+        )
+
+    def test_retry_delay_doubles_up_to_the_maximum(self) -> None:
+        delays = [get_retry_delay(attempts).total_seconds() for attempts in (1, 2, 3, 10)]
+
+        self.assertEqual(delays, [60, 120, 240, 3600], f"Unexpected retry delays '{delays}'")
+
+    def test_command_reports_the_result(self) -> None:
+        self._enqueue()
+
+        output = StringIO()
+        call_command("process_outbox", stdout=output)
+
+        self.assertIn("1 sent, 0 to retry, 0 failed", output.getvalue(), f"Unexpected output '{output.getvalue()}'")
+
+
+@override_settings(IS_RECAPTCHA_CONFIGURED=False, RECAPTCHA_SITE_KEY=None, RECAPTCHA_SECRET_KEY=None)
+class TestContactViewOutbox(TestCase):
+    FORM_DATA: ClassVar[dict[str, str]] = {
+        "name": "Visitor",
+        "email": "visitor@example.com",
+        "subject": "Hello",
+        "message": "A message long enough to be valid.",
+    }
+
+    def test_message_is_not_saved_without_its_notification(self) -> None:
+        with (
+            mock.patch("contact.views.enqueue_email", side_effect=RuntimeError("Mocked outbox failure")),
+            self.assertRaises(RuntimeError),
+            self.assertLogs("django.request", level="ERROR"),
+        ):
+            self.client.post("/en/contact/", data=self.FORM_DATA)
+
+        self.assertFalse(
+            ContactMessage.objects.exists(), "The message should be saved in the same transaction as its notification"
+        )
@@ -0,0 +1,185 @@
+"""Tests for the rate limiting of the contact form submissions."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import Any, ClassVar
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from contact.models import ContactMessage
+from contact.rate_limit import Rate, get_client_ip, parse_rate, take_token
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestParseRate(SimpleTestCase):
+    def test_valid_rates(self) -> None:
+        rates = [parse_rate(value) for value in ("5/h", "10/m", " 1 / d ", "")]
+
+        self.assertEqual(
+            rates, [Rate(5, 3600), Rate(10, 60), Rate(1, 86400), None], f"Unexpected parsed rates '{rates}'"
+        )
+
+    def test_invalid_rates(self) -> None:
+        for value in ("5", "5/w", "0/h", "-1/h", "five/h"):
+            with self.subTest(value=value), self.assertRaises(ImproperlyConfigured):
+                parse_rate(value)
+
+
+class TestTakeToken(TestCase):
+    RATE: ClassVar[Rate] = Rate(tokens=2, seconds=60)
+
+    def setUp(self) -> None:
+        self.clock = _FakeClock()
+        patcher = mock.patch("contact.rate_limit.time.time", side_effect=self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_bucket_allows_a_burst_up_to_its_capacity(self) -> None:
+        waits = [take_token("ip", "192.0.2.1", self.RATE) for _ in range(3)]
+
+        self.assertEqual(waits[:2], [0, 0], f"The first submissions should be allowed, got '{waits}'")
+        self.assertAlmostEqual(waits[2], 30, msg=f"A token should be refilled every 30 seconds, got '{waits[2]}'")
+
+    def test_bucket_is_refilled_over_time(self) -> None:
+        for _ in range(2):
+            take_token("ip", "192.0.2.1", self.RATE)
+
+        self.clock.now += 30
+        self.assertEqual(take_token("ip", "192.0.2.1", self.RATE), 0, "A token should have been refilled")
+        self.assertGreater(take_token("ip", "192.0.2.1", self.RATE), 0, "A single token should have been refilled")
+
+    def test_buckets_are_per_identity_and_scope(self) -> None:
+        for _ in range(2):
+            take_token("ip", "192.0.2.1", self.RATE)
+
+        self.assertEqual(take_token("ip", "192.0.2.2", self.RATE), 0, "Another IP should have its own bucket")
+        self.assertEqual(take_token("email", "192.0.2.1", self.RATE), 0, "Another scope should have its own bucket")
+
+
+class TestGetClientIP(SimpleTestCase):
+    def _get_client_ip(self, **headers: Any) -> str:
+        return get_client_ip(RequestFactory().post("/", REMOTE_ADDR="172.18.0.5", **headers))
+
+    @override_settings(TRUSTED_PROXY_COUNT=1)
+    def test_address_added_by_the_proxy_is_used(self) -> None:
+        client_ip = self._get_client_ip(HTTP_X_FORWARDED_FOR="203.0.113.9, 198.51.100.7")
+
+        self.assertEqual(
+            client_ip,
+            "198.51.100.7",
+            f"The address added by the proxy should be used, not forged ones, got '{client_ip}'",
+        )
+
+    @override_settings(TRUSTED_PROXY_COUNT=2)
+    def test_address_added_by_the_first_of_several_proxies_is_used(self) -> None:
+        client_ip = self._get_client_ip(HTTP_X_FORWARDED_FOR="203.0.113.9, 198.51.100.7, 10.0.0.2")
+
+        self.assertEqual(client_ip, "198.51.100.7", f"Unexpected client IP '{client_ip}'")
+
+    @override_settings(TRUSTED_PROXY_COUNT=2)
+    def test_address_added_by_the_outermost_proxy_is_used_with_fewer_proxies(self) -> None:
+        client_ip = self._get_client_ip(HTTP_X_FORWARDED_FOR="198.51.100.7")
+
+        self.assertEqual(
+            client_ip,
+            "198.51.100.7",
+            f"The address added by the proxy should be used, not the proxy's, got '{client_ip}'",
+        )
+
+    @override_settings(TRUSTED_PROXY_COUNT=1)
+    def test_remote_address_is_used_without_forwarding_header(self) -> None:
+        self.assertEqual(client_ip := self._get_client_ip(), "172.18.0.5", f"Unexpected client IP '{client_ip}'")
+
+    @override_settings(TRUSTED_PROXY_COUNT=0)
+    def test_forwarding_header_is_ignored_without_proxies(self) -> None:
+        client_ip = self._get_client_ip(HTTP_X_FORWARDED_FOR="203.0.113.9")
+
+        self.assertEqual(client_ip, "172.18.0.5", f"The header should be ignored, got '{client_ip}'")
+
+
+@override_settings(
+    IS_RECAPTCHA_CONFIGURED=True,
+    RECAPTCHA_SITE_KEY="test_site_key",
+    RECAPTCHA_SECRET_KEY="test_secret_key",
+    CONTACT_RATE_LIMIT_IP="2/h",
+    CONTACT_RATE_LIMIT_EMAIL="3/h",
+    TRUSTED_PROXY_COUNT=1,
+)
+class TestContactViewRateLimit(TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch("contact.views.verify_recaptcha")
+        self.verify_recaptcha = patcher.start()
+        self.verify_recaptcha.return_value.is_valid = True
+        self.verify_recaptcha.return_value.score = 0.9
+        self.addCleanup(patcher.stop)
+
+    def _post(self, email: str = "visitor@example.com", client_ip: str = "198.51.100.7") -> Any:
+        data = {
+            "name": "Visitor",
+            "email": email,
+            "subject": "Hello",
+            "message": "A message long enough to be valid.",
+            "recaptcha_token": "token",
+        }
+        return self.client.post("/en/contact/", data=data, HTTP_X_FORWARDED_FOR=client_ip)
+
+    def test_submissions_over_the_ip_limit_are_refused(self) -> None:
+        with self.assertLogs("contact", level="INFO"):
+            for index in range(2):
+                self._post(email=f"visitor{index}@example.com")
+
+        with self.assertLogs("security", level="WARNING") as logs, self.assertLogs("django.request", level="WARNING"):
+            response = self._post(email="visitor2@example.com")
+
+        self.assertEqual(
+            response.status_code, HTTPStatus.TOO_MANY_REQUESTS, f"Unexpected status '{response.status_code}'"
+        )
+        self.assertEqual(
+            retry_after := response["Retry-After"], "1800", f"Expected a retry after half an hour, got '{retry_after}'"
+        )
+        self.assertEqual(self.verify_recaptcha.call_count, 2, "reCAPTCHA should not be called once rate limited")
+        self.assertEqual(count := ContactMessage.objects.count(), 2, f"Expected 2 saved messages, got '{count}'")
+        self.assertIn("rate limited", logs.output[0], f"Unexpected log '{logs.output}'")
+
+    def test_submissions_over_the_email_limit_are_refused(self) -> None:
+        with self.assertLogs("contact", level="INFO"):
+            for index in range(3):
+                self._post(email="Visitor@Example.com ", client_ip=f"198.51.100.{index}")
+
+        with self.assertLogs("security", level="WARNING"), self.assertLogs("django.request", level="WARNING"):
+            response = self._post(client_ip="198.51.100.99")
+
+        self.assertEqual(
+            response.status_code, HTTPStatus.TOO_MANY_REQUESTS, f"Unexpected status '{response.status_code}'"
+        )
+
+    def test_refused_submission_keeps_the_message(self) -> None:
+        with self.assertLogs("contact", level="INFO"):
+            for index in range(2):
+                self._post(email=f"visitor{index}@example.com")
+
+        with self.assertLogs("security", level="WARNING"), self.assertLogs("django.request", level="WARNING"):
+            response = self._post()
+
+        self.assertContains(response, "A message long enough to be valid.", status_code=HTTPStatus.TOO_MANY_REQUESTS)
+
+    @override_settings(CONTACT_RATE_LIMIT_IP="", CONTACT_RATE_LIMIT_EMAIL="")
+    def test_limits_can_be_disabled(self) -> None:
+        with self.assertLogs("contact", level="INFO"):
+            responses = [self._post() for _ in range(5)]
+
+        self.assertEqual(
+            statuses := {response.status_code for response in responses},
+            {HTTPStatus.FOUND},
+            f"Every submission should be accepted, got '{statuses}'",
+        )
@@ -0,0 +1,254 @@
+"""Tests for the reCAPTCHA client, against a local fake siteverify server."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, ClassVar, cast
+from urllib.parse import parse_qs
+
+from django.test import SimpleTestCase, override_settings
+
+from contact.recaptcha import CircuitBreaker, RecaptchaClient, RecaptchaResult
+from core.metrics import render_metrics, reset_metrics
+
+
+class _VerificationLogRecord(logging.LogRecord):
+    """A LogRecord with the fields recorded for every verification, for typed access in tests."""
+
+    outcome: str
+    duration_ms: float
+
+
+def _get_verification_record(logs: Any) -> _VerificationLogRecord:
+    return cast("_VerificationLogRecord", logs.records[0])
+
+
+class _FakeSiteverifyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _FakeSiteverifyServer
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append(parse_qs(body.decode()))
+        self.server.client_ports.add(self.client_address[1])
+        time.sleep(self.server.delay)
+
+        content = json.dumps(self.server.result).encode()
+        # The client may have given up at its timeout
+        with contextlib.suppress(ConnectionError):
+            self.send_response(self.server.status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _FakeSiteverifyServer(ThreadingHTTPServer):
+    """Siteverify endpoint answering every verification with the configured status, result and delay."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _FakeSiteverifyHandler)
+        self.status = HTTPStatus.OK
+        self.result: dict[str, Any] = {"success": True, "score": 0.9, "action": "contact_form"}
+        self.delay = 0.0
+        self.requests: list[dict[str, list[str]]] = []
+        self.client_ports: set[int] = set()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}/recaptcha/api/siteverify"
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@override_settings(RECAPTCHA_SECRET_KEY="test_secret_key_67890", RECAPTCHA_SCORE_THRESHOLD=0.5)
+class TestRecaptchaClient(SimpleTestCase):
+    FAILURE_THRESHOLD: ClassVar[int] = 3
+    RESET_SECONDS: ClassVar[float] = 30.0
+
+    def setUp(self) -> None:
+        self.server = _FakeSiteverifyServer()
+        threading.Thread(target=self.server.serve_forever, args=(0.01,), daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.clock = _FakeClock()
+        self.recaptcha_client = RecaptchaClient(
+            verify_url=self.server.url,
+            timeout=1.0,
+            circuit_breaker=CircuitBreaker(self.FAILURE_THRESHOLD, self.RESET_SECONDS, clock=self.clock),
+        )
+        self.addCleanup(self.recaptcha_client.session.close)
+
+    def _verify_failing(self, times: int) -> None:
+        self.server.status = HTTPStatus.INTERNAL_SERVER_ERROR
+        with self.assertLogs("recaptcha", level="WARNING"):
+            for _ in range(times):
+                self.recaptcha_client.verify("token")
+
+    def test_valid_token_passes(self) -> None:
+        with self.assertLogs("recaptcha", level="INFO") as logs:
+            result = self.recaptcha_client.verify("token")
+
+        self.assertEqual(result, RecaptchaResult(is_valid=True, score=0.9), f"Unexpected result '{result}'")
+        self.assertEqual(
+            self.server.requests,
+            [{"secret": ["test_secret_key_67890"], "response": ["token"]}],
+            f"Unexpected verification requests '{self.server.requests}'",
+        )
+        record = _get_verification_record(logs)
+        self.assertEqual(outcome := record.outcome, "passed", f"Expected the 'passed' outcome, got '{outcome}'")
+        self.assertGreater(record.duration_ms, 0, "The latency of the verification should be recorded")
+
+    def test_latency_is_counted_in_the_metrics(self) -> None:
+        reset_metrics()
+        self.addCleanup(reset_metrics)
+
+        with self.assertLogs("recaptcha", level="INFO"):
+            self.recaptcha_client.verify("token")
+
+        self.assertIn(
+            'recaptcha_verification_duration_seconds_count{outcome="passed"} 1',
+            render_metrics().splitlines(),
+            "Expected the verification to be counted with its outcome",
+        )
+
+    def test_low_score_is_rejected(self) -> None:
+        self.server.result = {"success": True, "score": 0.3, "action": "contact_form"}
+
+        with self.assertLogs("security", level="WARNING") as logs:
+            result = self.recaptcha_client.verify("token")
+
+        self.assertEqual(result, RecaptchaResult(is_valid=False, score=0.3), f"Unexpected result '{result}'")
+        self.assertEqual(
+            outcome := _get_verification_record(logs).outcome, "rejected", f"Unexpected outcome '{outcome}'"
+        )
+
+    def test_connection_is_reused(self) -> None:
+        with self.assertLogs("recaptcha", level="INFO"):
+            for _ in range(3):
+                self.recaptcha_client.verify("token")
+
+        self.assertEqual(len(self.server.requests), 3, f"Expected 3 verifications, got '{len(self.server.requests)}'")
+        self.assertEqual(
+            len(self.server.client_ports),
+            1,
+            f"The verifications should share a keep-alive connection, got '{self.server.client_ports}'",
+        )
+
+    def test_api_error_allows_submission(self) -> None:
+        self.server.status = HTTPStatus.INTERNAL_SERVER_ERROR
+
+        with self.assertLogs("recaptcha", level="WARNING") as logs:
+            result = self.recaptcha_client.verify("token")
+
+        self.assertEqual(result, RecaptchaResult(is_valid=True, score=None), f"Unexpected result '{result}'")
+        self.assertEqual(
+            outcome := _get_verification_record(logs).outcome, "api_error", f"Unexpected outcome '{outcome}'"
+        )
+
+    def test_timeout_allows_submission(self) -> None:
+        self.server.delay = 0.5
+        self.recaptcha_client.timeout = 0.1
+
+        with self.assertLogs("recaptcha", level="WARNING") as logs:
+            result = self.recaptcha_client.verify("token")
+
+        self.assertEqual(result, RecaptchaResult(is_valid=True, score=None), f"Unexpected result '{result}'")
+        self.assertLess(
+            duration_ms := _get_verification_record(logs).duration_ms,
+            500,
+            f"The verification should give up at the timeout, took '{duration_ms}' ms",
+        )
+
+    def test_circuit_opens_after_repeated_failures(self) -> None:
+        self._verify_failing(self.FAILURE_THRESHOLD)
+        self.server.status = HTTPStatus.OK
+
+        with self.assertLogs("recaptcha", level="WARNING") as logs:
+            result = self.recaptcha_client.verify("token")
+
+        self.assertEqual(result, RecaptchaResult(is_valid=True, score=None), f"Unexpected result '{result}'")
+        self.assertEqual(
+            len(self.server.requests),
+            self.FAILURE_THRESHOLD,
+            "The API should not be called while the circuit is open",
+        )
+        self.assertEqual(
+            outcome := _get_verification_record(logs).outcome, "circuit_open", f"Unexpected outcome '{outcome}'"
+        )
+
+    def test_failures_below_the_threshold_keep_the_circuit_closed(self) -> None:
+        self._verify_failing(self.FAILURE_THRESHOLD - 1)
+
+        self.assertFalse(self.recaptcha_client.circuit_breaker.is_open, "The circuit should still be closed")
+
+    def test_circuit_closes_after_a_successful_probe(self) -> None:
+        self._verify_failing(self.FAILURE_THRESHOLD)
+        self.server.status = HTTPStatus.OK
+        self.clock.now += self.RESET_SECONDS
+
+        with self.assertLogs("recaptcha", level="INFO"):
+            result = self.recaptcha_client.verify("token")
+
+        self.assertEqual(result, RecaptchaResult(is_valid=True, score=0.9), f"Unexpected result '{result}'")
+        self.assertFalse(self.recaptcha_client.circuit_breaker.is_open, "A successful probe should close the circuit")
+
+
+class TestCircuitBreaker(SimpleTestCase):
+    def setUp(self) -> None:
+        self.clock = _FakeClock()
+        self.circuit_breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10.0, clock=self.clock)
+
+    def _open(self) -> None:
+        for _ in range(2):
+            self.circuit_breaker.allow_call()
+            self.circuit_breaker.record_failure()
+
+    def test_success_resets_the_failure_count(self) -> None:
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_success()
+        self.circuit_breaker.record_failure()
+
+        self.assertTrue(self.circuit_breaker.allow_call(), "Only consecutive failures should open the circuit")
+
+    def test_open_circuit_rejects_calls_until_the_reset_period(self) -> None:
+        self._open()
+        self.clock.now += 9.9
+
+        self.assertFalse(self.circuit_breaker.allow_call(), "The open circuit should reject calls")
+
+    def test_half_open_circuit_allows_a_single_probe(self) -> None:
+        self._open()
+        self.clock.now += 10.0
+
+        self.assertTrue(self.circuit_breaker.allow_call(), "The half-open circuit should allow a probe")
+        self.assertFalse(self.circuit_breaker.allow_call(), "A single probe should be allowed at a time")
+
+    def test_failed_probe_reopens_the_circuit(self) -> None:
+        self._open()
+        self.clock.now += 10.0
+        self.circuit_breaker.allow_call()
+        self.circuit_breaker.record_failure()
+
+        self.assertFalse(self.circuit_breaker.allow_call(), "A failed probe should reopen the circuit")
+        self.clock.now += 10.0
+        self.assertTrue(self.circuit_breaker.allow_call(), "The reopened circuit should half-open again")
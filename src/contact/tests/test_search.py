@@ -0,0 +1,125 @@
+"""Tests for the full-text search of the contact messages, through the SQLite FTS5 fallback."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from contact.models import ContactMessage
+from contact.search import SEARCH_RANK, get_search_words, search_contact_messages
+
+
+def _create_message(name: str = "Visitor", subject: str = "Hello", message: str = "A message") -> ContactMessage:
+    return ContactMessage.objects.create(
+        name=name, email=f"{name.lower().replace(' ', '.')}@example.com", subject=subject, message=message
+    )
+
+
+def _search(search_term: str) -> list[str]:
+    results = search_contact_messages(ContactMessage.objects.all(), search_term)
+    assert results is not None
+    return [message.name for message in results.order_by(f"-{SEARCH_RANK}", "pk")]
+
+
+class TestSearchContactMessages(TestCase):
+    def test_every_word_must_prefix_a_word_of_the_message(self) -> None:
+        _create_message("Ada Lovelace", message="About the analytical engine")
+        _create_message("Charles Babbage", message="About the difference engine")
+
+        self.assertEqual(names := _search("analyt eng"), ["Ada Lovelace"], f"Unexpected results '{names}'")
+        self.assertEqual(
+            names := _search("engine"), ["Ada Lovelace", "Charles Babbage"], f"Unexpected results '{names}'"
+        )
+
+    def test_results_are_ranked_by_the_field_matched(self) -> None:
+        _create_message("In message", message="Quote for a django project")
+        _create_message("In subject", subject="Django project")
+        _create_message("Django Reinhardt")
+
+        self.assertEqual(
+            names := _search("django"),
+            ["Django Reinhardt", "In subject", "In message"],
+            f"The matches in the name should rank first, then the subject ones, got '{names}'",
+        )
+
+    def test_email_and_accents_are_searched(self) -> None:
+        _create_message("José Núñez")
+
+        self.assertEqual(names := _search("jose.nunez"), ["José Núñez"], f"Unexpected results '{names}'")
+        self.assertEqual(names := _search("nunez"), ["José Núñez"], f"Unexpected results '{names}'")
+
+    def test_index_follows_updates_and_deletions(self) -> None:
+        updated = _create_message("Updated", message="Before")
+        deleted = _create_message("Deleted", message="Before")
+
+        ContactMessage.objects.filter(pk=updated.pk).update(message="After")
+        deleted.delete()
+
+        self.assertEqual(names := _search("before"), [], f"Unexpected results '{names}'")
+        self.assertEqual(names := _search("after"), ["Updated"], f"Unexpected results '{names}'")
+
+    def test_query_syntax_is_not_interpreted(self) -> None:
+        _create_message("Not Sure", message="And or not")
+
+        self.assertEqual(names := _search('NOT "and" OR*'), ["Not Sure"], f"Unexpected results '{names}'")
+
+    def test_search_term_without_words_is_not_searched(self) -> None:
+        self.assertEqual(get_search_words(" @ - "), [], "Expected no words")
+        self.assertIsNone(
+            search_contact_messages(ContactMessage.objects.all(), " @ - "),
+            "The default search should be used for a search term without words",
+        )
+
+
+class TestContactMessageAdminSearch(TestCase):
+    def setUp(self) -> None:
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(user)
+
+        _create_message("Django Reinhardt")
+        # Newer, so listed first without the ranking
+        _create_message("In message", message="Looking for a django developer")
+        _create_message("Unrelated")
+
+    def _get_changelist_names(self, **params: str) -> list[str]:
+        response = self.client.get("/en/admin/contact/contactmessage/", params)
+        self.assertEqual(response.status_code, HTTPStatus.OK, f"Unexpected status '{response.status_code}'")
+        return [str(message).split(" - ")[0] for message in response.context["cl"].result_list]
+
+    def test_search_results_are_sorted_by_relevance(self) -> None:
+        self.assertEqual(
+            names := self._get_changelist_names(q="django"),
+            ["Django Reinhardt", "In message"],
+            f"Unexpected search results '{names}'",
+        )
+
+    def test_search_results_can_be_sorted_by_column(self) -> None:
+        names = self._get_changelist_names(q="django", o="1")
+
+        self.assertEqual(sorted(names), ["Django Reinhardt", "In message"], f"Unexpected search results '{names}'")
+
+    def test_search_term_without_words_uses_the_default_search(self) -> None:
+        names = self._get_changelist_names(q="@example")
+
+        self.assertEqual(len(names), 3, f"Every message should match the email domain, got '{names}'")
+
+
+class TestBenchsearchCommand(TestCase):
+    def test_searches_are_reported_and_messages_rolled_back(self) -> None:
+        output = StringIO()
+        call_command("benchsearch", messages=50, iterations=2, searches=["project", "quasar"], stdout=output)
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(
+            [line.split()[0] for line in lines], ["search", "project", "quasar"], f"Unexpected report '{lines}'"
+        )
+        self.assertFalse(ContactMessage.objects.exists(), "The seeded messages should be rolled back")
+
+    def test_invalid_options_are_refused(self) -> None:
+        with self.assertRaises(CommandError):
+            call_command("benchsearch", messages=10, iterations=0, stdout=StringIO())
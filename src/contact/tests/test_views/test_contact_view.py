@@ -12,9 +12,12 @@ import contact.tests.test_views.utils.constants as test_view_constants
 import home.tests.test_views.utils.constants as home_test_view_constants
 import utils.test_utils.constants as common_constants
 from base.models import LegalAndPrivacy, SiteMedia
-from contact.models import ContactFormConfiguration, ContactMessage
+from contact.models import ContactFormConfiguration, ContactMessage, OutboxEmail
+from contact.outbox import process_outbox
 from contact.tests.test_views.base_view_test import BaseContactViewTest
+from core.metrics import render_metrics, reset_metrics
 from home.models import Service
+from utils.singletons import invalidate_solo
 from utils.test_utils import base_view_test_case
 from utils.test_utils.base_view_test_case import ElementText, get_beautiful_soup_from_response
 from utils.test_utils.constants import ATTR_PLACEHOLDER, HtmlTag, Language
@@ -29,6 +32,7 @@ class BaseTestContactViewContent(base_view_test_case.CommonPageTestsMixin, BaseC
     """Base class for testing contact view content."""
 
     request_path = "contact/"
+    max_queries = 8
 
     @classmethod
     def init_db(cls) -> None:
@@ -305,6 +309,17 @@ class BaseTestContactViewContent(base_view_test_case.CommonPageTestsMixin, BaseC
             "Error field should be empty for valid submissions",
         )
 
+        # Check the email was queued, and only sent by the outbox worker
+        self.assertEqual(
+            outbox_len := len(mail.outbox), 0, f"Expected no email to be sent during the request, got '{outbox_len}'"
+        )
+        self.assertEqual(
+            queued := OutboxEmail.objects.filter(contact_message=message).count(),
+            1,
+            f"Expected exactly one queued email, got '{queued}'",
+        )
+        process_outbox()
+
         # Check email was sent
         self.assertEqual(
             outbox_len := len(mail.outbox), 1, f"Expected exactly one email to be sent, got '{outbox_len}'"
@@ -478,15 +493,20 @@ class BaseTestContactViewContent(base_view_test_case.CommonPageTestsMixin, BaseC
             "message": test_view_constants.TEST_MESSAGE,
         }
 
-        # Mock EmailMessage.send to raise an exception
-        with mock.patch(
-            "contact.views.EmailMessage.send", side_effect=Exception(test_view_constants.MOCKED_ERROR_MESSAGE)
-        ):
-            response = self.client.post(f"/{self.language}/{self.request_path}", data=form_data)
+        response = self.client.post(f"/{self.language}/{self.request_path}", data=form_data)
 
         # Should still redirect (user shouldn't see the error)
         self.assertRedirects(response, f"/{self.language}/{self.request_path}", status_code=302, target_status_code=200)
 
+        # Mock EmailMessage.send to raise an exception, on the last attempt of the outbox worker
+        with (
+            mock.patch(
+                "contact.outbox.EmailMessage.send", side_effect=Exception(test_view_constants.MOCKED_ERROR_MESSAGE)
+            ),
+            override_settings(OUTBOX_MAX_ATTEMPTS=1),
+        ):
+            process_outbox()
+
         # Check message was saved to database
         self.assertEqual(ContactMessage.objects.count(), 1, "ContactMessage was not created in the database")
         message = ContactMessage.objects.first()
@@ -536,6 +556,36 @@ class BaseTestContactViewContent(base_view_test_case.CommonPageTestsMixin, BaseC
         # Check that no email was sent (since send() was mocked to fail)
         self.assertEqual(len(mail.outbox), 0, "No email should have been sent when send() raises an exception")
 
+    def test_submission_outcomes_are_counted(self) -> None:
+        """Test that the outcomes of the submissions, and of their emails, are counted in the metrics."""
+        reset_metrics()
+        self.addCleanup(reset_metrics)
+        form_data = {
+            "name": test_view_constants.TEST_NAME,
+            "email": test_view_constants.TEST_EMAIL,
+            "subject": test_view_constants.TEST_SUBJECT,
+            "message": test_view_constants.TEST_MESSAGE,
+        }
+
+        self.client.post(f"/{self.language}/{self.request_path}", data={**form_data, "message": ""})
+        self.client.post(f"/{self.language}/{self.request_path}", data=form_data)
+        with (
+            mock.patch(
+                "contact.outbox.EmailMessage.send", side_effect=Exception(test_view_constants.MOCKED_ERROR_MESSAGE)
+            ),
+            override_settings(OUTBOX_MAX_ATTEMPTS=1),
+        ):
+            process_outbox()
+
+        samples = render_metrics().splitlines()
+        for sample in (
+            'contact_submissions_total{outcome="invalid"} 1',
+            'contact_submissions_total{outcome="valid"} 1',
+            'contact_submissions_total{outcome="email_failed"} 1',
+            'contact_email_send_duration_seconds_count{outcome="failed"} 1',
+        ):
+            self.assertIn(sample, samples, f"Expected the sample '{sample}' in the metrics")
+
 
 class TestContactViewContentEnglish(BaseTestContactViewContent):
     """Test contact view content in English."""
@@ -706,6 +756,8 @@ class BaseTestContactViewIntro(BaseContactViewTest):
         """Test that the default (translated) intro is shown when the model field is blank."""
         config = ContactFormConfiguration.get_solo()
         ContactFormConfiguration.objects.filter(pk=config.pk).update(intro_en="", intro_es="")
+        # Queryset updates don't send signals: the cached singleton has to be invalidated by hand
+        invalidate_solo(ContactFormConfiguration)
 
         response = self.client.get(f"/{self.language}/{self.request_path}")
         soup = get_beautiful_soup_from_response(response)
@@ -880,6 +932,7 @@ class BaseTestContactViewQualificationFields(BaseContactViewTest):
             f"timeline mismatch: expected '{test_view_constants.TEST_TIMELINE_VALUE}', got '{message.timeline}'",
         )
 
+        process_outbox()
         self.assertEqual(len(mail.outbox), 1, "Expected exactly one email to be sent")
         expected_body = test_view_constants.EMAIL_BODY_WITH_QUALIFICATION_TEMPLATE.format(
             name=test_view_constants.TEST_NAME,
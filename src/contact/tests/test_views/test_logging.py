@@ -14,6 +14,7 @@ from django.test import override_settings
 
 import contact.tests.test_views.utils.constants as test_view_constants
 from contact.models import ContactMessage
+from contact.outbox import process_outbox
 from contact.tests.test_views.base_view_test import BaseContactViewTest
 from utils.test_utils.constants import Language
 
@@ -79,14 +80,17 @@ class TestContactLogging(BaseContactViewTest):
         )
 
     def test_email_sending_failure_is_logged(self) -> None:
-        """A failure sending the notification email logs an exception to the 'contact' logger."""
+        """The final failure sending the notification email logs an exception to the 'contact' logger."""
+        self.client.post(f"/{self.language}/{self.request_path}", data=_get_form_data())
+
         with (
             mock.patch(
-                "contact.views.EmailMessage.send", side_effect=Exception(test_view_constants.MOCKED_ERROR_MESSAGE)
+                "contact.outbox.EmailMessage.send", side_effect=Exception(test_view_constants.MOCKED_ERROR_MESSAGE)
             ),
+            override_settings(OUTBOX_MAX_ATTEMPTS=1),
             self.assertLogs("contact", level="ERROR") as captured,
         ):
-            self.client.post(f"/{self.language}/{self.request_path}", data=_get_form_data())
+            process_outbox()
 
         message = ContactMessage.objects.get()
 
@@ -124,7 +128,7 @@ class TestRecaptchaLogging(BaseContactViewTest):
         mock_response = mock.Mock(["raise_for_status", "json"])
         mock_response.raise_for_status.return_value = None
         mock_response.json.return_value = {"success": success, "score": score, "action": action}
-        return mock.patch("contact.views.requests.post", return_value=mock_response)
+        return mock.patch("requests.Session.post", return_value=mock_response)
 
     def test_missing_token_is_logged_as_security_warning(self) -> None:
         """A submission missing the reCAPTCHA token logs a warning to the 'security' logger."""
@@ -183,7 +187,7 @@ class TestRecaptchaLogging(BaseContactViewTest):
     def test_network_error_is_logged_as_recaptcha_warning(self) -> None:
         """A network error contacting the reCAPTCHA API logs a warning to the 'recaptcha' logger."""
         with (
-            mock.patch("contact.views.requests.post", side_effect=requests.RequestException("Network error")),
+            mock.patch("requests.Session.post", side_effect=requests.RequestException("Network error")),
             self.assertLogs("recaptcha", level="WARNING") as captured,
         ):
             self.client.post(f"/{self.language}/{self.request_path}", data=_get_form_data(with_recaptcha_token=True))
@@ -200,7 +204,7 @@ class TestRecaptchaLogging(BaseContactViewTest):
     def test_unexpected_error_is_logged_as_recaptcha_error(self) -> None:
         """An unexpected error during reCAPTCHA verification logs an exception to the 'recaptcha' logger."""
         with (
-            mock.patch("contact.views.requests.post", side_effect=ValueError("Unexpected error")),
+            mock.patch("requests.Session.post", side_effect=ValueError("Unexpected error")),
             self.assertLogs("recaptcha", level="ERROR") as captured,
         ):
             self.client.post(f"/{self.language}/{self.request_path}", data=_get_form_data(with_recaptcha_token=True))
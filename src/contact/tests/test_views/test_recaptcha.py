@@ -13,6 +13,7 @@ from django.test import override_settings
 
 import contact.tests.test_views.utils.constants as test_view_constants
 from contact.models import ContactMessage
+from contact.outbox import process_outbox
 from contact.tests.test_views.base_view_test import BaseContactViewTest
 from utils.test_utils.base_view_test_case import get_beautiful_soup_from_response
 from utils.test_utils.constants import HtmlTag, Language
@@ -45,7 +46,10 @@ class BaseTestRecaptcha(BaseContactViewTest):
         return data
 
     def _send_request(self) -> _MonkeyPatchedWSGIResponse:
-        return self.client.post(f"/{self.language}/{self.request_path}", data=self._get_form_data(), follow=True)
+        response = self.client.post(f"/{self.language}/{self.request_path}", data=self._get_form_data(), follow=True)
+        # Send the queued notification, as the outbox worker does
+        process_outbox()
+        return response
 
     @classmethod
     def _create_mock_recaptcha_response(cls, *, success: bool, score: float, action: str) -> ContextManager[Any]:
@@ -63,7 +67,7 @@ class BaseTestRecaptcha(BaseContactViewTest):
             "score": score,
             "action": action,
         }
-        return mock.patch("contact.views.requests.post", return_value=mock_response)
+        return mock.patch("requests.Session.post", return_value=mock_response)
 
     def _assert_contact_message(
         self,
@@ -350,7 +354,7 @@ class _BaseTestRecaptchaNetworkFailure(_BaseTestRecaptchaConfigured):
     @classmethod
     def _mock_on_request(cls) -> ContextManager[Any]:
         """Override to simulate network error."""
-        return mock.patch("contact.views.requests.post", side_effect=requests.RequestException("Network error"))
+        return mock.patch("requests.Session.post", side_effect=requests.RequestException("Network error"))
 
     def test_recaptcha_network_error_allows_submission(self) -> None:
         """Test that network errors allow submission (fail open).
@@ -381,7 +385,7 @@ class _BaseTestRecaptchaTimeout(_BaseTestRecaptchaConfigured):
     @classmethod
     def _mock_on_request(cls) -> ContextManager[Any]:
         """Override to simulate timeout."""
-        return mock.patch("contact.views.requests.post", side_effect=requests.Timeout("Request timeout"))
+        return mock.patch("requests.Session.post", side_effect=requests.Timeout("Request timeout"))
 
     def test_recaptcha_timeout_allows_submission(self) -> None:
         """Test that API timeout allows submission (fail open).
@@ -412,7 +416,7 @@ class _BaseTestRecaptchaUnexpectedFailure(_BaseTestRecaptchaConfigured):
     @classmethod
     def _mock_on_request(cls) -> ContextManager[Any]:
         """Override to simulate unexpected error."""
-        return mock.patch("contact.views.requests.post", side_effect=ValueError("Unexpected error"))
+        return mock.patch("requests.Session.post", side_effect=ValueError("Unexpected error"))
 
     def test_recaptcha_unexpected_error_rejects_submission(self) -> None:
         """Test that unexpected errors reject submission (fail closed).
@@ -442,7 +446,7 @@ class _BaseTestRecaptchaHttpFailure(_BaseTestRecaptchaConfigured):
         """Override to simulate HTTP error."""
         mock_response = mock.Mock()
         mock_response.raise_for_status.side_effect = requests.HTTPError("500 Server Error")
-        return mock.patch("contact.views.requests.post", return_value=mock_response)
+        return mock.patch("requests.Session.post", return_value=mock_response)
 
     def test_recaptcha_api_http_error(self) -> None:
         """Test handling of HTTP errors from reCAPTCHA API.
@@ -0,0 +1,320 @@
+"""In-process benchmark of the rendering of the public pages.
+
+Every public URL, in every language, is requested through the test client (the full
+middleware stack, as an anonymous visitor) over a number of iterations, against a seeded
+dataset of configurable size. The page cache is disabled so each request is rendered,
+while the caches of derived data (singletons, JSON-LD documents) work as in production.
+
+The dataset is seeded within a transaction that is always rolled back, with the existing
+content removed first, so the results only depend on the dataset size and the database
+is left untouched.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import translation
+
+from base.models import FollowMeLink, LegalAndPrivacy
+from core.queries import record_queries
+from home.models import Education, Experience, PersonalInfo, ProcessStep, Project, Service, Technology
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# Compared against the baseline, in this order
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "queries", "memory_kib", "bytes")
+
+_TECHNOLOGIES_PER_ITEM = 3
+_FEATURED_PROJECTS = 3
+_SERVICES = 3
+_MARKDOWN = (
+    "A paragraph with **bold** and *emphasised* text, [a link](https://example.com) and `code`.\n\n"
+    "- A first item\n- A second item\n- A third item\n"
+)
+_BENCHMARK_SETTINGS: dict[str, Any] = {
+    "CACHES": {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    "CACHE_MIDDLEWARE_SECONDS": 0,
+    "DEBUG": False,
+    "MAINTENANCE_MODE": False,
+    "PREPEND_WWW": False,
+    "PRERENDER_ROOT": "",
+    "SERVER_TIMING_SAMPLE_RATE": 0.0,
+}
+
+
+class DatasetSize(NamedTuple):
+    """Number of objects of each kind in the seeded dataset."""
+
+    projects: int
+    experiences: int
+    education: int
+    technologies: int
+
+
+class PageStats(NamedTuple):
+    """Rendering statistics of a page, over every iteration (and project, for the detail page)."""
+
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries: int
+    memory_kib: float
+    bytes: int
+
+
+class BenchmarkedPage(NamedTuple):
+    """A page to benchmark: a key identifying it in the results, the URL paths it is rendered from, and their status."""
+
+    key: str
+    paths: list[str]
+    status: HTTPStatus = HTTPStatus.OK
+
+
+class BenchmarkError(Exception):
+    """A page could not be benchmarked, as it was not rendered with its expected status."""
+
+
+def _delete_content() -> None:
+    for model in (Project, Experience, Education, Technology, Service, ProcessStep, PersonalInfo, FollowMeLink):
+        model._default_manager.all().delete()
+    LegalAndPrivacy.objects.all().delete()
+
+
+def _seed_technologies(item: Any, technologies: list[Technology], index: int) -> list[Any]:
+    # The relations are bulk created: adding them one by one would purge the related pages every time
+    through = type(item).technologies.through
+    field_name = f"{type(item)._meta.model_name}_id"
+    selected = {technologies[(index + offset) % len(technologies)] for offset in range(_TECHNOLOGIES_PER_ITEM)}
+    return [through(**{field_name: item.pk, "technology_id": technology.pk}) for technology in selected]
+
+
+def seed_dataset(size: DatasetSize) -> None:
+    """Replace the content of the site with a generated dataset of the given size.
+
+    Must be run within a transaction that is rolled back.
+
+    Args:
+        size: The number of objects of each kind.
+    """
+    _delete_content()
+    today = datetime.date.today()
+
+    with translation.override(settings.LANGUAGE_CODE):
+        technologies = [
+            Technology.objects.create(name=f"Technology {index}", name_es=f"Tecnología {index}", priority=index)
+            for index in range(max(size.technologies, 1))
+        ]
+        personal_info = PersonalInfo.objects.create(
+            name="Benchmark Owner",
+            title="Software Engineer",
+            location="Remote",
+            introduction=_MARKDOWN,
+            biography=_MARKDOWN,
+        )
+        personal_info.technologies.set(technologies[:10])
+        FollowMeLink.objects.create(name="GitHub", link="https://github.com/", svg_view_box="0 0 24 24", svg_path="M0")
+        LegalAndPrivacy.objects.create(title="Privacy policy", text=_MARKDOWN)
+
+        for index in range(_SERVICES):
+            Service.objects.create(
+                title=f"Service {index}",
+                slug=f"service-{index}",
+                short_description="A short description of the service.",
+                long_description=_MARKDOWN,
+                order=index,
+            )
+            ProcessStep.objects.create(title=f"Step {index}", description="A step of the process.", order=index)
+
+        relations: list[Any] = []
+        for index in range(size.projects):
+            project = Project.objects.create(
+                title=f"Project {index}",
+                title_es=f"Proyecto {index}",
+                slug=f"project-{index}",
+                summary="A short, problem-oriented excerpt of the project.",
+                problem=_MARKDOWN,
+                approach=_MARKDOWN,
+                outcome=_MARKDOWN,
+                featured=index < _FEATURED_PROJECTS,
+                order=index,
+            )
+            relations.extend(_seed_technologies(project, technologies, index))
+        Project.technologies.through.objects.bulk_create(relations)
+
+        relations = []
+        for index in range(size.experiences):
+            experience = Experience.objects.create(
+                title=f"Position {index}",
+                location="Remote",
+                institution=f"Company {index}",
+                description=_MARKDOWN,
+                start_date=today - datetime.timedelta(days=365 * (index + 1)),
+                end_date=today - datetime.timedelta(days=365 * index) if index else None,
+            )
+            relations.extend(_seed_technologies(experience, technologies, index))
+        Experience.technologies.through.objects.bulk_create(relations)
+
+        for index in range(size.education):
+            Education.objects.create(
+                title=f"Degree {index}",
+                institution=f"University {index}",
+                location="Remote",
+                description=_MARKDOWN,
+                start_date=today - datetime.timedelta(days=365 * (index + 4)),
+                end_date=today - datetime.timedelta(days=365 * index),
+            )
+
+
+def get_benchmarked_pages() -> list[BenchmarkedPage]:
+    """Return the public pages, in every language, along with the language independent ones."""
+    slugs = list(Project.objects.values_list("slug", flat=True))
+    pages: list[BenchmarkedPage] = []
+
+    for language, _ in settings.LANGUAGES:
+        with translation.override(language):
+            pages.extend(
+                BenchmarkedPage(f"{language}:{url_name}", [reverse(url_name)])
+                for url_name in ("home", "my-career", "projects", "contact")
+            )
+            if slugs:
+                pages.append(
+                    BenchmarkedPage(
+                        f"{language}:project-detail",
+                        [reverse("project-detail", kwargs={"slug": slug}) for slug in slugs],
+                    )
+                )
+            pages.append(
+                BenchmarkedPage(f"{language}:404", [f"/{language}/benchmark-missing-page/"], HTTPStatus.NOT_FOUND)
+            )
+
+    pages.append(BenchmarkedPage("robots.txt", ["/robots.txt"]))
+    pages.append(BenchmarkedPage("sitemap.xml", ["/sitemap.xml"]))
+    return pages
+
+
+def _get_percentile(sorted_values: list[float], percentile: int) -> float:
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    return statistics.quantiles(sorted_values, n=100, method="inclusive")[percentile - 1]
+
+
+def _benchmark_page(client: Client, page: BenchmarkedPage, iterations: int) -> PageStats:
+    durations: list[float] = []
+    query_counts: list[int] = []
+    sizes: list[int] = []
+
+    # Warm up the caches of derived data (singletons, JSON-LD), as in a running server
+    for path in page.paths:
+        if (status := client.get(path).status_code) != page.status:
+            msg = f"'{path}' was rendered with status {status} instead of {page.status}"
+            raise BenchmarkError(msg)
+
+    for _ in range(iterations):
+        for path in page.paths:
+            with record_queries() as queries:
+                start = time.perf_counter()
+                response = client.get(path)
+                durations.append(time.perf_counter() - start)
+            query_counts.append(len(queries))
+            sizes.append(len(response.content))
+
+    # Measured apart, since tracing the allocations slows the rendering down
+    peaks: list[int] = []
+    for path in page.paths:
+        tracemalloc.start()
+        try:
+            client.get(path)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+
+    durations_ms = sorted(duration * 1000 for duration in durations)
+    return PageStats(
+        p50_ms=round(_get_percentile(durations_ms, 50), 2),
+        p95_ms=round(_get_percentile(durations_ms, 95), 2),
+        p99_ms=round(_get_percentile(durations_ms, 99), 2),
+        queries=max(query_counts),
+        memory_kib=round(max(peaks) / 1024, 1),
+        bytes=max(sizes),
+    )
+
+
+@contextmanager
+def benchmark_environment() -> Iterator[None]:
+    """Isolate the benchmark: settings rendering every request, and a transaction rolled back on exit."""
+    with (
+        override_settings(**_BENCHMARK_SETTINGS, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]),
+        translation.override(translation.get_language()),
+    ):
+        # The benchmarked 404 pages would log a warning on every request
+        request_logger = logging.getLogger("django.request")
+        level = request_logger.level
+        request_logger.setLevel(logging.ERROR)
+        try:
+            with transaction.atomic():
+                try:
+                    yield
+                finally:
+                    transaction.set_rollback(True)
+        finally:
+            request_logger.setLevel(level)
+
+
+def run_benchmark(size: DatasetSize, iterations: int) -> dict[str, PageStats]:
+    """Seed a dataset of the given size and render every public page over the given iterations.
+
+    A `BenchmarkError` is raised if a page is not rendered with its expected status.
+
+    Args:
+        size: The number of objects of each kind in the dataset.
+        iterations: The number of times each page is rendered.
+
+    Returns:
+        The rendering statistics of each page, by page key (e.g. `en:home`).
+    """
+    with benchmark_environment():
+        seed_dataset(size)
+        client = Client(raise_request_exception=False)
+        return {page.key: _benchmark_page(client, page, iterations) for page in get_benchmarked_pages()}
+
+
+def compare_to_baseline(
+    results: dict[str, PageStats], baseline: dict[str, dict[str, float]], tolerance: float
+) -> list[str]:
+    """Return the regressions of the results over the baseline, as human readable descriptions.
+
+    Args:
+        results: The rendering statistics of each page.
+        baseline: The rendering statistics of each page in the baseline, as stored in JSON.
+        tolerance: The relative increase of a metric over its baseline value tolerated, e.g. 0.2 for 20%.
+
+    Returns:
+        A description of each metric of each page over its tolerated value.
+    """
+    regressions: list[str] = []
+
+    for key, stats in results.items():
+        baseline_stats = baseline.get(key)
+        if baseline_stats is None:
+            continue
+
+        for metric in METRICS:
+            value = getattr(stats, metric)
+            baseline_value = baseline_stats.get(metric)
+            if baseline_value is not None and value > baseline_value * (1 + tolerance):
+                regressions.append(f"{key} {metric}: {value} > {baseline_value} (+{tolerance:.0%})")
+
+    return regressions
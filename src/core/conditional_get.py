@@ -0,0 +1,48 @@
+"""Conditional GET support (ETag, Last-Modified and 304 responses) for the pages.
+
+The pages only change with the content they render, so their validators derive from the
+site-wide content version stamp (see core.page_cache) instead of the rendered response:
+the ETag of a page is a hash of its absolute URL and the content version, and its
+Last-Modified the time that version started. A request whose validators match is
+answered with a 304 before the view runs, without rendering templates nor querying the
+database.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING, Any
+
+from django.views.decorators.http import condition
+
+from core.page_cache import get_content_version_stamp, is_visitor_state_deferred
+
+if TYPE_CHECKING:
+    import datetime
+
+    from django.http import HttpRequest
+
+
+def _get_content_etag(request: HttpRequest, *args: Any, **kwargs: Any) -> str:
+    version = get_content_version_stamp().version
+    return hashlib.md5(f"{version}:{request.build_absolute_uri()}".encode()).hexdigest()
+
+
+def _get_content_last_modified(request: HttpRequest, *args: Any, **kwargs: Any) -> datetime.datetime:
+    return get_content_version_stamp().modified_at
+
+
+def _get_page_etag(request: HttpRequest, *args: Any, **kwargs: Any) -> str | None:
+    # Pages rendering the per-visitor state inline differ between visitors
+    return _get_content_etag(request) if is_visitor_state_deferred(request) else None
+
+
+def _get_page_last_modified(request: HttpRequest, *args: Any, **kwargs: Any) -> datetime.datetime | None:
+    return _get_content_last_modified(request) if is_visitor_state_deferred(request) else None
+
+
+# For the responses depending only on the content, e.g. the sitemap
+content_condition = condition(etag_func=_get_content_etag, last_modified_func=_get_content_last_modified)
+
+# For the HTML pages, validated only when identical for every visitor (PAGE_CACHE_COOKIELESS)
+page_condition = condition(etag_func=_get_page_etag, last_modified_func=_get_page_last_modified)
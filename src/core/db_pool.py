@@ -0,0 +1,105 @@
+"""Statistics of the PostgreSQL connection pools, exposed in the metrics.
+
+With `DATABASE_POOL`, each process keeps a pool of connections (psycopg 3's, through Django),
+lent to the requests for their duration. The statistics of the pools of the process are copied
+to its metrics as each request starts: the counts since the previous request (connections
+requested, those which waited for one, the time waited, the errors), and the connections busy
+and idle and the requests waiting for one at that moment.
+
+The gauges only sample the pools of the process when a request starts, its connection not taken
+yet: they count the connections held by its other threads (threaded workers, background work).
+With the single-threaded sync workers, they stay at 0 busy and 0 waiting; the pressure on the
+pools shows in the counters of the requests queued and the time they waited.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+
+from core.metrics import (
+    DB_POOL_CONNECTIONS,
+    DB_POOL_ERRORS,
+    DB_POOL_MAX_CONNECTIONS,
+    DB_POOL_QUEUED_REQUESTS,
+    DB_POOL_REQUESTS,
+    DB_POOL_WAIT_SECONDS,
+    DB_POOL_WAITING_REQUESTS,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from django.db.backends.base.base import BaseDatabaseWrapper
+    from psycopg_pool import ConnectionPool
+
+# The counters of the pool statistics, by kind of error
+_ERROR_KINDS = {
+    "requests_errors": "timeout",
+    "connections_errors": "connect",
+    "connections_lost": "lost",
+    "returns_bad": "bad_return",
+}
+
+
+def is_pooled(alias: str) -> bool:
+    """Return whether the connections of the database of the given alias are pooled."""
+    return bool(settings.DATABASES[alias].get("OPTIONS", {}).get("pool"))
+
+
+def get_pool(connection: BaseDatabaseWrapper) -> ConnectionPool | None:
+    """Return the pool of the connections of a database, or None if they are not pooled."""
+    if not is_pooled(connection.alias):
+        return None
+    return getattr(connection, "pool", None)
+
+
+def close_pools() -> None:
+    """Close the connection pools of the process, e.g. before forking, for the children not to share them."""
+    for connection in connections.all():
+        if is_pooled(connection.alias):
+            # Only the PostgreSQL backend pools its connections
+            connection.close_pool()  # type: ignore[attr-defined]
+
+
+def record_pool_stats(alias: str, stats: Mapping[str, int]) -> None:
+    """Copy the statistics of a pool to the metrics of the process.
+
+    Args:
+        alias: The alias of the database of the pool.
+        stats: The statistics of the pool, its counters (absent when zero) since the previous call.
+    """
+    available = stats.get("pool_available", 0)
+    DB_POOL_CONNECTIONS.set(available, alias=alias, state="idle")
+    DB_POOL_CONNECTIONS.set(stats.get("pool_size", 0) - available, alias=alias, state="busy")
+    DB_POOL_MAX_CONNECTIONS.set(stats.get("pool_max", 0), alias=alias)
+    DB_POOL_WAITING_REQUESTS.set(stats.get("requests_waiting", 0), alias=alias)
+
+    if requests := stats.get("requests_num"):
+        DB_POOL_REQUESTS.inc(requests, alias=alias)
+    if queued := stats.get("requests_queued"):
+        DB_POOL_QUEUED_REQUESTS.inc(queued, alias=alias)
+    if wait_ms := stats.get("requests_wait_ms"):
+        DB_POOL_WAIT_SECONDS.inc(wait_ms / 1000, alias=alias)
+    for key, kind in _ERROR_KINDS.items():
+        if errors := stats.get(key):
+            DB_POOL_ERRORS.inc(errors, alias=alias, kind=kind)
+
+
+def _record_pools_stats(**kwargs: Any) -> None:
+    for connection in connections.all(initialized_only=True):
+        if (pool := get_pool(connection)) is not None:
+            # Resetting the counters, for the next call to count from there
+            record_pool_stats(connection.alias, pool.pop_stats())
+
+
+def connect_pool_stats() -> None:
+    """Record the statistics of the connection pools as each request starts, if any database is pooled.
+
+    Recorded before the request uses the database, so those of the request serving the metrics are current.
+    """
+    if any(is_pooled(alias) for alias in settings.DATABASES):
+        request_started.connect(_record_pools_stats, dispatch_uid="record_pools_stats")
@@ -0,0 +1,111 @@
+"""Stress test of the database connection pool, with more concurrent requests than it has connections.
+
+Threads, more than the connections of the pool, each make requests holding a connection for a
+while (a `pg_sleep` query) and returning it to the pool at their end, as the requests do. Once
+every connection is busy, the requests wait for one: their latency shows the time waited, and
+those waiting longer than the timeout of the pool fail. The requests waiting are sampled while
+the threads run, and the statistics of the pool are reported too.
+"""
+
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+from typing import NamedTuple
+
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+
+from .db_pool import get_pool
+
+# Interval of the sampling of the requests waiting for a connection, in seconds
+_SAMPLING_INTERVAL = 0.005
+
+
+class PoolStressStats(NamedTuple):
+    """Outcome of the requests, their latency in ms, and the statistics of the pool while they ran."""
+
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    max_waiting: int
+    queued: int
+    wait_ms: int
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_pool_stress(threads: int, requests: int, hold_ms: float, alias: str = DEFAULT_DB_ALIAS) -> PoolStressStats:
+    """Make requests from concurrent threads, each holding a pooled connection for the given time.
+
+    Args:
+        threads: The number of concurrent threads, e.g. more than the connections of the pool.
+        requests: The number of requests of each thread.
+        hold_ms: The time each request holds its connection, in ms.
+        alias: The alias of the pooled database.
+
+    Returns:
+        The outcome and latency of the requests, and the statistics of the pool.
+
+    Raises:
+        RuntimeError: If the connections of the database are not pooled.
+    """
+    pool = get_pool(connections[alias])
+    if pool is None:
+        msg = f"The connections of the database '{alias}' are not pooled (DATABASE_POOL)."
+        raise RuntimeError(msg)
+
+    # Counting from here
+    pool.pop_stats()
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def make_requests() -> None:
+        nonlocal errors
+        barrier.wait()
+        for _ in range(requests):
+            start = time.perf_counter()
+            try:
+                with connections[alias].cursor() as cursor:
+                    cursor.execute("SELECT pg_sleep(%s)", [hold_ms / 1000])
+            except OperationalError:
+                # Timed out waiting for a connection
+                with lock:
+                    errors += 1
+            else:
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+            finally:
+                # Returned to the pool, as at the end of a request
+                connections[alias].close()
+
+    workers = [threading.Thread(target=make_requests) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+
+    max_waiting = 0
+    while any(worker.is_alive() for worker in workers):
+        max_waiting = max(max_waiting, pool.get_stats().get("requests_waiting", 0))
+        time.sleep(_SAMPLING_INTERVAL)
+    for worker in workers:
+        worker.join()
+
+    stats = pool.pop_stats()
+    latencies_ms = [latency * 1000 for latency in latencies] or [0.0]
+    return PoolStressStats(
+        requests=threads * requests,
+        errors=errors,
+        p50_ms=round(statistics.median(latencies_ms), 1),
+        p95_ms=round(_percentile(latencies_ms, 0.95), 1),
+        max_ms=round(max(latencies_ms), 1),
+        max_waiting=max_waiting,
+        queued=stats.get("requests_queued", 0),
+        wait_ms=stats.get("requests_wait_ms", 0),
+    )
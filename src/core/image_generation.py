@@ -0,0 +1,257 @@
+"""Pre-generation of the imagekit cache files, spread over a pool of processes.
+
+Without it, each rendition of an `ImageSpecField` is generated by the first request showing it.
+The `generate_images` command generates the renditions of every spec ahead of time, recording
+in a manifest (`IMAGEKIT_MANIFEST_PATH`, by default `CACHE/manifest.json` in the media root) the
+hash of the source image each one was generated from, so the next runs skip the renditions that
+still exist and whose source is unchanged. The `GenerateOnSourceSaved` cache file strategy
+queues the generation of the renditions of an uploaded image as soon as its transaction
+commits, in a background thread of the process, requests coming before still generating them
+just in time.
+
+The strategy is optimistic: the renditions known to be generated are assumed to exist, so
+showing them doesn't touch the storage (nor the existence state imagekit keeps in the cache).
+Each process knows the renditions of the manifest, loaded on first use, and those recorded
+since in the shared cache by any process; only on a miss is the storage checked, and the
+rendition generated if missing, then recorded.
+
+The manifest is rewritten as a whole; concurrent writers (e.g. an upload while the command
+runs) may lose each other's entries, which only gets those renditions generated again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from enum import StrEnum
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from imagekit.cachefiles.strategies import JustInTime
+from imagekit.registry import cachefile_registry, generator_registry
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from concurrent.futures import Future
+
+    from imagekit.cachefiles import ImageCacheFile
+
+logger = logging.getLogger("images")
+
+MANIFEST_FILE_NAME = "manifest.json"
+
+_GENERATED_KEY_TEMPLATE = "image-generated:{name_hash}"
+
+_upload_executor: ThreadPoolExecutor | None = None
+
+# Names of the cache files known to be generated by the process, by manifest (i.e. media root)
+_generated_images: dict[Path, set[str]] = {}
+
+
+class ImageStatus(StrEnum):
+    GENERATED = "generated"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+
+class ImageResult(NamedTuple):
+    """Outcome of the generation of a cache file, with the hash of its source image."""
+
+    name: str
+    source_hash: str
+    status: ImageStatus
+
+
+def get_manifest_path() -> Path:
+    """Return the path of the manifest of the generated cache files."""
+    return Path(settings.IMAGEKIT_MANIFEST_PATH or Path(settings.MEDIA_ROOT) / "CACHE" / MANIFEST_FILE_NAME)
+
+
+def load_manifest() -> dict[str, str]:
+    """Return the hashes of the source images of the generated cache files, by cache file name."""
+    try:
+        manifest: dict[str, str] = json.loads(get_manifest_path().read_text())
+    except FileNotFoundError:
+        return {}
+    except ValueError:
+        logger.warning("Invalid image manifest, every image will be generated", extra={"path": get_manifest_path()})
+        return {}
+    return manifest
+
+
+def save_manifest(manifest: dict[str, str]) -> None:
+    """Replace the manifest of the generated cache files, in a single step."""
+    path = get_manifest_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=path.parent, prefix=f".{path.name}.", delete=False) as temporary_file:
+        json.dump(manifest, temporary_file, indent=2, sort_keys=True)
+    Path(temporary_file.name).replace(path)
+
+
+def _get_generated_key(name: str) -> str:
+    return _GENERATED_KEY_TEMPLATE.format(name_hash=hashlib.sha256(name.encode()).hexdigest())
+
+
+def _get_generated_images() -> set[str]:
+    path = get_manifest_path()
+    generated = _generated_images.get(path)
+    if generated is None:
+        generated = _generated_images[path] = set(load_manifest())
+    return generated
+
+
+def is_image_generated(name: str) -> bool:
+    """Return whether a cache file is known to be generated, from the process memory or the shared cache."""
+    generated = _get_generated_images()
+    if name in generated:
+        return True
+
+    if cache.get(_get_generated_key(name)):
+        generated.add(name)
+        return True
+    return False
+
+
+def record_generated_images(names: Iterable[str], generated: bool = True) -> None:
+    """Record cache files as generated, or as not generated, for every process.
+
+    Args:
+        names: The names of the cache files.
+        generated: Whether the cache files were generated, or failed to be (e.g. deleted meanwhile).
+    """
+    names = list(names)
+    if generated:
+        _get_generated_images().update(names)
+        cache.set_many(dict.fromkeys(map(_get_generated_key, names), True), timeout=None)
+    else:
+        _get_generated_images().difference_update(names)
+        cache.delete_many(list(map(_get_generated_key, names)))
+
+
+def get_cache_files(generator_ids: Iterable[str] | None = None) -> list[ImageCacheFile]:
+    """Return the cache files of the given image specs (e.g. `home:project:card_images_webp_400`), or of every spec.
+
+    Args:
+        generator_ids: The ids of the image specs, or None for every registered spec.
+
+    Returns:
+        The cache files of every source image of the specs, by name.
+    """
+    files: dict[str, ImageCacheFile] = {}
+    for generator_id in generator_registry.get_ids() if generator_ids is None else generator_ids:
+        for file in cachefile_registry.get(generator_id):
+            # Without a name, the source field is empty
+            if file.name:
+                files.setdefault(file.name, file)
+    return [files[name] for name in sorted(files)]
+
+
+def hash_source(file: ImageCacheFile) -> str:
+    """Return the SHA-256 hash of the source image of a cache file."""
+    source = file.generator.source
+    digest = hashlib.sha256()
+    with source.storage.open(source.name, "rb") as source_file:
+        for chunk in source_file.chunks():
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def generate_image(file: ImageCacheFile, recorded_hash: str | None = None, force: bool = False) -> ImageResult:
+    """Generate a cache file, unless it exists and was generated from a source image of the recorded hash.
+
+    Args:
+        file: The cache file to generate.
+        recorded_hash: The hash of the source image the cache file was last generated from, if any.
+        force: Whether to generate the cache file regardless of the hash of its source image.
+
+    Returns:
+        The outcome of the generation, failures being logged.
+    """
+    try:
+        source_hash = hash_source(file)
+        exists = file.storage.exists(file.name)
+        if exists and not force and source_hash == recorded_hash:
+            return ImageResult(file.name, source_hash, ImageStatus.SKIPPED)
+
+        # Replaced, as the storage would save it under another name
+        if exists:
+            file.storage.delete(file.name)
+        file.generate(force=True)
+    except Exception:
+        logger.exception("Image generation failed", extra={"image": file.name})
+        return ImageResult(file.name, "", ImageStatus.FAILED)
+
+    return ImageResult(file.name, source_hash, ImageStatus.GENERATED)
+
+
+def generate_images(files: list[ImageCacheFile], workers: int = 1, force: bool = False) -> list[ImageResult]:
+    """Generate the cache files whose source image changed since recorded in the manifest, which is then updated.
+
+    Args:
+        files: The cache files to generate.
+        workers: The number of processes generating them, 1 generating them in the current one.
+        force: Whether to generate every cache file, regardless of the manifest.
+
+    Returns:
+        The outcome of the generation of each cache file, in order.
+    """
+    manifest = load_manifest()
+    recorded_hashes = [manifest.get(file.name) for file in files]
+
+    if workers > 1 and len(files) > 1:
+        # The cache files are pickled with their source, the processes setting Django up to load them
+        with ProcessPoolExecutor(max_workers=min(workers, len(files)), initializer=django.setup) as executor:
+            results = list(executor.map(generate_image, files, recorded_hashes, itertools.repeat(force)))
+    else:
+        results = [generate_image(file, recorded_hash, force) for file, recorded_hash in zip(files, recorded_hashes)]
+
+    for result in results:
+        if result.status is ImageStatus.FAILED:
+            manifest.pop(result.name, None)
+        else:
+            manifest[result.name] = result.source_hash
+    save_manifest(manifest)
+
+    record_generated_images(result.name for result in results if result.status is not ImageStatus.FAILED)
+    record_generated_images((result.name for result in results if result.status is ImageStatus.FAILED), False)
+
+    return results
+
+
+def queue_image_generation(file: ImageCacheFile) -> Future[list[ImageResult]]:
+    """Generate a cache file in the background thread of the process, one at a time."""
+    global _upload_executor  # noqa: PLW0603
+    if _upload_executor is None:
+        _upload_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-generation")
+    return _upload_executor.submit(generate_images, [file])
+
+
+class GenerateOnSourceSaved(JustInTime):  # type: ignore[misc]
+    """Optimistic imagekit cache file strategy generating the cache files of a source image once saved (e.g. uploaded).
+
+    The cache files are generated in the background once the transaction commits, and still
+    just in time when requested before. Those known to be generated are assumed to exist.
+    """
+
+    def on_source_saved(self, file: ImageCacheFile) -> None:
+        transaction.on_commit(partial(queue_image_generation, file))
+
+    def on_existence_required(self, file: ImageCacheFile) -> None:
+        if file.name and is_image_generated(file.name):
+            return
+
+        file.generate()
+        if file.name:
+            record_generated_images([file.name])
+
+    def on_content_required(self, file: ImageCacheFile) -> None:
+        self.on_existence_required(file)
@@ -0,0 +1,114 @@
+"""Import time of the startup of the site, profiled with `python -X importtime` against a budget.
+
+The startup is that of a gunicorn worker before its first request: Django set up with every
+app, and the URLconf with the views it imports. The management commands (`collectstatic`,
+`migrate`... run on every container start) and the test runs import most of it too. The heavy
+modules used by a few code paths only (Markdown rendering, encryption, outbound HTTP calls) are
+imported on first use, and the budget lists them for the startup not to import them again.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Any, NamedTuple
+
+from django.conf import settings
+
+# The imports of a gunicorn worker before its first request
+STARTUP_CODE = "import core.wsgi, core.urls"
+
+_IMPORT_TIME_PREFIX = "import time:"
+
+
+class ImportProfile(NamedTuple):
+    """Import time of the startup, and the self time of the modules of each top-level package, in ms."""
+
+    total_ms: float
+    packages: dict[str, float]
+    modules: list[str]
+
+
+def parse_import_times(output: str) -> ImportProfile:
+    """Parse the `-X importtime` output of a process.
+
+    Args:
+        output: The standard error of the process, with a line per imported module.
+
+    Returns:
+        The total import time, the self time of the modules of each top-level package, and the modules imported.
+    """
+    total = 0
+    packages: defaultdict[str, int] = defaultdict(int)
+    modules: list[str] = []
+
+    for line in output.splitlines():
+        if not line.startswith(_IMPORT_TIME_PREFIX):
+            continue
+        self_us, cumulative_us, name = line.removeprefix(_IMPORT_TIME_PREFIX).split("|")
+        if not self_us.strip().isdigit():
+            # The header of the columns
+            continue
+
+        module = name.strip()
+        modules.append(module)
+        packages[module.partition(".")[0]] += int(self_us)
+        # Nested imports are indented, and already counted in the cumulative time of the top-level ones
+        if not name.startswith("  ", 1):
+            total += int(cumulative_us)
+
+    return ImportProfile(
+        total_ms=round(total / 1000, 1),
+        packages={package: round(self_us / 1000, 1) for package, self_us in packages.items()},
+        modules=modules,
+    )
+
+
+def profile_startup(runs: int, code: str = STARTUP_CODE) -> ImportProfile:
+    """Import the startup modules in new processes, returning the profile of the fastest run.
+
+    Args:
+        runs: The number of processes, the fastest of them being the least disturbed.
+        code: The Python code importing the startup modules.
+    """
+    profiles: list[ImportProfile] = []
+    environ = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "core.settings")}
+    for _ in range(runs):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=settings.BASE_DIR,
+            env=environ,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if process.returncode:
+            msg = f"The startup modules could not be imported:\n{process.stderr.splitlines()[-1]}"
+            raise RuntimeError(msg)
+        profiles.append(parse_import_times(process.stderr))
+
+    return min(profiles, key=lambda profile: profile.total_ms)
+
+
+def check_budget(profile: ImportProfile, budget: dict[str, Any]) -> list[str]:
+    """Return the overruns of the budget by the startup, as human readable descriptions.
+
+    Args:
+        profile: The import profile of the startup.
+        budget: The total import time allowed (`total_ms`) and the modules not to import (`deferred`), as stored
+            in JSON.
+    """
+    overruns: list[str] = []
+    if profile.total_ms > budget["total_ms"]:
+        overruns.append(f"Import time: {profile.total_ms} ms > {budget['total_ms']} ms")
+
+    # The parent packages of a module are imported first, so they are listed too
+    imported = set(profile.modules)
+    overruns.extend(
+        f"Imported on startup, instead of on first use: {module}"
+        for module in budget.get("deferred", [])
+        if module in imported
+    )
+    return overruns
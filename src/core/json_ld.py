@@ -0,0 +1,84 @@
+"""Precomputed JSON-LD documents of the pages.
+
+The schema.org document of a page only changes with its content, so it is built once per
+page (URL path, hence language) and content version, and stored serialized in the cache
+and, when `JSON_LD_DB_STORAGE` is enabled, in the database so that it outlives cache
+evictions. The documents are built with a placeholder instead of the site's base URL,
+which is substituted at request time as it depends on the requested host and scheme.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.safestring import mark_safe
+
+from base.models import JsonLdDocument
+from core.page_cache import get_content_version
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from django.http import HttpRequest
+    from django.utils.safestring import SafeString
+
+BASE_URL_PLACEHOLDER = "__JSON_LD_BASE_URL__"
+
+_DOCUMENT_KEY_TEMPLATE = "json-ld:{path_hash}:{content_version}"
+_DOCUMENT_TIMEOUT = 24 * 60 * 60
+
+
+def _get_document_key(path: str, content_version: str) -> str:
+    return _DOCUMENT_KEY_TEMPLATE.format(
+        path_hash=hashlib.md5(path.encode()).hexdigest(), content_version=content_version
+    )
+
+
+def _get_stored_document(path: str, content_version: str) -> str | None:
+    cache_key = _get_document_key(path, content_version)
+    document: str | None = cache.get(cache_key)
+
+    if document is None and settings.JSON_LD_DB_STORAGE:
+        document = (
+            JsonLdDocument.objects.filter(path=path, content_version=content_version)
+            .values_list("document", flat=True)
+            .first()
+        )
+        if document is not None:
+            cache.set(cache_key, document, timeout=_DOCUMENT_TIMEOUT)
+
+    return document
+
+
+def _store_document(path: str, content_version: str, document: str) -> None:
+    cache.set(_get_document_key(path, content_version), document, timeout=_DOCUMENT_TIMEOUT)
+
+    if settings.JSON_LD_DB_STORAGE:
+        JsonLdDocument.objects.update_or_create(
+            path=path, defaults={"content_version": content_version, "document": document}
+        )
+
+
+def get_json_ld(request: HttpRequest, build: Callable[[str], dict[str, Any]]) -> SafeString:
+    """Return the JSON-LD document of the requested page, building it only if not stored yet.
+
+    Args:
+        request: The HTTP request object.
+        build: Function building the schema of the page for the given base URL. Only called
+            when the document of the current content version is not stored yet.
+
+    Returns:
+        A SafeString containing the JSON-LD representation, with the base URL of the request.
+    """
+    content_version = get_content_version()
+    document = _get_stored_document(request.path, content_version)
+
+    if document is None:
+        document = json.dumps(build(BASE_URL_PLACEHOLDER), ensure_ascii=False)
+        _store_document(request.path, content_version, document)
+
+    return mark_safe(document.replace(BASE_URL_PLACEHOLDER, f"{request.scheme}://{request.get_host()}"))
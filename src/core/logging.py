@@ -1,10 +1,26 @@
-"""Custom logging formatters."""
+"""Custom logging formatters, filters and handlers.
+
+The records are handed over to a queue by the `QueueHandler` of the loggers, so the request
+threads don't format nor write them: a `QueueListener` thread does, with the handlers it was
+configured with (see `LOGGING` in the settings). The noisy loggers can let through only a
+fraction of their records below ERROR, with a `SamplingFilter`.
+"""
 
 from __future__ import annotations
 
+import atexit
 import json
 import logging
-from typing import Any
+import logging.handlers
+import os
+import random
+import time
+import weakref
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import queue
+    from collections.abc import Mapping
 
 # Attributes always present on a LogRecord; anything else was passed in via `extra=`.
 _RECORD_ATTRS = frozenset(
@@ -33,10 +49,34 @@ _RECORD_ATTRS = frozenset(
     }
 )
 
+# Left out of the extra fields, computed once: the keys of the JSON objects, and the record attributes
+# set by the formatting
+_EXCLUDED_ATTRS = _RECORD_ATTRS | {"timestamp", "level", "logger", "message", "asctime"}
+
+_json_encoder = json.JSONEncoder(default=str, ensure_ascii=False)
+
+_listeners: weakref.WeakSet[QueueListener] = weakref.WeakSet()
+
 
 class JsonFormatter(logging.Formatter):
     """Format log records as single-line JSON objects, for structured production logging."""
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._second: int | None = None
+        self._second_text = ""
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:  # noqa: N802 # Overrided method
+        # The timestamp of a second is formatted once, for the records of the same second
+        if datefmt is not None:
+            return super().formatTime(record, datefmt)
+
+        second = int(record.created)
+        if second != self._second:
+            self._second_text = time.strftime(self.default_time_format, self.converter(record.created))
+            self._second = second
+        return f"{self._second_text},{int(record.msecs):03d}"
+
     def format(self, record: logging.LogRecord) -> str:
         log_data: dict[str, Any] = {
             "timestamp": self.formatTime(record, self.datefmt),
@@ -45,9 +85,9 @@ class JsonFormatter(logging.Formatter):
             "message": record.getMessage(),
         }
 
-        for key, value in record.__dict__.items():
-            if key not in _RECORD_ATTRS and key not in log_data:
-                log_data[key] = value
+        attributes = record.__dict__
+        for key in attributes.keys() - _EXCLUDED_ATTRS:
+            log_data[key] = attributes[key]
 
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
@@ -55,4 +95,106 @@ class JsonFormatter(logging.Formatter):
         if record.stack_info:
             log_data["stack"] = self.formatStack(record.stack_info)
 
-        return json.dumps(log_data, default=str, ensure_ascii=False)
+        return _json_encoder.encode(log_data)
+
+
+class SamplingFilter(logging.Filter):
+    """Let through a fraction of the records below ERROR of the given loggers, e.g. flooded by scanners.
+
+    The rate of a logger applies to its descendants without a rate of their own. The records
+    let through get a `sample_rate` attribute, so their counts can be scaled back.
+
+    Args:
+        rates: The fraction (0 to 1) of the records below ERROR let through, by logger name.
+    """
+
+    def __init__(self, rates: Mapping[str, float]) -> None:
+        super().__init__()
+        self.rates = dict(rates)
+        # Resolved once per logger name, along its ancestors
+        self._logger_rates: dict[str, float | None] = {}
+
+    def _get_rate(self, logger_name: str) -> float | None:
+        try:
+            return self._logger_rates[logger_name]
+        except KeyError:
+            pass
+
+        name: str | None = logger_name
+        rate = None
+        while name and rate is None:
+            rate = self.rates.get(name)
+            name = name.rpartition(".")[0] or None
+        self._logger_rates[logger_name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        rate = self._get_rate(record.name)
+        if rate is None:
+            return True
+        if random.random() >= rate:
+            return False
+
+        record.sample_rate = rate
+        return True
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    """Handler handing the records over to the thread of its listener, unformatted.
+
+    Only the message is merged on the calling thread, as its arguments may change once the
+    logging call returns; the records stay in the process, so their exceptions are formatted
+    by the listener. The merged message is the same for the other handlers of the records, so
+    the records aren't copied.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class QueueListener(logging.handlers.QueueListener):
+    """Listener writing the queued records from a thread, started once configured.
+
+    The queued records are written at exit. The thread is stopped, writing them, before the
+    process forks (e.g. gunicorn forking its workers), so no lock is inherited held, and
+    started again in both processes.
+    """
+
+    def __init__(
+        self, record_queue: queue.SimpleQueue[Any], *handlers: logging.Handler, respect_handler_level: bool = False
+    ) -> None:
+        super().__init__(record_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.start()
+        atexit.register(self.stop)
+        _listeners.add(self)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+
+_forking_listeners: list[QueueListener] = []
+
+
+def _stop_listeners_before_fork() -> None:
+    _forking_listeners[:] = [listener for listener in _listeners if listener.is_running]
+    for listener in _forking_listeners:
+        listener.stop()
+
+
+def _start_listeners_after_fork() -> None:
+    for listener in _forking_listeners:
+        listener.start()
+    _forking_listeners.clear()
+
+
+os.register_at_fork(
+    before=_stop_listeners_before_fork,
+    after_in_parent=_start_listeners_after_fork,
+    after_in_child=_start_listeners_after_fork,
+)
@@ -0,0 +1,95 @@
+"""Benchmark of the structured logging, on the calling thread and through the queue of the listener.
+
+A burst of records shaped as the request logs (a message with arguments, and a few structured
+fields) is logged as JSON to the null device: synchronously with the formatter as it was before
+its faster path, synchronously, and through a `QueueHandler` and its listener as configured in
+the settings. Both the logging calls (the latency added to the requests) and the writing of
+every record are timed.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .logging import _RECORD_ATTRS, JsonFormatter, QueueHandler, QueueListener
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class LoggingStats(NamedTuple):
+    """Records per second logged by the calling thread, and written, with a logging setup."""
+
+    calls_per_second: int
+    written_per_second: int
+
+
+class _PreviousJsonFormatter(logging.Formatter):
+    # The JSON formatter before its faster path, as the baseline
+    def format(self, record: logging.LogRecord) -> str:
+        log_data: dict[str, Any] = {
+            "timestamp": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key not in log_data:
+                log_data[key] = value
+        return json.dumps(log_data, default=str, ensure_ascii=False)
+
+
+def _get_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"logging_benchmark.{name}")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def _time_records(logger: logging.Logger, records: int, wait_written: Callable[[], None]) -> LoggingStats:
+    start = time.perf_counter()
+    for index in range(records):
+        logger.info(
+            "Request %s handled",
+            "/en/projects/",
+            extra={"status": 200, "duration_ms": 12.5, "request_id": index, "timings": {"db": 1.5, "template": 4.0}},
+        )
+    called = time.perf_counter() - start
+    wait_written()
+    written = time.perf_counter() - start
+    return LoggingStats(round(records / called), round(records / written))
+
+
+def run_logging_benchmark(records: int) -> dict[str, LoggingStats]:
+    """Log the given number of records with each logging setup, to the null device.
+
+    Args:
+        records: The number of records logged with each setup.
+
+    Returns:
+        The statistics of each logging setup, by name.
+    """
+    results: dict[str, LoggingStats] = {}
+    with open(os.devnull, "w") as sink:
+        previous_handler = logging.StreamHandler(sink)
+        previous_handler.setFormatter(_PreviousJsonFormatter())
+        results["sync-previous"] = _time_records(_get_logger("previous", previous_handler), records, lambda: None)
+
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(JsonFormatter())
+        results["sync"] = _time_records(_get_logger("sync", handler), records, lambda: None)
+
+        record_queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        listener = QueueListener(record_queue, handler, respect_handler_level=True)
+        try:
+            results["queue"] = _time_records(_get_logger("queue", QueueHandler(record_queue)), records, listener.stop)
+        finally:
+            listener.stop()
+
+    return results
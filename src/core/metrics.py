@@ -0,0 +1,512 @@
+"""Prometheus metrics of the processes serving the site, aggregated across them.
+
+Each process adds its counts to its own file in `METRICS_DIR`, memory-mapped so that counting
+is a write to memory, without any lock between the processes nor system call. The `metrics`
+view (see core.views.MetricsView) sums the files of every process sharing the directory, e.g.
+the gunicorn workers and the `process_outbox` command, in the Prometheus text format.
+
+When a process exits, its counts are merged into an archive of the exited processes and its
+file is deleted, so the files don't pile up as the workers are recycled; the file of a killed
+process is left, still counted. The gauges, the current values of the processes (e.g. the
+connections of their database pools), are summed across the live processes only. Without
+`METRICS_DIR`, the counts are kept in memory and only those of the process serving the metrics
+are exposed.
+
+The metrics are all declared here, for the exposition to describe them whatever the modules
+imported by the process serving it.
+"""
+
+from __future__ import annotations
+
+import atexit
+import bisect
+import fcntl
+import functools
+import json
+import mmap
+import os
+import socket
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar
+
+from django.conf import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Layout of the files: the number of bytes used, then the entries, each the length of its key,
+# the key, and its value aligned on 8 bytes
+_USED = struct.Struct("<Q")
+_KEY_LENGTH = struct.Struct("<I")
+_VALUE = struct.Struct("<d")
+_INITIAL_FILE_SIZE = 64 * 1024
+_FILE_SUFFIX = ".db"
+_ARCHIVE_NAME = "archive.json"
+_LOCK_NAME = ".lock"
+
+# The label values of a sample, by its suffix (e.g. `bucket`), of a metric
+type _Samples = dict[tuple[str, tuple[str, ...]], float]
+
+
+class _ValuesFile:
+    """Counts of the process, memory-mapped from its file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file = path.open("w+b")
+        self._file.truncate(_INITIAL_FILE_SIZE)
+        self._mmap = mmap.mmap(self._file.fileno(), _INITIAL_FILE_SIZE)
+        self._used = _USED.size
+        _USED.pack_into(self._mmap, 0, self._used)
+        self._offsets: dict[str, int] = {}
+
+    def increment(self, key: str, amount: float) -> None:
+        offset = self._offsets.get(key)
+        if offset is None:
+            offset = self._append(key)
+        (value,) = _VALUE.unpack_from(self._mmap, offset)
+        _VALUE.pack_into(self._mmap, offset, value + amount)
+
+    def set(self, key: str, value: float) -> None:
+        offset = self._offsets.get(key)
+        if offset is None:
+            offset = self._append(key)
+        _VALUE.pack_into(self._mmap, offset, value)
+
+    def _append(self, key: str) -> int:
+        encoded_key = key.encode()
+        key_offset = self._used + _KEY_LENGTH.size
+        value_offset = key_offset + len(encoded_key)
+        value_offset += -value_offset % 8
+        end = value_offset + _VALUE.size
+
+        if end > len(self._mmap):
+            self._grow(end)
+
+        _KEY_LENGTH.pack_into(self._mmap, self._used, len(encoded_key))
+        self._mmap[key_offset : key_offset + len(encoded_key)] = encoded_key
+        _VALUE.pack_into(self._mmap, value_offset, 0.0)
+        # Written last, for the readers to only see complete entries
+        _USED.pack_into(self._mmap, 0, end)
+
+        self._used = end
+        self._offsets[key] = value_offset
+        return value_offset
+
+    def _grow(self, size: int) -> None:
+        capacity = len(self._mmap)
+        while capacity < size:
+            capacity *= 2
+        self._mmap.close()
+        self._file.truncate(capacity)
+        self._mmap = mmap.mmap(self._file.fileno(), capacity)
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._file.close()
+
+
+class _MemoryValues:
+    """Counts of the process, without a metrics directory."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, float] = {}
+
+    def increment(self, key: str, amount: float) -> None:
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def set(self, key: str, value: float) -> None:
+        self.values[key] = value
+
+    def close(self) -> None:
+        pass
+
+
+_lock = threading.Lock()
+_values: _ValuesFile | _MemoryValues | None = None
+
+
+def _get_values() -> _ValuesFile | _MemoryValues:
+    """Return the counts of the process, opening its file on first use. Must be called with the lock held."""
+    global _values  # noqa: PLW0603
+    if _values is None:
+        if settings.METRICS_DIR:
+            directory = Path(settings.METRICS_DIR)
+            directory.mkdir(parents=True, exist_ok=True)
+            # The host name tells apart the processes of containers sharing the directory
+            _values = _ValuesFile(directory / f"{socket.gethostname()}-{os.getpid()}{_FILE_SUFFIX}")
+        else:
+            _values = _MemoryValues()
+    return _values
+
+
+def _increment(items: Iterable[tuple[str, float]]) -> None:
+    with _lock:
+        values = _get_values()
+        for key, amount in items:
+            values.increment(key, amount)
+
+
+def _set(items: Iterable[tuple[str, float]]) -> None:
+    with _lock:
+        values = _get_values()
+        for key, value in items:
+            values.set(key, value)
+
+
+@functools.lru_cache(maxsize=4096)
+def _encode_key(name: str, suffix: str, label_values: tuple[str, ...]) -> str:
+    return json.dumps([name, suffix, *label_values], ensure_ascii=False)
+
+
+def _read_values_file(path: Path) -> dict[str, float]:
+    data = path.read_bytes()
+    if len(data) < _USED.size:
+        return {}
+
+    (used,) = _USED.unpack_from(data)
+    used = min(used, len(data))
+    values: dict[str, float] = {}
+    offset = _USED.size
+    while offset < used:
+        (key_length,) = _KEY_LENGTH.unpack_from(data, offset)
+        key_offset = offset + _KEY_LENGTH.size
+        value_offset = key_offset + key_length
+        value_offset += -value_offset % 8
+        values[data[key_offset : key_offset + key_length].decode()] = _VALUE.unpack_from(data, value_offset)[0]
+        offset = value_offset + _VALUE.size
+    return values
+
+
+def _read_archive(directory: Path) -> dict[str, float]:
+    try:
+        archive: dict[str, float] = json.loads((directory / _ARCHIVE_NAME).read_text())
+    except FileNotFoundError:
+        return {}
+    return archive
+
+
+def _add_values(totals: dict[str, float], values: Mapping[str, float]) -> None:
+    for key, value in values.items():
+        totals[key] = totals.get(key, 0.0) + value
+
+
+def _is_gauge_key(key: str) -> bool:
+    return isinstance(_metrics.get(json.loads(key)[0]), Gauge)
+
+
+@contextmanager
+def _lock_directory(directory: Path, *, exclusive: bool) -> Iterator[None]:
+    """Lock the metrics directory against the other processes, while its files are archived or read."""
+    with (directory / _LOCK_NAME).open("a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+
+
+def archive_process(pid: int | None = None) -> None:
+    """Merge the counts of a process into the archive of the exited processes, deleting its file.
+
+    Called at exit for the process itself. The counts of a process killed before it could
+    archive them can be archived by its parent, e.g. the gunicorn arbiter once a worker exited.
+
+    Args:
+        pid: The ID of the exited process of this host. Defaults to the current process, whose
+            counts start again from zero if it keeps counting.
+    """
+    global _values  # noqa: PLW0603
+    if not settings.METRICS_DIR:
+        return
+
+    directory = Path(settings.METRICS_DIR)
+    path = directory / f"{socket.gethostname()}-{pid or os.getpid()}{_FILE_SUFFIX}"
+    if not path.exists():
+        return
+
+    with _lock_directory(directory, exclusive=True):
+        try:
+            values = _read_values_file(path)
+        except FileNotFoundError:
+            # Archived by the process itself meanwhile
+            return
+        totals = _read_archive(directory)
+        # The values of the gauges ended with the process
+        _add_values(totals, {key: value for key, value in values.items() if not _is_gauge_key(key)})
+        temporary_path = directory / f"{_ARCHIVE_NAME}.{os.getpid()}"
+        temporary_path.write_text(json.dumps(totals, ensure_ascii=False))
+        temporary_path.replace(directory / _ARCHIVE_NAME)
+        path.unlink()
+
+    if pid is None:
+        with _lock:
+            if _values is not None:
+                _values.close()
+            _values = None
+
+
+def _collect_values() -> dict[str, float]:
+    with _lock:
+        values = _get_values()
+        if isinstance(values, _MemoryValues):
+            return dict(values.values)
+
+    directory = values.path.parent
+    totals: dict[str, float] = {}
+    with _lock_directory(directory, exclusive=False):
+        _add_values(totals, _read_archive(directory))
+        for path in directory.glob(f"*{_FILE_SUFFIX}"):
+            _add_values(totals, _read_values_file(path))
+    return totals
+
+
+def reset_metrics() -> None:
+    """Discard the counts of the process, e.g. between tests, and forget its file."""
+    global _values  # noqa: PLW0603
+    with _lock:
+        if _values is not None:
+            _values.close()
+        _values = None
+
+
+def _forget_values_after_fork() -> None:
+    # The child counts in a file of its own, rather than in the file of its parent
+    global _lock, _values  # noqa: PLW0603
+    _lock = threading.Lock()
+    if _values is not None:
+        _values.close()
+    _values = None
+
+
+os.register_at_fork(after_in_child=_forget_values_after_fork)
+atexit.register(archive_process)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(label_names: Iterable[str], label_values: Iterable[str]) -> str:
+    labels = ",".join(
+        f'{name}="{_escape_label_value(value)}"' for name, value in zip(label_names, label_values, strict=True)
+    )
+    return f"{{{labels}}}" if labels else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+_metrics: dict[str, Metric] = {}
+
+
+class Metric:
+    """Metric of the exposition, counted across the processes.
+
+    Args:
+        name: The name of the metric.
+        documentation: The description of the metric.
+        label_names: The names of the labels of its samples.
+    """
+
+    type: ClassVar[str]
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        _metrics[name] = self
+
+    def _get_label_values(self, labels: Mapping[str, object]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def get_samples(self, samples: _Samples) -> Iterator[str]:
+        """Return the lines of the samples of the metric, from their totals across the processes."""
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Metric counting events, e.g. the submissions of the contact form."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        """Add the given amount to the sample of the given labels."""
+        _increment(((_encode_key(self.name, "", self._get_label_values(labels)), amount),))
+
+    def get_samples(self, samples: _Samples) -> Iterator[str]:
+        for (_suffix, label_values), value in sorted(samples.items()):
+            yield f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}"
+
+
+class Gauge(Metric):
+    """Metric of a current value of each process, e.g. its open connections, summed across the live processes."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels: object) -> None:
+        """Set the sample of the given labels of the process to the given value."""
+        _set(((_encode_key(self.name, "", self._get_label_values(labels)), value),))
+
+    def get_samples(self, samples: _Samples) -> Iterator[str]:
+        for (_suffix, label_values), value in sorted(samples.items()):
+            yield f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    """Metric counting observations, e.g. durations in seconds, by bucket of values.
+
+    Args:
+        name: The name of the metric.
+        documentation: The description of the metric.
+        label_names: The names of the labels of its samples.
+        buckets: The upper bounds of the buckets, `+Inf` being added.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._bucket_labels = (*(repr(float(bucket)) for bucket in self.buckets), "+Inf")
+
+    def observe(self, value: float, **labels: object) -> None:
+        """Count an observation of the given labels."""
+        label_values = self._get_label_values(labels)
+        # Counted in its bucket only: the buckets are made cumulative by the exposition
+        bucket_label = self._bucket_labels[bisect.bisect_left(self.buckets, value)]
+        _increment(
+            (
+                (_encode_key(self.name, "bucket", (*label_values, bucket_label)), 1.0),
+                (_encode_key(self.name, "sum", label_values), value),
+            )
+        )
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        """Observe the time spent within the context, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def get_samples(self, samples: _Samples) -> Iterator[str]:
+        bucket_counts: dict[tuple[str, ...], dict[str, float]] = {}
+        sums: dict[tuple[str, ...], float] = {}
+        for (suffix, label_values), value in samples.items():
+            if suffix == "bucket":
+                bucket_counts.setdefault(label_values[:-1], {})[label_values[-1]] = value
+            else:
+                sums[label_values] = value
+
+        bucket_label_names = (*self.label_names, "le")
+        for label_values in sorted(bucket_counts.keys() | sums.keys()):
+            counts = bucket_counts.get(label_values, {})
+            count = 0.0
+            for bucket_label in self._bucket_labels:
+                count += counts.get(bucket_label, 0.0)
+                labels = _format_labels(bucket_label_names, (*label_values, bucket_label))
+                yield f"{self.name}_bucket{labels} {_format_value(count)}"
+
+            labels = _format_labels(self.label_names, label_values)
+            yield f"{self.name}_sum{labels} {_format_value(sums.get(label_values, 0.0))}"
+            yield f"{self.name}_count{labels} {_format_value(count)}"
+
+
+def render_metrics() -> str:
+    """Return every metric, summed across the processes, in the Prometheus text format."""
+    samples: dict[str, _Samples] = {}
+    for key, value in _collect_values().items():
+        name, suffix, *label_values = json.loads(key)
+        samples.setdefault(name, {})[suffix, tuple(label_values)] = value
+
+    lines = []
+    for metric in _metrics.values():
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        lines.extend(metric.get_samples(samples.get(metric.name, {})))
+    return "\n".join(lines) + "\n"
+
+
+REQUEST_DURATION = Histogram(
+    "django_http_request_duration_seconds",
+    "Time spent handling the requests, by view (URL name) and language.",
+    ("view", "language"),
+)
+DB_QUERIES = Counter(
+    "django_db_queries_total",
+    "Database queries run by the requests, by view (URL name).",
+    ("view",),
+)
+PAGE_CACHE_LOOKUPS = Counter(
+    "django_page_cache_lookups_total",
+    "Lookups of the cacheable pages in the page cache, by outcome (hit or miss).",
+    ("outcome",),
+)
+CONTACT_SUBMISSIONS = Counter(
+    "contact_submissions_total",
+    "Submissions of the contact form, by outcome (valid, invalid, rate_limited, recaptcha_rejected, email_failed).",
+    ("outcome",),
+)
+RECAPTCHA_DURATION = Histogram(
+    "recaptcha_verification_duration_seconds",
+    "Time spent verifying the reCAPTCHA tokens with Google, by outcome.",
+    ("outcome",),
+)
+EMAIL_SEND_DURATION = Histogram(
+    "contact_email_send_duration_seconds",
+    "Time spent sending the emails of the outbox, by outcome (sent or failed).",
+    ("outcome",),
+)
+EMAIL_CONNECTIONS = Counter(
+    "contact_email_connections_total",
+    "Connections of the email backend, by event (open or reconnect).",
+    ("event",),
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "django_db_pool_connections",
+    "Connections of the database pools, by database alias and state (busy or idle).",
+    ("alias", "state"),
+)
+DB_POOL_MAX_CONNECTIONS = Gauge(
+    "django_db_pool_max_connections",
+    "Maximum connections of the database pools, by database alias.",
+    ("alias",),
+)
+DB_POOL_WAITING_REQUESTS = Gauge(
+    "django_db_pool_waiting_requests",
+    "Requests waiting for a connection of the database pools, by database alias.",
+    ("alias",),
+)
+DB_POOL_REQUESTS = Counter(
+    "django_db_pool_requests_total",
+    "Connections requested from the database pools, by database alias.",
+    ("alias",),
+)
+DB_POOL_QUEUED_REQUESTS = Counter(
+    "django_db_pool_queued_requests_total",
+    "Connections requested from the database pools which waited for one to be available, by database alias.",
+    ("alias",),
+)
+DB_POOL_WAIT_SECONDS = Counter(
+    "django_db_pool_wait_seconds_total",
+    "Time spent waiting for a connection of the database pools, by database alias.",
+    ("alias",),
+)
+DB_POOL_ERRORS = Counter(
+    "django_db_pool_errors_total",
+    "Errors of the database pools, by database alias and kind (timeout waiting for a connection, connect, lost "
+    "connection found by the health checks, bad connection returned).",
+    ("alias", "kind"),
+)
@@ -1,16 +1,36 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import logging
+import random
+import time
+from contextlib import ExitStack
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
 
 from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponseBase
+from django.middleware.cache import FetchFromCacheMiddleware, UpdateCacheMiddleware
 from django.shortcuts import render
+from django.urls import Resolver404, resolve
 from django.utils import translation
+from django.utils.cache import get_cache_key, get_max_age
+
+from core.metrics import DB_QUERIES, REQUEST_DURATION
+from core.page_cache import record_lookup, register_page_key
+from core.queries import find_repeated_queries, record_queries
+from core.server_timing import collect_timings
+from core.workers import is_warm_up_request
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
     from django.http import HttpRequest, HttpResponse
 
+queries_logger = logging.getLogger("queries")
+server_timing_logger = logging.getLogger("server_timing")
+
 
 class MaintenanceModeMiddleware:
     def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
@@ -23,3 +43,153 @@ class MaintenanceModeMiddleware:
             request.LANGUAGE_CODE = language
             return render(request, "maintenance.html", status=503)
         return self.get_response(request)
+
+
+class PageCacheUpdateMiddleware(UpdateCacheMiddleware):
+    """UpdateCacheMiddleware that also records page cache misses and indexes the cached pages by path.
+
+    The index lets the page cache invalidation purge every cached variant of a page.
+    """
+
+    def process_response(self, request: HttpRequest, response: HttpResponseBase | str) -> HttpResponseBase | str:
+        # Only handle cacheable pages: not never_cache views nor errors
+        is_cacheable = (
+            getattr(request, "_cache_update_cache", False)
+            and isinstance(response, HttpResponseBase)
+            and response.status_code == HTTPStatus.OK
+            and "private" not in response.get("Cache-Control", "")
+        )
+        if is_cacheable and not is_warm_up_request(request):
+            record_lookup(request.path, hit=False)
+
+        response = super().process_response(request, response)
+
+        if is_cacheable and isinstance(response, HttpResponseBase):
+            timeout: float | None = get_max_age(response)
+            if timeout is None:
+                timeout = self.cache_timeout
+            cache_key = get_cache_key(request, self.key_prefix, request.method or "GET", cache=self.cache)
+            if timeout and cache_key is not None:
+                register_page_key(request.path, cache_key, timeout)
+
+        return response
+
+
+class PageCacheFetchMiddleware(FetchFromCacheMiddleware):
+    """FetchFromCacheMiddleware that also records page cache hits for the hit-rate stats.
+
+    The pages requested by the warm-up of a worker are rendered and stored again, as on a miss.
+    """
+
+    def process_request(self, request: HttpRequest) -> HttpResponse | None:
+        if is_warm_up_request(request):
+            request._cache_update_cache = True  # type: ignore[attr-defined]
+            return None
+
+        response = super().process_request(request)
+        if response is not None:
+            record_lookup(request.path, hit=True)
+        return response
+
+
+class MetricsMiddleware:
+    """Count the latency and database queries of the requests, per view (URL name) and language (see core.metrics).
+
+    First in the chain, for the pages served from the page cache and the responses of the other
+    middleware to be counted too. The requests of the warm-up of the workers are not counted.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        queries = 0
+
+        def count_query(execute: Callable[..., Any], sql: str, params: Any, many: bool, context: dict[str, Any]) -> Any:
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_query))
+            response = self.get_response(request)
+
+        if is_warm_up_request(request):
+            return response
+
+        view = self._get_view_name(request)
+        REQUEST_DURATION.observe(time.perf_counter() - start, view=view, language=getattr(request, "LANGUAGE_CODE", ""))
+        if queries:
+            DB_QUERIES.inc(queries, view=view)
+        return response
+
+    def _get_view_name(self, request: HttpRequest) -> str:
+        resolver_match = request.resolver_match
+        if resolver_match is None:
+            # Not resolved by the pages served from the page cache, nor by the responses of the other middleware
+            try:
+                resolver_match = resolve(request.path_info, getattr(request, "urlconf", None))
+            except Resolver404:
+                return "unresolved"
+        return resolver_match.url_name or "unnamed"
+
+
+class RepeatedQueriesMiddleware:
+    """Log the SQL queries repeated within a request, so that N+1 query patterns surface while developing.
+
+    Only enabled with DEBUG.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not settings.DEBUG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with record_queries() as queries:
+            response = self.get_response(request)
+
+        repeated_queries = find_repeated_queries(queries, settings.REPEATED_QUERIES_THRESHOLD)
+        for sql, count in repeated_queries.items():
+            queries_logger.warning(
+                "Query repeated %d times in %s %s, likely an N+1 pattern: %s", count, request.method, request.path, sql
+            )
+
+        return response
+
+
+class ServerTimingMiddleware:
+    """Time the phases of a sample of the requests (see core.server_timing).
+
+    The timings are reported in the `Server-Timing` header of the response, and logged
+    with the breakdown as structured fields. Only a `SERVER_TIMING_SAMPLE_RATE` fraction of
+    the requests are timed; none when 0.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if settings.SERVER_TIMING_SAMPLE_RATE <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if random.random() >= settings.SERVER_TIMING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        with collect_timings() as timings:
+            response = self.get_response(request)
+
+        response["Server-Timing"] = timings.get_header()
+        server_timing_logger.info(
+            "Timed %s %s",
+            request.method,
+            request.path,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status_code": response.status_code,
+                "timings": timings.as_dict(),
+            },
+        )
+        return response
@@ -0,0 +1,234 @@
+"""Helpers for the full-page cache (`UpdateCacheMiddleware`/`FetchFromCacheMiddleware`).
+
+Cached pages must be identical for every anonymous visitor, so the per-visitor parts of
+a page (CSRF token, flash messages, cookie consent state) are left out of the HTML and
+filled in by the browser from the uncached `visitor_state` endpoint.
+
+A site-wide content version, bumped whenever the content rendered in the pages changes,
+lets derived data (e.g. the JSON-LD documents) be stored per content version, and
+validate the copies of the pages held by the clients (see core.conditional_get).
+
+The keys of the cached pages are indexed by URL path (a path is cached under several
+keys, one per host and query string), so that they can be purged when their content
+changes instead of waiting for `CACHE_MIDDLEWARE_SECONDS` to expire. As the cache may
+outlive a deployment (e.g. in a persistent volume), every cached page is purged, and the
+content version bumped, on container start (the `reset_page_cache` command).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import uuid
+from typing import TYPE_CHECKING, NamedTuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from core.metrics import PAGE_CACHE_LOOKUPS
+
+if TYPE_CHECKING:
+    import datetime
+    from collections.abc import Iterable
+
+    from django.core.cache.backends.base import BaseCache
+    from django.http import HttpRequest
+
+_STATS_PATHS_KEY = "page-cache-stats:paths"
+_STATS_COUNTER_KEY_TEMPLATE = "page-cache-stats:{outcome}:{path_hash}"
+_OUTCOMES = ("hit", "miss")
+_PAGE_KEYS_INDEX_KEY_TEMPLATE = "page-cache-keys:{path_hash}"
+_CACHED_PATHS_KEY = "page-cache-paths"
+_CONTENT_VERSION_KEY = "content-version-stamp"
+
+
+class PageCacheStats(NamedTuple):
+    """Page cache lookup counters for a single URL path."""
+
+    path: str
+    hits: int
+    misses: int
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class ContentVersionStamp(NamedTuple):
+    """Site-wide content version, and the time it started."""
+
+    version: str
+    modified_at: datetime.datetime
+
+
+def _new_content_version_stamp() -> ContentVersionStamp:
+    # HTTP dates have a one-second resolution
+    return ContentVersionStamp(uuid.uuid4().hex, timezone.now().replace(microsecond=0))
+
+
+def _get_cache() -> BaseCache:
+    return caches[settings.CACHE_MIDDLEWARE_ALIAS]
+
+
+def is_visitor_state_deferred(request: HttpRequest) -> bool:
+    """Return whether the per-visitor parts of the page must be left out of the HTML.
+
+    Only GET/HEAD responses can be served from the page cache; other methods (e.g. a
+    contact form POST re-rendering the form with errors) keep rendering them inline.
+    """
+    return settings.PAGE_CACHE_COOKIELESS and request.method in ("GET", "HEAD")
+
+
+def _hash_path(path: str) -> str:
+    # Hash the path: it comes from the request and may not be a valid key for every cache backend
+    return hashlib.md5(path.encode()).hexdigest()
+
+
+def _get_counter_key(outcome: str, path: str) -> str:
+    return _STATS_COUNTER_KEY_TEMPLATE.format(outcome=outcome, path_hash=_hash_path(path))
+
+
+def _get_page_keys_index_key(path: str) -> str:
+    return _PAGE_KEYS_INDEX_KEY_TEMPLATE.format(path_hash=_hash_path(path))
+
+
+def _increment(cache: BaseCache, key: str) -> bool:
+    """Increment a counter, creating it if needed. Return whether the counter is new."""
+    created = cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The key was evicted between add() and incr()
+        cache.set(key, 1, timeout=None)
+    return created
+
+
+def record_lookup(path: str, *, hit: bool) -> None:
+    """Count a page cache lookup for the given path.
+
+    Only lookups for cacheable pages should be recorded, so that requests for unknown
+    paths (e.g. from vulnerability scanners) don't grow the stats index.
+
+    Args:
+        path: The requested URL path.
+        hit: Whether the page was served from the cache.
+    """
+    outcome = "hit" if hit else "miss"
+    PAGE_CACHE_LOOKUPS.inc(outcome=outcome)
+    cache = _get_cache()
+
+    if _increment(cache, _get_counter_key(outcome, path)):
+        paths: set[str] = cache.get(_STATS_PATHS_KEY, set())
+        if path not in paths:
+            cache.set(_STATS_PATHS_KEY, paths | {path}, timeout=None)
+
+
+def get_stats() -> list[PageCacheStats]:
+    """Return the page cache lookup counters of every recorded path, sorted by path."""
+    cache = _get_cache()
+    paths = sorted(cache.get(_STATS_PATHS_KEY, set()))
+
+    counters = cache.get_many([_get_counter_key(outcome, path) for path in paths for outcome in _OUTCOMES])
+
+    return [
+        PageCacheStats(
+            path=path,
+            hits=counters.get(_get_counter_key("hit", path), 0),
+            misses=counters.get(_get_counter_key("miss", path), 0),
+        )
+        for path in paths
+    ]
+
+
+def reset_stats() -> None:
+    """Delete every recorded page cache lookup counter."""
+    cache = _get_cache()
+    paths: set[str] = cache.get(_STATS_PATHS_KEY, set())
+
+    cache.delete_many(
+        [
+            _STATS_PATHS_KEY,
+            *(_get_counter_key(outcome, path) for path in paths for outcome in _OUTCOMES),
+        ]
+    )
+
+
+def register_page_key(path: str, cache_key: str, timeout: float) -> None:
+    """Index the cache key a page has been stored under, so it can be purged by its path.
+
+    Args:
+        path: The URL path of the cached page.
+        cache_key: The key the page has been stored under.
+        timeout: The lifetime of the cached page, in seconds.
+    """
+    cache = _get_cache()
+    index_key = _get_page_keys_index_key(path)
+
+    keys: set[str] = cache.get(index_key, set())
+    # The index lives as long as the last page stored, which already covers the older ones
+    cache.set(index_key, keys | {cache_key}, timeout=timeout)
+
+    paths: set[str] = cache.get(_CACHED_PATHS_KEY, set())
+    if path not in paths:
+        cache.set(_CACHED_PATHS_KEY, paths | {path}, timeout=None)
+
+
+def purge_pages(paths: Iterable[str]) -> int:
+    """Delete every cached page of the given URL paths.
+
+    Args:
+        paths: The URL paths whose cached pages must be deleted.
+
+    Returns:
+        The number of cache keys deleted.
+    """
+    cache = _get_cache()
+    index_keys = [_get_page_keys_index_key(path) for path in set(paths)]
+
+    page_keys = {key for keys in cache.get_many(index_keys).values() for key in keys}
+    cache.delete_many([*index_keys, *page_keys])
+
+    return len(page_keys)
+
+
+def reset_page_cache() -> int:
+    """Delete every cached page and start a new content version, e.g. after a deployment changed the templates.
+
+    Returns:
+        The number of cache keys of pages deleted.
+    """
+    cache = _get_cache()
+    paths: set[str] = cache.get(_CACHED_PATHS_KEY, set())
+
+    bump_content_version()
+    purged_keys = purge_pages(paths)
+    cache.delete(_CACHED_PATHS_KEY)
+
+    return purged_keys
+
+
+def get_content_version_stamp() -> ContentVersionStamp:
+    """Return the current site-wide content version, along with the time the content last changed."""
+    cache = _get_cache()
+    stamp: ContentVersionStamp | None = cache.get(_CONTENT_VERSION_KEY)
+
+    if stamp is None:
+        # Unknown (e.g. evicted): consider the content changed now, so no outdated copy is validated
+        cache.add(_CONTENT_VERSION_KEY, _new_content_version_stamp(), timeout=None)
+        stamp = cache.get(_CONTENT_VERSION_KEY) or _new_content_version_stamp()
+
+    return stamp
+
+
+def get_content_version() -> str:
+    """Return the current site-wide content version."""
+    return get_content_version_stamp().version
+
+
+def bump_content_version() -> None:
+    """Start a new site-wide content version, after the content rendered in the pages has changed."""
+    _get_cache().set(_CONTENT_VERSION_KEY, _new_content_version_stamp(), timeout=None)
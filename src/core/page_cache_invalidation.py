@@ -0,0 +1,176 @@
+"""Purge the cached pages whose content depends on a model instance when it changes.
+
+Each model rendered in the pages maps to the pages it appears in (`PAGE_DEPENDENCIES`).
+When an instance is saved, deleted or has its many-to-many relations changed, the cached
+pages of every language are purged once the transaction commits, so cached pages can
+live for hours without serving stale content after an edit in the admin. The site-wide
+content version is bumped as well, and the pre-rendered pages, if enabled, are queued to be
+rendered again (see core.prerender).
+"""
+
+from __future__ import annotations
+
+import logging
+from itertools import chain
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, pre_delete, pre_save
+from django.urls import reverse
+from django.utils import translation
+
+from base.models import FollowMeLink, GoogleAnalytics, LegalAndPrivacy, SiteMedia
+from contact.models import ContactFormConfiguration
+from core.page_cache import bump_content_version, purge_pages
+from core.prerender import is_prerender_enabled, queue_prerender
+from core.sitemaps import StaticViewSitemap
+from home.models import Education, Experience, PersonalInfo, ProcessStep, Project, Service, Technology
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from django.db.models import Model
+
+logger = logging.getLogger("page_cache")
+
+SITEMAP_URL_NAME = "django.contrib.sitemaps.views.sitemap"
+
+
+class PageRef(NamedTuple):
+    """A page that can be cached, identified by its URL name and arguments."""
+
+    url_name: str
+    kwargs: dict[str, str] | None = None
+
+
+def _static_pages(*url_names: str) -> Callable[[Any], Iterator[PageRef]]:
+    def get_pages(_instance: Any) -> Iterator[PageRef]:
+        for url_name in url_names:
+            yield PageRef(url_name)
+
+    return get_pages
+
+
+def _project_detail_pages(projects: Iterable[Project]) -> Iterator[PageRef]:
+    for project in projects:
+        yield PageRef("project-detail", {"slug": project.slug})
+
+
+def _all_pages(_instance: Any) -> Iterator[PageRef]:
+    """Pages rendering the site layout (navbar, footer, analytics) or the owner's name in their title."""
+    yield from _static_pages(*StaticViewSitemap().items())(_instance)
+    yield from _project_detail_pages(Project.objects.only("slug"))
+
+
+def _project_pages(project: Project) -> Iterator[PageRef]:
+    yield from _static_pages("home", "projects", SITEMAP_URL_NAME)(project)
+    yield from _project_detail_pages((project,))
+
+
+def _technology_pages(technology: Technology) -> Iterator[PageRef]:
+    yield from _static_pages("home", "my-career", "projects")(technology)
+    if technology.pk is not None:
+        yield from _project_detail_pages(technology.projects.only("slug"))
+
+
+PAGE_DEPENDENCIES: dict[type[Model], Callable[[Any], Iterable[PageRef]]] = {
+    PersonalInfo: _all_pages,
+    Project: _project_pages,
+    Service: _static_pages("home", "contact"),
+    ProcessStep: _static_pages("home"),
+    Experience: _static_pages("my-career"),
+    Education: _static_pages("my-career"),
+    Technology: _technology_pages,
+    SiteMedia: _all_pages,
+    FollowMeLink: _all_pages,
+    LegalAndPrivacy: _all_pages,
+    GoogleAnalytics: _all_pages,
+    ContactFormConfiguration: _static_pages("contact"),
+}
+
+
+def get_page_paths(instance: Model) -> set[str]:
+    """Return the URL paths, in every language, of the pages depending on the given instance.
+
+    Args:
+        instance: The changed model instance.
+
+    Returns:
+        The URL paths of the pages to purge.
+    """
+    get_pages = PAGE_DEPENDENCIES.get(type(instance))
+    if get_pages is None:
+        return set()
+
+    pages = list(get_pages(instance))
+    paths: set[str] = set()
+    for language, _ in settings.LANGUAGES:
+        with translation.override(language):
+            paths.update(reverse(page.url_name, kwargs=page.kwargs) for page in pages)
+
+    return paths
+
+
+def _purge_on_commit(paths: set[str]) -> None:
+    def purge() -> None:
+        bump_content_version()
+        purged_keys = purge_pages(paths)
+        logger.info("Purged %d cached pages of %d paths", purged_keys, len(paths))
+
+        if is_prerender_enabled():
+            queue_prerender(paths)
+
+    if paths:
+        # Also bumped right away, so the changes are visible within the transaction
+        bump_content_version()
+        transaction.on_commit(purge)
+
+
+def _remember_previous_paths(sender: type[Model], instance: Model, **kwargs: Any) -> None:
+    # The pages rendering the stored state (e.g. the detail page of a project's former slug)
+    # must be purged as well as those rendering the new one.
+    previous = sender._default_manager.filter(pk=instance.pk).first() if instance.pk is not None else None
+    instance._page_cache_previous_paths = get_page_paths(previous) if previous is not None else set()  # type: ignore[attr-defined]
+
+
+def _purge_on_save(sender: type[Model], instance: Model, **kwargs: Any) -> None:
+    previous_paths: set[str] = getattr(instance, "_page_cache_previous_paths", set())
+    _purge_on_commit(previous_paths | get_page_paths(instance))
+
+
+def _purge_on_delete(sender: type[Model], instance: Model, **kwargs: Any) -> None:
+    # Collected before the deletion, while the related objects can still be reached
+    _purge_on_commit(get_page_paths(instance))
+
+
+def _purge_on_m2m_change(
+    sender: type[Model],
+    instance: Model,
+    action: str,
+    model: type[Model],
+    pk_set: set[Any] | None,
+    **kwargs: Any,
+) -> None:
+    # pre_clear: the cleared objects are only known before the relation is cleared
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    related = model._default_manager.filter(pk__in=pk_set) if pk_set else ()
+    _purge_on_commit(set(chain(get_page_paths(instance), *(get_page_paths(obj) for obj in related))))
+
+
+def connect_page_cache_invalidation() -> None:
+    """Connect the signal receivers purging the cached pages of the models in PAGE_DEPENDENCIES."""
+    for model in PAGE_DEPENDENCIES:
+        dispatch_uid = f"page_cache_invalidation_{model._meta.label_lower}"
+        pre_save.connect(_remember_previous_paths, sender=model, dispatch_uid=dispatch_uid)
+        post_save.connect(_purge_on_save, sender=model, dispatch_uid=dispatch_uid)
+        pre_delete.connect(_purge_on_delete, sender=model, dispatch_uid=dispatch_uid)
+
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(
+                _purge_on_m2m_change,
+                sender=field.remote_field.through,
+                dispatch_uid=f"{dispatch_uid}_{field.name}",
+            )
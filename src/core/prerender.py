@@ -0,0 +1,253 @@
+"""Static pre-rendering of the pages, for nginx to serve them without reaching Django.
+
+Every page of the site (the `StaticViewSitemap` items and the project detail pages, in
+each language) is rendered through the real views and middleware, as an anonymous
+visitor, and written to `PRERENDER_ROOT` as `<path>/index.html` along with its gzip and
+brotli compressed siblings for nginx's `gzip_static`/`brotli_static`. Pages that are not
+rendered successfully (e.g. a deleted project, or the maintenance page) are removed, so
+nginx falls back to Django for them.
+
+Pre-rendered pages are shared by every visitor, so it requires `PAGE_CACHE_COOKIELESS`.
+When enabled, the pages depending on a changed instance are rendered again once the
+transaction commits (see core.page_cache_invalidation), in a background thread of the
+process, so the admin's request doesn't wait for them.
+
+nginx serves the pages without Django's middleware: it adds their security headers itself and
+only serves them to the requests for the host they are rendered for (`PRERENDER_HOST`), those
+for other hosts reaching Django (e.g. for the `PREPEND_WWW` redirect). In maintenance mode, the
+`prerender` command removes the pages instead, for Django to answer with the maintenance page.
+"""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from io import BytesIO
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import brotli
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils import translation
+
+from core.sitemaps import StaticViewSitemap
+from home.models import Project
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from concurrent.futures import Future
+
+    from django.http import HttpResponseBase
+
+logger = logging.getLogger("page_cache")
+
+PAGE_FILE_NAME = "index.html"
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+_FILE_MODE = 0o644
+
+_prerender_executor: ThreadPoolExecutor | None = None
+
+
+class PrerenderResult(NamedTuple):
+    """Outcome of pre-rendering a set of pages."""
+
+    written: list[str]
+    removed: list[str]
+    size: int
+
+
+def is_prerender_enabled() -> bool:
+    """Return whether the pages are pre-rendered, and hence must be rendered again when they change."""
+    return bool(settings.PRERENDER_ROOT) and settings.PAGE_CACHE_COOKIELESS
+
+
+def get_prerender_paths() -> set[str]:
+    """Return the URL paths, in every language, of the pages to pre-render."""
+    slugs = list(Project.objects.values_list("slug", flat=True))
+    paths: set[str] = set()
+
+    for language, _ in settings.LANGUAGES:
+        with translation.override(language):
+            paths.update(reverse(url_name) for url_name in StaticViewSitemap().items())
+            paths.update(reverse("project-detail", kwargs={"slug": slug}) for slug in slugs)
+
+    return paths
+
+
+class SiteRenderer(BaseHandler):
+    """Renders pages through the views and middleware, as requested by an anonymous visitor over HTTPS through nginx.
+
+    The pages are requested to `PRERENDER_HOST`, for their absolute URLs (canonical, JSON-LD). Unlike
+    the test client, it doesn't send the request signals, so it can render pages in a thread of a
+    worker serving requests; the middleware is loaded once, when it is created.
+
+    Args:
+        environ: WSGI environ variables of every request.
+    """
+
+    def __init__(self, **environ: Any) -> None:
+        super().__init__()
+        self.load_middleware()
+        self.environ = environ
+
+    def get(self, path: str) -> HttpResponseBase:
+        """Render the page of the given URL path; errors are rendered as error pages, not raised."""
+        host = settings.PRERENDER_HOST or "localhost"
+        request = WSGIRequest(
+            {
+                "REQUEST_METHOD": "GET",
+                "SCRIPT_NAME": "",
+                "PATH_INFO": path,
+                "QUERY_STRING": "",
+                "SERVER_NAME": host,
+                "SERVER_PORT": "443",
+                "SERVER_PROTOCOL": "HTTP/1.1",
+                "REMOTE_ADDR": "127.0.0.1",
+                "HTTP_HOST": host,
+                # As set by nginx, for SECURE_PROXY_SSL_HEADER
+                "HTTP_X_FORWARDED_PROTO": "https",
+                "wsgi.version": (1, 0),
+                "wsgi.url_scheme": "https",
+                "wsgi.input": BytesIO(),
+                "wsgi.errors": sys.stderr,
+                "wsgi.multithread": True,
+                "wsgi.multiprocess": True,
+                "wsgi.run_once": False,
+                **self.environ,
+            }
+        )
+        return self.get_response(request)
+
+
+def get_page_file(root: Path, path: str) -> Path:
+    """Return the file a page is pre-rendered to, where nginx's `try_files $uri/index.html` looks for it."""
+    return root.joinpath(*(segment for segment in path.split("/") if segment), PAGE_FILE_NAME)
+
+
+def _write_atomically(file: Path, content: bytes) -> None:
+    # Replaced in a single step, so nginx never serves a partially written page
+    file.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=file.parent, prefix=f".{file.name}.", delete=False) as temporary_file:
+        temporary_file.write(content)
+    os.chmod(temporary_file.name, _FILE_MODE)
+    os.replace(temporary_file.name, file)
+
+
+def _write_page(file: Path, content: bytes) -> int:
+    compressed = {
+        ".gz": gzip.compress(content, compresslevel=9, mtime=0),
+        ".br": brotli.compress(content, mode=brotli.MODE_TEXT),
+    }
+
+    for suffix in COMPRESSED_SUFFIXES:
+        _write_atomically(file.with_name(file.name + suffix), compressed[suffix])
+    _write_atomically(file, content)
+
+    return len(content) + sum(len(data) for data in compressed.values())
+
+
+def _remove_page(root: Path, file: Path) -> bool:
+    removed = False
+    for page_file in (file, *(file.with_name(file.name + suffix) for suffix in COMPRESSED_SUFFIXES)):
+        if page_file.exists():
+            page_file.unlink()
+            removed = True
+
+    # Prune the directories left empty, up to the root
+    directory = file.parent
+    while directory != root and directory.is_dir() and not any(directory.iterdir()):
+        directory.rmdir()
+        directory = directory.parent
+
+    return removed
+
+
+def prerender_pages(paths: Iterable[str], root: Path | None = None) -> PrerenderResult:
+    """Render the given pages through the views and write them, compressed as well, under the root.
+
+    Only successfully rendered HTML pages are written; the files of the other paths are removed.
+
+    Args:
+        paths: The URL paths of the pages.
+        root: The directory to write the pages to. Defaults to `PRERENDER_ROOT`.
+
+    Returns:
+        The written and removed paths, and the size of the written files.
+    """
+    root = Path(root or settings.PRERENDER_ROOT)
+    renderer = SiteRenderer()
+    written: list[str] = []
+    removed: list[str] = []
+    size = 0
+
+    # The views activate the language of each page: restore the caller's once done
+    with translation.override(translation.get_language()):
+        for path in sorted(paths):
+            response = renderer.get(path)
+            file = get_page_file(root, path)
+
+            if response.status_code == HTTPStatus.OK:
+                # Only the HTML pages: the others (e.g. the sitemap) are left to Django
+                if isinstance(response, HttpResponse) and response.get("Content-Type", "").startswith("text/html"):
+                    size += _write_page(file, response.content)
+                    written.append(path)
+            elif _remove_page(root, file):
+                logger.info("Removed pre-rendered page '%s' (status %d)", path, response.status_code)
+                removed.append(path)
+
+    return PrerenderResult(written, removed, size)
+
+
+def remove_stale_pages(keep: Iterable[str], root: Path | None = None) -> list[str]:
+    """Remove the pre-rendered pages that are not among the given paths (e.g. of deleted projects).
+
+    Args:
+        keep: The URL paths of the pages to keep.
+        root: The directory the pages were written to. Defaults to `PRERENDER_ROOT`.
+
+    Returns:
+        The URL paths of the removed pages.
+    """
+    root = Path(root or settings.PRERENDER_ROOT)
+    keep_files = {get_page_file(root, path) for path in keep}
+    removed: list[str] = []
+
+    for file in sorted(root.rglob(PAGE_FILE_NAME)):
+        if file not in keep_files:
+            _remove_page(root, file)
+            removed.append(f"/{file.parent.relative_to(root).as_posix()}/".replace("//", "/"))
+
+    return removed
+
+
+def _prerender_in_background(paths: set[str]) -> PrerenderResult:
+    try:
+        result = prerender_pages(paths)
+    except Exception:
+        logger.exception("Failed to pre-render %d pages", len(paths))
+        raise
+    finally:
+        # The connections of the thread are not closed at the end of a request: release them
+        connections.close_all()
+
+    logger.info("Pre-rendered %d pages, removed %d", len(result.written), len(result.removed))
+    return result
+
+
+def queue_prerender(paths: Iterable[str]) -> Future[PrerenderResult]:
+    """Render the given pages again in the background thread of the process, one set at a time."""
+    global _prerender_executor  # noqa: PLW0603
+    if _prerender_executor is None:
+        _prerender_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prerender")
+    return _prerender_executor.submit(_prerender_in_background, set(paths))
@@ -0,0 +1,49 @@
+"""Recording of the SQL queries executed while handling a request, to surface N+1 patterns.
+
+An N+1 pattern runs the same query, with different parameters, once per item of a list
+(e.g. the technologies of each experience). Queries are recorded as their SQL with the
+parameter placeholders, so the repetitions of such a query are identical.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from typing import TYPE_CHECKING, Any
+
+from django.db import connections
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+
+@contextmanager
+def record_queries() -> Iterator[list[str]]:
+    """Record the SQL of the queries executed on every database connection within the context.
+
+    Yields:
+        The list the SQL of each query is appended to, with the placeholders of its parameters.
+    """
+    queries: list[str] = []
+
+    def record(execute: Callable[..., Any], sql: str, params: Any, many: bool, context: dict[str, Any]) -> Any:
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(record))
+        yield queries
+
+
+def find_repeated_queries(queries: Iterable[str], threshold: int = 2) -> dict[str, int]:
+    """Return the queries executed at least `threshold` times, along with their count, most repeated first.
+
+    Args:
+        queries: The SQL of the executed queries, as recorded by `record_queries`.
+        threshold: The number of executions from which a query is considered repeated.
+
+    Returns:
+        A dictionary mapping the SQL of each repeated query to its number of executions.
+    """
+    return {sql: count for sql, count in Counter(queries).most_common() if count >= threshold}
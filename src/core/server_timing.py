@@ -0,0 +1,180 @@
+"""Per-request timing of the phases of a request, reported in the `Server-Timing` header.
+
+While a request is timed (see core.middleware.ServerTimingMiddleware), the time spent in
+each phase is added up: the database queries, the template rendering, the markdown
+conversions, the imagekit cache file checks and generation (and, within them, the storage
+operations), and the outbound HTTP calls.
+Phases may overlap, e.g. the template rendering includes the queries it triggers. Outside
+of a timed request, the hooks are no-ops.
+
+The hooks are the Django extension points of each phase: a database execute wrapper, the
+`TimedDjangoTemplates` template backend, the `TimedCacheFileBackend` imagekit backend, and
+the `time_phase` context manager and `timed` decorator for the rest.
+"""
+
+from __future__ import annotations
+
+import functools
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+from django.template.backends.django import Template as DjangoTemplate
+from imagekit.cachefiles.backends import CacheFileState, Simple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from django.http import HttpRequest
+
+TOTAL_PHASE = "total"
+
+
+class ServerTimings:
+    """Time spent, and number of times entered, in each phase of a request."""
+
+    def __init__(self) -> None:
+        self.durations: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+        self._active_phases: set[str] = set()
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Add the time spent within the context to the given phase, unless already within that phase."""
+        if phase in self._active_phases:
+            yield
+            return
+
+        self._active_phases.add(phase)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[phase] = self.durations.get(phase, 0.0) + time.perf_counter() - start
+            self.counts[phase] = self.counts.get(phase, 0) + 1
+            self._active_phases.discard(phase)
+
+    def get_header(self) -> str:
+        """Return the value of the `Server-Timing` header, with the durations in milliseconds."""
+        metrics = []
+        for phase, duration in self.durations.items():
+            metric = f"{phase};dur={duration * 1000:.1f}"
+            if phase != TOTAL_PHASE:
+                metric += f';desc="{self.counts[phase]}x"'
+            metrics.append(metric)
+        return ", ".join(metrics)
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        """Return the duration in milliseconds and the count of each phase, e.g. for structured logs."""
+        return {
+            phase: {"duration_ms": round(duration * 1000, 1), "count": self.counts[phase]}
+            for phase, duration in self.durations.items()
+        }
+
+
+_current_timings: ContextVar[ServerTimings | None] = ContextVar("server_timings", default=None)
+
+
+@contextmanager
+def time_phase(phase: str) -> Iterator[None]:
+    """Add the time spent within the context to the given phase of the current request, if timed.
+
+    Nested contexts of the same phase (e.g. a template rendered from a template tag) are only
+    counted once.
+
+    Args:
+        phase: The name of the phase, as reported in the `Server-Timing` header.
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+
+    with timings.measure(phase):
+        yield
+
+
+def timed[**P, R](phase: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorate a function for its calls to be added to the given phase of the current request, if timed.
+
+    Args:
+        phase: The name of the phase, as reported in the `Server-Timing` header.
+    """
+
+    def decorator(function: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(function)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with time_phase(phase):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _time_query(execute: Callable[..., Any], sql: str, params: Any, many: bool, context: dict[str, Any]) -> Any:
+    with time_phase("db"):
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def collect_timings() -> Iterator[ServerTimings]:
+    """Time the phases of the code run within the context, e.g. the handling of a request.
+
+    Yields:
+        The timings, complete (including the total) once the context exits.
+    """
+    timings = ServerTimings()
+    token = _current_timings.set(timings)
+    try:
+        with ExitStack() as stack, timings.measure(TOTAL_PHASE):
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(_time_query))
+            yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+class _TimedTemplate(DjangoTemplate):
+    def render(self, context: dict[str, Any] | None = None, request: HttpRequest | None = None) -> str:
+        with time_phase("template"):
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Django template backend timing the rendering of its templates."""
+
+    def from_string(self, template_code: str) -> _TimedTemplate:
+        return _TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name: str) -> _TimedTemplate:
+        return _TimedTemplate(super().get_template(template_name).template, self)
+
+
+class TimedCacheFileBackend(Simple):  # type: ignore[misc]
+    """Imagekit cache file backend timing the checks for, and generation of, the cache files.
+
+    The checks made in the storage, when the state of a cache file is not in the cache, and the
+    generations are also counted as storage operations.
+    """
+
+    def _exists(self, file: Any) -> bool:
+        with time_phase("storage"):
+            return bool(super()._exists(file))
+
+    def exists(self, file: Any) -> bool:
+        with time_phase("imagekit"):
+            return bool(super().exists(file))
+
+    def generate(self, file: Any, force: bool = False) -> None:
+        with time_phase("imagekit"):
+            super().generate(file, force)
+
+    def generate_now(self, file: Any, force: bool = False) -> None:
+        if not force and self.get_state(file) in {CacheFileState.GENERATING, CacheFileState.EXISTS}:
+            return
+        with time_phase("storage"):
+            super().generate_now(file, force=True)
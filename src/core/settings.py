@@ -18,6 +18,7 @@ from pathlib import Path
 import dj_database_url
 import django_stubs_ext
 import environ  # type: ignore[import-untyped]
+from django.core.exceptions import ImproperlyConfigured
 from django.utils.translation import gettext_lazy as _
 
 # Monkeypatching Django, so stubs will work for all generics,
@@ -34,6 +35,24 @@ env = environ.Env(
     MAINTENANCE_MODE=(bool, False),
     PREPEND_WWW=(bool, False),
     ROBOTS_DISALLOW_PATHS=(list, []),
+    PAGE_CACHE_COOKIELESS=(bool, False),
+    CACHE_MIDDLEWARE_SECONDS=(int, 6 * 60 * 60),
+    JSON_LD_DB_STORAGE=(bool, False),
+    PRERENDER_ROOT=(str, ""),
+    REPEATED_QUERIES_THRESHOLD=(int, 2),
+    SERVER_TIMING_SAMPLE_RATE=(float, 0.0),
+    LOG_SAMPLE_RATES=(dict, {}),
+    METRICS_DIR=(str, ""),
+    METRICS_TOKEN=(str, ""),
+    METRICS_ALLOWED_IPS=(list, []),
+    DATABASE_CONN_MAX_AGE=(int, 600),
+    DATABASE_CONN_HEALTH_CHECKS=(bool, True),
+    DATABASE_POOL=(bool, False),
+    DATABASE_POOL_MIN_SIZE=(int, 1),
+    DATABASE_POOL_MAX_SIZE=(int, 4),
+    DATABASE_POOL_TIMEOUT=(float, 10.0),
+    DATABASE_POOL_MAX_IDLE=(float, 600.0),
+    DATABASE_POOL_MAX_LIFETIME=(float, 3600.0),
 )
 
 environ.Env.read_env(os.path.join(BASE_DIR, ".env"))
@@ -48,12 +67,32 @@ if not DEBUG:
     SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 CSRF_TRUSTED_ORIGINS = [f"https://{allowed_host}" for allowed_host in ALLOWED_HOSTS]
 
+# Each thread keeps its connection open for DATABASE_CONN_MAX_AGE seconds, checked before being
+# reused by a new request (CONN_HEALTH_CHECKS), so a connection dropped by a restart of PostgreSQL
+# is replaced rather than failing the request.
 DATABASES = {
     "default": dj_database_url.config(
         default=env("DATABASE_URL"),
-        conn_max_age=600,
+        conn_max_age=env("DATABASE_CONN_MAX_AGE"),
+        conn_health_checks=env("DATABASE_CONN_HEALTH_CHECKS"),
     )
 }
+# With DATABASE_POOL, each process keeps instead a pool of connections to PostgreSQL (psycopg 3),
+# lent to the requests for their duration and, with CONN_HEALTH_CHECKS, checked before being lent.
+# Once all of them are busy, a request waits up to DATABASE_POOL_TIMEOUT seconds for one, so
+# MAX_SIZE should cover the threads of a gunicorn worker. The connections idle for MAX_IDLE seconds
+# (down to MIN_SIZE) or open for MAX_LIFETIME seconds are replaced. The statistics of the pools
+# are exposed in the metrics (see core.db_pool).
+if env("DATABASE_POOL") and DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    # The connections are returned to the pool at the end of the requests, rather than kept
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": env("DATABASE_POOL_MIN_SIZE"),
+        "max_size": env("DATABASE_POOL_MAX_SIZE"),
+        "timeout": env("DATABASE_POOL_TIMEOUT"),
+        "max_idle": env("DATABASE_POOL_MAX_IDLE"),
+        "max_lifetime": env("DATABASE_POOL_MAX_LIFETIME"),
+    }
 
 
 # Application definition
@@ -71,7 +110,8 @@ INSTALLED_APPS = (
     "modeltranslation",
     "django_cotton",
     "django_cooco",
-    "anymail",
+    # Not "anymail": its app only registers system checks, importing requests on every start;
+    # they are registered by the contact app instead, importing it when the checks run
     "base",
     "cookie_consent",
     "home",
@@ -86,13 +126,17 @@ MODELTRANSLATION_TRANSLATION_FILES = ("third_party.django_cooco.translation",)
 
 
 MIDDLEWARE = [
+    "core.middleware.MetricsMiddleware",
+    "core.middleware.ServerTimingMiddleware",
+    "core.middleware.RepeatedQueriesMiddleware",
     "core.middleware.MaintenanceModeMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "django.middleware.http.ConditionalGetMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
-    "django.middleware.cache.UpdateCacheMiddleware",
+    "core.middleware.PageCacheUpdateMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.cache.FetchFromCacheMiddleware",
+    "core.middleware.PageCacheFetchMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -103,7 +147,9 @@ ROOT_URLCONF = "core.urls"
 
 TEMPLATES = (
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "core.server_timing.TimedDjangoTemplates",
+        # The name of the default backend, which django-cotton sets its loaders up for
+        "NAME": "django",
         "DIRS": (),
         "APP_DIRS": True,
         "OPTIONS": {
@@ -114,9 +160,6 @@ TEMPLATES = (
                 "django.contrib.messages.context_processors.messages",
                 "django.template.context_processors.media",
             ],
-            "libraries": {
-                "filters": "core.templatetags.filters",
-            },
         },
     },
 )
@@ -192,22 +235,115 @@ if DEBUG:
 else:
     EMAIL_BACKEND = "contact.email_backend.DatabaseEmailBackend"
 
-# Symmetric key used to encrypt provider credentials stored in the database.
-FIELD_ENCRYPTION_KEY = env("FIELD_ENCRYPTION_KEY")
+# The connection to the email provider is kept open across sends; one idle for longer than
+# EMAIL_CONNECTION_IDLE_TIMEOUT seconds is opened again before sending, as SMTP servers drop
+# idle connections after a few minutes
+EMAIL_CONNECTION_IDLE_TIMEOUT = env.float("EMAIL_CONNECTION_IDLE_TIMEOUT", default=60.0)
+
+# The notifications are queued in the outbox table and sent by the `process_outbox` command, in
+# batches; a failed email is retried after OUTBOX_RETRY_BASE_SECONDS, doubled after every
+# attempt (up to OUTBOX_RETRY_MAX_SECONDS), and given up on after OUTBOX_MAX_ATTEMPTS. The
+# emails of a batch are claimed for OUTBOX_LEASE_SECONDS, which should cover sending it: those
+# still claimed after it (e.g. by a worker killed while sending them) are sent again
+OUTBOX_BATCH_SIZE = env.int("OUTBOX_BATCH_SIZE", default=50)
+OUTBOX_LEASE_SECONDS = env.int("OUTBOX_LEASE_SECONDS", default=600)
+OUTBOX_MAX_ATTEMPTS = env.int("OUTBOX_MAX_ATTEMPTS", default=5)
+OUTBOX_RETRY_BASE_SECONDS = env.int("OUTBOX_RETRY_BASE_SECONDS", default=60)
+OUTBOX_RETRY_MAX_SECONDS = env.int("OUTBOX_RETRY_MAX_SECONDS", default=3600)
+
+# Symmetric keys used to encrypt provider credentials stored in the database, comma-separated
+# and newest first. To rotate the key, put the new one first, run `manage.py reencrypt_fields`,
+# then drop the old one.
+FIELD_ENCRYPTION_KEYS = env.list("FIELD_ENCRYPTION_KEY")
+
+# Cache shared by all the workers (page cache, hit-rate stats). The default local-memory
+# cache is per process; set CACHE_URL (e.g. filecache:///tmp/django-cache) in production.
+CACHES = {"default": env.cache_url("CACHE_URL", default="locmemcache://")}
+
+# Cached pages are purged as soon as the content they render changes (see
+# core.page_cache_invalidation), so they can be kept for hours.
+CACHE_MIDDLEWARE_SECONDS = env("CACHE_MIDDLEWARE_SECONDS")
 
 if DEBUG:
     CACHE_MIDDLEWARE_SECONDS = 0
 
+# Leave the per-visitor parts of the pages (CSRF token, messages, cookie consent banner)
+# out of the HTML, so cached pages are identical for every anonymous visitor and can be
+# served without varying on Cookie. The browser fetches them from the visitor_state view.
+PAGE_CACHE_COOKIELESS = env("PAGE_CACHE_COOKIELESS")
+
+# Also store the precomputed JSON-LD documents of the pages in the database (see core.json_ld),
+# so they outlive cache evictions; they are always stored in the cache.
+JSON_LD_DB_STORAGE = env("JSON_LD_DB_STORAGE")
+
+# Directory the pages are pre-rendered to by `manage.py prerender` (see core.prerender), for
+# nginx to serve them directly. When set, along with PAGE_CACHE_COOKIELESS, the pages are
+# rendered again as soon as the content they render changes. Pages are rendered for
+# PRERENDER_HOST, which should be the canonical host of the site: nginx only serves them to the
+# requests for that host, so it must be set along with PRERENDER_ROOT. Otherwise it defaults to
+# the first of ALLOWED_HOSTS, for the pages rendered by the warm-up of the workers.
+PRERENDER_ROOT = env("PRERENDER_ROOT")
+PRERENDER_HOST = env("PRERENDER_HOST", default="")
+if PRERENDER_ROOT and not PRERENDER_HOST:
+    msg = "Set the PRERENDER_HOST environment variable, the host nginx serves the pre-rendered pages for"
+    raise ImproperlyConfigured(msg)
+PRERENDER_HOST = PRERENDER_HOST or ALLOWED_HOSTS[0]
+
+# With DEBUG, the queries run this many times within a request are logged as likely N+1 patterns
+REPEATED_QUERIES_THRESHOLD = env("REPEATED_QUERIES_THRESHOLD")
+
+# Fraction (0 to 1) of the requests timed per phase (database, templates, markdown, imagekit,
+# outbound HTTP), reported in their Server-Timing header and logged (see core.server_timing)
+SERVER_TIMING_SAMPLE_RATE = env("SERVER_TIMING_SAMPLE_RATE")
+IMAGEKIT_DEFAULT_CACHEFILE_BACKEND = "core.server_timing.TimedCacheFileBackend"
+
+# Directory the processes count the Prometheus metrics in (see core.metrics), shared by every
+# process of the site (e.g. the gunicorn workers and the outbox) to expose their totals; without
+# it, only the counts of the process serving /metrics are exposed
+METRICS_DIR = env("METRICS_DIR")
+# /metrics is served to the requests bearing METRICS_TOKEN (`Authorization: Bearer <token>`) or
+# coming from METRICS_ALLOWED_IPS (addresses or networks, e.g. 172.16.0.0/12), and not at all
+# when neither is set
+METRICS_TOKEN = env("METRICS_TOKEN")
+METRICS_ALLOWED_IPS: list[str] = env("METRICS_ALLOWED_IPS")
+
+# The renditions of an uploaded image are generated in the background once saved, and by
+# `manage.py generate_images` ahead of time, skipping those whose source image is unchanged
+# since recorded in IMAGEKIT_MANIFEST_PATH (default: CACHE/manifest.json in the media root).
+# The renditions known to be generated, from the manifest or the shared cache, are assumed to
+# exist without checking the storage.
+IMAGEKIT_DEFAULT_CACHEFILE_STRATEGY = "core.image_generation.GenerateOnSourceSaved"
+IMAGEKIT_MANIFEST_PATH = env("IMAGEKIT_MANIFEST_PATH", default="")
+
 # Google reCAPTCHA v3 Configuration
 RECAPTCHA_SITE_KEY = env("RECAPTCHA_SITE_KEY", default=None)
 RECAPTCHA_SECRET_KEY = env("RECAPTCHA_SECRET_KEY", default=None)
 RECAPTCHA_SCORE_THRESHOLD = env.float("RECAPTCHA_SCORE_THRESHOLD", default=0.5)
+RECAPTCHA_VERIFY_URL = env("RECAPTCHA_VERIFY_URL", default="https://www.google.com/recaptcha/api/siteverify")
+RECAPTCHA_TIMEOUT = env.float("RECAPTCHA_TIMEOUT", default=5.0)
+# After this many consecutive failed verifications, the submissions are allowed without calling
+# the API for RECAPTCHA_CIRCUIT_RESET_SECONDS, after which a single verification probes it again
+RECAPTCHA_CIRCUIT_FAILURE_THRESHOLD = env.int("RECAPTCHA_CIRCUIT_FAILURE_THRESHOLD", default=3)
+RECAPTCHA_CIRCUIT_RESET_SECONDS = env.float("RECAPTCHA_CIRCUIT_RESET_SECONDS", default=30.0)
 
 IS_RECAPTCHA_CONFIGURED = bool(RECAPTCHA_SITE_KEY) and bool(RECAPTCHA_SECRET_KEY)
 
+# Contact form submissions allowed per client IP and per email address, as a number per s, m, h
+# or d (e.g. 5/h), before reCAPTCHA is even called; an empty value disables the limit. The
+# client IP is read from X-Forwarded-For, as appended by the TRUSTED_PROXY_COUNT proxies in front
+# of Django (e.g. 1 for the nginx of deploy/ alone, 2 behind the host's reverse proxy as well)
+CONTACT_RATE_LIMIT_IP = env("CONTACT_RATE_LIMIT_IP", default="5/h")
+CONTACT_RATE_LIMIT_EMAIL = env("CONTACT_RATE_LIMIT_EMAIL", default="3/h")
+TRUSTED_PROXY_COUNT = env.int("TRUSTED_PROXY_COUNT", default=1)
+
 # Logging
 # https://docs.djangoproject.com/en/5.1/topics/logging/
 
+# Fraction (0 to 1) of the records below ERROR logged, per noisy logger and its descendants, e.g.
+# "django.request=0.1,security=0.5" under scanner traffic (see core.logging.SamplingFilter)
+LOG_SAMPLE_RATES = {name: float(rate) for name, rate in env("LOG_SAMPLE_RATES").items()}
+
+# The records are written to stdout by a thread of each process, off the request threads (see core.logging)
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -220,31 +356,65 @@ LOGGING = {
             "()": "core.logging.JsonFormatter",
         },
     },
+    "filters": {
+        "sample": {
+            "()": "core.logging.SamplingFilter",
+            "rates": LOG_SAMPLE_RATES,
+        },
+    },
     "handlers": {
         "stdout": {
             "class": "logging.StreamHandler",
             "stream": "ext://sys.stdout",
             "formatter": "console" if DEBUG else "json",
         },
+        "queue": {
+            "class": "core.logging.QueueHandler",
+            "queue": "queue.SimpleQueue",
+            "listener": "core.logging.QueueListener",
+            "handlers": ["stdout"],
+            "respect_handler_level": True,
+            "filters": ["sample"],
+        },
     },
     "loggers": {
         "django": {
-            "handlers": ["stdout"],
+            "handlers": ["queue"],
             "level": "INFO",
             "propagate": False,
         },
         "contact": {
-            "handlers": ["stdout"],
+            "handlers": ["queue"],
             "level": "INFO",
             "propagate": False,
         },
         "recaptcha": {
-            "handlers": ["stdout"],
+            "handlers": ["queue"],
             "level": "INFO",
             "propagate": False,
         },
         "security": {
-            "handlers": ["stdout"],
+            "handlers": ["queue"],
+            "level": "INFO",
+            "propagate": False,
+        },
+        "page_cache": {
+            "handlers": ["queue"],
+            "level": "INFO",
+            "propagate": False,
+        },
+        "queries": {
+            "handlers": ["queue"],
+            "level": "WARNING",
+            "propagate": False,
+        },
+        "server_timing": {
+            "handlers": ["queue"],
+            "level": "INFO",
+            "propagate": False,
+        },
+        "images": {
+            "handlers": ["queue"],
             "level": "INFO",
             "propagate": False,
         },
@@ -0,0 +1,171 @@
+"""Benchmark of the startup of gunicorn, with and without the warm-up of its workers.
+
+gunicorn is started as in production (gunicorn.conf.py) on a free local port, and every page
+is requested in each language as soon as it accepts connections, each over a new connection as
+from a different visitor, then several times more for its steady latency. The time from the start
+of gunicorn to its first response, and to its first fast response (one not slower than the
+threshold, twice the steady median by default), show how long the visitors wait for a restarted
+container to serve them as fast as before.
+"""
+
+from __future__ import annotations
+
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from http import HTTPStatus
+from typing import NamedTuple
+
+from django.conf import settings
+
+from .page_cache import purge_pages
+
+# Time for gunicorn to accept connections, and for it to respond to a request
+_START_TIMEOUT = 120.0
+_REQUEST_TIMEOUT = 60.0
+
+
+class StartupStats(NamedTuple):
+    """Times from the start of gunicorn to its first response and to its first fast one, and latencies, in ms."""
+
+    first_response_ms: float
+    first_fast_response_ms: float
+    first_latency_ms: float
+    slowest_first_pass_ms: float
+    steady_p50_ms: float
+
+
+class _Sample(NamedTuple):
+    # Seconds from the start of gunicorn to the response, and latency of the request
+    elapsed: float
+    latency: float
+
+
+def _get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def _start_server(port: int, workers: int, *, warm_up: bool) -> subprocess.Popen[bytes]:
+    environ = {**os.environ, "WEB_CONCURRENCY": str(workers), "GUNICORN_WARM_UP": "true" if warm_up else "false"}
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "--config",
+            "gunicorn.conf.py",
+            "--bind",
+            f"127.0.0.1:{port}",
+            "core.wsgi:application",
+        ],
+        cwd=settings.BASE_DIR,
+        env=environ,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _stop_server(process: subprocess.Popen[bytes]) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=_REQUEST_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def _request(port: int, path: str) -> float:
+    # Requested over HTTPS through nginx, as by a visitor, on a new connection
+    headers = {"Host": settings.PRERENDER_HOST or "localhost", "X-Forwarded-Proto": "https"}
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=_REQUEST_TIMEOUT)
+    start = time.perf_counter()
+    try:
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+    finally:
+        connection.close()
+    latency = time.perf_counter() - start
+
+    if response.status != HTTPStatus.OK:
+        msg = f"Request of '{path}' failed with status {response.status}"
+        raise RuntimeError(msg)
+    return latency
+
+
+def _wait_first_response(process: subprocess.Popen[bytes], port: int, path: str, start: float) -> float:
+    # gunicorn listens once the app is preloaded: until then, the connections are refused
+    while True:
+        try:
+            return _request(port, path)
+        except ConnectionRefusedError:
+            if process.poll() is not None:
+                msg = f"gunicorn exited with status {process.returncode} before accepting connections"
+                raise RuntimeError(msg) from None
+            if time.perf_counter() - start > _START_TIMEOUT:
+                msg = f"gunicorn did not accept connections within {_START_TIMEOUT:.0f}s"
+                raise RuntimeError(msg) from None
+            time.sleep(0.005)
+
+
+def _measure(paths: list[str], workers: int, passes: int, *, warm_up: bool) -> tuple[list[_Sample], list[float]]:
+    # The samples of the first pass, from the start of gunicorn, and the latencies of the next passes
+    purge_pages(paths)
+    port = _get_free_port()
+    start = time.perf_counter()
+    process = _start_server(port, workers, warm_up=warm_up)
+    try:
+        latency = _wait_first_response(process, port, paths[0], start)
+        first_pass = [_Sample(time.perf_counter() - start, latency)]
+        for path in paths[1:]:
+            latency = _request(port, path)
+            first_pass.append(_Sample(time.perf_counter() - start, latency))
+
+        steady = [_request(port, path) for _ in range(passes) for path in paths]
+    finally:
+        _stop_server(process)
+    return first_pass, steady
+
+
+def run_startup_benchmark(
+    paths: list[str], workers: int, passes: int, fast_ms: float | None = None
+) -> dict[str, StartupStats]:
+    """Start gunicorn without and with the warm-up of its workers, timing the requests of the pages.
+
+    Args:
+        paths: The URL paths of the pages, requested in order.
+        workers: The number of gunicorn workers.
+        passes: The number of requests of every page, after the first, for the steady latency.
+        fast_ms: The latency of a fast response, in ms; twice the steady median by default.
+
+    Returns:
+        The statistics of gunicorn without ("cold") and with ("warm-up") the warm-up, by name.
+    """
+    results: dict[str, StartupStats] = {}
+    for name, warm_up in (("cold", False), ("warm-up", True)):
+        first_pass, steady = _measure(paths, workers, passes, warm_up=warm_up)
+
+        steady_p50 = statistics.median(steady)
+        fast = fast_ms / 1000 if fast_ms is not None else 2 * steady_p50
+        # Counting the steady passes, in case no request of the first pass was fast
+        elapsed = first_pass[-1].elapsed
+        samples = [*first_pass]
+        for latency in steady:
+            elapsed += latency
+            samples.append(_Sample(elapsed, latency))
+        first_fast = next((sample.elapsed for sample in samples if sample.latency <= fast), elapsed)
+
+        results[name] = StartupStats(
+            first_response_ms=round(first_pass[0].elapsed * 1000, 1),
+            first_fast_response_ms=round(first_fast * 1000, 1),
+            first_latency_ms=round(first_pass[0].latency * 1000, 1),
+            slowest_first_pass_ms=round(max(sample.latency for sample in first_pass) * 1000, 1),
+            steady_p50_ms=round(steady_p50 * 1000, 1),
+        )
+    return results
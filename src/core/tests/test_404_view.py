@@ -58,6 +58,7 @@ HOME_HREF = {
 
 class BaseTest404ViewContent(base_view_test_case.CommonPageTestsMixin):
     request_path = REQUEST_PATH
+    max_queries = 5
 
     def setUp(self) -> None:
         logger = logging.getLogger("django.request")
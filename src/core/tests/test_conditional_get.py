@@ -0,0 +1,118 @@
+"""Tests for the conditional GET support driven by the content version."""
+
+from __future__ import annotations
+
+import datetime
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.utils import translation
+
+from base.models import GoogleAnalytics, SiteMedia
+from contact.models import ContactFormConfiguration
+from home.models import Experience, PersonalInfo, Project
+
+
+class BaseConditionalGetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        PersonalInfo.objects.create(name="Test User", title="Developer", introduction="Intro", biography="Bio")
+        Project.objects.create(
+            title="Portfolio", slug="portfolio", summary="Summary", problem="P", approach="A", outcome="O"
+        )
+        # Created up front: their creation on first access would start a new content version
+        GoogleAnalytics.get_solo()
+        SiteMedia.get_solo()
+        ContactFormConfiguration.get_solo()
+
+    def setUp(self) -> None:
+        self.enterContext(translation.override("en"))
+        cache.clear()
+        self.client = Client()
+
+    def _assert_not_modified(self, path: str, **headers: str) -> None:
+        with self.assertNumQueries(0):
+            response = self.client.get(path, headers=headers)
+
+        self.assertEqual(
+            response.status_code,
+            HTTPStatus.NOT_MODIFIED,
+            f"Expected '{path}' to be not modified with {headers}, got '{response.status_code}'",
+        )
+
+
+@override_settings(PAGE_CACHE_COOKIELESS=True, CACHE_MIDDLEWARE_SECONDS=0)
+class TestPageConditionalGet(BaseConditionalGetTest):
+    def test_pages_have_strong_validators(self) -> None:
+        response = self.client.get("/en/")
+
+        self.assertRegex(etag := response["ETag"], r'^"[0-9a-f]{32}"$', f"Expected a strong ETag, got '{etag}'")
+        self.assertIn("Last-Modified", response, "Pages should have a Last-Modified header")
+
+    def test_matching_etag_is_not_modified_without_queries(self) -> None:
+        for path in ("/en/", "/en/my-career/", "/en/projects/", "/en/projects/portfolio/", "/en/contact/"):
+            etag = self.client.get(path)["ETag"]
+            self._assert_not_modified(path, if_none_match=etag)
+
+    def test_unchanged_since_last_modified_is_not_modified(self) -> None:
+        last_modified = self.client.get("/en/")["Last-Modified"]
+        self._assert_not_modified("/en/", if_modified_since=last_modified)
+
+    def test_etag_depends_on_the_requested_url(self) -> None:
+        etags = {self.client.get(path)["ETag"] for path in ("/en/", "/es/", "/en/contact/", "/en/contact/?service=web")}
+        self.assertEqual(len(etags), 4, f"Every page and query string should have its own ETag, got '{etags}'")
+
+    def test_content_change_invalidates_the_validators(self) -> None:
+        response = self.client.get("/en/my-career/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Experience.objects.create(title="Job", location="Remote", description="D", start_date=datetime.date.today())
+
+        response = self.client.get(
+            "/en/my-career/",
+            headers={"if_none_match": response["ETag"], "if_modified_since": response["Last-Modified"]},
+        )
+        self.assertEqual(
+            response.status_code, HTTPStatus.OK, f"Changed pages should be rendered again, got '{response.status_code}'"
+        )
+        self.assertIn("Job", response.content.decode(), "The page should render the new content")
+
+
+@override_settings(PAGE_CACHE_COOKIELESS=True, CACHE_MIDDLEWARE_SECONDS=600)
+class TestCachedPageConditionalGet(BaseConditionalGetTest):
+    def test_cached_page_is_not_modified(self) -> None:
+        etag = self.client.get("/en/")["ETag"]
+        self.client.get("/en/")
+
+        self._assert_not_modified("/en/", if_none_match=etag)
+
+
+@override_settings(PAGE_CACHE_COOKIELESS=False, CACHE_MIDDLEWARE_SECONDS=0)
+class TestInlineVisitorStateConditionalGet(BaseConditionalGetTest):
+    def test_pages_are_not_validated_by_content_version(self) -> None:
+        response = self.client.get("/en/")
+        self.assertNotIn(
+            "Last-Modified", response, "Pages rendering the per-visitor state inline should not be validated by date"
+        )
+
+
+class TestSeoConditionalGet(BaseConditionalGetTest):
+    def test_sitemap_is_not_modified(self) -> None:
+        response = self.client.get("/sitemap.xml")
+        self.assertIn("Last-Modified", response, "The sitemap should have a Last-Modified header")
+
+        self._assert_not_modified("/sitemap.xml", if_none_match=response["ETag"])
+
+    def test_sitemap_has_the_last_modification_of_projects(self) -> None:
+        updated_at = Project.objects.get().updated_at
+        content = self.client.get("/sitemap.xml").content.decode()
+        self.assertIn(
+            f"<lastmod>{updated_at.date().isoformat()}</lastmod>",
+            content,
+            f"The project entries should have their last modification date, got '{content}'",
+        )
+
+    def test_robots_txt_is_not_modified(self) -> None:
+        etag = self.client.get("/robots.txt")["ETag"]
+        self._assert_not_modified("/robots.txt", if_none_match=etag)
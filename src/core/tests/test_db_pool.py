@@ -0,0 +1,81 @@
+"""Tests for the statistics of the database connection pools, and their stress test."""
+
+from __future__ import annotations
+
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from core.db_pool import get_pool, record_pool_stats
+from core.metrics import render_metrics, reset_metrics
+
+
+class TestPoolStats(SimpleTestCase):
+    def setUp(self) -> None:
+        reset_metrics()
+        self.addCleanup(reset_metrics)
+
+    def _get_sample_lines(self, prefix: str) -> list[str]:
+        return [line for line in render_metrics().splitlines() if line.startswith(prefix)]
+
+    def test_gauges_are_set_from_the_stats(self) -> None:
+        stats = {"pool_min": 1, "pool_max": 4, "pool_size": 3, "pool_available": 1, "requests_waiting": 2}
+        record_pool_stats("default", stats)
+        record_pool_stats("default", {**stats, "pool_available": 2})
+
+        lines = self._get_sample_lines("django_db_pool_")
+        self.assertEqual(
+            lines,
+            [
+                'django_db_pool_connections{alias="default",state="busy"} 1',
+                'django_db_pool_connections{alias="default",state="idle"} 2',
+                'django_db_pool_max_connections{alias="default"} 4',
+                'django_db_pool_waiting_requests{alias="default"} 2',
+            ],
+            f"Expected the gauges of the latest stats, without counters, got {lines}",
+        )
+
+    def test_counters_are_added_from_the_stats(self) -> None:
+        stats = {
+            "pool_max": 4,
+            "pool_size": 4,
+            "pool_available": 0,
+            "requests_num": 10,
+            "requests_queued": 3,
+            "requests_wait_ms": 1500,
+            "requests_errors": 1,
+            "connections_lost": 2,
+        }
+        record_pool_stats("default", stats)
+        record_pool_stats("default", {"pool_max": 4, "requests_num": 5})
+
+        for prefix, expected in (
+            ("django_db_pool_requests_total", ['django_db_pool_requests_total{alias="default"} 15']),
+            ("django_db_pool_queued_requests_total", ['django_db_pool_queued_requests_total{alias="default"} 3']),
+            ("django_db_pool_wait_seconds_total", ['django_db_pool_wait_seconds_total{alias="default"} 1.5']),
+            (
+                "django_db_pool_errors_total",
+                [
+                    'django_db_pool_errors_total{alias="default",kind="lost"} 2',
+                    'django_db_pool_errors_total{alias="default",kind="timeout"} 1',
+                ],
+            ),
+        ):
+            with self.subTest(metric=prefix):
+                lines = self._get_sample_lines(prefix)
+                self.assertEqual(lines, expected, f"Unexpected samples {lines}")
+
+
+class TestBenchpoolCommand(TestCase):
+    def test_not_pooled_database_is_refused(self) -> None:
+        self.assertIsNone(get_pool(connection), "The test database should not be pooled")
+
+        with self.assertRaisesMessage(CommandError, "are not pooled"):
+            call_command("benchpool", stdout=StringIO())
+
+    def test_invalid_options_are_refused(self) -> None:
+        for options in ({"threads": 0}, {"requests": 0}, {"hold_ms": -1}):
+            with self.subTest(options=options), self.assertRaises(CommandError):
+                call_command("benchpool", stdout=StringIO(), **options)
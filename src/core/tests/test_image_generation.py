@@ -0,0 +1,223 @@
+"""Tests for the pre-generation of the imagekit cache files, and their optimistic cache file strategy."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from base.models import SiteMedia
+from base.signals import create_default_site_media
+from core.image_generation import (
+    ImageStatus,
+    generate_images,
+    get_cache_files,
+    get_manifest_path,
+    queue_image_generation,
+)
+from core.server_timing import collect_timings
+from home.models import Project
+from utils.images import WEBP
+
+# The 12 renditions of the site media defaults, and the 10 of the project hero image
+RENDITION_COUNT = 22
+PROJECT_RENDITION_COUNT = 10
+
+
+def _build_image(color: str) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (800, 450), color=color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class TestGenerateImages(TestCase):
+    def setUp(self) -> None:
+        self.media_root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root))
+        create_default_site_media()
+        SiteMedia.get_solo()
+
+        self.project = Project.objects.create(
+            title="Project", slug="project", summary="Summary", problem="Problem", approach="Approach", outcome="Done"
+        )
+        self.project.hero_image = SimpleUploadedFile("hero.png", _build_image("red"), content_type="image/png")
+        self.project.save()
+
+    def _get_project_renditions(self) -> set[str]:
+        return {
+            image.get_file(image_format, width).name
+            for image in (self.project.card_images, self.project.hero_images)
+            for image_format in image.field.formats
+            for width in image.field.widths
+        }
+
+    def _get_statuses(self, workers: int = 1, force: bool = False) -> dict[str, ImageStatus]:
+        return {result.name: result.status for result in generate_images(get_cache_files(), workers, force)}
+
+    def _assert_statuses(self, statuses: dict[str, ImageStatus], expected: dict[ImageStatus, int]) -> None:
+        counts = {status: list(statuses.values()).count(status) for status in expected}
+        self.assertEqual(counts, expected, f"Unexpected image statuses '{statuses}'")
+
+    def test_every_rendition_is_generated_and_recorded(self) -> None:
+        statuses = self._get_statuses()
+
+        self._assert_statuses(statuses, {ImageStatus.GENERATED: RENDITION_COUNT})
+        for name in statuses:
+            self.assertTrue((self.media_root / name).exists(), f"The rendition '{name}' should have been generated")
+        self.assertEqual(
+            manifest := set(json.loads(get_manifest_path().read_text())),
+            set(statuses),
+            f"Every rendition should be recorded in the manifest, got '{manifest}'",
+        )
+
+    def test_unchanged_renditions_are_skipped(self) -> None:
+        self._get_statuses()
+
+        self._assert_statuses(self._get_statuses(), {ImageStatus.SKIPPED: RENDITION_COUNT})
+
+    def test_renditions_of_a_source_replaced_in_place_are_generated_again(self) -> None:
+        self._get_statuses()
+        Path(self.project.hero_image.path).write_bytes(_build_image("blue"))
+
+        statuses = self._get_statuses()
+
+        self._assert_statuses(
+            statuses,
+            {
+                ImageStatus.GENERATED: PROJECT_RENDITION_COUNT,
+                ImageStatus.SKIPPED: RENDITION_COUNT - PROJECT_RENDITION_COUNT,
+            },
+        )
+        self.assertEqual(
+            {name for name, status in statuses.items() if status is ImageStatus.GENERATED},
+            self._get_project_renditions(),
+            "Only the renditions of the replaced image should be generated",
+        )
+        with Image.open(self.project.card_images.get_file(WEBP, 400).path) as image:
+            red, _, blue = image.convert("RGB").tobytes()[:3]
+        self.assertGreater(blue, red, "The rendition should have been generated from the new image")
+
+    def test_deleted_renditions_are_generated_again(self) -> None:
+        self._get_statuses()
+        Path(self.project.card_images.get_file(WEBP, 400).path).unlink()
+
+        self._assert_statuses(
+            self._get_statuses(), {ImageStatus.GENERATED: 1, ImageStatus.SKIPPED: RENDITION_COUNT - 1}
+        )
+
+    def test_every_rendition_is_generated_when_forced(self) -> None:
+        self._get_statuses()
+
+        self._assert_statuses(self._get_statuses(force=True), {ImageStatus.GENERATED: RENDITION_COUNT})
+
+    def test_renditions_of_missing_sources_fail(self) -> None:
+        (self.media_root / "site" / "icon.png").unlink()
+
+        with self.assertLogs("images", level="ERROR"):
+            statuses = self._get_statuses()
+
+        self._assert_statuses(statuses, {ImageStatus.FAILED: 1, ImageStatus.GENERATED: RENDITION_COUNT - 1})
+
+    def test_renditions_are_generated_across_processes(self) -> None:
+        statuses = self._get_statuses(workers=2)
+
+        self._assert_statuses(statuses, {ImageStatus.GENERATED: RENDITION_COUNT})
+        for name in statuses:
+            self.assertTrue((self.media_root / name).exists(), f"The rendition '{name}' should have been generated")
+
+    def test_renditions_of_an_upload_are_queued_once_committed(self) -> None:
+        self.project.hero_image = SimpleUploadedFile("new.png", _build_image("green"), content_type="image/png")
+
+        with mock.patch("core.image_generation.queue_image_generation") as queue:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.project.save()
+                queue.assert_not_called()
+
+        self.assertEqual(
+            queued := {call.args[0].name for call in queue.call_args_list},
+            self._get_project_renditions(),
+            f"The renditions of the new image should be queued, got '{queued}'",
+        )
+
+    def test_queued_renditions_are_generated_in_the_background(self) -> None:
+        file = self.project.card_images.get_file(WEBP, 400)
+
+        results = queue_image_generation(file).result(timeout=30)
+
+        self.assertEqual(
+            statuses := [result.status for result in results], [ImageStatus.GENERATED], f"Got '{statuses}'"
+        )
+        self.assertTrue(Path(file.path).exists(), "The rendition should have been generated")
+
+
+class TestGenerateOnSourceSaved(TestCase):
+    def setUp(self) -> None:
+        self.media_root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root))
+        create_default_site_media()
+        SiteMedia.get_solo()
+
+        project = Project.objects.create(
+            title="Project", slug="project", summary="Summary", problem="Problem", approach="Approach", outcome="Done"
+        )
+        project.hero_image = SimpleUploadedFile("hero.png", _build_image("red"), content_type="image/png")
+        project.save()
+        self.project_pk = project.pk
+
+        self.exists = self.enterContext(
+            mock.patch.object(FileSystemStorage, "exists", autospec=True, side_effect=FileSystemStorage.exists)
+        )
+
+    def _get_rendition_url(self) -> str:
+        # From a new instance, as when rendering a page
+        url: str = Project.objects.get(pk=self.project_pk).card_images.get_file(WEBP, 400).url
+        return url
+
+    def _restart_process(self) -> None:
+        self.enterContext(mock.patch.dict("core.image_generation._generated_images", clear=True))
+
+    def test_missing_rendition_is_generated_once(self) -> None:
+        url = self._get_rendition_url()
+
+        self.assertTrue((self.media_root / url.removeprefix("/media/")).exists(), "The rendition should be generated")
+        self.exists.reset_mock()
+        self._get_rendition_url()
+        self.exists.assert_not_called()
+
+    def test_renditions_recorded_by_another_process_are_not_checked(self) -> None:
+        self._get_rendition_url()
+        self._restart_process()
+        self.exists.reset_mock()
+
+        self._get_rendition_url()
+
+        self.exists.assert_not_called()
+
+    def test_pregenerated_renditions_are_not_checked(self) -> None:
+        generate_images(get_cache_files())
+        # Without the shared cache, known from the manifest
+        cache.clear()
+        self._restart_process()
+        self.exists.reset_mock()
+
+        self._get_rendition_url()
+        _ = SiteMedia.objects.get().logo_display.url
+
+        self.exists.assert_not_called()
+
+    def test_storage_operations_are_counted(self) -> None:
+        with collect_timings() as timings:
+            self._get_rendition_url()
+            self._get_rendition_url()
+
+        self.assertEqual(
+            count := timings.counts.get("storage"), 2, f"Expected a check and a write of the storage, got '{count}'"
+        )
@@ -0,0 +1,72 @@
+"""Tests for the import time profile of the startup, and its budget."""
+
+from __future__ import annotations
+
+import json
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+from base.management.commands.benchimports import DEFAULT_BUDGET
+from core.import_time import ImportProfile, check_budget, parse_import_times, profile_startup
+
+_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   django.utils
+import time:       400 |        500 | django
+import time:        50 |         50 |     markdown.core
+import time:       150 |        200 |   markdown
+import time:       300 |        500 | utils.helpers
+"""
+
+
+class TestImportTime(SimpleTestCase):
+    def test_parses_the_import_times(self) -> None:
+        profile = parse_import_times(_OUTPUT)
+
+        self.assertEqual(profile.total_ms, 1.0, f"Expected the top-level imports to be summed, got {profile.total_ms}")
+        self.assertEqual(
+            profile.packages,
+            {"django": 0.5, "markdown": 0.2, "utils": 0.3},
+            f"Expected the self times summed per package, got {profile.packages}",
+        )
+        self.assertEqual(
+            profile.modules,
+            ["django.utils", "django", "markdown.core", "markdown", "utils.helpers"],
+            f"Unexpected modules {profile.modules}",
+        )
+
+    def test_budget_overruns(self) -> None:
+        profile = parse_import_times(_OUTPUT)
+
+        for budget, expected in (
+            ({"total_ms": 1.0, "deferred": ["requests"]}, []),
+            ({"total_ms": 0.5}, ["Import time: 1.0 ms > 0.5 ms"]),
+            (
+                {"total_ms": 1.0, "deferred": ["markdown", "django.test"]},
+                ["Imported on startup, instead of on first use: markdown"],
+            ),
+        ):
+            with self.subTest(budget=budget):
+                self.assertEqual(overruns := check_budget(profile, budget), expected, f"Unexpected overruns {overruns}")
+
+    def test_startup_does_not_import_the_deferred_modules(self) -> None:
+        budget = json.loads(DEFAULT_BUDGET.read_text())
+        profile = profile_startup(runs=1)
+
+        overruns = check_budget(profile, {**budget, "total_ms": float("inf")})
+        self.assertEqual(overruns, [], f"Expected the heavy modules to be imported on first use, got {overruns}")
+
+    def test_profile_of_the_fastest_run(self) -> None:
+        profile = profile_startup(runs=2, code="import json")
+
+        self.assertIsInstance(profile, ImportProfile)
+        self.assertIn("json", profile.modules, f"Expected json to be imported, got {profile.modules}")
+
+
+class TestBenchimportsCommand(SimpleTestCase):
+    def test_invalid_options_are_refused(self) -> None:
+        for options in ({"runs": 0}, {"top": -1}):
+            with self.subTest(options=options), self.assertRaises(CommandError):
+                call_command("benchimports", stdout=StringIO(), **options)
@@ -0,0 +1,75 @@
+"""Tests for the precomputed JSON-LD documents."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+from unittest.mock import Mock
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import translation
+
+from base.models import JsonLdDocument
+from core.json_ld import _get_document_key, get_json_ld
+from core.page_cache import bump_content_version, get_content_version
+
+
+def _build(base_url: str) -> dict[str, Any]:
+    return {"@type": "WebPage", "name": "Pági", "url": f"{base_url}/en/", "language": translation.get_language()}
+
+
+@override_settings(ALLOWED_HOSTS=["example.com", "other.example.com"])
+class TestGetJsonLd(TestCase):
+    def setUp(self) -> None:
+        self.enterContext(translation.override("en"))
+        cache.clear()
+        self.build = Mock(side_effect=_build)
+
+    def _get_json_ld(self, host: str = "example.com", path: str = "/en/") -> str:
+        return get_json_ld(RequestFactory().get(path, HTTP_HOST=host), self.build)
+
+    def test_document_is_identical_to_direct_serialization(self) -> None:
+        self.assertEqual(
+            json_ld := self._get_json_ld(),
+            expected := json.dumps(_build("http://example.com"), ensure_ascii=False),
+            f"Expected the JSON-LD '{expected}', got '{json_ld}'",
+        )
+
+    def test_document_is_built_once_per_content_version(self) -> None:
+        self._get_json_ld()
+        json_ld = self._get_json_ld(host="other.example.com")
+
+        self.assertEqual(
+            calls := self.build.call_count, 1, f"The document should be built only once, got {calls} builds"
+        )
+        self.assertIn(
+            "http://other.example.com/en/", json_ld, f"The base URL should be the requested one, got '{json_ld}'"
+        )
+
+    def test_document_is_rebuilt_after_content_change(self) -> None:
+        self._get_json_ld()
+        bump_content_version()
+        self._get_json_ld()
+
+        self.assertEqual(
+            calls := self.build.call_count, 2, f"The document should be rebuilt for the new version, got {calls}"
+        )
+
+    def test_documents_are_stored_per_path(self) -> None:
+        with translation.override("es"):
+            spanish_json_ld = self._get_json_ld(path="/es/")
+        english_json_ld = self._get_json_ld(path="/en/")
+
+        self.assertNotEqual(spanish_json_ld, english_json_ld, "Each language should have its own document")
+
+    @override_settings(JSON_LD_DB_STORAGE=True)
+    def test_document_is_stored_in_database(self) -> None:
+        json_ld = self._get_json_ld()
+        self.assertTrue(JsonLdDocument.objects.filter(path="/en/").exists(), "The document should be stored in the DB")
+
+        # Evict the document from the cache, keeping the content version
+        cache.delete(_get_document_key("/en/", get_content_version()))
+
+        self.assertEqual(self._get_json_ld(), json_ld, "The document should be read back from the database")
+        self.assertEqual(calls := self.build.call_count, 1, f"The document should not be rebuilt, got {calls} builds")
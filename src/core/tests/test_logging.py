@@ -4,11 +4,21 @@ from __future__ import annotations
 
 import json
 import logging
+import queue
 import sys
+from io import StringIO
+from typing import Any
+from unittest import mock
 
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import SimpleTestCase
 
-from core.logging import JsonFormatter
+from core.logging import JsonFormatter, QueueHandler, QueueListener, SamplingFilter
+
+
+def _build_record(name: str = "contact", level: int = logging.INFO, msg: str = "Hello world") -> logging.LogRecord:
+    return logging.LogRecord(name=name, level=level, pathname=__file__, lineno=1, msg=msg, args=None, exc_info=None)
 
 
 class TestJsonFormatter(SimpleTestCase):
@@ -85,3 +95,106 @@ class TestJsonFormatter(SimpleTestCase):
             data["exception"],
             f"Expected the traceback to contain 'ValueError: boom', got '{data['exception']}'",
         )
+
+    def test_timestamp_matches_the_default_format(self) -> None:
+        """The timestamps, formatted once per second, match the default format of the logging module."""
+        for created in (1_700_000_000.123, 1_700_000_000.9, 1_700_000_001.05):
+            record = _build_record()
+            record.created, record.msecs = created, (created % 1) * 1000
+
+            self.assertEqual(
+                timestamp := json.loads(self.formatter.format(record))["timestamp"],
+                expected := logging.Formatter().formatTime(record),
+                f"Expected the timestamp '{expected}', got '{timestamp}'",
+            )
+
+
+class TestSamplingFilter(SimpleTestCase):
+    def setUp(self) -> None:
+        self.filter = SamplingFilter({"django.request": 0.25})
+
+    def test_records_of_the_logger_and_its_descendants_are_sampled(self) -> None:
+        with mock.patch("core.logging.random.random", side_effect=[0.1, 0.5, 0.1]):
+            kept = [
+                self.filter.filter(_build_record(name))
+                for name in ("django.request", "django.request", "django.request.handler")
+            ]
+
+        self.assertEqual(kept, [True, False, True], f"Unexpected sampled records '{kept}'")
+
+    def test_kept_records_have_the_sample_rate(self) -> None:
+        record = _build_record("django.request")
+        with mock.patch("core.logging.random.random", return_value=0.1):
+            self.filter.filter(record)
+
+        self.assertEqual(rate := getattr(record, "sample_rate", None), 0.25, f"Unexpected sample rate '{rate}'")
+
+    def test_errors_and_other_loggers_are_not_sampled(self) -> None:
+        with mock.patch("core.logging.random.random", return_value=0.9):
+            kept = [
+                self.filter.filter(_build_record("django.request", logging.ERROR)),
+                self.filter.filter(_build_record("django")),
+                self.filter.filter(_build_record("security")),
+            ]
+
+        self.assertEqual(kept, [True, True, True], f"Unexpected sampled records '{kept}'")
+
+
+class TestQueueHandler(SimpleTestCase):
+    def setUp(self) -> None:
+        self.stream = StringIO()
+        stream_handler = logging.StreamHandler(self.stream)
+        stream_handler.setFormatter(JsonFormatter())
+
+        record_queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self.listener = QueueListener(record_queue, stream_handler, respect_handler_level=True)
+        self.addCleanup(self.listener.stop)
+
+        self.logger = logging.getLogger("test_queue_handler")
+        self.logger.propagate = False
+        self.logger.addHandler(handler := QueueHandler(record_queue))
+        self.addCleanup(self.logger.removeHandler, handler)
+
+    def _get_written_records(self) -> list[dict[str, Any]]:
+        self.listener.stop()
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_records_are_written_by_the_listener(self) -> None:
+        arguments = ["first"]
+        self.logger.warning("Message of %s", arguments, extra={"path": "/en/"})
+        # Changed once logged, as the message is merged on the calling thread
+        arguments.append("second")
+
+        self.assertEqual(
+            records := [(record["message"], record["path"]) for record in self._get_written_records()],
+            [("Message of ['first']", "/en/")],
+            f"Unexpected records '{records}'",
+        )
+
+    def test_exceptions_are_formatted_by_the_listener(self) -> None:
+        try:
+            error_message = "boom"
+            raise ValueError(error_message)
+        except ValueError:
+            self.logger.exception("Something failed")
+
+        records = self._get_written_records()
+
+        self.assertIn("ValueError: boom", records[0]["exception"], f"Expected the traceback, got '{records}'")
+
+
+class TestBenchloggingCommand(SimpleTestCase):
+    def test_every_setup_is_reported(self) -> None:
+        output = StringIO()
+        call_command("benchlogging", records=100, stdout=output)
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(
+            [line.split()[0] for line in lines],
+            ["setup", "sync-previous", "sync", "queue"],
+            f"Unexpected report '{lines}'",
+        )
+
+    def test_invalid_options_are_refused(self) -> None:
+        with self.assertRaises(CommandError):
+            call_command("benchlogging", records=0, stdout=StringIO())
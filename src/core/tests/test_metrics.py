@@ -0,0 +1,228 @@
+"""Tests for the Prometheus metrics, counted across the processes and served by the metrics view."""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.utils import translation
+
+from core.metrics import (
+    CONTACT_SUBMISSIONS,
+    Counter,
+    Gauge,
+    Histogram,
+    _encode_key,
+    _metrics,
+    _ValuesFile,
+    archive_process,
+    render_metrics,
+    reset_metrics,
+)
+from home.models import PersonalInfo
+
+_TOKEN = "metrics-token"
+
+
+def _get_sample_lines(text: str, prefix: str) -> list[str]:
+    return [line for line in text.splitlines() if line.startswith(prefix)]
+
+
+class TestMetrics(SimpleTestCase):
+    def setUp(self) -> None:
+        self.metrics_dir = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(override_settings(METRICS_DIR=str(self.metrics_dir)))
+        reset_metrics()
+        self.addCleanup(reset_metrics)
+
+    def _register(self, metric: Counter | Gauge | Histogram) -> None:
+        self.addCleanup(_metrics.pop, metric.name)
+
+    def test_counts_of_every_process_are_summed(self) -> None:
+        counter = Counter("test_events_total", "Test events.", ("kind",))
+        self._register(counter)
+        counter.inc(kind="a")
+        counter.inc(2, kind="a")
+
+        # The file of another process sharing the directory
+        other_process = _ValuesFile(self.metrics_dir / "other-host-1.db")
+        self.addCleanup(other_process.close)
+        other_process.increment(_encode_key("test_events_total", "", ("a",)), 4)
+
+        lines = _get_sample_lines(render_metrics(), "test_events_total")
+        self.assertEqual(
+            lines, ['test_events_total{kind="a"} 7'], f"Expected the counts of both processes summed, got {lines}"
+        )
+
+    def test_counts_outlive_the_archived_process(self) -> None:
+        counter = Counter("test_archived_total", "Test events.")
+        self._register(counter)
+        counter.inc(3)
+
+        archive_process()
+
+        self.assertEqual(
+            files := sorted(path.name for path in self.metrics_dir.glob("*.db")),
+            [],
+            f"Expected the file of the process to be deleted, got {files}",
+        )
+        counter.inc()
+        lines = _get_sample_lines(render_metrics(), "test_archived_total")
+        self.assertEqual(lines, ["test_archived_total 4"], f"Expected the archived counts to be kept, got {lines}")
+
+    def test_gauges_of_the_live_processes_are_summed(self) -> None:
+        gauge = Gauge("test_connections", "Test connections.", ("state",))
+        self._register(gauge)
+        gauge.set(3, state="idle")
+        gauge.set(1, state="idle")
+
+        other_process = _ValuesFile(self.metrics_dir / "other-host-1.db")
+        self.addCleanup(other_process.close)
+        other_process.set(_encode_key("test_connections", "", ("idle",)), 2)
+
+        lines = _get_sample_lines(render_metrics(), "test_connections")
+        self.assertEqual(
+            lines,
+            ['test_connections{state="idle"} 3'],
+            f"Expected the last values of both processes summed, got {lines}",
+        )
+
+        archive_process()
+        lines = _get_sample_lines(render_metrics(), "test_connections")
+        self.assertEqual(
+            lines,
+            ['test_connections{state="idle"} 2'],
+            f"Expected the gauges of the exited process dropped, got {lines}",
+        )
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        histogram = Histogram("test_duration_seconds", "Test durations.", ("view",), buckets=(0.1, 1.0))
+        self._register(histogram)
+        histogram.observe(0.05, view="home")
+        histogram.observe(0.5, view="home")
+        histogram.observe(5, view="home")
+
+        lines = _get_sample_lines(render_metrics(), "test_duration_seconds")
+        self.assertEqual(
+            lines,
+            [
+                'test_duration_seconds_bucket{view="home",le="0.1"} 1',
+                'test_duration_seconds_bucket{view="home",le="1.0"} 2',
+                'test_duration_seconds_bucket{view="home",le="+Inf"} 3',
+                'test_duration_seconds_sum{view="home"} 5.55',
+                'test_duration_seconds_count{view="home"} 3',
+            ],
+            f"Expected cumulative buckets, the sum and the count, got {lines}",
+        )
+
+    def test_label_values_are_escaped(self) -> None:
+        counter = Counter("test_escaped_total", "Test events.", ("value",))
+        self._register(counter)
+        counter.inc(value='a "quoted"\\value\n')
+
+        lines = _get_sample_lines(render_metrics(), "test_escaped_total")
+        self.assertEqual(
+            lines,
+            ['test_escaped_total{value="a \\"quoted\\"\\\\value\\n"} 1'],
+            f"Expected the label value to be escaped, got {lines}",
+        )
+
+    def test_files_grow_with_the_samples(self) -> None:
+        counter = Counter("test_many_total", "Test events.", ("index",))
+        self._register(counter)
+        for index in range(5000):
+            counter.inc(index=index)
+
+        lines = _get_sample_lines(render_metrics(), "test_many_total")
+        self.assertEqual(count := len(lines), 5000, f"Expected every sample to be kept, got {count}")
+
+
+@override_settings(METRICS_TOKEN=_TOKEN, METRICS_ALLOWED_IPS=["10.0.0.0/8"], TRUSTED_PROXY_COUNT=0)
+class TestMetricsView(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        PersonalInfo.objects.create(name="Test User", title="Developer", introduction="Intro", biography="Bio")
+
+    def setUp(self) -> None:
+        self.enterContext(translation.override("en"))
+        reset_metrics()
+        self.addCleanup(reset_metrics)
+
+    def _get_metrics(self) -> str:
+        response = Client(headers={"Authorization": f"Bearer {_TOKEN}"}).get("/metrics")
+        self.assertEqual(response.status_code, 200, f"Expected the metrics to be served, got {response.status_code}")
+        return response.content.decode()
+
+    def test_served_with_the_token(self) -> None:
+        response = Client(headers={"Authorization": f"Bearer {_TOKEN}"}).get("/metrics")
+
+        self.assertEqual(
+            content_type := response["Content-Type"],
+            "text/plain; version=0.0.4; charset=utf-8",
+            f"Expected the Prometheus text format, got '{content_type}'",
+        )
+        self.assertIn("no-cache", response["Cache-Control"], "The metrics should never be cached")
+
+    def test_served_to_the_allowed_ips(self) -> None:
+        response = Client(REMOTE_ADDR="10.1.2.3").get("/metrics")
+
+        self.assertEqual(response.status_code, 200, f"Expected the metrics to be served, got {response.status_code}")
+
+    def test_forbidden_without_the_token_from_other_ips(self) -> None:
+        for headers in ({}, {"Authorization": "Bearer wrong"}):
+            with self.subTest(headers=headers):
+                response = Client(headers=headers, REMOTE_ADDR="192.168.1.1").get("/metrics")
+
+                self.assertEqual(response.status_code, 403, f"Expected a 403, got {response.status_code}")
+
+    @override_settings(METRICS_TOKEN="", METRICS_ALLOWED_IPS=[])
+    def test_not_found_when_not_configured(self) -> None:
+        response = Client(REMOTE_ADDR="10.1.2.3").get("/metrics")
+
+        self.assertEqual(response.status_code, 404, f"Expected a 404, got {response.status_code}")
+
+    def test_requests_are_counted_per_view_and_language(self) -> None:
+        Client().get("/en/")
+        Client().get("/es/")
+
+        text = self._get_metrics()
+        for language in ("en", "es"):
+            lines = _get_sample_lines(
+                text, f'django_http_request_duration_seconds_count{{view="home",language="{language}"}}'
+            )
+            self.assertEqual(
+                lines,
+                [f'django_http_request_duration_seconds_count{{view="home",language="{language}"}} 1'],
+                f"Expected a request of the home page in '{language}', got {lines}",
+            )
+        self.assertTrue(
+            _get_sample_lines(text, 'django_db_queries_total{view="home"}'), "Expected the queries to be counted"
+        )
+
+    @override_settings(PAGE_CACHE_COOKIELESS=True, CACHE_MIDDLEWARE_SECONDS=60)
+    def test_page_cache_lookups_are_counted(self) -> None:
+        Client().get("/en/")
+        Client().get("/en/")
+
+        text = self._get_metrics()
+        for outcome in ("hit", "miss"):
+            lines = _get_sample_lines(text, f'django_page_cache_lookups_total{{outcome="{outcome}"}}')
+            self.assertEqual(
+                lines,
+                [f'django_page_cache_lookups_total{{outcome="{outcome}"}} 1'],
+                f"Expected a page cache {outcome}, got {lines}",
+            )
+        self.assertTrue(
+            _get_sample_lines(text, 'django_http_request_duration_seconds_count{view="home",language="en"} 2'),
+            "Expected the page served from the cache to be counted for its view",
+        )
+
+    def test_every_metric_is_described(self) -> None:
+        text = self._get_metrics()
+
+        self.assertIn(
+            f"# TYPE {CONTACT_SUBMISSIONS.name} counter",
+            text,
+            "Expected the metrics to be described, even without samples",
+        )
@@ -0,0 +1,208 @@
+"""Tests for the cookie-independent full-page cache and the visitor_state view."""
+
+from __future__ import annotations
+
+import json
+from io import StringIO
+
+from bs4 import BeautifulSoup, Tag
+from django.contrib.messages import constants as message_constants
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django_cooco.models import BannerConfig, CookieGroup
+from django_cooco.utils import CooCoManager
+
+from core.page_cache import get_content_version, get_stats
+from home.models import PersonalInfo
+
+CSRF_INPUT_NAME = "csrfmiddlewaretoken"
+
+
+class BasePageCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        PersonalInfo.objects.create(
+            name="Test User",
+            title="Test Developer",
+            introduction="Test intro",
+            biography="Test bio",
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def _get_csrf_inputs(self, content: bytes) -> list[str]:
+        soup = BeautifulSoup(content, "html.parser")
+        return [str(tag.get("value", "")) for tag in soup.find_all("input", attrs={"name": CSRF_INPUT_NAME})]
+
+
+@override_settings(PAGE_CACHE_COOKIELESS=True, CACHE_MIDDLEWARE_SECONDS=600)
+class TestCookielessPageCache(BasePageCacheTest):
+    """With PAGE_CACHE_COOKIELESS, pages are identical for every visitor and served from the cache."""
+
+    def test_response_does_not_vary_on_cookie(self) -> None:
+        response = Client().get("/en/")
+        self.assertNotIn(
+            "Cookie",
+            vary := response.get("Vary", ""),
+            f"Cacheable page should not vary on Cookie, got Vary '{vary}'",
+        )
+        self.assertFalse(response.cookies, f"Cacheable page should not set cookies, got '{response.cookies}'")
+
+    def test_csrf_inputs_are_left_empty(self) -> None:
+        csrf_inputs = self._get_csrf_inputs(Client().get("/en/").content)
+        self.assertTrue(csrf_inputs, "The language switcher forms should still render a CSRF input")
+        self.assertEqual(
+            set(csrf_inputs), {""}, f"CSRF inputs should be empty placeholders, got values '{csrf_inputs}'"
+        )
+
+    def test_html_points_to_visitor_state_view(self) -> None:
+        soup = BeautifulSoup(Client().get("/en/").content, "html.parser")
+        html = soup.find("html")
+        assert isinstance(html, Tag), "html element not found"
+        self.assertEqual(
+            url := html.get("data-visitor-state-url"),
+            "/en/visitor-state/",
+            f"Expected the visitor state URL '/en/visitor-state/', got '{url}'",
+        )
+
+    def test_page_is_shared_between_visitors(self) -> None:
+        first_response = Client().get("/en/")
+        second_response = Client(headers={"Cookie": "cookie_consent=whatever; sessionid=abc"}).get("/en/")
+
+        self.assertEqual(
+            first_response.content,
+            second_response.content,
+            "Every anonymous visitor should get the same cached page",
+        )
+
+        stats = {entry.path: entry for entry in get_stats()}
+        self.assertEqual(
+            (stats["/en/"].hits, stats["/en/"].misses),
+            (1, 1),
+            f"Expected 1 hit and 1 miss for '/en/', got '{stats['/en/']}'",
+        )
+
+    def test_post_responses_render_csrf_token_inline(self) -> None:
+        response = Client().post("/en/contact/", data={})
+        csrf_inputs = self._get_csrf_inputs(response.content)
+        self.assertTrue(all(csrf_inputs), f"POST responses should render real CSRF tokens, got '{csrf_inputs}'")
+
+
+@override_settings(PAGE_CACHE_COOKIELESS=False)
+class TestInlineVisitorState(BasePageCacheTest):
+    """Without PAGE_CACHE_COOKIELESS, the per-visitor parts are rendered inline."""
+
+    def test_csrf_inputs_have_a_token(self) -> None:
+        csrf_inputs = self._get_csrf_inputs(Client().get("/en/").content)
+        self.assertTrue(csrf_inputs, "The language switcher forms should render a CSRF input")
+        self.assertTrue(all(csrf_inputs), f"CSRF inputs should have a token, got '{csrf_inputs}'")
+
+
+class TestVisitorStateView(TestCase):
+    """The visitor_state view returns the per-visitor parts of the cached pages."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        banner = BannerConfig.get_solo()
+        banner.title = "Cookies"
+        banner.text = "We use cookies"
+        banner.show_banner = True
+        banner.save()
+        CookieGroup.objects.create(cookie_id="analytics", name="Analytics", description="", is_required=False)
+
+    def _get_state(self, client: Client, path: str = "/en/visitor-state/?next=/en/projects/") -> dict[str, object]:
+        response = client.get(path)
+        self.assertEqual(response.status_code, 200, f"Expected status code 200, got '{response.status_code}'")
+        self.assertIn("no-store", response["Cache-Control"], "The visitor state must never be cached")
+        data = json.loads(response.content)
+        assert isinstance(data, dict), "Visitor state should be a JSON object"
+        return data
+
+    def test_returns_csrf_token_and_sets_cookie(self) -> None:
+        client = Client()
+        state = self._get_state(client)
+        self.assertTrue(state["csrf_token"], "Visitor state should include a CSRF token")
+        self.assertIn("csrftoken", client.cookies, "Visitor state should set the CSRF cookie")
+
+    def test_returns_cookie_banner_with_page_as_redirect_target(self) -> None:
+        banner = self._get_state(Client())["cookie_consent_banner"]
+        assert isinstance(banner, str), "Cookie consent banner should be an HTML string"
+        self.assertIn('id="cooco_banner"', banner, f"Expected the cookie consent banner, got '{banner}'")
+        self.assertIn(
+            'value="/en/projects/"', banner, "Cookie consent forms should redirect back to the completed page"
+        )
+
+    def test_rejects_foreign_redirect_target(self) -> None:
+        banner = self._get_state(Client(), "/en/visitor-state/?next=https://evil.example.com/")["cookie_consent_banner"]
+        assert isinstance(banner, str), "Cookie consent banner should be an HTML string"
+        self.assertNotIn("evil.example.com", banner, "Foreign redirect targets should be discarded")
+
+    def test_no_cookie_banner_when_consent_is_up_to_date(self) -> None:
+        client = Client()
+        response = CooCoManager.all_cookies_accepted().set_cooco_cookie(HttpResponse())
+        client.cookies.update(response.cookies)
+
+        state = self._get_state(client)
+        self.assertEqual(
+            banner := state["cookie_consent_banner"], "", f"Expected no cookie consent banner, got '{banner}'"
+        )
+
+    def test_returns_pending_messages(self) -> None:
+        client = Client()
+        storage = CookieStorage(RequestFactory().get("/"))
+        storage.add(message_constants.SUCCESS, "Message sent")
+        storage.update(response := HttpResponse())
+        client.cookies.update(response.cookies)
+
+        messages_html = self._get_state(client)["messages"]
+        assert isinstance(messages_html, str), "Messages should be an HTML string"
+        self.assertIn("Message sent", messages_html, f"Expected the pending message, got '{messages_html}'")
+        self.assertIn("alert-success", messages_html, f"Expected a success alert, got '{messages_html}'")
+
+
+@override_settings(PAGE_CACHE_COOKIELESS=True, CACHE_MIDDLEWARE_SECONDS=600)
+class TestPageCacheStatsCommand(BasePageCacheTest):
+    def test_reports_hit_rate_per_path(self) -> None:
+        client = Client()
+        for _ in range(4):
+            client.get("/en/")
+
+        output = StringIO()
+        call_command("page_cache_stats", "--reset", stdout=output)
+
+        self.assertRegex(output.getvalue(), r"/en/\s+3\s+1\s+75\.0%", f"Unexpected stats output '{output.getvalue()}'")
+        self.assertEqual(get_stats(), [], "Counters should be reset after --reset")
+
+
+@override_settings(PAGE_CACHE_COOKIELESS=True, CACHE_MIDDLEWARE_SECONDS=600)
+class TestResetPageCacheCommand(BasePageCacheTest):
+    def test_deletes_every_cached_page_and_bumps_the_content_version(self) -> None:
+        client = Client()
+        for path in ("/en/", "/es/my-career/"):
+            client.get(path)
+        version = get_content_version()
+
+        call_command("reset_page_cache", stdout=StringIO())
+        for path in ("/en/", "/es/my-career/"):
+            client.get(path)
+
+        self.assertEqual(
+            lookups := [(entry.path, entry.hits, entry.misses) for entry in get_stats()],
+            [("/en/", 0, 2), ("/es/my-career/", 0, 2)],
+            f"The pages should be rendered again after the reset, got '{lookups}'",
+        )
+        self.assertNotEqual(get_content_version(), version, "The content version should be bumped")
+
+
+@override_settings(PAGE_CACHE_COOKIELESS=True, CACHE_MIDDLEWARE_SECONDS=600)
+class TestPageCacheStatsExclusions(BasePageCacheTest):
+    def test_uncacheable_responses_are_not_recorded(self) -> None:
+        client = Client()
+        client.get("/en/visitor-state/")
+        client.get("/en/this-page-does-not-exist/")
+
+        self.assertEqual(stats := get_stats(), [], f"Only cacheable pages should be recorded, got '{stats}'")
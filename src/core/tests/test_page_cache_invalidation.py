@@ -0,0 +1,120 @@
+"""Tests for the signal-driven purge of the cached pages."""
+
+from __future__ import annotations
+
+import datetime
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+
+from base.models import FollowMeLink
+from core.page_cache import get_stats
+from core.page_cache_invalidation import get_page_paths
+from home.models import Experience, PersonalInfo, Project, Technology
+
+
+@override_settings(PAGE_CACHE_COOKIELESS=True, CACHE_MIDDLEWARE_SECONDS=600)
+class TestPageCacheInvalidation(TestCase):
+    technology: Technology
+    project: Project
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        PersonalInfo.objects.create(name="Test User", title="Developer", introduction="Intro", biography="Bio")
+        cls.technology = Technology.objects.create(name="Django")
+        cls.project = Project.objects.create(
+            title="Portfolio", slug="portfolio", summary="Summary", problem="P", approach="A", outcome="O"
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = Client()
+
+    def _get_misses(self, path: str) -> int:
+        return next((entry.misses for entry in get_stats() if entry.path == path), 0)
+
+    def _assert_purged(self, path: str, *, purged: bool) -> None:
+        misses = self._get_misses(path)
+        self.client.get(path)
+        self.assertEqual(
+            new_misses := self._get_misses(path) - misses,
+            int(purged),
+            f"Expected '{path}' to be {'purged' if purged else 'kept'} in the page cache, got {new_misses} new misses",
+        )
+
+    def test_paths_cover_every_language(self) -> None:
+        self.assertEqual(
+            paths := get_page_paths(self.project),
+            {
+                "/en/",
+                "/es/",
+                "/en/projects/",
+                "/es/projects/",
+                "/en/projects/portfolio/",
+                "/es/projects/portfolio/",
+                "/sitemap.xml",
+            },
+            f"Unexpected pages for a project '{paths}'",
+        )
+
+    def test_save_purges_only_dependent_pages(self) -> None:
+        for path in ("/en/my-career/", "/es/my-career/", "/en/"):
+            self.client.get(path)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Experience.objects.create(title="Job", location="Remote", description="D", start_date=datetime.date.today())
+
+        self._assert_purged("/en/my-career/", purged=True)
+        self._assert_purged("/es/my-career/", purged=True)
+        self._assert_purged("/en/", purged=False)
+
+    def test_purges_every_variant_of_a_path(self) -> None:
+        self.client.get("/en/contact/")
+        self.client.get("/en/contact/?service=web")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FollowMeLink.objects.create(name="GitHub", link="https://github.com", svg_view_box="0 0 1 1", svg_path="M")
+
+        self._assert_purged("/en/contact/", purged=True)
+        response = self.client.get("/en/contact/?service=web")
+        self.assertIn(
+            "https://github.com", response.content.decode(), "Every cached variant of the page should be purged"
+        )
+
+    def test_slug_change_purges_former_detail_page(self) -> None:
+        self.client.get("/en/projects/portfolio/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.slug = "new-portfolio"
+            self.project.save()
+
+        response = self.client.get("/en/projects/portfolio/")
+        self.assertEqual(
+            response.status_code, 404, f"The former detail page should not be served, got '{response.status_code}'"
+        )
+
+    def test_m2m_change_purges_related_pages(self) -> None:
+        self.client.get("/en/projects/portfolio/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.technology.projects.add(self.project)
+
+        self._assert_purged("/en/projects/portfolio/", purged=True)
+
+    def test_delete_purges_pages_of_former_relations(self) -> None:
+        self.project.technologies.add(self.technology)
+        self.client.get("/en/projects/portfolio/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.technology.delete()
+
+        self._assert_purged("/en/projects/portfolio/", purged=True)
+
+    def test_no_purge_when_transaction_is_rolled_back(self) -> None:
+        self.client.get("/en/my-career/")
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Experience.objects.create(title="Job", location="Remote", description="D", start_date=datetime.date.today())
+
+        self.assertTrue(callbacks, "The purge should wait for the transaction to be committed")
+        self._assert_purged("/en/my-career/", purged=False)
@@ -0,0 +1,173 @@
+"""Tests for the static pre-rendering of the pages."""
+
+from __future__ import annotations
+
+import datetime
+import gzip
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import brotli
+from django.core.management import CommandError, call_command
+from django.core.signals import request_finished, request_started
+from django.test import TestCase, override_settings
+from django.utils import translation
+
+from core.prerender import get_page_file, prerender_pages, queue_prerender
+from home.models import Experience, PersonalInfo, Project
+
+EXPECTED_PAGES = {
+    f"/{language}/{page}"
+    for language in ("en", "es")
+    for page in ("", "my-career/", "projects/", "contact/", "projects/portfolio/")
+}
+
+
+@override_settings(ALLOWED_HOSTS=["www.example.com"], PRERENDER_HOST="www.example.com", PAGE_CACHE_COOKIELESS=True)
+class TestPrerender(TestCase):
+    project: Project
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        PersonalInfo.objects.create(name="Test User", title="Developer", introduction="Intro", biography="Bio")
+        cls.project = Project.objects.create(
+            title="Portfolio", slug="portfolio", summary="Summary", problem="P", approach="A", outcome="O"
+        )
+
+    def setUp(self) -> None:
+        self.enterContext(translation.override("en"))
+        self.root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(override_settings(PRERENDER_ROOT=str(self.root)))
+
+    def _prerender(self, *args: str) -> str:
+        output = StringIO()
+        call_command("prerender", *args, stdout=output)
+        return output.getvalue()
+
+    def _get_pages(self) -> set[str]:
+        return {f"/{file.parent.relative_to(self.root).as_posix()}/" for file in self.root.rglob("index.html")}
+
+    def test_writes_every_page_of_every_language(self) -> None:
+        self._prerender()
+        self.assertEqual(pages := self._get_pages(), EXPECTED_PAGES, f"Unexpected pre-rendered pages '{pages}'")
+
+    def test_writes_compressed_siblings(self) -> None:
+        self._prerender()
+        file = get_page_file(self.root, "/en/")
+        content = file.read_bytes()
+
+        self.assertEqual(
+            gzip.decompress(file.with_name("index.html.gz").read_bytes()),
+            content,
+            "The gzip sibling should decompress to the page",
+        )
+        self.assertEqual(
+            brotli.decompress(file.with_name("index.html.br").read_bytes()),
+            content,
+            "The brotli sibling should decompress to the page",
+        )
+
+    def test_pages_are_rendered_for_the_canonical_host_without_visitor_state(self) -> None:
+        self._prerender()
+        content = get_page_file(self.root, "/en/").read_text()
+
+        self.assertIn("https://www.example.com/en/", content, "The JSON-LD should use the canonical base URL")
+        self.assertIn('name="csrfmiddlewaretoken" value=""', content, "Pages should not embed a CSRF token")
+
+    def test_pages_are_rendered_without_the_request_signals(self) -> None:
+        # The test client's handler reconnects close_old_connections around each request, racing with
+        # the requests served by the other threads of the worker
+        receiver = mock.Mock()
+        for signal in (request_started, request_finished):
+            signal.connect(receiver, dispatch_uid="test_prerender_signals")
+            self.addCleanup(signal.disconnect, dispatch_uid="test_prerender_signals")
+
+        result = prerender_pages(["/en/"])
+
+        self.assertEqual(result.written, ["/en/"], f"Unexpected pre-rendered pages '{result.written}'")
+        receiver.assert_not_called()
+
+    def test_removes_pages_that_no_longer_exist(self) -> None:
+        self._prerender()
+        Project.objects.filter(pk=self.project.pk).update(slug="renamed")
+
+        output = self._prerender()
+
+        self.assertFalse(
+            get_page_file(self.root, "/en/projects/portfolio/").parent.exists(),
+            "The pages of the former slug should be removed",
+        )
+        self.assertIn("Removed /en/projects/portfolio/", output, f"Unexpected command output '{output}'")
+
+    def test_renders_only_the_given_paths(self) -> None:
+        self._prerender("--path", "/en/", "--path", "/es/")
+        self.assertEqual(pages := self._get_pages(), {"/en/", "/es/"}, f"Unexpected pre-rendered pages '{pages}'")
+
+    def test_requires_cookieless_pages(self) -> None:
+        with override_settings(PAGE_CACHE_COOKIELESS=False), self.assertRaises(CommandError):
+            self._prerender()
+
+    def test_maintenance_mode_removes_every_page(self) -> None:
+        self._prerender()
+
+        with override_settings(MAINTENANCE_MODE=True):
+            output = self._prerender()
+
+        self.assertEqual(pages := self._get_pages(), set(), f"No page should be left pre-rendered, got '{pages}'")
+        self.assertEqual(list(self.root.iterdir()), [], "The directories of the pages should be removed")
+        self.assertIn("Removed /en/", output, f"Unexpected command output '{output}'")
+
+    def test_save_renders_only_the_affected_pages_again(self) -> None:
+        self._prerender()
+        home_file = get_page_file(self.root, "/en/")
+        home_file.write_text("unchanged")
+
+        # Rendered in the calling thread, where the test data is visible
+        with (
+            mock.patch("core.page_cache_invalidation.queue_prerender", side_effect=prerender_pages),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            Experience.objects.create(
+                title="New Job", location="Remote", description="D", start_date=datetime.date.today()
+            )
+
+        self.assertIn(
+            "New Job", get_page_file(self.root, "/en/my-career/").read_text(), "The affected page should be rendered"
+        )
+        self.assertEqual(home_file.read_text(), "unchanged", "Pages not depending on the change should be kept")
+
+    def test_delete_removes_the_pages_of_the_instance(self) -> None:
+        self._prerender()
+
+        with (
+            mock.patch("core.page_cache_invalidation.queue_prerender", side_effect=prerender_pages),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            self.project.delete()
+
+        self.assertEqual(
+            pages := self._get_pages(),
+            EXPECTED_PAGES - {"/en/projects/portfolio/", "/es/projects/portfolio/"},
+            f"Unexpected pre-rendered pages after the deletion '{pages}'",
+        )
+
+    def test_save_queues_the_affected_pages_once_committed(self) -> None:
+        with mock.patch("core.page_cache_invalidation.queue_prerender") as queue:
+            with self.captureOnCommitCallbacks(execute=True):
+                Experience.objects.create(
+                    title="New Job", location="Remote", description="D", start_date=datetime.date.today()
+                )
+                queue.assert_not_called()
+
+        self.assertEqual(
+            queued := queue.call_args.args[0],
+            {"/en/my-career/", "/es/my-career/"},
+            f"Only the affected pages should be queued, got '{queued}'",
+        )
+
+    def test_queued_pages_are_rendered_in_the_background(self) -> None:
+        result = queue_prerender(["/en/no-such-page/"]).result(timeout=30)
+
+        self.assertEqual(result.written, [], f"Unexpected pre-rendered pages '{result.written}'")
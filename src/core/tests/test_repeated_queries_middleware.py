@@ -0,0 +1,51 @@
+"""Tests for the DEBUG-only middleware logging the queries repeated within a request."""
+
+from __future__ import annotations
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from core.middleware import RepeatedQueriesMiddleware
+from home.models import Project
+
+
+def _get_response_querying_projects(times: int) -> HttpResponse:
+    for index in range(times):
+        list(Project.objects.filter(slug=f"project-{index}"))
+    return HttpResponse()
+
+
+@override_settings(DEBUG=True, REPEATED_QUERIES_THRESHOLD=2)
+class TestRepeatedQueriesMiddleware(TestCase):
+    def _send_request(self, times: int) -> None:
+        def get_response(request: HttpRequest) -> HttpResponse:
+            return _get_response_querying_projects(times)
+
+        RepeatedQueriesMiddleware(get_response)(RequestFactory().get("/en/projects/"))
+
+    def test_repeated_query_is_logged(self) -> None:
+        with self.assertLogs("queries", level="WARNING") as logs:
+            self._send_request(times=3)
+
+        self.assertEqual(len(logs.records), 1, f"Expected a single warning, got '{logs.output}'")
+        self.assertIn(
+            "Query repeated 3 times in GET /en/projects/",
+            message := logs.records[0].getMessage(),
+            f"Unexpected warning '{message}'",
+        )
+        self.assertIn('FROM "home_project"', message, f"The warning should include the SQL, got '{message}'")
+
+    def test_single_query_is_not_logged(self) -> None:
+        with self.assertNoLogs("queries", level="WARNING"):
+            self._send_request(times=1)
+
+    @override_settings(REPEATED_QUERIES_THRESHOLD=4)
+    def test_queries_below_the_threshold_are_not_logged(self) -> None:
+        with self.assertNoLogs("queries", level="WARNING"):
+            self._send_request(times=3)
+
+    @override_settings(DEBUG=False)
+    def test_not_used_without_debug(self) -> None:
+        with self.assertRaises(MiddlewareNotUsed):
+            RepeatedQueriesMiddleware(lambda request: HttpResponse())
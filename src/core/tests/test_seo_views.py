@@ -18,6 +18,8 @@ _EXCLUDED_FROM_SITEMAP: frozenset[str] = frozenset(
         "robots_txt",  # meta: crawlers read this, not users
         "django.contrib.sitemaps.views.sitemap",  # meta: the sitemap file itself
         "set_language",  # Django i18n language switcher
+        "visitor_state",  # per-visitor parts of cached pages, fetched by the browser
+        "metrics",  # Prometheus metrics, for the scrapers only
         "accept_all_cookies",  # cookie-consent action (django_cooco)
         "reject_all_cookies",  # cookie-consent action (django_cooco)
         "set_cookie_preferences",  # cookie-consent action (django_cooco)
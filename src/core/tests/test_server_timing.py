@@ -0,0 +1,67 @@
+"""Tests for the per-request Server-Timing instrumentation."""
+
+from __future__ import annotations
+
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.utils import translation
+
+from core.server_timing import collect_timings, time_phase
+from home.models import PersonalInfo
+from utils.helpers import markdown_to_plaintext
+
+
+@override_settings(SERVER_TIMING_SAMPLE_RATE=1.0)
+class TestServerTimingMiddleware(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        PersonalInfo.objects.create(name="Test User", title="Developer", introduction="Intro", biography="Bio")
+
+    def setUp(self) -> None:
+        self.enterContext(translation.override("en"))
+
+    def test_header_has_the_timed_phases(self) -> None:
+        header = Client().get("/en/")["Server-Timing"]
+        phases = {metric.split(";")[0] for metric in header.split(", ")}
+
+        self.assertLessEqual(
+            {"total", "db", "template"}, phases, f"Expected the total, db and template phases, got '{header}'"
+        )
+
+    def test_breakdown_is_logged_as_structured_fields(self) -> None:
+        with self.assertLogs("server_timing", level="INFO") as logs:
+            Client().get("/en/")
+
+        record = logs.records[0]
+        self.assertEqual(path := getattr(record, "path", None), "/en/", f"Expected the path '/en/', got '{path}'")
+        self.assertEqual(status := getattr(record, "status_code", None), 200, f"Expected status 200, got '{status}'")
+        timings = getattr(record, "timings", {})
+        self.assertGreater(
+            count := timings.get("db", {}).get("count", 0), 0, f"Expected the queries to be counted, got '{count}'"
+        )
+        self.assertIn("duration_ms", timings.get("total", {}), f"Expected the total duration, got '{timings}'")
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0.0)
+    def test_disabled_without_sample_rate(self) -> None:
+        with self.assertNoLogs("server_timing"):
+            response = Client().get("/en/")
+
+        self.assertNotIn("Server-Timing", response, "Requests should not be timed with a sample rate of 0")
+
+
+class TestTimePhase(SimpleTestCase):
+    def test_nested_phases_are_counted_once(self) -> None:
+        with collect_timings() as timings:
+            markdown_to_plaintext("Some *markdown*")
+
+        self.assertEqual(
+            count := timings.counts.get("markdown"), 1, f"Expected a single markdown conversion, got '{count}'"
+        )
+
+    def test_phases_outside_of_a_timed_request_are_ignored(self) -> None:
+        with time_phase("http"):
+            pass
+
+        with collect_timings() as timings:
+            pass
+
+        self.assertNotIn("http", timings.durations, "Phases outside of the timed context should not be recorded")
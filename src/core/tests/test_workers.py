@@ -0,0 +1,116 @@
+"""Tests for the sizing, warm-up and recycling of the gunicorn workers."""
+
+from __future__ import annotations
+
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.utils import translation
+
+from core.metrics import render_metrics, reset_metrics
+from core.workers import WorkerSettings, get_cpu_quota, get_memory_usage, get_worker_settings, warm_up
+from home.models import PersonalInfo, Project
+
+
+class TestWorkerSizing(SimpleTestCase):
+    def setUp(self) -> None:
+        self.cgroup_root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+
+    def test_cpu_quota_of_cgroup_v2(self) -> None:
+        (self.cgroup_root / "cpu.max").write_text("150000 100000\n")
+
+        self.assertEqual(quota := get_cpu_quota(self.cgroup_root), 1.5, f"Expected a quota of 1.5 CPUs, got {quota}")
+
+    def test_cpu_quota_of_cgroup_v2_without_limit(self) -> None:
+        (self.cgroup_root / "cpu.max").write_text("max 100000\n")
+
+        self.assertIsNone(quota := get_cpu_quota(self.cgroup_root), f"Expected no quota, got {quota}")
+
+    def test_cpu_quota_of_cgroup_v1(self) -> None:
+        (self.cgroup_root / "cpu").mkdir()
+        (self.cgroup_root / "cpu" / "cpu.cfs_quota_us").write_text("50000\n")
+        (self.cgroup_root / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+
+        self.assertEqual(quota := get_cpu_quota(self.cgroup_root), 0.5, f"Expected a quota of 0.5 CPUs, got {quota}")
+
+    def test_cpu_quota_of_cgroup_v1_without_limit(self) -> None:
+        (self.cgroup_root / "cpu").mkdir()
+        (self.cgroup_root / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+        (self.cgroup_root / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+
+        self.assertIsNone(quota := get_cpu_quota(self.cgroup_root), f"Expected no quota, got {quota}")
+
+    def test_no_cpu_quota_without_cgroup(self) -> None:
+        self.assertIsNone(quota := get_cpu_quota(self.cgroup_root), f"Expected no quota, got {quota}")
+
+    def test_worker_settings(self) -> None:
+        for cpus, expected in (
+            (0.5, WorkerSettings(workers=2, worker_class="gthread", threads=4)),
+            (1, WorkerSettings(workers=3, worker_class="sync", threads=1)),
+            (2.5, WorkerSettings(workers=5, worker_class="sync", threads=1)),
+        ):
+            with self.subTest(cpus=cpus):
+                self.assertEqual(
+                    settings := get_worker_settings(cpus),
+                    expected,
+                    f"Unexpected workers for {cpus} CPUs: {settings}",
+                )
+
+    def test_memory_usage(self) -> None:
+        self.assertGreater(get_memory_usage(), 0, "Expected the resident memory of the process")
+
+
+@override_settings(ALLOWED_HOSTS=["www.example.com"], PRERENDER_HOST="www.example.com", PAGE_CACHE_COOKIELESS=True)
+class TestWarmUp(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        PersonalInfo.objects.create(name="Test User", title="Developer", introduction="Intro", biography="Bio")
+        Project.objects.create(
+            title="Portfolio", slug="portfolio", summary="Summary", problem="P", approach="A", outcome="O"
+        )
+
+    def setUp(self) -> None:
+        self.enterContext(translation.override("en"))
+        reset_metrics()
+        self.addCleanup(reset_metrics)
+
+    def test_renders_every_page_of_every_language(self) -> None:
+        pages: list[None] = []
+
+        result = warm_up(on_page=lambda: pages.append(None))
+
+        self.assertEqual(result.pages, 10, f"Expected 5 pages in 2 languages, got {result.pages}")
+        self.assertEqual(result.failed, [], f"Expected every page to be rendered, got failures for {result.failed}")
+        self.assertEqual(len(pages), 10, f"Expected to be notified after each page, got {len(pages)} notifications")
+        self.assertEqual(
+            language := translation.get_language(), "en", f"Expected the language to be restored, got '{language}'"
+        )
+
+    @override_settings(CACHE_MIDDLEWARE_SECONDS=60)
+    def test_stores_the_pages_in_the_cache(self) -> None:
+        warm_up()
+
+        with self.assertNumQueries(0):
+            response = Client(headers={"x-forwarded-proto": "https", "host": "www.example.com"}).get(
+                "/es/projects/", secure=True
+            )
+        self.assertEqual(response.status_code, 200, f"Expected the page to be served, got {response.status_code}")
+
+    @override_settings(CACHE_MIDDLEWARE_SECONDS=60)
+    def test_not_counted_in_the_metrics(self) -> None:
+        warm_up()
+
+        text = render_metrics()
+        for prefix in ("django_http_request_duration_seconds_count", "django_page_cache_lookups_total{"):
+            lines = [line for line in text.splitlines() if line.startswith(prefix)]
+            self.assertEqual(lines, [], f"Expected the warm-up requests not to be counted, got {lines}")
+
+
+class TestBenchstartupCommand(SimpleTestCase):
+    def test_invalid_options_are_refused(self) -> None:
+        for options in ({"workers": 0}, {"passes": 0}, {"fast_ms": 0}):
+            with self.subTest(options=options), self.assertRaises(CommandError):
+                call_command("benchstartup", stdout=StringIO(), **options)
@@ -24,8 +24,9 @@ from django.contrib.sitemaps.views import sitemap
 from django.urls import include, path
 
 from core import settings
+from core.conditional_get import content_condition
 from core.sitemaps import ProjectSitemap, StaticViewSitemap
-from core.views import RobotsTxtView
+from core.views import MetricsView, RobotsTxtView, VisitorStateView
 
 handler404 = "core.views.page_not_found"
 
@@ -40,10 +41,15 @@ urlpatterns = (
         path("", include("home.urls")),
         path("contact/", include("contact.urls")),
         path("i18n/", include("django.conf.urls.i18n")),
+        path("visitor-state/", VisitorStateView.as_view(), name="visitor_state"),
     ),
     path("robots.txt", RobotsTxtView.as_view(), name="robots_txt"),
-    path("sitemap.xml", sitemap, {"sitemaps": sitemaps}, name="django.contrib.sitemaps.views.sitemap"),
+    path(
+        "sitemap.xml", content_condition(sitemap), {"sitemaps": sitemaps}, name="django.contrib.sitemaps.views.sitemap"
+    ),
     path("cookie-consent/", include("django_cooco.urls")),
+    # Outside of the language prefixes, for the scrapers
+    path("metrics", MetricsView.as_view(), name="metrics"),
 )
 
 if settings.DEBUG:
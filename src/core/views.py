@@ -1,14 +1,31 @@
 from __future__ import annotations
 
+import hashlib
+import hmac
+import ipaddress
+from http import HTTPStatus
 from typing import TYPE_CHECKING
 
 from django.conf import settings
-from django.http import HttpResponse
+from django.contrib.messages import get_messages
+from django.http import Http404, HttpResponse, JsonResponse
+from django.middleware.csrf import get_token
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils.decorators import method_decorator
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext
 from django.views import View
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import condition
+from django_cooco.templatetags.cooco import is_cookie_group_accepted
+from django_cooco.utils import CooCoManager
 
+from base.models import GoogleAnalytics
+from contact.rate_limit import get_client_ip
+from core.metrics import render_metrics
+from utils.singletons import get_solo
 from utils.types import PageMetadata
 
 if TYPE_CHECKING:
@@ -31,6 +48,22 @@ def page_not_found(request: HttpRequest, exception: Exception) -> HttpResponse:
     )
 
 
+def _get_robots_txt(request: HttpRequest) -> str:
+    lines = [
+        "User-agent: *",
+        "Allow: /",
+        *[f"Disallow: {path}" for path in settings.ROBOTS_DISALLOW_PATHS],
+        "",
+        f"Sitemap: {request.scheme}://{request.get_host()}/sitemap.xml",
+    ]
+    return "\n".join(lines)
+
+
+def _get_robots_txt_etag(request: HttpRequest) -> str:
+    return hashlib.md5(_get_robots_txt(request).encode()).hexdigest()
+
+
+@method_decorator(condition(etag_func=_get_robots_txt_etag), name="dispatch")
 class RobotsTxtView(View):
     """Serve robots.txt file dynamically."""
 
@@ -43,11 +76,86 @@ class RobotsTxtView(View):
         Returns:
             An HttpResponse containing the robots.txt content.
         """
-        lines = [
-            "User-agent: *",
-            "Allow: /",
-            *[f"Disallow: {path}" for path in settings.ROBOTS_DISALLOW_PATHS],
-            "",
-            f"Sitemap: {request.scheme}://{request.get_host()}/sitemap.xml",
-        ]
-        return HttpResponse("\n".join(lines), content_type="text/plain")
+        return HttpResponse(_get_robots_txt(request), content_type="text/plain")
+
+
+@method_decorator(never_cache, name="dispatch")
+class VisitorStateView(View):
+    """Serve the per-visitor parts of the cached pages, filled in by the browser after load."""
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        """Return the CSRF token, pending messages and cookie consent state of the visitor.
+
+        Args:
+            request: The HTTP request object. The `next` query parameter holds the path of
+                the page being completed, used as redirect target by the cookie consent forms.
+
+        Returns:
+            A JsonResponse with the visitor state.
+        """
+        page_path = request.GET.get("next", "")
+        if not url_has_allowed_host_and_scheme(page_path, allowed_hosts={request.get_host()}):
+            page_path = "/"
+
+        cooco_manager = CooCoManager.from_request(request)
+        analytics = get_solo(GoogleAnalytics)
+
+        return JsonResponse(
+            {
+                "csrf_token": get_token(request),
+                "messages": render_to_string(
+                    "cotton/messages.html", {"messages": get_messages(request)}, request
+                ).strip(),
+                "cookie_consent_banner": (
+                    render_to_string(
+                        "cotton/cookie_consent_banner/index.html", {"page_path": page_path}, request
+                    ).strip()
+                    if cooco_manager.is_cooco_outdated()
+                    else ""
+                ),
+                "analytics_consent": analytics.use_analytics
+                and analytics.cookie_consent is not None
+                and is_cookie_group_accepted(cooco_manager, analytics.cookie_consent),
+            }
+        )
+
+
+def _is_metrics_access_allowed(request: HttpRequest) -> bool:
+    if settings.METRICS_TOKEN:
+        authorization = request.headers.get("Authorization", "")
+        if hmac.compare_digest(authorization.encode(), f"Bearer {settings.METRICS_TOKEN}".encode()):
+            return True
+
+    if settings.METRICS_ALLOWED_IPS:
+        try:
+            client_ip = ipaddress.ip_address(get_client_ip(request))
+        except ValueError:
+            return False
+        return any(client_ip in ipaddress.ip_network(network, strict=False) for network in settings.METRICS_ALLOWED_IPS)
+
+    return False
+
+
+@method_decorator(never_cache, name="dispatch")
+class MetricsView(View):
+    """Serve the Prometheus metrics of the site, summed across its processes (see core.metrics)."""
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        """Return the metrics in the Prometheus text format.
+
+        Args:
+            request: The HTTP request object, bearing `METRICS_TOKEN` or coming from `METRICS_ALLOWED_IPS`.
+
+        Returns:
+            An HttpResponse with the metrics, or a 403 response if the request is not allowed.
+
+        Raises:
+            Http404: If neither `METRICS_TOKEN` nor `METRICS_ALLOWED_IPS` is set.
+        """
+        if not settings.METRICS_TOKEN and not settings.METRICS_ALLOWED_IPS:
+            raise Http404
+
+        if not _is_metrics_access_allowed(request):
+            return HttpResponse(status=HTTPStatus.FORBIDDEN)
+
+        return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
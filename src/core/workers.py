@@ -0,0 +1,140 @@
+"""Sizing, warm-up and recycling of the gunicorn workers (see gunicorn.conf.py).
+
+The number of workers is derived from the CPU quota of the container (its cgroup), as a
+container limited to a share of the CPUs of its host still sees all of them. The workers are
+forked from the arbiter, which preloaded the app, and warm up before serving their first
+request: they connect to the database and render every page in each language, compiling the
+templates and loading the translations of the process and storing the pages in the shared
+page cache. A worker whose memory grew past a limit is recycled gracefully, once its current
+request is served.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from http import HTTPStatus
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from django.db import connections
+from django.utils import translation
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from django.http import HttpRequest
+
+# WSGI environ key marking the requests of the warm-up, which can't be set through HTTP headers
+WARM_UP_ENVIRON_KEY = "portfolio.warm_up"
+
+_CGROUP_ROOT = Path("/sys/fs/cgroup")
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+class WorkerSettings(NamedTuple):
+    """Number, class and threads of the gunicorn workers."""
+
+    workers: int
+    worker_class: str
+    threads: int
+
+
+class WarmUpResult(NamedTuple):
+    """Pages rendered by the warm-up of a worker, those not rendered successfully, and its duration."""
+
+    pages: int
+    failed: list[str]
+    seconds: float
+
+
+def get_cpu_quota(cgroup_root: Path = _CGROUP_ROOT) -> float | None:
+    """Return the number of CPUs the container may use per its cgroup quota, or None without a quota.
+
+    Args:
+        cgroup_root: The mount point of the cgroup filesystem.
+    """
+    # cgroup v2: "<quota> <period>", the quota being "max" without a limit
+    try:
+        quota, period = (cgroup_root / "cpu.max").read_text().split()
+    except (OSError, ValueError):
+        pass
+    else:
+        return None if quota == "max" else int(quota) / int(period)
+
+    # cgroup v1: a quota of -1 without a limit
+    try:
+        cfs_quota = int((cgroup_root / "cpu" / "cpu.cfs_quota_us").read_text())
+        cfs_period = int((cgroup_root / "cpu" / "cpu.cfs_period_us").read_text())
+    except (OSError, ValueError):
+        return None
+    return cfs_quota / cfs_period if cfs_quota > 0 else None
+
+
+def get_cpu_count() -> float:
+    """Return the number of CPUs available to the process: its CPU affinity, bounded by the quota of its cgroup."""
+    cpus: float = os.process_cpu_count() or 1
+    if (quota := get_cpu_quota()) is not None:
+        cpus = min(cpus, quota)
+    return cpus
+
+
+def get_worker_settings(cpus: float) -> WorkerSettings:
+    """Return the gunicorn workers fitting the given number of CPUs.
+
+    Two sync workers per whole CPU, plus one, for a worker to run while another waits on I/O.
+    Below a whole CPU, more processes would only contend for it: two workers with a few threads
+    each cover the waits on the database and on the outbound calls instead.
+
+    Args:
+        cpus: The number of CPUs available, possibly fractional.
+    """
+    if cpus < 1:
+        return WorkerSettings(workers=2, worker_class="gthread", threads=4)
+    return WorkerSettings(workers=2 * int(cpus) + 1, worker_class="sync", threads=1)
+
+
+def get_memory_usage() -> int:
+    """Return the resident memory of the process, in bytes."""
+    # The second field is the number of resident pages
+    return int(Path("/proc/self/statm").read_text().split()[1]) * _PAGE_SIZE
+
+
+def is_warm_up_request(request: HttpRequest) -> bool:
+    """Return whether the request was made by the warm-up of a worker, rather than by a visitor."""
+    return bool(request.META.get(WARM_UP_ENVIRON_KEY))
+
+
+def warm_up(on_page: Callable[[], object] | None = None) -> WarmUpResult:
+    """Connect to the databases and render every page in each language, storing them in the page cache.
+
+    The pages are rendered even if already cached (e.g. by another worker), for the templates
+    and translations of the process to be loaded; they are not counted in the metrics.
+
+    Args:
+        on_page: Called after each page, e.g. for the worker to notify the arbiter that it is alive.
+
+    Returns:
+        The number of pages rendered, those not rendered successfully, and the duration.
+    """
+    # Imported on use: this module is imported by gunicorn.conf.py, before the apps are loaded
+    from core.prerender import SiteRenderer, get_prerender_paths  # noqa: PLC0415
+
+    start = time.perf_counter()
+    for connection in connections.all():
+        connection.ensure_connection()
+
+    paths = sorted(get_prerender_paths())
+    renderer = SiteRenderer(**{WARM_UP_ENVIRON_KEY: True})
+    failed: list[str] = []
+
+    # The views activate the language of each page: restore the caller's once done
+    with translation.override(translation.get_language()):
+        for path in paths:
+            response = renderer.get(path)
+            if response.status_code != HTTPStatus.OK:
+                failed.append(path)
+            if on_page is not None:
+                on_page()
+
+    return WarmUpResult(pages=len(paths), failed=failed, seconds=time.perf_counter() - start)
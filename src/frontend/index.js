@@ -4,6 +4,9 @@ import "./styles/main.css";
 import { initProgressBar } from "./javascript/progress_bar";
 import { setupContactForm } from "./javascript/contact_form";
 import { initStickyHeadings } from "./javascript/sticky_headings";
+import { loadVisitorState } from "./javascript/visitor_state";
+
+document.addEventListener("DOMContentLoaded", loadVisitorState);
 
 window.addEventListener("load", () => {
   initProgressBar();
@@ -0,0 +1,47 @@
+/**
+ * Fill in the per-visitor parts of a cached page (CSRF token, messages, cookie
+ * consent banner and analytics consent) from the uncached visitor state view.
+ *
+ * Only runs on pages rendered with PAGE_CACHE_COOKIELESS, which expose the view
+ * URL in the `data-visitor-state-url` attribute of the <html> element.
+ */
+export function loadVisitorState() {
+  const visitorStateUrl = document.documentElement.dataset.visitorStateUrl;
+
+  if (!visitorStateUrl) {
+    return;
+  }
+
+  const params = new URLSearchParams({ next: window.location.pathname });
+
+  fetch(`${visitorStateUrl}?${params}`, { credentials: "same-origin" })
+    .then(function (response) {
+      return response.json();
+    })
+    .then(function (state) {
+      document
+        .querySelectorAll("input[data-visitor-csrf-token]")
+        .forEach(function (input) {
+          input.value = state.csrf_token;
+        });
+
+      const alertsContainer = document.getElementById("response-alerts");
+      if (alertsContainer && state.messages) {
+        alertsContainer.insertAdjacentHTML("afterbegin", state.messages);
+      }
+
+      if (state.cookie_consent_banner) {
+        document.body.insertAdjacentHTML(
+          "beforeend",
+          state.cookie_consent_banner,
+        );
+      }
+
+      if (state.analytics_consent && typeof window.gtag === "function") {
+        window.gtag("consent", "update", { analytics_storage: "granted" });
+      }
+    })
+    .catch(function (error) {
+      console.error("Visitor state error:", error);
+    });
+}
@@ -0,0 +1,90 @@
+"""Configuration of gunicorn, serving the site in production (see core.workers).
+
+The app is preloaded by the arbiter, so the workers share its memory and fork ready to serve;
+each one then warms up before accepting requests. `kill -HUP` on the arbiter replaces the
+workers gracefully, letting them finish their requests, e.g. to apply new environment
+variables; as the app is preloaded, new code needs the container to be restarted.
+
+Every setting can be overridden through `GUNICORN_CMD_ARGS` or on the command line.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from core.workers import get_cpu_count, get_memory_usage, get_worker_settings
+
+if TYPE_CHECKING:
+    from gunicorn.arbiter import Arbiter
+    from gunicorn.http.message import Request
+    from gunicorn.http.wsgi import Response
+    from gunicorn.workers.base import Worker
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+_worker_settings = get_worker_settings(get_cpu_count())
+
+# Recycle a worker once its resident memory exceeds this many MiB, after its current request (0 to disable)
+_max_worker_memory = int(os.environ.get("GUNICORN_MAX_WORKER_MEMORY_MB") or 300) * 1024 * 1024
+# Render every page in each language in the workers before they accept requests
+_warm_up = (os.environ.get("GUNICORN_WARM_UP") or "true").lower() in ("1", "true", "yes")
+
+bind = "0.0.0.0:8000"
+# Derived from the CPU quota of the container, unless set
+workers = int(os.environ.get("WEB_CONCURRENCY") or 0) or _worker_settings.workers
+worker_class = _worker_settings.worker_class
+threads = _worker_settings.threads
+
+preload_app = True
+# The heartbeats of the workers, in memory rather than on the overlay filesystem of the container
+worker_tmp_dir = "/dev/shm" if Path("/dev/shm").is_dir() else None
+timeout = 30
+graceful_timeout = 30
+# Recycle the workers after this many requests as well, jittered not to restart them all at once
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS") or 2000)
+max_requests_jitter = max_requests // 10
+
+
+def pre_fork(server: Arbiter, worker: Worker) -> None:
+    from django.db import connections  # noqa: PLC0415
+
+    from core.db_pool import close_pools  # noqa: PLC0415
+
+    # No database connection (nor pool) of the arbiter is inherited by the workers
+    connections.close_all()
+    close_pools()
+
+
+def post_worker_init(worker: Worker) -> None:
+    # Called in the forked worker once initialised, before it accepts requests
+    if not _warm_up:
+        return
+
+    from core.workers import warm_up  # noqa: PLC0415
+
+    try:
+        # Notifying the arbiter after each page, not to be killed for a warm-up longer than the timeout
+        result = warm_up(on_page=worker.notify)
+    except Exception:
+        worker.log.exception("Warm-up of the worker failed")
+        return
+
+    worker.log.info("Worker warmed up: %d pages rendered in %.2fs", result.pages, result.seconds)
+    if result.failed:
+        worker.log.warning("Pages not rendered by the warm-up of the worker: %s", ", ".join(result.failed))
+
+
+def post_request(worker: Worker, req: Request, environ: dict[str, Any], resp: Response) -> None:
+    if _max_worker_memory and worker.alive and (memory := get_memory_usage()) > _max_worker_memory:
+        worker.log.info("Recycling the worker, using %d MiB of memory", memory // (1024 * 1024))
+        # Exits once the current request is served; the arbiter forks a new worker
+        worker.alive = False
+
+
+def child_exit(server: Arbiter, worker: Worker) -> None:
+    from core.metrics import archive_process  # noqa: PLC0415
+
+    # The metrics of a worker killed before it archived them itself
+    archive_process(worker.pid)
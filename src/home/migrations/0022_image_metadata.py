@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:13
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (("home", "0021_updated_at"),)
+
+    operations = (
+        migrations.AddField(
+            model_name="project",
+            name="hero_image_color",
+            field=models.CharField(blank=True, editable=False, max_length=7),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="hero_image_height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="hero_image_placeholder",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="hero_image_width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    )
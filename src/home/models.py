@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import datetime
 from functools import cached_property
+from types import MappingProxyType
 from typing import TYPE_CHECKING, NamedTuple
 
 from django.db import models
@@ -9,15 +10,17 @@ from django.forms import ValidationError
 from django.template.defaultfilters import date as datefilter
 from django.utils.translation import gettext, ngettext
 from django.utils.translation import gettext_lazy as _
-from imagekit.models import ImageSpecField
-from imagekit.processors import SmartResize
 from solo.models import SingletonModel
 
+from utils.images import ResponsiveImageField
+from utils.models import ImageMetadataModel, MarkdownRendering, RenderedMarkdownModel, TimestampedModel
+from utils.singletons import find_solo
+
 if TYPE_CHECKING:
     from django_stubs_ext import StrOrPromise
 
 
-class Technology(models.Model):
+class Technology(TimestampedModel):
     name = models.CharField(max_length=100, unique=True)
     priority = models.PositiveIntegerField(default=0)
 
@@ -29,14 +32,24 @@ class Technology(models.Model):
         return self.name
 
 
-class PersonalInfo(SingletonModel):
+class PersonalInfo(RenderedMarkdownModel, TimestampedModel, SingletonModel):
     name = models.CharField(max_length=100)
     title = models.CharField(max_length=100)
     location = models.CharField(max_length=200, blank=True)
     introduction = models.TextField(max_length=500)
+    introduction_html = models.TextField(blank=True, editable=False)
+    introduction_plaintext = models.TextField(blank=True, editable=False)
     biography = models.TextField()
+    biography_html = models.TextField(blank=True, editable=False)
     technologies = models.ManyToManyField(Technology, blank=True, related_name="personal_info")
 
+    rendered_markdown_fields = MappingProxyType(
+        {
+            "introduction": (MarkdownRendering.HTML, MarkdownRendering.PLAINTEXT),
+            "biography": (MarkdownRendering.HTML,),
+        }
+    )
+
     @cached_property
     def technology_names(self) -> tuple[str, ...]:
         """Return a tuple of technology names associated with this personal info."""
@@ -57,7 +70,7 @@ class PersonalInfo(SingletonModel):
             "title": self.title,
         }
 
-        if self.technologies.exists():
+        if self.technology_names:
             description += " " + gettext("specialized in %(tech)s") % {
                 "tech": ", ".join(self.technology_names[:3]),
             }
@@ -68,6 +81,12 @@ class PersonalInfo(SingletonModel):
         """Return the page keywords for SEO purposes."""
         return ", ".join(tech.lower() for tech in self.technology_names)
 
+    @staticmethod
+    def get_page_title_suffix() -> str:
+        """Return the suffix of the page titles with the name of the portfolio owner, if set up."""
+        personal_info = find_solo(PersonalInfo)
+        return f" | {personal_info.name}" if personal_info and personal_info.name else ""
+
 
 class DatedModel(models.Model):
     start_date = models.DateField()
@@ -126,13 +145,17 @@ class DatedModel(models.Model):
         return ", ".join((p for p in parts if p))
 
 
-class Experience(DatedModel):
+class Experience(RenderedMarkdownModel, TimestampedModel, DatedModel):
     title = models.CharField(max_length=200)
     location = models.CharField(max_length=200)
     institution = models.CharField(max_length=200, blank=True, verbose_name="Company")
     description = models.TextField()
+    description_html = models.TextField(blank=True, editable=False)
+    description_plaintext = models.TextField(blank=True, editable=False)
     technologies = models.ManyToManyField(Technology, blank=True, related_name="experiences")
 
+    rendered_markdown_fields = MappingProxyType({"description": (MarkdownRendering.HTML, MarkdownRendering.PLAINTEXT)})
+
     def __str__(self) -> str:
         if self.institution:
             return gettext("%(title)s at %(institution)s") % {"title": self.title, "institution": self.institution}
@@ -140,35 +163,54 @@ class Experience(DatedModel):
         return self.title
 
 
-class Project(models.Model):
+class Project(ImageMetadataModel, RenderedMarkdownModel, TimestampedModel):
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=200, unique=True)
     summary = models.CharField(max_length=200, help_text="Short, problem-oriented excerpt shown on project cards.")
+    summary_plaintext = models.TextField(blank=True, editable=False)
     problem = models.TextField()
+    problem_html = models.TextField(blank=True, editable=False)
     approach = models.TextField()
+    approach_html = models.TextField(blank=True, editable=False)
     outcome = models.TextField()
+    outcome_html = models.TextField(blank=True, editable=False)
     technologies = models.ManyToManyField(Technology, blank=True, related_name="projects")
     hero_image = models.ImageField(upload_to="projects/", blank=True, null=True)
+    hero_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    hero_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    hero_image_color = models.CharField(max_length=7, blank=True, editable=False)
+    hero_image_placeholder = models.TextField(blank=True, editable=False)
 
-    # Card thumbnail — keeps the listing/featured grids light
-    card_image = ImageSpecField(
+    # Card thumbnail — keeps the listing/featured grids light (a third of the grid on desktop)
+    card_images = ResponsiveImageField(
         source="hero_image",
-        processors=[SmartResize(400, 225)],
-        format="WEBP",
-        options={"quality": 80},
+        widths=(400, 800),
+        aspect_ratio=(16, 9),
+        sizes="(min-width: 1024px) 384px, (min-width: 640px) 50vw, 100vw",
     )
 
-    # Larger 16:9 render for the project detail hero.
-    hero_display = ImageSpecField(
+    # Larger 16:9 render for the project detail hero, as wide as the content column.
+    hero_images = ResponsiveImageField(
         source="hero_image",
-        processors=[SmartResize(1600, 900)],
-        format="WEBP",
-        options={"quality": 85},
+        widths=(640, 1024, 1600),
+        aspect_ratio=(16, 9),
+        sizes="(min-width: 1024px) 976px, calc(100vw - 3rem)",
+        fallback_width=1024,
     )
 
     featured = models.BooleanField(default=False)
     order = models.PositiveIntegerField(default=0)
 
+    rendered_markdown_fields = MappingProxyType(
+        {
+            "summary": (MarkdownRendering.PLAINTEXT,),
+            "problem": (MarkdownRendering.HTML,),
+            "approach": (MarkdownRendering.HTML,),
+            "outcome": (MarkdownRendering.HTML,),
+        }
+    )
+    image_metadata_fields = ("hero_image",)
+
     class Meta:
         ordering = ("order", "title")
 
@@ -301,15 +343,18 @@ SERVICE_ICON_CHOICES = (
 )
 
 
-class Service(models.Model):
+class Service(RenderedMarkdownModel, TimestampedModel):
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=200, unique=True)
     short_description = models.CharField(max_length=300)
     long_description = models.TextField()
+    long_description_html = models.TextField(blank=True, editable=False)
     icon_name = models.CharField(max_length=100, blank=True, choices=SERVICE_ICON_CHOICES)
     order = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
 
+    rendered_markdown_fields = MappingProxyType({"long_description": (MarkdownRendering.HTML,)})
+
     class Meta:
         ordering = ("order", "title")
 
@@ -322,7 +367,7 @@ class Service(models.Model):
         return SERVICE_ICON_PATHS.get(self.icon_name, DEFAULT_SERVICE_ICON_PATH).path
 
 
-class ProcessStep(models.Model):
+class ProcessStep(TimestampedModel):
     title = models.CharField(max_length=200)
     description = models.TextField()
     icon_name = models.CharField(max_length=100, blank=True, choices=SERVICE_ICON_CHOICES)
@@ -339,11 +384,15 @@ class ProcessStep(models.Model):
         return SERVICE_ICON_PATHS.get(self.icon_name, DEFAULT_SERVICE_ICON_PATH).path
 
 
-class Education(DatedModel):
+class Education(RenderedMarkdownModel, TimestampedModel, DatedModel):
     title = models.CharField(max_length=200)
     institution = models.CharField(max_length=200)
     location = models.CharField(max_length=200)
     description = models.TextField()
+    description_html = models.TextField(blank=True, editable=False)
+    description_plaintext = models.TextField(blank=True, editable=False)
+
+    rendered_markdown_fields = MappingProxyType({"description": (MarkdownRendering.HTML, MarkdownRendering.PLAINTEXT)})
 
     class Meta:
         verbose_name_plural = "Education entries"
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import itertools
 from io import BytesIO
 from typing import ClassVar, NamedTuple
 
@@ -9,6 +10,7 @@ from django.test import TestCase
 from PIL import Image
 
 from home.models import Project, Technology
+from utils.images import DEFAULT_FORMATS
 
 TEST_TITLE = "Test Project"
 TEST_SLUG = "test-project"
@@ -167,25 +169,27 @@ class TestProjectImageThumbnails(BaseTestProjectModel):
 
         return project
 
-    def test_card_image_is_resized_to_fill(self) -> None:
+    def test_card_images_are_resized_to_fill(self) -> None:
         project = self._project_with_image((3000, 2000))
 
-        with Image.open(project.card_image.path) as image:
-            self.assertEqual(
-                image.size,
-                expected_size := (400, 225),
-                f"Expected card_image to be resized to '{expected_size}', got '{image.size}'",
-            )
+        for image_format, width in itertools.product(DEFAULT_FORMATS, (400, 800)):
+            with Image.open(project.card_images.get_file(image_format, width).path) as image:
+                self.assertEqual(
+                    (image.format, image.size),
+                    expected := (image_format.name, (width, width * 9 // 16)),
+                    f"Expected the card image to be a '{expected}' rendition, got '{(image.format, image.size)}'",
+                )
 
-    def test_hero_display_is_resized_to_fill(self) -> None:
+    def test_hero_images_are_resized_to_fill(self) -> None:
         project = self._project_with_image((3000, 2000))
 
-        with Image.open(project.hero_display.path) as image:
-            self.assertEqual(
-                image.size,
-                expected_size := (1600, 900),
-                f"Expected hero_display to be resized to '{expected_size}', got '{image.size}'",
-            )
+        for image_format, width in itertools.product(DEFAULT_FORMATS, (640, 1024, 1600)):
+            with Image.open(project.hero_images.get_file(image_format, width).path) as image:
+                self.assertEqual(
+                    (image.format, image.size),
+                    expected := (image_format.name, (width, width * 9 // 16)),
+                    f"Expected the hero image to be a '{expected}' rendition, got '{(image.format, image.size)}'",
+                )
 
 
 class TestProjectTechnologiesRelation(BaseTestProjectModel):
@@ -33,6 +33,7 @@ class TestHomeViewBasics(TestCase):
 
 class BaseTestHomeViewContent(BaseHomeViewTest):
     request_path = ""
+    max_queries = 12
 
     def test_response(self) -> None:
         self._assert_reponse_status_code(expected_status_code=200)
@@ -174,6 +175,15 @@ class BaseTestHomeViewContent(BaseHomeViewTest):
             "Expected service 2 url to link to the contact page pre-filled with its slug",
         )
 
+    def test_portrait_is_preloaded(self) -> None:
+        """Test that the portrait, the largest image of the page, is preloaded with its preferred renditions."""
+        preload = self._find_element_by_tag_and_attribute(self.response_data.soup, HtmlTag.LINK, "as", "image")
+        expected_source = SiteMedia.get_solo().portrait_images.sources[0]
+
+        self.assertEqual(rel := preload["rel"], ["preload"], f"Expected a preload link, got rel '{rel}'")
+        self._assert_attribute_of_element(preload, "type", expected_source.type)
+        self._assert_attribute_of_element(preload, "imagesrcset", expected_source.srcset)
+
     def test_meta_tags(self) -> None:
         """Test that meta tags have correct values for home page."""
         self._assert_text_of_element(
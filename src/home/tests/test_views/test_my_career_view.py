@@ -18,6 +18,7 @@ class TestHomeViewBasics(TestCase):
 
 class BaseTestMyCareerViewContent(BaseHomeViewTest):
     request_path = "my-career/"
+    max_queries = 9
 
     def test_response(self) -> None:
         self._assert_reponse_status_code(expected_status_code=200)
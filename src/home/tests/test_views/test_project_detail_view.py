@@ -29,6 +29,7 @@ class TestProjectDetailViewBasics(TestCase):
 
 class BaseTestProjectDetailViewContent(BaseHomeViewTest):
     request_path = f"projects/{test_view_constants.PROJECT_1_SLUG}/"
+    max_queries = 8
 
     def test_response(self) -> None:
         self._assert_reponse_status_code(expected_status_code=200)
@@ -18,6 +18,7 @@ class TestProjectsViewBasics(TestCase):
 
 class BaseTestProjectsViewContent(BaseHomeViewTest):
     request_path = "projects/"
+    max_queries = 8
 
     def test_response(self) -> None:
         self._assert_reponse_status_code(expected_status_code=200)
@@ -16,7 +16,10 @@ class PersonalInfoTranslationOptions(TranslationOptions):
         "title",
         "location",
         "introduction",
+        "introduction_html",
+        "introduction_plaintext",
         "biography",
+        "biography_html",
     )
 
 
@@ -26,6 +29,8 @@ class ExperienceTranslationOptions(TranslationOptions):
         "title",
         "location",
         "description",
+        "description_html",
+        "description_plaintext",
     )
 
 
@@ -34,9 +39,13 @@ class ProjectTranslationOptions(TranslationOptions):
     fields = (
         "title",
         "summary",
+        "summary_plaintext",
         "problem",
+        "problem_html",
         "approach",
+        "approach_html",
         "outcome",
+        "outcome_html",
     )
 
 
@@ -54,6 +63,7 @@ class ServiceTranslationOptions(TranslationOptions):
         "title",
         "short_description",
         "long_description",
+        "long_description_html",
     )
 
 
@@ -64,4 +74,6 @@ class EducationTranslationOptions(TranslationOptions):
         "institution",
         "location",
         "description",
+        "description_html",
+        "description_plaintext",
     )
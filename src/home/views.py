@@ -1,16 +1,18 @@
 from __future__ import annotations
 
-import json
 from typing import TYPE_CHECKING, Any, TypedDict
 
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse
-from django.utils.safestring import SafeString, mark_safe
+from django.utils.decorators import method_decorator
+from django.utils.safestring import mark_safe
 from django.utils.translation import get_language, gettext
 from django.views import View
 
 from base.models import FollowMeLink, SiteMedia
-from utils.helpers import markdown_to_plaintext
+from core.conditional_get import page_condition
+from core.json_ld import get_json_ld
+from utils.singletons import get_solo
 from utils.types import PageMetadata
 
 from .models import Education, Experience, PersonalInfo, ProcessStep, Project, Service
@@ -51,34 +53,29 @@ class ProjectDetailViewContext(TypedDict):
     project: Project
 
 
+@method_decorator(page_condition, name="dispatch")
 class HomeView(View):
     @staticmethod
-    def __get_json_ld(
-        personal_info: PersonalInfo,
-        request: HttpRequest,
-        services: list[Service],
-        social_links: list[str],
-    ) -> SafeString:
-        """Generate JSON-LD @graph with Person and Service schemas.
+    def __build_json_ld(personal_info: PersonalInfo, services: list[Service], base_url: str) -> dict[str, Any]:
+        """Build JSON-LD @graph with Person and Service schemas.
 
         Args:
             personal_info: The personal information instance.
-            request: The HTTP request object.
             services: Active services to include as Service schema entries.
-            social_links: URLs for the Person sameAs property.
+            base_url: The base URL of the site.
 
         Returns:
-            A SafeString containing the JSON-LD representation.
+            A dictionary with the JSON-LD representation.
         """
-        base_url = f"{request.scheme}://{request.get_host()}"
         current_lang = get_language()
-        site_media = SiteMedia.get_solo()
+        site_media = get_solo(SiteMedia)
+        social_links = list(FollowMeLink.objects.values_list("link", flat=True))
 
         person: dict[str, Any] = {
             "@type": "Person",
             "name": personal_info.name,
             "jobTitle": personal_info.title,
-            "description": markdown_to_plaintext(personal_info.introduction),
+            "description": personal_info.introduction_plaintext,
             "url": base_url,
             "image": f"{base_url}{site_media.portrait_display.url}",
         }
@@ -86,7 +83,7 @@ class HomeView(View):
         if personal_info.location:
             person["homeLocation"] = {"@type": "Place", "name": personal_info.location}
 
-        if personal_info.technologies.exists():
+        if personal_info.technology_names:
             person["knowsAbout"] = personal_info.technology_names
 
         if social_links:
@@ -112,7 +109,7 @@ class HomeView(View):
             "@graph": graph,
         }
 
-        return mark_safe(json.dumps(schema, ensure_ascii=False))
+        return schema
 
     @classmethod
     def __get_page_metadata(
@@ -120,7 +117,6 @@ class HomeView(View):
         personal_info: PersonalInfo | None,
         request: HttpRequest,
         services: list[Service],
-        social_links: list[str],
     ) -> PageMetadata:
         """Get page metadata for the home page.
 
@@ -128,7 +124,6 @@ class HomeView(View):
             personal_info: The personal information instance or None.
             request: The HTTP request object.
             services: Active services passed through to the JSON-LD generator.
-            social_links: Social profile URLs passed through to the JSON-LD generator.
 
         Returns:
             A PageMetadata dictionary containing SEO metadata.
@@ -145,7 +140,7 @@ class HomeView(View):
             page_title=personal_info.get_page_title(),
             page_description=personal_info.get_page_description(),
             page_keywords=personal_info.get_page_keywords(),
-            json_ld=cls.__get_json_ld(personal_info, request, services, social_links),
+            json_ld=get_json_ld(request, lambda base_url: cls.__build_json_ld(personal_info, services, base_url)),
         )
 
     def get(self, request: HttpRequest) -> HttpResponse:
@@ -157,15 +152,15 @@ class HomeView(View):
         Returns:
             An HttpResponse rendering the home page.
         """
-        personal_info = PersonalInfo.objects.first()
+        # Not the process-wide cached singleton: its technologies are rendered in the language of the request
+        personal_info = PersonalInfo.objects.prefetch_related("technologies").first()
         services = list(Service.objects.filter(is_active=True))
-        social_links = list(FollowMeLink.objects.values_list("link", flat=True))
 
         return render(
             request,
             "index.html",
             HomeViewContext(
-                page_metadata=self.__get_page_metadata(personal_info, request, services, social_links),
+                page_metadata=self.__get_page_metadata(personal_info, request, services),
                 personal_info=personal_info,
                 featured_projects=list(Project.objects.filter(featured=True).prefetch_related("technologies")),
                 services=services,
@@ -174,6 +169,7 @@ class HomeView(View):
         )
 
 
+@method_decorator(page_condition, name="dispatch")
 class MyCareerView(View):
     @staticmethod
     def __get_experiences_json_ld(experiences: list[Experience]) -> list[dict[str, Any]]:
@@ -191,7 +187,7 @@ class MyCareerView(View):
             schema: dict[str, Any] = {
                 "@type": "WorkExperience",
                 "name": experience.title,
-                "description": markdown_to_plaintext(experience.description),
+                "description": experience.description_plaintext,
                 "startDate": experience.start_date.isoformat(),
                 "location": {
                     "@type": "Place",
@@ -208,8 +204,8 @@ class MyCareerView(View):
             if experience.end_date:
                 schema["endDate"] = experience.end_date.isoformat()
 
-            if experience.technologies.exists():
-                schema["skills"] = [tech.name for tech in experience.technologies.all()]
+            if skills := [tech.name for tech in experience.technologies.all()]:
+                schema["skills"] = skills
 
             schemas.append(schema)
 
@@ -231,7 +227,7 @@ class MyCareerView(View):
             schema: dict[str, Any] = {
                 "@type": "EducationalOccupationalCredential",
                 "name": education.title,
-                "description": markdown_to_plaintext(education.description),
+                "description": education.description_plaintext,
                 "educationalLevel": education.title,
                 "dateCreated": education.start_date.isoformat(),
                 "recognizedBy": {
@@ -252,15 +248,15 @@ class MyCareerView(View):
         return schemas
 
     @classmethod
-    def __get_json_ld(cls, experiences: list[Experience], education_entries: list[Education]) -> SafeString:
-        """Generate MyCareer schema JSON-LD.
+    def __build_json_ld(cls, experiences: list[Experience], education_entries: list[Education]) -> dict[str, Any]:
+        """Build MyCareer schema JSON-LD.
 
         Args:
             experiences: A list of Experience instances.
             education_entries: A list of Education instances.
 
         Returns:
-            A SafeString containing the JSON-LD representation.
+            A dictionary with the JSON-LD representation.
         """
         current_lang = get_language()
 
@@ -275,29 +271,30 @@ class MyCareerView(View):
             ],
         }
 
-        return mark_safe(json.dumps(schema, ensure_ascii=False))
+        return schema
 
     @classmethod
-    def __get_page_metadata(cls, experiences: list[Experience], education_entries: list[Education]) -> PageMetadata:
+    def __get_page_metadata(
+        cls, experiences: list[Experience], education_entries: list[Education], request: HttpRequest
+    ) -> PageMetadata:
         """Get page metadata for the My Career page.
 
         Args:
             experiences: A list of Experience instances.
             education_entries: A list of Education instances.
+            request: The HTTP request object.
 
         Returns:
             A PageMetadata dictionary containing SEO metadata.
         """
-        name = PersonalInfo.objects.values_list("name", flat=True).first()
-        suffix = f" | {name}" if name else ""
         return PageMetadata(
-            page_title=gettext("My Career") + suffix,
+            page_title=gettext("My Career") + PersonalInfo.get_page_title_suffix(),
             page_description=gettext(
                 "Professional experience and educational background."
                 " View my complete career history, work experience, and academic qualifications."
             ),
             page_keywords=gettext("experience, education, professional background, work history"),
-            json_ld=cls.__get_json_ld(experiences, education_entries),
+            json_ld=get_json_ld(request, lambda _base_url: cls.__build_json_ld(experiences, education_entries)),
         )
 
     def get(self, request: HttpRequest) -> HttpResponse:
@@ -310,7 +307,7 @@ class MyCareerView(View):
             An HttpResponse rendering the My Career page.
         """
         experiences = sorted(
-            Experience.objects.all(),
+            Experience.objects.prefetch_related("technologies"),
             key=lambda experience: experience.actual_end_date,
             reverse=True,
         )
@@ -324,17 +321,17 @@ class MyCareerView(View):
             request,
             "my-career.html",
             MyCareerViewContext(
-                page_metadata=self.__get_page_metadata(experiences, education_entries),
+                page_metadata=self.__get_page_metadata(experiences, education_entries, request),
                 experiences=experiences,
                 education_entries=education_entries,
             ),
         )
 
 
+@method_decorator(page_condition, name="dispatch")
 class ProjectListView(View):
     @staticmethod
-    def __get_json_ld(projects: list[Project], request: HttpRequest) -> SafeString:
-        base_url = f"{request.scheme}://{request.get_host()}"
+    def __build_json_ld(projects: list[Project], base_url: str) -> dict[str, Any]:
         current_lang = get_language()
 
         schema: dict[str, Any] = {
@@ -356,17 +353,15 @@ class ProjectListView(View):
             ],
         }
 
-        return mark_safe(json.dumps(schema, ensure_ascii=False))
+        return schema
 
     @classmethod
     def __get_page_metadata(cls, projects: list[Project], request: HttpRequest) -> PageMetadata:
-        name = PersonalInfo.objects.values_list("name", flat=True).first()
-        suffix = f" | {name}" if name else ""
         return PageMetadata(
-            page_title=gettext("Projects") + suffix,
+            page_title=gettext("Projects") + PersonalInfo.get_page_title_suffix(),
             page_description=gettext("Browse all my projects — problem, approach, and outcomes."),
             page_keywords=gettext("projects, software development, case studies"),
-            json_ld=cls.__get_json_ld(projects, request),
+            json_ld=get_json_ld(request, lambda base_url: cls.__build_json_ld(projects, base_url)),
         )
 
     def get(self, request: HttpRequest) -> HttpResponse:
@@ -381,10 +376,10 @@ class ProjectListView(View):
         )
 
 
+@method_decorator(page_condition, name="dispatch")
 class ProjectDetailView(View):
     @staticmethod
-    def __get_json_ld(project: Project, request: HttpRequest) -> SafeString:
-        base_url = f"{request.scheme}://{request.get_host()}"
+    def __build_json_ld(project: Project, base_url: str) -> dict[str, Any]:
         current_lang = get_language()
 
         schema: dict[str, Any] = {
@@ -394,27 +389,25 @@ class ProjectDetailView(View):
             },
             "@type": "CreativeWork",
             "name": project.title,
-            "description": markdown_to_plaintext(project.summary),
+            "description": project.summary_plaintext,
             "url": f"{base_url}{reverse('project-detail', kwargs={'slug': project.slug})}",
         }
 
-        if project.technologies.exists():
-            schema["keywords"] = ", ".join(tech.name for tech in project.technologies.all())
+        if keywords := ", ".join(tech.name for tech in project.technologies.all()):
+            schema["keywords"] = keywords
 
         if project.hero_image:
             schema["image"] = f"{base_url}{project.hero_image.url}"
 
-        return mark_safe(json.dumps(schema, ensure_ascii=False))
+        return schema
 
     @classmethod
     def __get_page_metadata(cls, project: Project, request: HttpRequest) -> PageMetadata:
-        name = PersonalInfo.objects.values_list("name", flat=True).first()
-        suffix = f" | {name}" if name else ""
         return PageMetadata(
-            page_title=f"{project.title}{suffix}",
+            page_title=project.title + PersonalInfo.get_page_title_suffix(),
             page_description=project.summary,
             page_keywords=", ".join(tech.name for tech in project.technologies.all()),
-            json_ld=cls.__get_json_ld(project, request),
+            json_ld=get_json_ld(request, lambda base_url: cls.__build_json_ld(project, base_url)),
         )
 
     def get(self, request: HttpRequest, slug: str) -> HttpResponse:
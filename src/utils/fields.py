@@ -1,40 +1,96 @@
 from __future__ import annotations
 
+import functools
 import json
 from typing import TYPE_CHECKING, Any
 
-from cryptography.fernet import Fernet
 from django.conf import settings
 from django.db import models
+from django.db.models.query_utils import DeferredAttribute
 
 if TYPE_CHECKING:
+    from cryptography.fernet import MultiFernet
     from django.db.backends.base.base import BaseDatabaseWrapper
+    from django.db.models import Model
     from django.db.models.expressions import Expression
 
 
+@functools.cache
+def _build_cipher(keys: tuple[str, ...]) -> MultiFernet:
+    from cryptography.fernet import Fernet, MultiFernet  # noqa: PLC0415
+
+    return MultiFernet([Fernet(key.encode()) for key in keys])
+
+
+def get_cipher() -> MultiFernet:
+    """Return the cipher of the encrypted fields, built once per set of `FIELD_ENCRYPTION_KEYS`.
+
+    Values are encrypted with the first key, and decrypted with whichever of the keys they were
+    encrypted with, so a new key can be put first while the values are re-encrypted.
+    """
+    return _build_cipher(tuple(settings.FIELD_ENCRYPTION_KEYS))
+
+
+class _Ciphertext:
+    """Encrypted value loaded from the database, decrypted on first access to the field."""
+
+    __slots__ = ("token",)
+
+    def __init__(self, token: str) -> None:
+        self.token = token
+
+
+class _DecryptingAttribute(DeferredAttribute):
+    """Attribute of the encrypted fields, decrypting the loaded value on first access.
+
+    A data descriptor, for it to take precedence over the value stored in the instance dict.
+    """
+
+    def __get__(self, instance: Model | None, cls: type[Model] | None = None) -> Any:
+        value = super().__get__(instance, cls)
+        if instance is not None and isinstance(value, _Ciphertext):
+            value = instance.__dict__[self.field.attname] = self.field.to_python(value.token)
+        return value
+
+    def __set__(self, instance: Model, value: Any) -> None:
+        instance.__dict__[self.field.attname] = value
+
+
 class EncryptedJSONField(models.TextField[dict[str, Any], dict[str, Any]]):
     """A TextField that transparently stores a dict as Fernet-encrypted JSON.
 
     Not a JSONField subclass: the encrypted value is ciphertext, not valid JSON,
     which doesn't play well with native jsonb columns and their adapters.
+
+    The value is only decrypted when the attribute is first read, and an instance saved without
+    reading it writes back the stored ciphertext as is.
     """
 
+    descriptor_class = _DecryptingAttribute
+
     def from_db_value(
         self, value: str | None, expression: Expression, connection: BaseDatabaseWrapper
-    ) -> dict[str, Any] | None:
+    ) -> dict[str, Any] | _Ciphertext | None:
         if value is None:
             return None
-        decrypted = Fernet(settings.FIELD_ENCRYPTION_KEY.encode()).decrypt(value.encode())
-        return json.loads(decrypted.decode())  # type: ignore[no-any-return]
+        return _Ciphertext(value)
 
     def to_python(self, value: Any) -> dict[str, Any] | None:
+        if isinstance(value, _Ciphertext):
+            value = value.token
         if value is None or isinstance(value, dict):
             return value
-        decrypted = Fernet(settings.FIELD_ENCRYPTION_KEY.encode()).decrypt(value.encode())
-        return json.loads(decrypted.decode())  # type: ignore[no-any-return]
+        return json.loads(get_cipher().decrypt(value.encode()))  # type: ignore[no-any-return]
 
     def get_prep_value(self, value: Any) -> str | None:
         if value is None:
             return None
-        encrypted = Fernet(settings.FIELD_ENCRYPTION_KEY.encode()).encrypt(json.dumps(value).encode())
-        return encrypted.decode()
+        if isinstance(value, _Ciphertext):
+            return value.token
+        return get_cipher().encrypt(json.dumps(value).encode()).decode()
+
+    def pre_save(self, model_instance: Model, add: bool) -> Any:
+        # Read without the descriptor, for a value never read to be saved without decrypting it
+        if self.attname in model_instance.__dict__:
+            return model_instance.__dict__[self.attname]
+        return super().pre_save(model_instance, add)
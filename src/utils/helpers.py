@@ -1,9 +1,40 @@
 from __future__ import annotations
 
-import markdown
-from bs4 import BeautifulSoup
+from core.server_timing import timed
 
 
+@timed("markdown")
+def markdown_to_html(text: str) -> str:
+    """Convert markdown to HTML.
+
+    Args:
+        text: The markdown text to convert.
+
+    Returns:
+        The HTML representation of the markdown.
+    """
+    import markdown  # noqa: PLC0415
+
+    return markdown.markdown(text)
+
+
+@timed("markdown")
+def html_to_plaintext(html: str) -> str:
+    """Convert HTML to plain text.
+
+    Args:
+        html: The HTML to convert.
+
+    Returns:
+        The text content of the HTML, with the elements separated by spaces.
+    """
+    from bs4 import BeautifulSoup  # noqa: PLC0415
+
+    soup = BeautifulSoup(html, "html.parser")
+    return soup.get_text(separator=" ", strip=True)
+
+
+@timed("markdown")
 def markdown_to_plaintext(text: str) -> str:
     """Convert markdown to plain text.
 
@@ -13,5 +44,4 @@ def markdown_to_plaintext(text: str) -> str:
     Returns:
         The plain text representation of the markdown.
     """
-    soup = BeautifulSoup(markdown.markdown(text), "html.parser")
-    return soup.get_text(separator=" ", strip=True)
+    return html_to_plaintext(markdown_to_html(text))
@@ -0,0 +1,285 @@
+"""Responsive image sets: renditions of an image field at several widths, in AVIF and WebP.
+
+A `ResponsiveImageField` declares the renditions of a source image field once, adding an
+imagekit `ImageSpecField` per format and width (e.g. `card_images_avif_800`), generated as any
+other spec (see core.image_generation). The renditions are either cropped to an aspect ratio,
+or keep the one of the source image, never upscaled, for the layout to crop them itself (e.g.
+a portrait photo with `object-cover object-top`). Its attribute on the model instances is a
+`ResponsiveImage`, rendered into a `<picture>` by the `c-picture` component: the browsers pick
+the first format they support, and the width best matching the `sizes` of the image at their
+pixel density.
+
+The metadata of the source images (dimensions, dominant colour and a tiny blurred placeholder)
+are read once on upload by `read_image_metadata`, and stored in the model (see
+utils.models.ImageMetadataModel), so the templates show the placeholder while the renditions
+load without reading the images.
+"""
+
+from __future__ import annotations
+
+import base64
+import logging
+from collections import Counter
+from functools import cached_property
+from io import BytesIO
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from imagekit.models import ImageSpecField
+from imagekit.processors import ResizeToFit, SmartResize
+from PIL import Image
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from django.core.files import File
+    from django.db.models import Model
+    from imagekit.cachefiles import ImageCacheFile
+
+logger = logging.getLogger("images")
+
+# Longest side of the placeholders, upscaled (hence blurred) by the browsers
+PLACEHOLDER_SIZE = 16
+_PLACEHOLDER_QUALITY = 40
+# Longest side of the sample the dominant colour is picked from, among a few palette colours
+_COLOR_SAMPLE_SIZE = 64
+_PALETTE_COLORS = 8
+
+
+class ImageFormat(NamedTuple):
+    """Format of the renditions: its Pillow name, MIME type and encoding options."""
+
+    name: str
+    mime_type: str
+    options: Mapping[str, Any]
+
+
+AVIF = ImageFormat("AVIF", "image/avif", {"quality": 55})
+WEBP = ImageFormat("WEBP", "image/webp", {"quality": 80})
+
+# Most compact first, as the browsers use the first format they support
+DEFAULT_FORMATS = (AVIF, WEBP)
+
+
+class ImageMetadata(NamedTuple):
+    """Metadata of an image, stored in the `<field>_<metadata>` companion fields of its image field."""
+
+    width: int | None
+    height: int | None
+    color: str
+    placeholder: str
+
+
+EMPTY_IMAGE_METADATA = ImageMetadata(width=None, height=None, color="", placeholder="")
+
+
+def _get_dominant_color(image: Image.Image) -> str:
+    sample = image.convert("RGB")
+    sample.thumbnail((_COLOR_SAMPLE_SIZE, _COLOR_SAMPLE_SIZE))
+    pixels: list[tuple[int, int, int]] = list(sample.quantize(_PALETTE_COLORS).convert("RGB").getdata())
+    red, green, blue = Counter(pixels).most_common(1)[0][0]
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def _get_placeholder(image: Image.Image) -> str:
+    thumbnail = image.convert("RGBA" if image.has_transparency_data else "RGB")
+    thumbnail.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    buffer = BytesIO()
+    thumbnail.save(buffer, format=WEBP.name, quality=_PLACEHOLDER_QUALITY)
+    return f"data:{WEBP.mime_type};base64,{base64.b64encode(buffer.getvalue()).decode()}"
+
+
+def read_image_metadata(file: File[Any]) -> ImageMetadata:
+    """Read the dimensions, dominant colour and placeholder of an image, leaving the file at its start.
+
+    Args:
+        file: The image, e.g. an upload still to be saved to the storage.
+
+    Returns:
+        The metadata of the image, or empty ones (logged) if it can't be read.
+    """
+    try:
+        file.seek(0)
+        with Image.open(file) as image:
+            width, height = image.size
+            # Decoded at a reduced scale where the format supports it (JPEG), as only a sample is needed
+            image.draft("RGB", (_COLOR_SAMPLE_SIZE, _COLOR_SAMPLE_SIZE))
+            metadata = ImageMetadata(width, height, _get_dominant_color(image), _get_placeholder(image))
+        file.seek(0)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        logger.warning("Image metadata could not be read", exc_info=True, extra={"image": file.name})
+        return EMPTY_IMAGE_METADATA
+
+    return metadata
+
+
+class ImageSource(NamedTuple):
+    """`<source>` of a `<picture>`: the renditions of a format, with their widths in `srcset`."""
+
+    type: str
+    srcset: str
+
+
+class ResponsiveImage:
+    """Renditions of the source image of a model instance, as declared by a `ResponsiveImageField`."""
+
+    def __init__(self, field: ResponsiveImageField, instance: Model) -> None:
+        self.field = field
+        self.instance = instance
+
+    def __bool__(self) -> bool:
+        return bool(getattr(self.instance, self.field.source))
+
+    def get_file(self, image_format: ImageFormat, width: int) -> ImageCacheFile:
+        """Return the rendition of the given format and width."""
+        file: ImageCacheFile = getattr(self.instance, self.field.get_spec_name(image_format, width))
+        return file
+
+    @cached_property
+    def source_size(self) -> tuple[int, int] | None:
+        """Dimensions of the source image, if stored by the model."""
+        width: int | None = getattr(self.instance, f"{self.field.source}_width", None)
+        height: int | None = getattr(self.instance, f"{self.field.source}_height", None)
+        return (width, height) if width and height else None
+
+    def get_width(self, width: int) -> int:
+        """Return the actual width of the renditions of the given width, not upscaled when keeping the aspect ratio."""
+        if self.field.aspect_ratio is None and self.source_size is not None:
+            return min(width, self.source_size[0])
+        return width
+
+    def get_height(self, width: int) -> int | None:
+        """Return the height of the renditions of the given width, None if unknown (source dimensions not stored)."""
+        if self.field.aspect_ratio is not None:
+            return self.field.get_height(width)
+        if self.source_size is None:
+            return None
+        source_width, source_height = self.source_size
+        return round(self.get_width(width) * source_height / source_width)
+
+    @cached_property
+    def sources(self) -> list[ImageSource]:
+        """The `<source>` elements of the renditions, one per format, in order of preference."""
+        # The renditions not upscaled past the source width are the same image: only the first is listed
+        widths = {self.get_width(width): width for width in reversed(self.field.widths)}
+        return [
+            ImageSource(
+                image_format.mime_type,
+                ", ".join(
+                    f"{self.get_file(image_format, width).url} {actual_width}w"
+                    for actual_width, width in sorted(widths.items())
+                ),
+            )
+            for image_format in self.field.formats
+        ]
+
+    @property
+    def url(self) -> str:
+        """URL of the fallback rendition, for the browsers without `<picture>` support."""
+        url: str = self.get_file(self.field.formats[-1], self.width).url
+        return url
+
+    @property
+    def width(self) -> int:
+        """Width of the fallback rendition."""
+        return self.get_width(self.field.fallback_width)
+
+    @property
+    def height(self) -> int | None:
+        """Height of the fallback rendition, reserving the space of the image before it loads."""
+        return self.get_height(self.field.fallback_width)
+
+    @property
+    def sizes(self) -> str:
+        """Default `sizes` of the image: its width in the layout, per media condition."""
+        return self.field.sizes
+
+    @property
+    def color(self) -> str:
+        """Dominant colour of the source image, if stored by the model."""
+        color: str = getattr(self.instance, f"{self.field.source}_color", "")
+        return color
+
+    @property
+    def placeholder(self) -> str:
+        """Blurred placeholder of the source image as a data URI, if stored by the model."""
+        placeholder: str = getattr(self.instance, f"{self.field.source}_placeholder", "")
+        return placeholder
+
+
+class ResponsiveImageField:
+    """Renditions of an image field at several widths, cropped to an aspect ratio or keeping it, in several formats.
+
+    Not a model field: like imagekit's `ImageSpecField`, which it adds one of per format and
+    width, it only declares renditions of the source field, and needs no migration.
+
+    Args:
+        source: The name of the image field the renditions are generated from.
+        widths: The widths of the renditions, in pixels.
+        aspect_ratio: The aspect ratio (width, height) the renditions are cropped to, upscaling the smaller
+            sources. If None, the renditions keep the aspect ratio of the source, resized to the width without
+            upscaling; their height is then derived from the dimensions stored by the model
+            (`<source>_width`/`<source>_height`, see utils.models.ImageMetadataModel).
+        sizes: The default `sizes` of the image, its width in the layout per media condition.
+        fallback_width: The width of the rendition used by the browsers without `<picture>`
+            support. Defaults to the smallest width.
+    """
+
+    # Formats of the renditions, in order of preference
+    formats: tuple[ImageFormat, ...] = DEFAULT_FORMATS
+
+    def __init__(
+        self,
+        source: str,
+        widths: tuple[int, ...],
+        aspect_ratio: tuple[int, int] | None,
+        sizes: str,
+        *,
+        fallback_width: int | None = None,
+    ) -> None:
+        if fallback_width is not None and fallback_width not in widths:
+            msg = f"The fallback width {fallback_width} is not one of the widths {widths}"
+            raise ValueError(msg)
+
+        self.source = source
+        self.widths = tuple(sorted(widths))
+        self.aspect_ratio = aspect_ratio
+        self.sizes = sizes
+        self.fallback_width = fallback_width or self.widths[0]
+        self.name = ""
+
+    def get_height(self, width: int) -> int | None:
+        """Return the height of the renditions of the given width, None if they keep the aspect ratio of the source."""
+        if self.aspect_ratio is None:
+            return None
+        ratio_width, ratio_height = self.aspect_ratio
+        return round(width * ratio_height / ratio_width)
+
+    def get_processors(self, width: int) -> list[Any]:
+        """Return the imagekit processors of the renditions of the given width."""
+        if (height := self.get_height(width)) is None:
+            return [ResizeToFit(width=width, upscale=False)]
+        return [SmartResize(width, height)]
+
+    def get_spec_name(self, image_format: ImageFormat, width: int) -> str:
+        """Return the name of the `ImageSpecField` of the renditions of the given format and width."""
+        return f"{self.name}_{image_format.name.lower()}_{width}"
+
+    def contribute_to_class(self, cls: type[Model], name: str) -> None:
+        self.name = name
+        for image_format in self.formats:
+            for width in self.widths:
+                spec_field = ImageSpecField(
+                    source=self.source,
+                    processors=self.get_processors(width),
+                    format=image_format.name,
+                    options=dict(image_format.options),
+                )
+                spec_field.contribute_to_class(cls, self.get_spec_name(image_format, width))
+        setattr(cls, name, self)
+
+    def __get__(self, instance: Model | None, owner: type[Model]) -> Any:
+        if instance is None:
+            return self
+        # Kept on the instance, as imagekit does with its cache files
+        image = instance.__dict__[self.name] = ResponsiveImage(self, instance)
+        return image
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from enum import StrEnum
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from django.db import models
+from modeltranslation.settings import AVAILABLE_LANGUAGES
+from modeltranslation.utils import build_localized_fieldname
+
+from utils.helpers import html_to_plaintext, markdown_to_html
+from utils.images import EMPTY_IMAGE_METADATA, ImageMetadata, read_image_metadata
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+
+class MarkdownRendering(StrEnum):
+    """Renderings of a markdown field, stored in the `<field>_<rendering>` companion field."""
+
+    HTML = "html"
+    PLAINTEXT = "plaintext"
+
+
+class TimestampedModel(models.Model):
+    """Model recording when each of its rows was last saved."""
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+
+class RenderedMarkdownModel(models.Model):
+    """Model storing the renderings of its markdown fields, so they are not rendered on every request.
+
+    Subclasses list their markdown fields and the renderings they need in `rendered_markdown_fields`,
+    and declare a non-editable `<field>_<rendering>` text field for each of them, registered for
+    translation like the markdown field itself. The renderings of every language are computed on save.
+    """
+
+    rendered_markdown_fields: ClassVar[Mapping[str, tuple[MarkdownRendering, ...]]] = MappingProxyType({})
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        self.render_markdown()
+
+        update_fields: Iterable[str] | None = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, *self.get_rendered_markdown_field_names()}
+
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def get_rendered_markdown_field_names(cls) -> Iterator[str]:
+        """Yield the names of the localized fields storing the markdown renderings."""
+        for field_name, renderings in cls.rendered_markdown_fields.items():
+            for rendering in renderings:
+                for language in AVAILABLE_LANGUAGES:
+                    yield build_localized_fieldname(f"{field_name}_{rendering}", language)
+
+    def render_markdown(self) -> None:
+        """Render the markdown fields of every language into their companion fields."""
+        for field_name, renderings in self.rendered_markdown_fields.items():
+            for language in AVAILABLE_LANGUAGES:
+                html = markdown_to_html(getattr(self, build_localized_fieldname(field_name, language)) or "")
+
+                for rendering in renderings:
+                    localized_field_name = build_localized_fieldname(f"{field_name}_{rendering}", language)
+                    setattr(
+                        self,
+                        localized_field_name,
+                        html if rendering == MarkdownRendering.HTML else html_to_plaintext(html),
+                    )
+
+
+class ImageMetadataModel(models.Model):
+    """Model storing the metadata of its images, so the templates get them without reading the images.
+
+    Subclasses list their image fields in `image_metadata_fields`, and declare non-editable
+    `<field>_width` and `<field>_height` nullable integer fields, and `<field>_color` and
+    `<field>_placeholder` text fields, for each of them (see utils.images.ImageMetadata). The
+    metadata of an image are read on save when it is uploaded, or was never read.
+    """
+
+    image_metadata_fields: ClassVar[tuple[str, ...]] = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        self.update_image_metadata()
+
+        update_fields: Iterable[str] | None = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, *self.get_image_metadata_field_names()}
+
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def get_image_metadata_field_names(cls) -> Iterator[str]:
+        """Yield the names of the fields storing the metadata of the images."""
+        for field_name in cls.image_metadata_fields:
+            for metadata_name in ImageMetadata._fields:
+                yield f"{field_name}_{metadata_name}"
+
+    def get_image_metadata(self, field_name: str) -> ImageMetadata:
+        """Return the stored metadata of the image of the given field."""
+        return ImageMetadata(*(getattr(self, f"{field_name}_{name}") for name in ImageMetadata._fields))
+
+    def update_image_metadata(self, force: bool = False) -> bool:
+        """Read the metadata of the images uploaded or never read into their companion fields.
+
+        Args:
+            force: Whether to read the metadata of every image, e.g. replaced outside of the model.
+
+        Returns:
+            Whether any stored metadata changed.
+        """
+        changed = False
+        for field_name in self.image_metadata_fields:
+            file = getattr(self, field_name)
+            stored = self.get_image_metadata(field_name)
+
+            if not file:
+                metadata = EMPTY_IMAGE_METADATA
+            elif force or not file._committed or stored.width is None:
+                metadata = read_image_metadata(file)
+                # Opened from the storage, unlike an upload still to be saved to it
+                if file._committed:
+                    file.close()
+            else:
+                continue
+
+            if metadata != stored:
+                for name, value in zip(ImageMetadata._fields, metadata, strict=True):
+                    setattr(self, f"{field_name}_{name}", value)
+                changed = True
+
+        return changed
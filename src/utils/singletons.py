@@ -0,0 +1,142 @@
+"""Process-local cache of the django-solo singletons.
+
+The singletons are read on almost every request (site media, analytics, contact form
+configuration) but only change when edited in the admin. Each process keeps its own copy
+of every singleton along with the version it was loaded at, while the current version of
+each singleton lives in the shared cache: a change bumps the version, so every worker
+reloads the singleton on its next access, and steady-state requests don't query the
+database for them at all.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import Any, NamedTuple
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from solo.models import SingletonModel
+
+_VERSION_KEY_TEMPLATE = "singleton-version:{label}"
+
+
+class _CachedSingleton(NamedTuple):
+    version: str
+    instance: SingletonModel | None
+
+
+_singletons: dict[type[SingletonModel], _CachedSingleton] = {}
+
+
+def _get_version_key(model: type[SingletonModel]) -> str:
+    return _VERSION_KEY_TEMPLATE.format(label=model._meta.label_lower)
+
+
+def get_solo_version(model: type[SingletonModel]) -> str:
+    """Return the current version of the singleton of the given model, changed whenever it is.
+
+    Args:
+        model: The django-solo singleton model.
+
+    Returns:
+        An opaque version, shared by every process.
+    """
+    version_key = _get_version_key(model)
+    version: str | None = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(version_key)
+    return str(version)
+
+
+def get_solo[T: SingletonModel](model: type[T]) -> T:
+    """Return the singleton instance of the given model, from the process-local cache when up to date.
+
+    The returned instance is shared by every request of the process, so it must not be modified:
+    use `model.get_solo()` to get an instance to edit.
+
+    Args:
+        model: The django-solo singleton model.
+
+    Returns:
+        The singleton instance.
+    """
+    version = get_solo_version(model)
+
+    cached = _singletons.get(model)
+    if cached is not None and cached.version == version and cached.instance is not None:
+        return cached.instance  # type: ignore[return-value]
+
+    # Loaded after reading the version: if it changes meanwhile, the next access reloads it
+    instance = model.get_solo()
+    _singletons[model] = _CachedSingleton(version, instance)
+    return instance
+
+
+def find_solo[T: SingletonModel](model: type[T]) -> T | None:
+    """Return the singleton instance of the given model if it exists, from the process-local cache when up to date.
+
+    Unlike `get_solo`, the instance is not created when missing, for the singletons that the pages
+    render differently until they are set up (e.g. the personal information).
+
+    Args:
+        model: The django-solo singleton model.
+
+    Returns:
+        The singleton instance, or None if it doesn't exist.
+    """
+    version = get_solo_version(model)
+
+    cached = _singletons.get(model)
+    if cached is not None and cached.version == version:
+        return cached.instance  # type: ignore[return-value]
+
+    instance = model._default_manager.first()
+    _singletons[model] = _CachedSingleton(version, instance)
+    return instance
+
+
+def invalidate_solo(model: type[SingletonModel]) -> None:
+    """Make every process reload the singleton instance of the given model on its next access.
+
+    Args:
+        model: The django-solo singleton model.
+    """
+    _singletons.pop(model, None)
+    cache.set(_get_version_key(model), uuid.uuid4().hex, timeout=None)
+
+
+def _invalidate_on_change(model: type[SingletonModel]) -> Any:
+    def invalidate(**kwargs: Any) -> None:
+        invalidate_solo(model)
+        # Bump the version again once committed: a worker reloading the singleton before the
+        # commit would otherwise keep the old state under the new version.
+        transaction.on_commit(lambda: invalidate_solo(model))
+
+    return invalidate
+
+
+def connect_singleton_invalidation() -> None:
+    """Invalidate the cached singletons whenever they, or the objects they relate to, change."""
+    for model in apps.get_models():
+        if not issubclass(model, SingletonModel):
+            continue
+
+        receiver = _invalidate_on_change(model)
+        dispatch_uid = f"singleton_invalidation_{model._meta.label_lower}"
+
+        senders: set[type[Model]] = {model}
+        for field in model._meta.get_fields():
+            # related_model may also be the lazy "self" reference, or None for non-relations
+            related = field.related_model
+            if field.is_relation and field.concrete and isinstance(related, type) and issubclass(related, Model):
+                senders.add(related)
+        for m2m_field in model._meta.local_many_to_many:
+            m2m_changed.connect(receiver, sender=m2m_field.remote_field.through, dispatch_uid=dispatch_uid, weak=False)
+
+        for sender in senders:
+            post_save.connect(receiver, sender=sender, dispatch_uid=dispatch_uid, weak=False)
+            post_delete.connect(receiver, sender=sender, dispatch_uid=dispatch_uid, weak=False)
@@ -8,10 +8,13 @@ from typing import TYPE_CHECKING, Any, ClassVar, ContextManager, NamedTuple
 from bs4 import BeautifulSoup, Tag
 from django.test import Client, TestCase
 from django.utils import translation
+from django_cooco.models import BannerConfig
 
 import home.tests.test_views.utils.constants as test_view_constants
 import utils.test_utils.constants as common_constants
-from base.models import FollowMeLink, LegalAndPrivacy
+from base.models import FollowMeLink, GoogleAnalytics, LegalAndPrivacy, SiteMedia
+from contact.models import ContactFormConfiguration
+from core.queries import find_repeated_queries, record_queries
 from utils.test_utils.constants import HtmlTag, Language
 
 if TYPE_CHECKING:
@@ -47,6 +50,7 @@ class BaseViewTestCase(TestCase, ABC):
     language: ClassVar[Language]
     response_data: ResponseData
     mocked_request: Any
+    queries: list[str]
 
     @classmethod
     @abstractmethod
@@ -72,9 +76,10 @@ class BaseViewTestCase(TestCase, ABC):
     def setUp(self) -> None:
         """Set up each test with a fresh request and response_data."""
         self.client = Client()
-        with self._mock_on_request() as mocked_request:
+        with self._mock_on_request() as mocked_request, record_queries() as queries:
             self.mocked_request = mocked_request
             self.response_data = ResponseData.get_response(self._send_request())
+        self.queries = queries
 
     def _get_json_ld_data(self) -> dict[str, Any]:
         script = self._find_element_by_tag_and_attribute(
@@ -178,6 +183,10 @@ class BaseViewTestCase(TestCase, ABC):
 
     @classmethod
     def _init_common_db(cls) -> None:
+        # Set up front as on a running site: their creation on first access would count towards the query budgets
+        for singleton_model in (SiteMedia, GoogleAnalytics, ContactFormConfiguration, BannerConfig):
+            singleton_model.get_solo()
+
         LegalAndPrivacy.objects.create(
             title=test_view_constants.LEGAL_SECTION_1[Language.ENGLISH],
             title_es=test_view_constants.LEGAL_SECTION_1[Language.SPANISH],
@@ -201,7 +210,24 @@ class BaseViewTestCase(TestCase, ABC):
 
 
 class CommonPageTestsMixin(BaseViewTestCase, ABC):
-    """Mixin with tests for elements common to every full-page view (footer, SEO tags)."""
+    """Mixin with tests for elements common to every full-page view (footer, SEO tags, query budget)."""
+
+    # Maximum number of queries to render the page: lower it along with the optimizations, never raise it lightly
+    max_queries: ClassVar[int]
+
+    def test_query_budget(self) -> None:
+        self.assertLessEqual(
+            query_count := len(self.queries),
+            self.max_queries,
+            f"The page ran {query_count} queries, over its budget of {self.max_queries}:\n" + "\n".join(self.queries),
+        )
+
+    def test_no_repeated_queries(self) -> None:
+        self.assertDictEqual(
+            repeated_queries := find_repeated_queries(self.queries),
+            {},
+            f"The page repeated queries, likely an N+1 pattern: {repeated_queries}",
+        )
 
     def test_footer_pages(self) -> None:
         upper_footer = self._find_element_by_tag_and_id(
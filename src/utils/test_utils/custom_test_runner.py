@@ -5,14 +5,18 @@ import shutil
 import tempfile
 from io import BytesIO
 from pathlib import Path
-from typing import Any
-from unittest import TestLoader
+from typing import TYPE_CHECKING, Any
+from unittest import TestLoader, TextTestResult
 from unittest.suite import TestSuite
 
 from django.conf import settings
+from django.core.cache import caches
 from django.test.runner import DiscoverRunner
 from PIL import Image
 
+if TYPE_CHECKING:
+    from unittest import TestCase
+
 # Loggers used in the contact flow: silenced during tests to avoid noise from the
 # error paths under test. `assertLogs` overrides the level for its block, so tests
 # asserting on these loggers are unaffected.
@@ -28,11 +32,26 @@ class CustomTestLoader(TestLoader):
         )
 
 
+class CacheClearingTestResult(TextTestResult):
+    """Clear every cache before each test, so cached pages don't leak between tests.
+
+    The database is rolled back after each test but the caches are not.
+    """
+
+    def startTest(self, test: TestCase) -> None:  # noqa: N802 # Overrided method
+        for cache in caches.all():
+            cache.clear()
+        super().startTest(test)
+
+
 class CustomTestRunner(DiscoverRunner):
     test_loader = CustomTestLoader()
     _original_media_root: Path
     _media_root: Path
 
+    def get_resultclass(self) -> type[TextTestResult] | None:
+        return super().get_resultclass() or CacheClearingTestResult
+
     def setup_test_environment(self, **kwargs: Any) -> None:
         super().setup_test_environment(**kwargs)
 
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 import json
+from unittest import mock
 
-from django.test import TestCase
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from django.test import TestCase, override_settings
 
-from utils.fields import EncryptedJSONField
+from contact.models import ContactFormConfiguration
+from utils.fields import EncryptedJSONField, get_cipher
+
+OLD_KEY = Fernet.generate_key().decode()
+NEW_KEY = Fernet.generate_key().decode()
 
 
 class TestEncryptedJSONField(TestCase):
@@ -48,3 +54,81 @@ class TestEncryptedJSONField(TestCase):
             prepped := self.field.get_prep_value(None), f"get_prep_value(None) returned '{prepped}' instead of None"
         )
         self.assertIsNone(parsed := self.field.to_python(None), f"to_python(None) returned '{parsed}' instead of None")
+
+
+class TestEncryptedJSONFieldKeys(TestCase):
+    def setUp(self) -> None:
+        self.field = EncryptedJSONField()
+
+    def test_cipher_is_built_once_per_set_of_keys(self) -> None:
+        with override_settings(FIELD_ENCRYPTION_KEYS=[NEW_KEY]):
+            cipher = get_cipher()
+            self.assertIs(get_cipher(), cipher, "The cipher should be built once for the same keys")
+
+        with override_settings(FIELD_ENCRYPTION_KEYS=[NEW_KEY, OLD_KEY]):
+            self.assertIsNot(get_cipher(), cipher, "The cipher should be built again for other keys")
+
+    def test_values_of_a_former_key_are_decrypted(self) -> None:
+        with override_settings(FIELD_ENCRYPTION_KEYS=[OLD_KEY]):
+            encrypted = self.field.get_prep_value({"api_key": "super-secret"})
+
+        with override_settings(FIELD_ENCRYPTION_KEYS=[NEW_KEY, OLD_KEY]):
+            self.assertEqual(
+                decrypted := self.field.to_python(encrypted),
+                {"api_key": "super-secret"},
+                f"The value encrypted with the former key should be decrypted, got '{decrypted}'",
+            )
+
+    def test_values_are_encrypted_with_the_newest_key(self) -> None:
+        with override_settings(FIELD_ENCRYPTION_KEYS=[NEW_KEY, OLD_KEY]):
+            encrypted = self.field.get_prep_value({"api_key": "super-secret"})
+
+        assert encrypted is not None
+        with self.assertRaises(InvalidToken, msg="The value should not be encrypted with the former key"):
+            Fernet(OLD_KEY.encode()).decrypt(encrypted.encode())
+        self.assertIn(
+            b"super-secret", Fernet(NEW_KEY.encode()).decrypt(encrypted.encode()), "Expected the newest key to be used"
+        )
+
+
+class TestEncryptedJSONFieldLazyDecryption(TestCase):
+    def setUp(self) -> None:
+        config = ContactFormConfiguration.get_solo()
+        config.provider_config = {"api_key": "super-secret"}
+        config.save()
+
+    def _count_decryptions(self) -> mock._patch[mock.MagicMock]:
+        return mock.patch.object(MultiFernet, "decrypt", autospec=True, side_effect=MultiFernet.decrypt)
+
+    def test_value_is_decrypted_on_first_access_only(self) -> None:
+        with self._count_decryptions() as decrypt:
+            config = ContactFormConfiguration.objects.get()
+            self.assertEqual(decrypt.call_count, 0, "The value should not be decrypted when loaded")
+
+            self.assertEqual(
+                config.provider_config, {"api_key": "super-secret"}, "The decrypted value should be returned"
+            )
+            self.assertEqual(config.provider_config["api_key"], "super-secret", "The decrypted value should be kept")
+
+        self.assertEqual(decrypt.call_count, 1, f"Expected a single decryption, got '{decrypt.call_count}'")
+
+    def test_value_not_read_is_saved_as_stored(self) -> None:
+        with self._count_decryptions() as decrypt:
+            config = ContactFormConfiguration.objects.get()
+            config.contact_email = "other@example.com"
+            config.save()
+
+        self.assertEqual(decrypt.call_count, 0, "The value should not be decrypted to be saved")
+        config.refresh_from_db()
+        self.assertEqual(config.provider_config, {"api_key": "super-secret"}, "The value should be saved unchanged")
+
+    def test_assigned_value_is_saved(self) -> None:
+        config = ContactFormConfiguration.objects.get()
+        config.provider_config = {"api_key": "other-secret"}
+        config.save()
+
+        self.assertEqual(
+            provider_config := ContactFormConfiguration.objects.get().provider_config,
+            {"api_key": "other-secret"},
+            f"Expected the assigned value to be saved, got '{provider_config}'",
+        )
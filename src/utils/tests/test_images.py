@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import base64
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.template.loader import render_to_string
+from django.test import TestCase
+from imagekit.processors import ResizeToFit, SmartResize
+from PIL import Image
+
+from base.models import SiteMedia
+from utils.images import (
+    AVIF,
+    DEFAULT_FORMATS,
+    EMPTY_IMAGE_METADATA,
+    PLACEHOLDER_SIZE,
+    WEBP,
+    ResponsiveImageField,
+    read_image_metadata,
+)
+
+
+def _build_image_file(size: tuple[int, int], image_format: str) -> ContentFile[bytes]:
+    buffer = BytesIO()
+    image = Image.new("RGB", size, color="green")
+    # A red band over a fifth of the image, so the dominant colour is the green
+    image.paste("red", (0, 0, size[0], size[1] // 5))
+    image.save(buffer, format=image_format)
+
+    return ContentFile(buffer.getvalue(), name=f"image.{image_format.lower()}")
+
+
+class TestResponsiveImageField(TestCase):
+    def setUp(self) -> None:
+        self.site_media = SiteMedia.get_solo()
+        self.field = SiteMedia.portrait_images
+
+    def test_a_spec_is_added_per_format_and_width(self) -> None:
+        for image_format in DEFAULT_FORMATS:
+            for width in self.field.widths:
+                spec_name = self.field.get_spec_name(image_format, width)
+                self.assertTrue(hasattr(SiteMedia, spec_name), f"Expected the spec '{spec_name}' in SiteMedia")
+
+    def test_sources_list_every_width_by_preferred_format(self) -> None:
+        sources = self.site_media.portrait_images.sources
+
+        self.assertEqual(
+            types := [source.type for source in sources],
+            ["image/avif", "image/webp"],
+            f"Unexpected source types '{types}'",
+        )
+        self.assertEqual(
+            srcset := sources[0].srcset,
+            expected_srcset := ", ".join(
+                f"{self.site_media.portrait_images.get_file(AVIF, width).url} {width}w" for width in self.field.widths
+            ),
+            f"Expected the srcset '{expected_srcset}', got '{srcset}'",
+        )
+
+    def test_fallback_is_the_least_preferred_format(self) -> None:
+        image = self.site_media.portrait_images
+
+        self.assertEqual(
+            url := image.url,
+            expected_url := image.get_file(WEBP, self.field.fallback_width).url,
+            f"Expected the fallback url '{expected_url}', got '{url}'",
+        )
+        self.assertEqual(
+            dimensions := (image.width, image.height), (1280, 720), f"Unexpected fallback dimensions '{dimensions}'"
+        )
+
+    def test_renditions_of_a_narrower_source_are_listed_at_its_width(self) -> None:
+        self.site_media.portrait_image = _build_image_file((1000, 1500), "JPEG")
+        self.site_media.save()
+        image = SiteMedia.objects.get(pk=self.site_media.pk).portrait_images
+
+        self.assertEqual(
+            srcset := image.sources[0].srcset,
+            expected_srcset := ", ".join(
+                f"{image.get_file(AVIF, width).url} {actual_width}w"
+                for width, actual_width in ((640, 640), (960, 960), (1280, 1000))
+            ),
+            f"Expected the renditions not upscaled once, at the source width, '{expected_srcset}', got '{srcset}'",
+        )
+        self.assertEqual(
+            dimensions := (image.width, image.height), (1000, 1500), f"Unexpected fallback dimensions '{dimensions}'"
+        )
+
+    def test_picture_leaves_out_unknown_dimensions(self) -> None:
+        self.site_media.portrait_image_width = self.site_media.portrait_image_height = None
+
+        html = render_to_string("cotton/picture.html", {"image": self.site_media.portrait_images, "alt": "Portrait"})
+
+        self.assertNotIn("height=", html, f"Expected no dimensions without the source ones in '{html}'")
+
+    def test_cropped_renditions_have_the_height_of_the_aspect_ratio(self) -> None:
+        field = ResponsiveImageField(source="portrait_image", widths=(400, 800), aspect_ratio=(16, 9), sizes="100vw")
+
+        self.assertEqual(height := field.get_height(800), 450, f"Unexpected height '{height}'")
+        self.assertIsInstance(field.get_processors(800)[0], SmartResize, "Expected the renditions to be cropped")
+        self.assertIsInstance(
+            self.field.get_processors(800)[0], ResizeToFit, "Expected the portrait to keep its aspect ratio"
+        )
+
+    def test_fallback_width_must_be_a_width(self) -> None:
+        with self.assertRaises(ValueError):
+            ResponsiveImageField(
+                source="portrait_image", widths=(400, 800), aspect_ratio=(1, 1), sizes="100vw", fallback_width=600
+            )
+
+    def test_picture_is_rendered_with_a_source_per_format(self) -> None:
+        html = render_to_string(
+            "cotton/picture.html", {"image": self.site_media.portrait_images, "alt": "Portrait", "sizes": "50vw"}
+        )
+
+        self.assertEqual(html.count("<source "), len(DEFAULT_FORMATS), f"Expected a source per format in '{html}'")
+        self.assertIn('sizes="50vw"', html, f"Expected the given sizes in '{html}'")
+        self.assertIn('width="1280"', html, f"Expected the fallback width in '{html}'")
+        self.assertIn('height="720"', html, f"Expected the fallback height in '{html}'")
+
+    def test_picture_shows_the_placeholder_while_loading(self) -> None:
+        html = render_to_string("cotton/picture.html", {"image": self.site_media.portrait_images, "alt": "Portrait"})
+
+        self.assertIn(
+            f"background: {self.site_media.portrait_image_color} url({self.site_media.portrait_image_placeholder})",
+            html,
+            f"Expected the placeholder in '{html}'",
+        )
+
+
+class TestReadImageMetadata(TestCase):
+    def test_metadata_of_a_large_jpeg(self) -> None:
+        file = _build_image_file((3000, 1000), "JPEG")
+
+        metadata = read_image_metadata(file)
+
+        self.assertEqual(
+            (metadata.width, metadata.height), (3000, 1000), f"Expected the full dimensions, got '{metadata}'"
+        )
+        red, green, blue = (int(metadata.color[index : index + 2], 16) for index in (1, 3, 5))
+        self.assertGreater(green, max(red, blue), f"Expected a green dominant colour, got '{metadata.color}'")
+        self.assertEqual(file.tell(), 0, "The file should be left at its start")
+
+    def test_placeholder_is_a_tiny_webp(self) -> None:
+        metadata = read_image_metadata(_build_image_file((1600, 900), "PNG"))
+
+        prefix = "data:image/webp;base64,"
+        self.assertTrue(metadata.placeholder.startswith(prefix), f"Unexpected placeholder '{metadata.placeholder}'")
+        with Image.open(BytesIO(base64.b64decode(metadata.placeholder.removeprefix(prefix)))) as placeholder:
+            self.assertEqual(size := placeholder.size, (PLACEHOLDER_SIZE, 9), f"Unexpected placeholder size '{size}'")
+
+    def test_unreadable_image_has_empty_metadata(self) -> None:
+        with self.assertLogs("images", "WARNING"):
+            metadata = read_image_metadata(ContentFile(b"not an image", name="image.png"))
+
+        self.assertEqual(metadata, EMPTY_IMAGE_METADATA, f"Expected empty metadata, got '{metadata}'")
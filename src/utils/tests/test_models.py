@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import translation
+from PIL import Image
+
+from home.models import Project
+from utils.images import EMPTY_IMAGE_METADATA
+
+
+def _build_uploaded_image(size: tuple[int, int], color: str) -> SimpleUploadedFile:
+    buffer = BytesIO()
+    Image.new("RGB", size, color=color).save(buffer, format="PNG")
+
+    return SimpleUploadedFile("image.png", buffer.getvalue(), content_type="image/png")
+
+
+class TestRenderedMarkdownModel(TestCase):
+    """Test cases for the markdown renderings stored on save."""
+
+    def setUp(self) -> None:
+        self.enterContext(translation.override("en"))
+        self.project = Project.objects.create(
+            title="Portfolio",
+            slug="portfolio",
+            summary="A **bold** summary",
+            summary_es="Un resumen **audaz**",
+            problem="The *problem*",
+            problem_es="El *problema*",
+            approach="Approach",
+            outcome="Outcome",
+        )
+
+    def test_renderings_are_stored_for_every_language(self) -> None:
+        """Test that saving a model stores the renderings of each language."""
+        project = Project.objects.get(pk=self.project.pk)
+
+        for language, expected_html, expected_plaintext in (
+            ("en", "<p>The <em>problem</em></p>", "A bold summary"),
+            ("es", "<p>El <em>problema</em></p>", "Un resumen audaz"),
+        ):
+            with translation.override(language):
+                self.assertEqual(
+                    html := project.problem_html,
+                    expected_html,
+                    f"Expected the '{language}' HTML '{expected_html}', got '{html}'",
+                )
+                self.assertEqual(
+                    plaintext := project.summary_plaintext,
+                    expected_plaintext,
+                    f"Expected the '{language}' plain text '{expected_plaintext}', got '{plaintext}'",
+                )
+
+    def test_renderings_are_updated_with_update_fields(self) -> None:
+        """Test that saving only the markdown field also stores its renderings."""
+        self.project.problem = "New problem"
+        self.project.save(update_fields=["problem_en"])
+
+        self.assertEqual(
+            html := Project.objects.get(pk=self.project.pk).problem_html,
+            "<p>New problem</p>",
+            f"Expected the updated HTML '<p>New problem</p>', got '{html}'",
+        )
+
+    def test_untranslated_rendering_falls_back_to_default_language(self) -> None:
+        """Test that a language without its own markdown uses the rendering of the default language."""
+        with translation.override("es"):
+            self.assertEqual(
+                html := self.project.approach_html,
+                "<p>Approach</p>",
+                f"Expected the fallback HTML '<p>Approach</p>', got '{html}'",
+            )
+
+
+class TestImageMetadataModel(TestCase):
+    """Test cases for the image metadata stored on save."""
+
+    def setUp(self) -> None:
+        self.enterContext(override_settings(MEDIA_ROOT=self.enterContext(tempfile.TemporaryDirectory())))
+        self.project = Project.objects.create(
+            title="Portfolio",
+            slug="portfolio",
+            summary="Summary",
+            problem="Problem",
+            approach="Approach",
+            outcome="Out",
+        )
+
+    def test_metadata_are_read_on_upload(self) -> None:
+        """Test that uploading an image stores its dimensions, dominant colour and placeholder."""
+        self.project.hero_image = _build_uploaded_image((800, 600), "blue")
+        self.project.save()
+
+        project = Project.objects.get(pk=self.project.pk)
+        metadata = project.get_image_metadata("hero_image")
+        self.assertEqual(
+            (metadata.width, metadata.height, metadata.color),
+            (800, 600, "#0000ff"),
+            f"Unexpected metadata '{metadata}'",
+        )
+        self.assertTrue(
+            metadata.placeholder.startswith("data:image/webp;base64,"),
+            f"Expected a WebP data URI placeholder, got '{metadata.placeholder}'",
+        )
+        with Image.open(project.hero_image.path) as image:
+            self.assertEqual(image.size, (800, 600), "The upload should be saved whole after being read")
+
+    def test_metadata_are_not_read_again_for_an_unchanged_image(self) -> None:
+        """Test that saving a row whose image was already read does not read it again."""
+        self.project.hero_image = _build_uploaded_image((800, 600), "blue")
+        self.project.save()
+
+        with mock.patch("utils.models.read_image_metadata") as read_image_metadata:
+            Project.objects.get(pk=self.project.pk).save()
+
+        read_image_metadata.assert_not_called()
+
+    def test_metadata_are_cleared_with_the_image(self) -> None:
+        """Test that clearing the image clears its metadata, even when saving only the image field."""
+        self.project.hero_image = _build_uploaded_image((800, 600), "blue")
+        self.project.save()
+
+        self.project.hero_image = None
+        self.project.save(update_fields=["hero_image"])
+
+        self.assertEqual(
+            metadata := Project.objects.get(pk=self.project.pk).get_image_metadata("hero_image"),
+            EMPTY_IMAGE_METADATA,
+            f"Expected empty metadata, got '{metadata}'",
+        )
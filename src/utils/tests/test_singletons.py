@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from django.test import TestCase
+
+from base.models import GoogleAnalytics, LegalAndPrivacy, SiteMedia
+from contact.models import ContactFormConfiguration
+from home.models import PersonalInfo
+from utils.singletons import find_solo, get_solo, invalidate_solo
+
+
+class TestGetSolo(TestCase):
+    """Test cases for the process-local singleton cache."""
+
+    def test_cached_instance_does_not_query_database(self) -> None:
+        """Test that once loaded, a singleton is returned without querying the database."""
+        SiteMedia.get_solo()
+        get_solo(SiteMedia)
+
+        with self.assertNumQueries(0):
+            site_media = get_solo(SiteMedia)
+
+        self.assertIsInstance(site_media, SiteMedia, f"Expected a SiteMedia instance, got '{site_media}'")
+
+    def test_save_reloads_instance(self) -> None:
+        """Test that saving the singleton makes the next access reload it."""
+        get_solo(GoogleAnalytics)
+
+        analytics = GoogleAnalytics.get_solo()
+        analytics.gtag = "G-TEST"
+        analytics.save()
+
+        self.assertEqual(
+            gtag := get_solo(GoogleAnalytics).gtag, "G-TEST", f"Expected the saved gtag 'G-TEST', got '{gtag}'"
+        )
+
+    def test_related_object_change_reloads_instance(self) -> None:
+        """Test that changing an object the singleton relates to makes the next access reload it."""
+        legal_and_privacy = LegalAndPrivacy.objects.create(title="Privacy", text="Old text")
+        config = ContactFormConfiguration.get_solo()
+        config.legal_and_privacy = legal_and_privacy
+        config.save()
+        self.assertEqual(
+            get_solo(ContactFormConfiguration).legal_and_privacy,
+            legal_and_privacy,
+            "Expected the configured privacy policy",
+        )
+
+        legal_and_privacy.text = "New text"
+        legal_and_privacy.save()
+
+        related = get_solo(ContactFormConfiguration).legal_and_privacy
+        self.assertEqual(
+            text := related.text if related else None,
+            "New text",
+            f"Expected the updated privacy text 'New text', got '{text}'",
+        )
+
+    def test_version_change_from_another_process_reloads_instance(self) -> None:
+        """Test that a version bump (e.g. by another worker) makes the next access reload the singleton."""
+        cached = get_solo(SiteMedia)
+
+        # Simulate another worker: the instance changes in the database and the version is bumped
+        SiteMedia.objects.filter(pk=cached.pk).update(portrait_image="site/other.png")
+        invalidate_solo(SiteMedia)
+
+        self.assertEqual(
+            image := get_solo(SiteMedia).portrait_image.name,
+            "site/other.png",
+            f"Expected the updated portrait image, got '{image}'",
+        )
+
+
+class TestFindSolo(TestCase):
+    """Test cases for looking up a singleton without creating it."""
+
+    def test_missing_instance_is_not_created(self) -> None:
+        """Test that a missing singleton is returned as None, and not created."""
+        self.assertIsNone(personal_info := find_solo(PersonalInfo), f"Expected no instance, got '{personal_info}'")
+        self.assertFalse(PersonalInfo.objects.exists(), "The singleton should not be created")
+
+    def test_cached_instance_does_not_query_database(self) -> None:
+        """Test that once found, a singleton is returned without querying the database."""
+        PersonalInfo.objects.create(name="Test User", title="Developer", introduction="Intro", biography="Bio")
+        find_solo(PersonalInfo)
+
+        with self.assertNumQueries(0):
+            personal_info = find_solo(PersonalInfo)
+
+        self.assertEqual(
+            name := personal_info.name if personal_info else None, "Test User", f"Expected 'Test User', got '{name}'"
+        )
+
+    def test_creation_reloads_missing_instance(self) -> None:
+        """Test that creating the singleton makes the next lookup find it."""
+        find_solo(PersonalInfo)
+
+        PersonalInfo.objects.create(name="Test User", title="Developer", introduction="Intro", biography="Bio")
+
+        self.assertIsNotNone(find_solo(PersonalInfo), "Expected the created instance to be found")